@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Benchmark admin KPI endpoints: sequential queries vs query fan-out.
+
+Calls the KPI endpoints directly (no HTTP, no auth) against DATABASE_URL,
+first with QueryFanout capped at one query at a time (the old sequential
+behaviour, on the request session) and then with the configured cap, and
+reports the median and p95 wall-clock latency per endpoint.
+
+--synthetic needs no database: every "query" sleeps for --latency-ms, which
+shows the upper bound of the speed-up for a given cap.
+
+Usage:
+    python benchmark_admin_kpis.py [--runs 10] [--concurrency 4]
+    python benchmark_admin_kpis.py --synthetic [--queries 16] [--latency-ms 20]
+"""
+
+import argparse
+import inspect
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+
+def call_with_defaults(endpoint, db):
+    """Call a FastAPI endpoint function with its Query(...) defaults."""
+    kwargs = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        if name == "db":
+            kwargs[name] = db
+        elif param.default is not inspect.Parameter.empty:
+            kwargs[name] = getattr(param.default, "default", param.default)
+    return endpoint(**kwargs)
+
+
+def timed(func, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(rows):
+    header = f"{'case':<44}{'median ms':>11}{'p95 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for label, samples in rows:
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{label:<44}{statistics.median(samples) * 1000:>11.1f}{p95 * 1000:>9.1f}")
+
+
+def run_synthetic(args):
+    from unittest import mock
+
+    from src.app.core import query_fanout as fanout_module
+    from src.app.core.query_fanout import QueryFanout
+
+    class NullSession:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    queries = {
+        f"q{i}": (lambda session: time.sleep(args.latency_ms / 1000))
+        for i in range(args.queries)
+    }
+    rows = []
+    with mock.patch.object(fanout_module, "ReadonlySessionLocal", NullSession):
+        for cap in (1, args.concurrency):
+            fanout = QueryFanout(max_workers=args.concurrency, max_concurrency=cap)
+            rows.append(
+                (
+                    f"{args.queries} queries, concurrency {cap}",
+                    timed(lambda: fanout.run(queries, db=NullSession()), args.runs),
+                )
+            )
+    report(rows)
+
+
+def run_database(args):
+    from src.app.api.endpoints import admin_dashboard, subscriptions_dashboard
+    from src.app.core.database import SessionLocal
+    from src.app.core.query_fanout import query_fanout
+
+    endpoints = [
+        ("contractors_kpis", admin_dashboard.contractors_kpis),
+        ("suppliers_kpis", admin_dashboard.suppliers_kpis),
+        ("system_ingested_jobs", admin_dashboard.system_ingested_jobs),
+        ("subscriptions_dashboard", subscriptions_dashboard.subscriptions_dashboard),
+        ("get_admin_analytics", admin_dashboard.get_admin_analytics),
+    ]
+    configured = min(args.concurrency, query_fanout.max_workers)
+    rows = []
+    for name, endpoint in endpoints:
+        for cap in (1, configured):
+            query_fanout.max_concurrency = cap
+            db = SessionLocal()
+            try:
+                call_with_defaults(endpoint, db)  # warm-up (plans, pool)
+                rows.append(
+                    (
+                        f"{name}, concurrency {cap}",
+                        timed(lambda: call_with_defaults(endpoint, db), args.runs),
+                    )
+                )
+            finally:
+                db.close()
+    report(rows)
+
+
+def main(args):
+    if args.synthetic:
+        run_synthetic(args)
+    else:
+        run_database(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    main(parser.parse_args())
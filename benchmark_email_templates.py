@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Benchmark email body rendering: inline f-string + html_to_text vs precompiled templates.
+
+The "before" case is what each send did before templates were precompiled:
+read and base64-encode the logo, build the body with an f-string and derive
+the plain-text part by running html_to_text over the whole body. The "after"
+case renders the same body (and its text part) through the template registry
+with the cached logo. Both render the lead-unlock email.
+
+Without app/static/logo.png (e.g. in a bare checkout) the "before" case skips
+the per-send file read, so it understates the difference.
+
+Usage:
+    python benchmark_email_templates.py [--renders 20000]
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+
+def logo_html_for(logo_base64: str) -> str:
+    return (
+        f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
+        if logo_base64
+        else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
+    )
+
+
+def render_values(i: int, logo_html: str) -> dict:
+    return {
+        "user_name": f"User {i}",
+        "credits_spent": 1 + i % 3,
+        "credits_suffix": "s" if 1 + i % 3 != 1 else "",
+        "frontend_url": "https://tigerleads.ai",
+        "job_title": "New Single Family Residence",
+        "job_location": "1234 Oak Street, Springfield",
+        "logo_html": logo_html,
+        "year": 2026,
+    }
+
+
+def run_before(renders: int, source: str) -> float:
+    """Per send: logo read + f-string (str.format over the same source) + html_to_text."""
+    from src.app.utils.email import LOGO_PATH
+    from src.app.utils.email_resend import html_to_text
+
+    started = time.perf_counter()
+    for i in range(renders):
+        logo_base64 = ""
+        if os.path.exists(LOGO_PATH):
+            with open(LOGO_PATH, "rb") as f:
+                logo_base64 = base64.b64encode(f.read()).decode("utf-8")
+        html = source.format(**render_values(i, logo_html_for(logo_base64)))
+        html_to_text(html)
+    return time.perf_counter() - started
+
+
+def run_after(renders: int) -> float:
+    from src.app.utils.email import load_logo_base64
+    from src.app.utils.email_templates import email_templates
+
+    started = time.perf_counter()
+    for i in range(renders):
+        email_templates.render("lead_unlock", **render_values(i, logo_html_for(load_logo_base64())))
+    return time.perf_counter() - started
+
+
+def main(args):
+    os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/benchmark")
+
+    from src.app.data.email_templates import LEAD_UNLOCK
+
+    results = [
+        ("f-string + html_to_text", run_before(args.renders, LEAD_UNLOCK)),
+        ("precompiled template", run_after(args.renders)),
+    ]
+
+    header = f"{'case':<28}{'renders':>9}{'seconds':>9}{'renders/s':>11}{'us/render':>11}"
+    print(header)
+    print("-" * len(header))
+    for label, elapsed in results:
+        print(
+            f"{label:<28}{args.renders:>9}{elapsed:>9.2f}"
+            f"{args.renders / elapsed:>11.0f}{elapsed / args.renders * 1e6:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20000)
+    main(parser.parse_args())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""Benchmark Groq job-matching prompts before/after prompt compaction.
+
+Runs the "before" GroqMatchingService (loaded from a git ref) and the current
+one against a local stub that replays recorded Groq responses, and reports
+prompt/completion tokens and end-to-end latency for both.
+
+The stub delays each answer in proportion to its token counts so latency
+reflects prompt size and output length the way the real API does:
+
+    delay = base + prompt_tokens * prefill_cost + completion_tokens * decode_cost
+
+Usage:
+    python benchmark_groq_prompts.py [--ref 539a516] [--runs 20]
+
+Token counts use tiktoken (cl100k_base) when installed, otherwise ~4 chars/token.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+MODULE_PATH = "src/app/api/endpoints/ai_job_matching.py"
+
+SAMPLE_JOB = {
+    "permit_number": "BP-2024-001234",
+    "permit_status": "Issued",
+    "project_type": "New Single Family Residence",
+    "property_type": "Residential",
+    "job_address": "123 Main St",
+    "cost": "$450,000",
+    "job_description": "Construct new 2-story single family residence with attached 2-car garage, 4 bedrooms, 3 baths, covered patio and pool.",
+    "state": "FL",
+    "county_city": "Orange County",
+}
+
+# Recorded answers (display name, offset days) replayed by the stub
+RECORDED_CONTRACTORS = [
+    ("General Contractor", 0),
+    ("Site Work/Grading Contractor", 7),
+    ("Excavation / Trenching Contractor", 14),
+    ("Erosion Control Contractor", 14),
+    ("Concrete Contractor", 30),
+    ("Foundation / Pier Installer", 30),
+    ("Waterproofing / Air Barrier Contractor", 45),
+    ("Framing Contractor", 60),
+    ("Roofing Contractor", 75),
+    ("Window / Door Contractor", 80),
+    ("Plumbing Contractor", 90),
+    ("Electrical Contractor", 90),
+    ("Mechanical / HVAC Contractor", 90),
+    ("Low Voltage Contractor", 95),
+    ("Insulation Contractor", 105),
+    ("Drywall / Sheetrock Contractor", 120),
+    ("Painting Contractor", 135),
+    ("Flooring / Carpet Installers", 145),
+    ("Tile Contractor", 145),
+    ("Cabinet Installer", 150),
+    ("Countertop Fabricator", 155),
+    ("Trim Carpenter", 155),
+    ("Garage Door Contractor", 160),
+    ("Gunite/shotcrete subcontractor", 160),
+    ("Landscape Contractor", 170),
+    ("Irrigation Contractor", 175),
+]
+
+RECORDED_SUPPLIERS = [
+    ("Dumpster / Roll Off Supplier", 0),
+    ("Equipment Rental", 0),
+    ("Portable Sanitation Rental", 0),
+    ("Temporary Fencing Supplier", 3),
+    ("Erosion control supplier", 7),
+    ("Concrete Supplier", 25),
+    ("Rebar & structural hardware", 25),
+    ("Lumber Supplier", 50),
+    ("Truss Company", 50),
+    ("Fasteners / anchoring suppliers", 55),
+    ("Window / Door / Glass Distributors", 60),
+    ("Roofing Materials Distributor", 70),
+    ("Plumbing Supplier", 85),
+    ("Electrical Supply House", 85),
+    ("HVAC Distributor", 85),
+    ("Insulation Suppliers", 100),
+    ("Drywall / Sheetrock Supplier", 115),
+    ("Paint / Coatings Suppliers", 130),
+    ("Flooring Distributor (Tile, LVP, Wood & Carpet)", 140),
+    ("Tile Suppliers", 140),
+    ("Cabinet Supplier", 145),
+    ("Countertop Suppliers", 150),
+    ("Appliance Suppliers", 155),
+    ("Pool equipment supplier / distributor", 160),
+    ("Landscape Suppliers", 165),
+    ("Irrigation Suppliers", 170),
+    ("Sod / grass Suppliers", 175),
+]
+
+
+def _token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken cl100k_base"
+    except Exception:
+        return (lambda text: max(1, len(text) // 4)), "~4 chars/token estimate"
+
+
+count_tokens, TOKENIZER = _token_counter()
+
+
+def _recorded_content(messages: list) -> str:
+    """Pick the recorded answer for a request, in the format the prompt asks for."""
+    prompt = "\n".join(m["content"] for m in messages)
+    supplier = "SUPPLIER" in prompt
+    recorded = RECORDED_SUPPLIERS if supplier else RECORDED_CONTRACTORS
+
+    if "(id=name)" not in prompt:
+        return json.dumps(
+            {"matches": [{"user_type": n, "offset_days": d} for n, d in recorded]},
+            indent=2,
+        )
+
+    from src.app.api.endpoints.ai_job_matching import (
+        CONTRACTOR_PROMPT_TYPES,
+        SUPPLIER_PROMPT_TYPES,
+    )
+
+    catalog = SUPPLIER_PROMPT_TYPES if supplier else CONTRACTOR_PROMPT_TYPES
+    ids = {name: idx for idx, name in enumerate(catalog, start=1)}
+    return json.dumps({"matches": [[ids[n], d] for n, d in recorded]}, separators=(",", ":"))
+
+
+def make_stub_handler(args, stats: list):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *_):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            messages = body["messages"]
+            content = _recorded_content(messages)
+            prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+            completion_tokens = count_tokens(content)
+            stats.append((prompt_tokens, completion_tokens, body.get("max_tokens")))
+
+            time.sleep(
+                args.base_ms / 1000
+                + prompt_tokens * args.prefill_ms / 1000
+                + completion_tokens * args.decode_ms / 1000
+            )
+            payload = json.dumps(
+                {
+                    "choices": [{"message": {"role": "assistant", "content": content}}],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                    },
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return StubHandler
+
+
+def load_service_from_ref(ref: str):
+    """Load GroqMatchingService as it was at ``ref``."""
+    source = subprocess.check_output(
+        ["git", "show", f"{ref}:{MODULE_PATH}"], cwd=ROOT, text=True
+    )
+    module = types.ModuleType("ai_job_matching_before")
+    module.__file__ = f"{ref}:{MODULE_PATH}"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module.GroqMatchingService
+
+
+async def run_case(label, service_cls, role, runs, stats):
+    service = service_cls()
+    method = service.match_contractors if role == "contractor" else service.match_suppliers
+    stats.clear()
+    latencies = []
+    matches = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        matches = await method(SAMPLE_JOB)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    prompt_tokens, completion_tokens, max_tokens = stats[-1]
+    return {
+        "label": label,
+        "role": role,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "max_tokens": max_tokens,
+        "matches": len(matches),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+async def main(args):
+    stats: list = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_stub_handler(args, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/benchmark")
+
+    from src.app.api.endpoints.ai_job_matching import GroqMatchingService
+    from src.app.services.groq_client import groq_client
+
+    before_cls = load_service_from_ref(args.ref)
+
+    results = []
+    for role in ("contractor", "supplier"):
+        results.append(await run_case(f"before ({args.ref})", before_cls, role, args.runs, stats))
+        results.append(await run_case("after", GroqMatchingService, role, args.runs, stats))
+    await groq_client.aclose()
+    server.shutdown()
+
+    print(f"Tokenizer: {TOKENIZER}; {args.runs} run(s) per case")
+    print(
+        f"Stub latency: {args.base_ms}ms + {args.prefill_ms}ms/prompt token"
+        f" + {args.decode_ms}ms/completion token\n"
+    )
+    header = f"{'case':<18}{'role':<12}{'prompt':>8}{'output':>8}{'max':>6}{'matches':>9}{'p50 ms':>9}{'p95 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['label']:<18}{r['role']:<12}{r['prompt_tokens']:>8}{r['completion_tokens']:>8}"
+            f"{r['max_tokens']:>6}{r['matches']:>9}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ref", default="539a516", help="git ref of the 'before' prompts")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--base-ms", type=float, default=150.0)
+    parser.add_argument("--prefill-ms", type=float, default=0.02)
+    parser.add_argument("--decode-ms", type=float, default=4.0)
+    asyncio.run(main(parser.parse_args()))
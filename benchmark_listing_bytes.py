@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""Benchmark bytes fetched by the job listing endpoints: whole rows vs projections.
+
+Calls the listing endpoints directly (no HTTP, no auth) against DATABASE_URL
+and counts the bytes of every value the SELECTs return (strings and binary by
+length, other values as 8 bytes), twice per endpoint:
+
+- "full rows": every ``with_entities(...)`` projection is replaced by the
+  whole Job entity with its deferred columns undeferred, i.e. what the
+  endpoints loaded before,
+- "projected": the endpoints as they are.
+
+Each SELECT is executed a second time on the same connection to count its
+result, so run it against a copy of production data, not production.
+
+The user-facing feeds need a Contractor or Supplier with a completed profile:
+pass --user-id to include them.
+
+Usage:
+    python benchmark_listing_bytes.py [--per-page 500] [--user-id 42]
+"""
+
+import argparse
+import inspect
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+
+def _value_bytes(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    return 8
+
+
+class FetchCounter:
+    """Counts rows and bytes returned by SELECTs on an engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.rows = 0
+        self.bytes = 0
+        event.listen(engine, "after_cursor_execute", self._count)
+
+    def reset(self):
+        self.rows = 0
+        self.bytes = 0
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        probe = conn.connection.dbapi_connection.cursor()
+        try:
+            probe.execute(statement, parameters)
+            for row in probe.fetchall():
+                self.rows += 1
+                self.bytes += sum(_value_bytes(value) for value in row)
+        finally:
+            probe.close()
+
+
+@contextmanager
+def full_rows():
+    """Make ``Query.with_entities`` a no-op that loads every Job column."""
+    from sqlalchemy.orm import Query, undefer
+
+    def whole_entity(query, *entities):
+        return query.options(undefer("*"))
+
+    with mock.patch.object(Query, "with_entities", whole_entity):
+        yield
+
+
+def call(endpoint, db, **overrides):
+    kwargs = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        if name == "db":
+            kwargs[name] = db
+        elif param.default is not inspect.Parameter.empty:
+            kwargs[name] = getattr(param.default, "default", param.default)
+    kwargs.update(overrides)
+    return endpoint(**kwargs)
+
+
+def main(args) -> int:
+    from src.app import models
+    from src.app.api.endpoints import admin_dashboard, dashboard, jobs
+    from src.app.core.database import SessionLocal, engine
+
+    cases = [
+        (
+            "admin system-ingested jobs",
+            admin_dashboard.system_ingested_jobs,
+            {"per_page": args.per_page},
+        ),
+        ("admin posted jobs", admin_dashboard.posted_jobs, {"per_page": args.per_page}),
+        (
+            "admin contractor-uploaded jobs",
+            admin_dashboard.contractor_uploaded_jobs,
+            {"per_page": args.per_page},
+        ),
+    ]
+
+    db = SessionLocal()
+    counter = FetchCounter(engine)
+    try:
+        if args.user_id:
+            user = db.get(models.user.User, args.user_id)
+            if user is None:
+                raise SystemExit(f"user {args.user_id} not found")
+            users = {"current_user": user, "effective_user": user}
+            cases += [
+                ("/jobs/feed", jobs.get_job_feed, users),
+                ("/jobs/all", jobs.get_all_jobs, users),
+                ("/dashboard", dashboard.get_dashboard, users),
+            ]
+
+        header = f"{'endpoint':<34}{'full rows':>14}{'projected':>14}{'saved':>8}"
+        print(header)
+        print("-" * len(header))
+        for label, endpoint, overrides in cases:
+            results = []
+            for patched in (True, False):
+                db.expire_all()
+                counter.reset()
+                if patched:
+                    with full_rows():
+                        call(endpoint, db, **overrides)
+                else:
+                    call(endpoint, db, **overrides)
+                results.append(counter.bytes)
+                db.rollback()
+            before, after = results
+            saved = 100 * (1 - after / before) if before else 0
+            print(f"{label:<34}{before:>14,}{after:>14,}{saved:>7.1f}%")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-page", type=int, default=500)
+    parser.add_argument("--user-id", type=int, default=None)
+    raise SystemExit(main(parser.parse_args()))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""Benchmark web-push delivery: serial webpush() calls vs PushDeliveryEngine.
+
+Runs both against a local fake push service that answers 201 Created (and
+410 Gone for a share of the endpoints) after a fixed delay, the way FCM /
+Mozilla autopush answer, and reports sends per second and the number of
+database statements issued for subscription bookkeeping.
+
+Subscriptions get real P-256 keys so payload encryption costs what it does in
+production; no database is needed (the engine's session is a recorder).
+
+Usage:
+    python benchmark_push_delivery.py [--subscriptions 2000] [--latency-ms 40]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+
+def make_push_handler(args, counters: dict):
+    class FakePushHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(args.latency_ms / 1000)
+            gone = self.path.rsplit("/", 1)[-1].startswith("gone")
+            counters["requests"] += 1
+            self.send_response(410 if gone else 201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    return FakePushHandler
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_subscriptions(base_url: str, count: int, gone_every: int) -> list:
+    subscriptions = []
+    for i in range(count):
+        public_key = ec.generate_private_key(ec.SECP256R1()).public_key()
+        p256dh = public_key.public_bytes(
+            serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+        )
+        name = f"gone-{i}" if gone_every and i % gone_every == 0 else f"sub-{i}"
+        subscriptions.append(
+            SimpleNamespace(
+                id=i + 1,
+                user_id=i + 1,
+                endpoint=f"{base_url}/push/{name}",
+                p256dh_key=_b64(p256dh),
+                auth_key=_b64(os.urandom(16)),
+            )
+        )
+    return subscriptions
+
+
+class RecordingSession:
+    """Counts the statements/commits the engine would send to Postgres."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def execute(self, *_args, **_kwargs):
+        self.statements += 1
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def run_serial(subscriptions, payload):
+    """The pre-engine behaviour: one webpush() call, UPDATE and COMMIT per subscription."""
+    from pywebpush import WebPushException, webpush
+    from urllib.parse import urlparse
+
+    from src.app.services.push_service import VAPID_CLAIM_EMAIL, VAPID_PRIVATE_KEY
+
+    stats = {"sent": 0, "gone": 0, "failed": 0, "statements": 0}
+    started = time.perf_counter()
+    for sub in subscriptions:
+        parsed = urlparse(sub.endpoint)
+        try:
+            webpush(
+                subscription_info={
+                    "endpoint": sub.endpoint,
+                    "keys": {"p256dh": sub.p256dh_key, "auth": sub.auth_key},
+                },
+                data=json.dumps(payload),
+                vapid_private_key=VAPID_PRIVATE_KEY,
+                vapid_claims={
+                    "sub": VAPID_CLAIM_EMAIL,
+                    "aud": f"{parsed.scheme}://{parsed.netloc}",
+                },
+            )
+            stats["sent"] += 1
+        except WebPushException as e:
+            status = e.response.status_code if e.response is not None else None
+            stats["gone" if status in (404, 410) else "failed"] += 1
+        stats["statements"] += 2  # UPDATE/DELETE + COMMIT
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def run_engine(subscriptions, payload, concurrency):
+    from src.app.services.push_service import PushDeliveryEngine
+
+    engine = PushDeliveryEngine(max_concurrency=concurrency)
+    db = RecordingSession()
+    started = time.perf_counter()
+    result = engine.deliver(db, subscriptions, lambda _sub: payload, mark_notified=True)
+    return {
+        "sent": result["sent"],
+        "gone": result["gone"],
+        "failed": result["failed"],
+        "statements": db.statements + db.commits,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def main(args):
+    counters = {"requests": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_push_handler(args, counters))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/benchmark")
+    os.environ.setdefault("VAPID_PUBLIC_KEY", "benchmark")
+
+    subscriptions = make_subscriptions(
+        f"http://127.0.0.1:{server.server_port}", args.subscriptions, args.gone_every
+    )
+    payload = {"title": "Benchmark", "body": "New jobs", "url": "https://tigerleads.ai/jobs"}
+
+    results = []
+    serial_subs = subscriptions[: args.serial_subscriptions]
+    results.append((f"serial ({len(serial_subs)} subs)", run_serial(serial_subs, payload)))
+    results.append(
+        (
+            f"engine x{args.concurrency} ({len(subscriptions)} subs)",
+            run_engine(subscriptions, payload, args.concurrency),
+        )
+    )
+    server.shutdown()
+
+    print(f"Fake push service latency: {args.latency_ms}ms; 1 in {args.gone_every} endpoints 410\n")
+    header = f"{'case':<30}{'sent':>7}{'gone':>6}{'failed':>8}{'db stmts':>10}{'seconds':>9}{'sends/s':>9}"
+    print(header)
+    print("-" * len(header))
+    for label, r in results:
+        total = r["sent"] + r["gone"] + r["failed"]
+        print(
+            f"{label:<30}{r['sent']:>7}{r['gone']:>6}{r['failed']:>8}{r['statements']:>10}"
+            f"{r['elapsed']:>9.2f}{total / r['elapsed']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=2000)
+    parser.add_argument(
+        "--serial-subscriptions", type=int, default=200,
+        help="subscriptions sent in the serial case (it is slow)",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--gone-every", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""Fail if importing the app (the cold-start path) regresses.
+
+Imports src.app.main in a fresh interpreter under ``python -X importtime``
+and exits non-zero when:
+
+- the cumulative import time of src.app.main (best of --runs) exceeds
+  --budget-ms (or IMPORT_TIME_BUDGET_MS),
+- a heavy optional library was actually executed during the import (they
+  must be imported lazily, see src/app/utils/lazy_import.py),
+- the import opened a database connection (schema bootstrap belongs in the
+  startup event or `python -m src.app.core.schema_bootstrap`).
+
+DATABASE_URL points at a closed local port so nothing can reach a real
+database.
+
+Also run by the test suite (tests/test_import_time.py).
+
+Usage:
+    python check_import_time.py [--budget-ms 2000] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+# About 15% above the measured cold import (~1.7 s)
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+HEAVY_MODULES = (
+    "pandas",
+    "openpyxl",
+    "stripe",
+    "fitz",
+    "qrcode",
+    "PIL",
+    "resend",
+    "pywebpush",
+    "py_vapid",
+)
+
+PROBE = f"""
+import json, sys
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+connects = []
+event.listen(Engine, "do_connect", lambda *args: connects.append(1))
+
+import src.app.main
+
+loaded = [
+    name
+    for name in {HEAVY_MODULES!r}
+    if name in sys.modules
+    and type(sys.modules[name]).__name__ != "_LazyModule"
+]
+print(json.dumps({{"loaded": loaded, "connects": len(connects)}}))
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$")
+
+
+def measure() -> tuple:
+    env = dict(
+        os.environ,
+        DATABASE_URL="postgresql://cold-start@127.0.0.1:1/none",
+        PYTHONPATH=str(ROOT),
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit("import of src.app.main failed")
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match and match.group(2) == "src.app.main":
+            cumulative_us = int(match.group(1))
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return cumulative_us / 1000, result
+
+
+def check(runs: int, budget_ms: float) -> tuple:
+    """Measure ``runs`` times; returns (samples in ms, failure messages)."""
+    samples = []
+    result = {}
+    for _ in range(runs):
+        elapsed_ms, result = measure()
+        samples.append(elapsed_ms)
+    best = min(samples)
+
+    failures = []
+    if best > budget_ms:
+        failures.append(f"import took {best:.0f} ms (budget {budget_ms:.0f} ms)")
+    if result["loaded"]:
+        failures.append(f"heavy modules imported eagerly: {', '.join(result['loaded'])}")
+    if result["connects"]:
+        failures.append(f"{result['connects']} database connection(s) during import")
+    return samples, failures
+
+
+def main(args) -> int:
+    samples, failures = check(args.runs, args.budget_ms)
+    best = min(samples)
+
+    print(
+        f"src.app.main import: best {best:.0f} ms of "
+        f"{', '.join(f'{s:.0f}' for s in samples)} ms (budget {args.budget_ms:.0f} ms)"
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    raise SystemExit(main(parser.parse_args()))
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from src.app import models
 from src.app.core.database import get_db
 from src.app.core.jwt import verify_token
+from src.app.core.schema_capabilities import schema_capabilities
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -30,32 +31,25 @@ def get_admin_by_email(db: Session, email: str):
     Uses raw SQL to avoid depending on ORM model/table mapping. Raises HTTPException(500)
     if the DB call fails.
     """
-    # Query admin_users and require the `password_hash` column exist.
-    # Try to select the optional `role` column if it exists; fall back if not.
+    # `role` comes from a startup migration (core/migrations.py); select it when
+    # the cached schema has it rather than retrying a failed statement
+    columns = "id, email, is_active, password_hash"
+    if schema_capabilities.has_column("admin_users", "role"):
+        columns += ", role"
     try:
-        # Attempt to fetch role as well (if migration applied)
         res = db.execute(
             text(
-                "SELECT id, email, is_active, password_hash, role FROM admin_users WHERE lower(email) = lower(:email) LIMIT 1"
+                f"SELECT {columns} FROM admin_users WHERE lower(email) = lower(:email) LIMIT 1"
             ),
             {"email": email},
         ).first()
     except Exception:
-        # Fallback to query without `role` if the column is missing or DB error
-        try:
-            res = db.execute(
-                text(
-                    "SELECT id, email, is_active, password_hash FROM admin_users WHERE lower(email) = lower(:email) LIMIT 1"
-                ),
-                {"email": email},
-            ).first()
-        except Exception:
-            logger.exception("get_admin_by_email: DB query failed for email=%s", email)
-            # Surface a clear 500 so migrations can be run to add missing columns.
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Admin authorization unavailable",
-            )
+        logger.exception("get_admin_by_email: DB query failed for email=%s", email)
+        # Surface a clear 500 so migrations can be run to add missing columns.
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Admin authorization unavailable",
+        )
 
     if not res:
         return None
@@ -256,17 +250,15 @@ def require_admin_token(
             token_dt = None
 
     try:
-        # Try to read last_logout_at; if column missing this will raise and be ignored
+        # last_logout_at comes from a startup migration; skip the check without it
         row = None
-        try:
+        if token_dt and schema_capabilities.has_column("admin_users", "last_logout_at"):
             row = db.execute(
                 text(
                     "SELECT last_logout_at FROM admin_users WHERE lower(email) = lower(:email) LIMIT 1"
                 ),
                 {"email": email},
             ).first()
-        except Exception:
-            row = None
 
         if row and row[0] and token_dt:
             last_logout_at = row[0]
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import secrets
 from datetime import datetime, timedelta
@@ -14,8 +15,11 @@ from src.app.api.endpoints import auth as auth_module
 from src.app.api.endpoints.auth import hash_password, verify_password
 from src.app.core.database import get_db
 from src.app.core.jwt import create_access_token
+from src.app.core.schema_capabilities import schema_capabilities
 from src.app.schemas.user import AdminAccountUpdate
+from src.app.services.blob_store import blob_store
 from src.app.utils.email import send_password_reset_email, send_verification_email
+from src.app.utils.stored_files import has_profile_picture, profile_picture_bytes
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -78,62 +82,23 @@ def _ensure_admin_exists(email: str, db: Session):
 
 
 def _ensure_admin_columns(db: Session):
-    """Ensure `verification_code` and `code_expires_at` columns exist on admin_users.
+    """Ensure the verification/reset columns exist on admin_users.
 
-    If missing, ALTER TABLE will add them. This makes the code robust when the
-    DB schema hasn't been migrated yet.
+    They are added by a startup migration (core/migrations.py); this only
+    checks the cached schema so a failed migration surfaces as a clear 500.
     """
-    logger.debug("_ensure_admin_columns: checking admin_users columns")
-    try:
-        col = db.execute(
-            text(
-                "SELECT column_name FROM information_schema.columns WHERE table_name = 'admin_users' AND column_name = 'verification_code' LIMIT 1"
-            )
-        ).first()
-        logger.debug("_ensure_admin_columns: column query result=%s", col)
-    except Exception as e:
-        logger.exception("_ensure_admin_columns: metadata check failed: %s", e)
-        # If the metadata query fails, surface an error to the caller
-        raise HTTPException(status_code=500, detail="Admin authorization unavailable")
-
-    if not col:
-        try:
-            logger.info(
-                "_ensure_admin_columns: adding missing verification/password columns to admin_users"
-            )
-            # Use larger field for verification_code to support URL-safe tokens for resets
-            db.execute(
-                text(
-                    "ALTER TABLE admin_users ADD COLUMN verification_code VARCHAR(255)"
-                )
-            )
-            db.execute(
-                text(
-                    "ALTER TABLE admin_users ADD COLUMN code_expires_at TIMESTAMP NULL"
-                )
-            )
-            db.execute(
-                text(
-                    "ALTER TABLE admin_users ADD COLUMN password_hash VARCHAR(255) NULL"
-                )
-            )
-            # Separate columns for password reset tokens so signup OTPs are not overwritten
-            db.execute(
-                text("ALTER TABLE admin_users ADD COLUMN reset_token VARCHAR(255) NULL")
-            )
-            db.execute(
-                text(
-                    "ALTER TABLE admin_users ADD COLUMN reset_token_expires_at TIMESTAMP NULL"
-                )
-            )
-            db.commit()
-            logger.info("_ensure_admin_columns: added missing admin_users columns")
-        except Exception as e:
-            logger.exception("_ensure_admin_columns: failed to add columns: %s", e)
-            db.rollback()
-            raise HTTPException(
-                status_code=500, detail="Unable to prepare admin table for verification"
-            )
+    if not schema_capabilities.has_columns(
+        "admin_users",
+        "verification_code",
+        "code_expires_at",
+        "password_hash",
+        "reset_token",
+        "reset_token_expires_at",
+    ):
+        logger.error("_ensure_admin_columns: admin_users migration has not been applied")
+        raise HTTPException(
+            status_code=500, detail="Unable to prepare admin table for verification"
+        )
 
 
 @router.post("/signup")
@@ -366,18 +331,29 @@ def admin_logout(
     """Record admin logout by setting `last_logout_at` on the admin_users row.
 
     This allows server-side token revocation checks by comparing a token's
-    `iat` against this timestamp (not implemented here). The column will be
-    created if missing so the endpoint is safe to call before migrations.
+    `iat` against this timestamp (see `require_admin_token`).
     """
+    # Update the admin row
     try:
-        # Ensure column exists (idempotent)
-        col = db.execute(
+        now = datetime.utcnow()
+        db.execute(
             text(
-                "SELECT column_name FROM information_schema.columns WHERE table_name = 'admin_users' AND column_name = 'last_logout_at' LIMIT 1"
-            )
-        ).first()
+                "UPDATE admin_users SET last_logout_at = :now WHERE lower(email) = lower(:email)"
+            ),
+            {"now": now, "email": getattr(admin, "email", None)},
+        )
+        db.commit()
+        return {"message": "Logged out"}
     except Exception as e:
-        logger.exception("admin_logout: metadata check failed: %s", e)
+        logger.exception(
+            "admin_logout: DB error updating last_logout_at for %s: %s",
+            getattr(admin, "email", None),
+            e,
+        )
+        try:
+            db.rollback()
+        except Exception:
+            pass
         raise HTTPException(
             status_code=500, detail="Unable to perform logout at this time"
         )
@@ -410,7 +386,7 @@ def admin_profile(
         "id": admin_user.id,
         "email": admin_user.email,
         "name": admin_user.name,
-        "hasProfilePicture": admin_user.profile_picture_data is not None,
+        "hasProfilePicture": has_profile_picture(admin_user),
     }
 
 
@@ -485,47 +461,6 @@ def admin_update_account(
 
     return {"message": "Account updated", "id": admin_id, "email": email}
 
-    if not col:
-        try:
-            db.execute(
-                text("ALTER TABLE admin_users ADD COLUMN last_logout_at TIMESTAMP NULL")
-            )
-            db.commit()
-        except Exception as e:
-            logger.exception("admin_logout: failed to add column: %s", e)
-            try:
-                db.rollback()
-            except Exception:
-                pass
-            raise HTTPException(
-                status_code=500, detail="Unable to perform logout at this time"
-            )
-
-    # Update the admin row
-    try:
-        now = datetime.utcnow()
-        db.execute(
-            text(
-                "UPDATE admin_users SET last_logout_at = :now WHERE lower(email) = lower(:email)"
-            ),
-            {"now": now, "email": getattr(admin, "email", None)},
-        )
-        db.commit()
-        return {"message": "Logged out"}
-    except Exception as e:
-        logger.exception(
-            "admin_logout: DB error updating last_logout_at for %s: %s",
-            getattr(admin, "email", None),
-            e,
-        )
-        try:
-            db.rollback()
-        except Exception:
-            pass
-        raise HTTPException(
-            status_code=500, detail="Unable to perform logout at this time"
-        )
-
 
 @router.post("/forgot-password")
 async def admin_forgot_password(
@@ -665,7 +600,7 @@ async def upload_admin_profile_picture(
     Upload or update admin profile picture.
 
     Accepts image files (JPEG, PNG, GIF, WebP) up to 5MB.
-    Stores the image as binary data in the database.
+    Stores the image in the blob store.
     """
     # Validate file type
     allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
@@ -699,7 +634,9 @@ async def upload_admin_profile_picture(
             raise HTTPException(status_code=404, detail="Admin not found")
 
         # Update profile picture
-        admin_user.profile_picture_data = content
+        stored = await asyncio.to_thread(blob_store.put_bytes, content)
+        admin_user.profile_picture_blob = stored.sha256
+        admin_user.profile_picture_data = None
         admin_user.profile_picture_content_type = file.content_type
 
         db.commit()
@@ -745,13 +682,12 @@ async def get_admin_profile_picture(
         if not admin_user:
             raise HTTPException(status_code=404, detail="Admin not found")
 
-        if not admin_user.profile_picture_data:
+        picture = await asyncio.to_thread(profile_picture_bytes, admin_user)
+        if not picture:
             raise HTTPException(status_code=404, detail="No profile picture uploaded")
 
         # Encode image data to base64
-        base64_encoded = base64.b64encode(admin_user.profile_picture_data).decode(
-            "utf-8"
-        )
+        base64_encoded = base64.b64encode(picture).decode("utf-8")
         content_type = admin_user.profile_picture_content_type or "image/jpeg"
 
         # Return as data URL blob
@@ -760,7 +696,7 @@ async def get_admin_profile_picture(
         return {
             "blob": data_url,
             "contentType": content_type,
-            "size": len(admin_user.profile_picture_data),
+            "size": len(picture),
             "name": admin_user.name,
             "email": admin_user.email,
             "role": getattr(admin_user, "role", None),
@@ -797,10 +733,11 @@ async def delete_admin_profile_picture(
         if not admin_user:
             raise HTTPException(status_code=404, detail="Admin not found")
 
-        if not admin_user.profile_picture_data:
+        if not has_profile_picture(admin_user):
             raise HTTPException(status_code=404, detail="No profile picture to delete")
 
         # Delete profile picture
+        admin_user.profile_picture_blob = None
         admin_user.profile_picture_data = None
         admin_user.profile_picture_content_type = None
 
@@ -1,14 +1,12 @@
 import asyncio
 import base64
 import csv
-import io
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from zoneinfo import ZoneInfo
 
-import pandas as pd
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -17,6 +15,7 @@ from fastapi import (
     File,
     HTTPException,
     Query,
+    Request,
     Response,
     UploadFile,
 )
@@ -35,7 +34,30 @@ from src.app.api.deps import (
     require_ops_or_billing,
 )
 from src.app.core.database import get_db
+from src.app.core.query_fanout import query_fanout
+from src.app.core.response_cache import response_cache
+from src.app.core.schema_capabilities import schema_capabilities
+from src.app.data import trade_taxonomy
+from src.app.services.analytics_rollups import (
+    USER_ANY,
+    day_bound,
+    is_day_aligned,
+    job_fact_filters,
+    sum_by_period,
+    user_fact_filters,
+)
+from src.app.services.blob_store import blob_store
+from src.app.services.job_archive import find_job
+from src.app.services.job_posted_push import record_job_posted
+from src.app.utils.spreadsheet_export import check_export_format, export_response
 from src.app.utils.geo import US_STATE_NAMES
+from src.app.utils.stored_files import (
+    file_response,
+    files_with_data,
+    has_profile_picture,
+    profile_picture_bytes,
+    with_data,
+)
 
 import uuid
 from pydantic import BaseModel
@@ -129,10 +151,21 @@ def search_system_ingested_jobs(
         else_=3,
     )
 
-    # Apply pagination
+    # Apply pagination (only the columns the table shows)
     offset = (page - 1) * per_page
     rows = (
-        base_query.order_by(status_order, models.user.Job.created_at.desc())
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.audience_type_names,
+            models.user.Job.contact_name,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.applicant_email,
+            models.user.Job.trs_score,
+            models.user.Job.job_review_status,
+        )
+        .order_by(status_order, models.user.Job.created_at.desc())
         .limit(per_page)
         .offset(offset)
         .all()
@@ -210,10 +243,22 @@ def search_posted_jobs(
     total_count = base_query.count()
     total_pages = (total_count + per_page - 1) // per_page
 
-    # Order by review_posted_at descending (most recent first)
+    # Order by review_posted_at descending (most recent first), only the
+    # columns the table shows
     offset = (page - 1) * per_page
     rows = (
-        base_query.order_by(models.user.Job.review_posted_at.desc())
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.audience_type_names,
+            models.user.Job.contact_name,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.applicant_email,
+            models.user.Job.trs_score,
+            models.user.Job.job_review_status,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
         .limit(per_page)
         .offset(offset)
         .all()
@@ -570,6 +615,7 @@ def approve_pending_jurisdiction(
     pj.reviewed_at = _dt.utcnow()
     pj.reviewed_by = admin.id
     db.add(pj)
+    response_cache.invalidate_on_commit(db, "users")
     db.commit()
     db.refresh(pj)
 
@@ -617,6 +663,7 @@ def reject_pending_jurisdiction(
     pj.reviewed_by = admin.id
     pj.rejection_note = body.note
     db.add(pj)
+    response_cache.invalidate_on_commit(db, "users")
     db.commit()
     db.refresh(pj)
 
@@ -706,6 +753,7 @@ def approve_pending_user_type(
     put.reviewed_at = _dt.utcnow()
     put.reviewed_by = admin.id
     db.add(put)
+    response_cache.invalidate_on_commit(db, "users")
     db.commit()
     db.refresh(put)
 
@@ -837,6 +885,7 @@ def reject_pending_user_type(
     put.reviewed_by = admin.id
     put.rejection_note = body.note
     db.add(put)
+    response_cache.invalidate_on_commit(db, "users")
     db.commit()
     db.refresh(put)
 
@@ -880,7 +929,8 @@ def get_job_details(job_id: int, db: Session = Depends(get_db)):
 
     Returns all job data points including documents, contractor info, project details, etc.
     """
-    job = db.query(models.user.Job).filter(models.user.Job.id == job_id).first()
+    # Retired jobs are served from jobs_archive
+    job = find_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -974,8 +1024,11 @@ def get_job_details(job_id: int, db: Session = Depends(get_db)):
             job.review_posted_at.isoformat() if job.review_posted_at else None
         ),
         "job_group_id": job.job_group_id,
-        "job_documents": job.job_documents,  # Array of document URLs/paths
+        "job_documents": files_with_data(job.job_documents),  # Array of document URLs/paths
         "decline_note": getattr(job, "decline_note", None),  # Admin's decline reason
+        "archived_at": (
+            job.archived_at.isoformat() if getattr(job, "archived_at", None) else None
+        ),
     }
 
 
@@ -989,13 +1042,7 @@ def get_contractor_uploaded_job_details(job_id: int, db: Session = Depends(get_d
 
     Returns all job data points including documents for jobs uploaded by contractors.
     """
-    job = (
-        db.query(models.user.Job)
-        .filter(
-            models.user.Job.id == job_id, models.user.Job.uploaded_by_contractor == True
-        )
-        .first()
-    )
+    job = find_job(db, job_id, uploaded_by_contractor=True)
 
     if not job:
         raise HTTPException(status_code=404, detail="Contractor-uploaded job not found")
@@ -1090,7 +1137,7 @@ def get_contractor_uploaded_job_details(job_id: int, db: Session = Depends(get_d
             job.review_posted_at.isoformat() if job.review_posted_at else None
         ),
         "job_group_id": job.job_group_id,
-        "job_documents": job.job_documents,  # Include documents for contractor jobs
+        "job_documents": files_with_data(job.job_documents),  # Include documents for contractor jobs
         "decline_note": getattr(job, "decline_note", None),  # Admin's decline reason
     }
 
@@ -1105,14 +1152,8 @@ def get_system_ingested_job_details(job_id: int, db: Session = Depends(get_db)):
 
     Returns all job data points (excluding documents) for jobs uploaded via bulk system ingestion.
     """
-    job = (
-        db.query(models.user.Job)
-        .filter(
-            models.user.Job.id == job_id,
-            models.user.Job.uploaded_by_contractor == False,
-            models.user.Job.uploaded_by_user_id.is_(None),
-        )
-        .first()
+    job = find_job(
+        db, job_id, uploaded_by_contractor=False, uploaded_by_user_id=None
     )
 
     if not job:
@@ -1205,13 +1246,7 @@ def get_posted_job_details(job_id: int, db: Session = Depends(get_db)):
 
     Returns all job data points including documents for jobs with status 'posted'.
     """
-    job = (
-        db.query(models.user.Job)
-        .filter(
-            models.user.Job.id == job_id, models.user.Job.job_review_status == "posted"
-        )
-        .first()
-    )
+    job = find_job(db, job_id, job_review_status="posted")
 
     if not job:
         raise HTTPException(status_code=404, detail="Posted job not found")
@@ -1306,7 +1341,7 @@ def get_posted_job_details(job_id: int, db: Session = Depends(get_db)):
             job.review_posted_at.isoformat() if job.review_posted_at else None
         ),
         "job_group_id": job.job_group_id,
-        "job_documents": job.job_documents,  # Include documents for posted jobs
+        "job_documents": files_with_data(job.job_documents),  # Include documents for posted jobs
         "decline_note": getattr(job, "decline_note", None),  # Admin's decline reason
     }
 
@@ -1469,14 +1504,6 @@ def _month_starts(last_n: int = 6):
     return months
 
 
-def _table_exists(db: Session, table_name: str) -> bool:
-    r = db.execute(
-        text("SELECT 1 FROM information_schema.tables WHERE table_name = :t LIMIT 1"),
-        {"t": table_name},
-    ).first()
-    return bool(r)
-
-
 def _percent_change(current: int, previous: int):
     """Return (pct, formatted_str) where pct is a float or None when undefined.
 
@@ -1508,168 +1535,112 @@ def contractors_kpis(db: Session = Depends(get_db)):
     """
     from datetime import datetime, timedelta
 
-    # Calculate KPIs
-    # Active Subscriptions
-    active_subs = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Past Due
-    past_due = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "past_due",
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Credits Outstanding (current credits)
-    credits_outstanding = (
-        db.query(func.coalesce(func.sum(models.user.Subscriber.current_credits), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Unlocks Last 7 Days
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    unlocks_last_7d = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.UnlockedLead.unlocked_at >= seven_days_ago,
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Credits Purchased - Total credits ever acquired (current + spent + frozen)
-    credits_purchased_result = (
-        db.query(
-            func.coalesce(
-                func.sum(
-                    models.user.Subscriber.current_credits
-                    + models.user.Subscriber.total_spending
-                    + models.user.Subscriber.frozen_credits
-                ),
-                0,
-            )
-        )
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    credits_purchased = int(credits_purchased_result) if credits_purchased_result else 0
-
-    # Credits Spent - Total credits spent on unlocking leads
-    credits_spent = (
-        db.query(func.coalesce(func.sum(models.user.Subscriber.total_spending), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Trial Credits Used - Total trial credits consumed by all contractors
-    trial_credits_used_sum = (
-        db.query(func.coalesce(func.sum(25 - models.user.Subscriber.trial_credits), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    trial_credits_used_count = (
-        int(trial_credits_used_sum) if trial_credits_used_sum else 0
-    )
-
-    # Leads Ingested Today (jobs created today)
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    leads_ingested_today = (
-        db.query(func.count(models.user.Job.id))
-        .filter(models.user.Job.created_at >= today_start)
-        .scalar()
-        or 0
-    )
-
-    # Leads Delivered (total posted jobs)
-    leads_delivered = (
-        db.query(func.count(models.user.Job.id))
-        .filter(models.user.Job.job_review_status == "posted")
-        .scalar()
-        or 0
-    )
-
-    # Leads Unlocked (total unlocks by contractors)
-    leads_unlocked = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Calculate previous period values for percentage changes
     fourteen_days_ago = datetime.utcnow() - timedelta(days=14)
-
-    # Previous Unlocks (7-14 days ago)
-    unlocks_prev_7d = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.UnlockedLead.unlocked_at >= fourteen_days_ago,
-            models.user.UnlockedLead.unlocked_at < seven_days_ago,
-            models.user.User.role == "Contractor",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Previous Leads Ingested (yesterday)
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     yesterday_start = today_start - timedelta(days=1)
-    leads_ingested_yesterday = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.created_at >= yesterday_start,
-            models.user.Job.created_at < today_start,
-        )
-        .scalar()
-        or 0
-    )
+
+    # Calculate KPIs: one pass per table with current and previous periods
+    # together (COUNT/SUM ... FILTER); the three passes run concurrently
+    kpis = query_fanout.rows(
+        {
+            "subscribers": db.query(
+                # Active Subscriptions
+                func.count(models.user.Subscriber.id)
+                .filter(models.user.Subscriber.is_active == True)
+                .label("active_subs"),
+                # Past Due
+                func.count(models.user.Subscriber.id)
+                .filter(models.user.Subscriber.subscription_status == "past_due")
+                .label("past_due"),
+                # Credits Outstanding (current credits)
+                func.coalesce(
+                    func.sum(models.user.Subscriber.current_credits), 0
+                ).label("credits_outstanding"),
+                # Credits Purchased - credits ever acquired (current + spent + frozen)
+                func.coalesce(
+                    func.sum(
+                        models.user.Subscriber.current_credits
+                        + models.user.Subscriber.total_spending
+                        + models.user.Subscriber.frozen_credits
+                    ),
+                    0,
+                ).label("credits_purchased"),
+                # Credits Spent - Total credits spent on unlocking leads
+                func.coalesce(
+                    func.sum(models.user.Subscriber.total_spending), 0
+                ).label("credits_spent"),
+                # Trial Credits Used - Total trial credits consumed by all contractors
+                func.coalesce(
+                    func.sum(25 - models.user.Subscriber.trial_credits).filter(
+                        models.user.Subscriber.trial_credits_used == True
+                    ),
+                    0,
+                ).label("trial_credits_used"),
+            )
+            .join(
+                models.user.User,
+                models.user.Subscriber.user_id == models.user.User.id,
+            )
+            .filter(
+                models.user.User.role == "Contractor",
+                models.user.User.approved_by_admin == "approved",
+            ),
+            "unlocks": db.query(
+                # Unlocks Last 7 Days and previous 7 days (7-14 days ago)
+                func.count(models.user.UnlockedLead.id)
+                .filter(models.user.UnlockedLead.unlocked_at >= seven_days_ago)
+                .label("unlocks_last_7d"),
+                func.count(models.user.UnlockedLead.id)
+                .filter(
+                    models.user.UnlockedLead.unlocked_at >= fourteen_days_ago,
+                    models.user.UnlockedLead.unlocked_at < seven_days_ago,
+                )
+                .label("unlocks_prev_7d"),
+                # Leads Unlocked (total unlocks by contractors)
+                func.count(models.user.UnlockedLead.id).label("leads_unlocked"),
+            )
+            .join(
+                models.user.User,
+                models.user.UnlockedLead.user_id == models.user.User.id,
+            )
+            .filter(
+                models.user.User.role == "Contractor",
+                models.user.User.approved_by_admin == "approved",
+            ),
+            "jobs": db.query(
+                # Leads Ingested Today (jobs created today) and yesterday
+                func.count(models.user.Job.id)
+                .filter(models.user.Job.created_at >= today_start)
+                .label("leads_ingested_today"),
+                func.count(models.user.Job.id)
+                .filter(
+                    models.user.Job.created_at >= yesterday_start,
+                    models.user.Job.created_at < today_start,
+                )
+                .label("leads_ingested_yesterday"),
+                # Leads Delivered (total posted jobs)
+                func.count(models.user.Job.id)
+                .filter(models.user.Job.job_review_status == "posted")
+                .label("leads_delivered"),
+            ),
+        },
+        db=db,
+    )
+    subscribers, unlocks, jobs = kpis["subscribers"], kpis["unlocks"], kpis["jobs"]
+
+    active_subs = subscribers.active_subs
+    past_due = subscribers.past_due
+    credits_outstanding = subscribers.credits_outstanding
+    credits_purchased = int(subscribers.credits_purchased)
+    credits_spent = subscribers.credits_spent
+    trial_credits_used_count = int(subscribers.trial_credits_used)
+    unlocks_last_7d = unlocks.unlocks_last_7d
+    unlocks_prev_7d = unlocks.unlocks_prev_7d
+    leads_unlocked = unlocks.leads_unlocked
+    leads_ingested_today = jobs.leads_ingested_today
+    leads_ingested_yesterday = jobs.leads_ingested_yesterday
+    leads_delivered = jobs.leads_delivered
 
     # Helper function to calculate percentage change
     def calc_percentage_change(current, previous):
@@ -2600,10 +2571,26 @@ def contractor_uploaded_jobs(
     total_count = base_query.count()
     total_pages = (total_count + per_page - 1) // per_page
 
-    # Apply pagination
+    # Apply pagination (only the columns the table shows)
     offset = (page - 1) * per_page
     rows = (
-        base_query.order_by(status_order, models.user.Job.created_at.desc())
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.audience_type_names,
+            models.user.Job.job_address,
+            models.user.Job.contact_name,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.applicant_email,
+            models.user.Job.project_cost_total,
+            models.user.Job.trs_score,
+            models.user.Job.property_type,
+            models.user.Job.job_review_status,
+            models.user.Job.review_posted_at,
+            models.user.Job.created_at,
+        )
+        .order_by(status_order, models.user.Job.created_at.desc())
         .limit(per_page)
         .offset(offset)
         .all()
@@ -2798,8 +2785,10 @@ def post_ingested_job(job_id: int, db: Session = Depends(get_db)):
     Works for BOTH contractor-uploaded and system-ingested jobs:
     - Sets review_posted_at = now() (triggers scheduler)
     - Sets uploaded_by_contractor = False (converts contractor jobs to system jobs)
-    - Keeps job_review_status = 'pending'
-    - Scheduler posts job when: review_posted_at + day_offset <= current_time
+    - With day_offset 0 the job is posted right away (job_review_status =
+      'posted', queued for push fan-out in the same transaction)
+    - Otherwise keeps job_review_status = 'pending'; the scheduler posts the
+      job when review_posted_at + day_offset <= current_time
 
     Use cases:
     1. Contractor jobs: Admin approval starts the posting schedule
@@ -2816,16 +2805,22 @@ def post_ingested_job(job_id: int, db: Session = Depends(get_db)):
     # Set review timestamp and convert to system job
     j.uploaded_by_contractor = False
     j.review_posted_at = now_est
-    # Keep job_review_status as 'pending' - scheduler will update to 'posted' based on day_offset
+
+    day_offset = j.day_offset if j.day_offset is not None else 0
+    posted_now = day_offset <= 0 and j.job_review_status == "pending"
+    if posted_now:
+        j.job_review_status = "posted"
+        record_job_posted(db, [j.id])
+    # Otherwise the scheduler updates it to 'posted' based on day_offset
 
     db.add(j)
+    response_cache.invalidate_on_commit(db, "jobs")
     db.commit()
     db.refresh(j)
 
     # Calculate when scheduler will post this job
     from datetime import timedelta
 
-    day_offset = j.day_offset if j.day_offset is not None else 0
     estimated_post_time = now_est + timedelta(days=day_offset)
 
     return {
@@ -2835,7 +2830,11 @@ def post_ingested_job(job_id: int, db: Session = Depends(get_db)):
         "review_posted_at": now_est.isoformat(),
         "day_offset": day_offset,
         "estimated_post_time": estimated_post_time.isoformat(),
-        "message": f"Job approved. Scheduler will post in {day_offset} day(s) at approximately {estimated_post_time.strftime('%Y-%m-%d %I:%M %p')} EST.",
+        "message": (
+            "Job approved and posted."
+            if posted_now
+            else f"Job approved. Scheduler will post in {day_offset} day(s) at approximately {estimated_post_time.strftime('%Y-%m-%d %I:%M %p')} EST."
+        ),
     }
 
 
@@ -2858,13 +2857,6 @@ async def decline_ingested_job(
     Sets `job_review_status` to `declined` and saves the admin's note explaining why.
     For contractor-uploaded jobs, sends rejection email with reasons and job details.
     """
-    # Ensure decline_note column exists (auto-migration)
-    try:
-        db.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS decline_note TEXT"))
-        db.commit()
-    except Exception:
-        db.rollback()
-
     j = db.query(models.user.Job).filter(models.user.Job.id == job_id).first()
     if not j:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -2872,6 +2864,7 @@ async def decline_ingested_job(
     j.job_review_status = "declined"
     j.decline_note = body.note
     db.add(j)
+    response_cache.invalidate_on_commit(db, "jobs")
     db.commit()
     db.refresh(j)
 
@@ -2984,154 +2977,93 @@ def system_ingested_jobs(
     # KPIs Calculation (only for system-ingested jobs)
     # ========================================================================
 
-    # Total Jobs (system-ingested)
-    total_jobs = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-        )
-        .scalar()
-        or 0
-    )
-
-    # Submitted Today
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    submitted_today = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.created_at >= today_start,
-        )
-        .scalar()
-        or 0
-    )
-
-    # Submitted Yesterday (for percentage change)
     yesterday_start = today_start - timedelta(days=1)
-    submitted_yesterday = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.created_at >= yesterday_start,
-            models.user.Job.created_at < today_start,
-        )
-        .scalar()
-        or 0
-    )
+    seven_days_ago = today_start - timedelta(days=7)
+    thirty_days_ago = today_start - timedelta(days=30)
+    sixty_days_ago = today_start - timedelta(days=60)
 
-    # Pending Review
-    pending_review = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.job_review_status == "pending",
-        )
-        .scalar()
-        or 0
+    system_jobs = db.query(func.count(models.user.Job.id)).filter(
+        models.user.Job.uploaded_by_contractor.is_(False),
+        models.user.Job.uploaded_by_user_id.is_(None),
     )
-
-    # Previous Pending (7 days ago for comparison)
-    seven_days_ago = today_start - timedelta(days=7)
-    previous_pending = (
-        db.query(func.count(models.user.Job.id))
+    unlocked_system_jobs_query = (
+        db.query(func.count(func.distinct(models.user.UnlockedLead.job_id)))
+        .join(models.user.Job, models.user.UnlockedLead.job_id == models.user.Job.id)
         .filter(
             models.user.Job.uploaded_by_contractor.is_(False),
             models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.job_review_status == "pending",
-            models.user.Job.created_at < seven_days_ago,
         )
-        .scalar()
-        or 0
     )
 
-    # Posted Jobs
-    posted = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.job_review_status == "posted",
-        )
-        .scalar()
-        or 0
+    # Independent aggregates, run concurrently
+    kpis = query_fanout.scalars(
+        {
+            # Total Jobs (system-ingested)
+            "total_jobs": system_jobs,
+            # Submitted Today
+            "submitted_today": system_jobs.filter(
+                models.user.Job.created_at >= today_start
+            ),
+            # Submitted Yesterday (for percentage change)
+            "submitted_yesterday": system_jobs.filter(
+                models.user.Job.created_at >= yesterday_start,
+                models.user.Job.created_at < today_start,
+            ),
+            # Pending Review
+            "pending_review": system_jobs.filter(
+                models.user.Job.job_review_status == "pending"
+            ),
+            # Previous Pending (7 days ago for comparison)
+            "previous_pending": system_jobs.filter(
+                models.user.Job.job_review_status == "pending",
+                models.user.Job.created_at < seven_days_ago,
+            ),
+            # Posted Jobs
+            "posted": system_jobs.filter(models.user.Job.job_review_status == "posted"),
+            # Previous Posted (7 days ago)
+            "previous_posted": system_jobs.filter(
+                models.user.Job.job_review_status == "posted",
+                models.user.Job.review_posted_at < seven_days_ago,
+            ),
+            # Average Per Day (last 30 days)
+            "jobs_last_30_days": system_jobs.filter(
+                models.user.Job.created_at >= thirty_days_ago
+            ),
+            # Previous 30 days average
+            "jobs_prev_30_days": system_jobs.filter(
+                models.user.Job.created_at >= sixty_days_ago,
+                models.user.Job.created_at < thirty_days_ago,
+            ),
+            # Unlock Conversion Rate (unlocks / posted jobs)
+            # Count unlocks for system-ingested jobs only
+            "unlocked_system_jobs": unlocked_system_jobs_query,
+            # Previous unlock conversion rate (7 days ago)
+            "unlocked_system_jobs_prev": unlocked_system_jobs_query.filter(
+                models.user.UnlockedLead.unlocked_at < seven_days_ago
+            ),
+        },
+        db=db,
     )
 
-    # Previous Posted (7 days ago)
-    previous_posted = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.job_review_status == "posted",
-            models.user.Job.review_posted_at < seven_days_ago,
-        )
-        .scalar()
-        or 0
-    )
+    total_jobs = kpis["total_jobs"]
+    submitted_today = kpis["submitted_today"]
+    submitted_yesterday = kpis["submitted_yesterday"]
+    pending_review = kpis["pending_review"]
+    previous_pending = kpis["previous_pending"]
+    posted = kpis["posted"]
+    previous_posted = kpis["previous_posted"]
+    jobs_last_30_days = kpis["jobs_last_30_days"]
+    jobs_prev_30_days = kpis["jobs_prev_30_days"]
+    unlocked_system_jobs = kpis["unlocked_system_jobs"]
+    unlocked_system_jobs_prev = kpis["unlocked_system_jobs_prev"]
 
-    # Average Per Day (last 30 days)
-    thirty_days_ago = today_start - timedelta(days=30)
-    jobs_last_30_days = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.created_at >= thirty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
     avg_per_day = round(jobs_last_30_days / 30, 1)
-
-    # Previous 30 days average
-    sixty_days_ago = today_start - timedelta(days=60)
-    jobs_prev_30_days = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.Job.created_at >= sixty_days_ago,
-            models.user.Job.created_at < thirty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
     prev_avg_per_day = round(jobs_prev_30_days / 30, 1) if jobs_prev_30_days > 0 else 0
 
-    # Unlock Conversion Rate (unlocks / posted jobs)
-    # Count unlocks for system-ingested jobs only
-    unlocked_system_jobs = (
-        db.query(func.count(func.distinct(models.user.UnlockedLead.job_id)))
-        .join(models.user.Job, models.user.UnlockedLead.job_id == models.user.Job.id)
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-        )
-        .scalar()
-        or 0
-    )
-
     unlock_conversion_rate = (
         round((unlocked_system_jobs / posted) * 100, 1) if posted > 0 else 0
     )
-
-    # Previous unlock conversion rate (7 days ago)
-    unlocked_system_jobs_prev = (
-        db.query(func.count(func.distinct(models.user.UnlockedLead.job_id)))
-        .join(models.user.Job, models.user.UnlockedLead.job_id == models.user.Job.id)
-        .filter(
-            models.user.Job.uploaded_by_contractor.is_(False),
-            models.user.Job.uploaded_by_user_id.is_(None),
-            models.user.UnlockedLead.unlocked_at < seven_days_ago,
-        )
-        .scalar()
-        or 0
-    )
-
     prev_unlock_conversion_rate = (
         round((unlocked_system_jobs_prev / previous_posted) * 100, 1)
         if previous_posted > 0
@@ -3246,10 +3178,22 @@ def system_ingested_jobs(
     total_count = base_query.count()
     total_pages = (total_count + per_page - 1) // per_page
 
-    # Apply pagination
+    # Apply pagination (only the columns the table shows)
     offset = (page - 1) * per_page
     rows = (
-        base_query.order_by(status_order, models.user.Job.created_at.desc())
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.audience_type_names,
+            models.user.Job.contact_name,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.applicant_email,
+            models.user.Job.trs_score,
+            models.user.Job.job_review_status,
+            models.user.Job.review_posted_at,
+        )
+        .order_by(status_order, models.user.Job.created_at.desc())
         .limit(per_page)
         .offset(offset)
         .all()
@@ -3623,10 +3567,22 @@ def posted_jobs(
     total_count = base_query.count()
     total_pages = (total_count + per_page - 1) // per_page
 
-    # Order by review_posted_at descending (most recent first)
+    # Order by review_posted_at descending (most recent first), only the
+    # columns the table shows
     offset = (page - 1) * per_page
     rows = (
-        base_query.order_by(models.user.Job.review_posted_at.desc())
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.audience_type_names,
+            models.user.Job.contact_name,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.applicant_email,
+            models.user.Job.trs_score,
+            models.user.Job.job_review_status,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
         .limit(per_page)
         .offset(offset)
         .all()
@@ -3738,6 +3694,7 @@ def update_job(
     job.updated_at = datetime.utcnow()
 
     db.add(job)
+    response_cache.invalidate_on_commit(db, "jobs")
     db.commit()
     db.refresh(job)
 
@@ -3814,7 +3771,7 @@ def update_job(
                 job.review_posted_at.isoformat() if job.review_posted_at else None
             ),
             "job_group_id": job.job_group_id,
-            "job_documents": job.job_documents,
+            "job_documents": files_with_data(job.job_documents),
             "contact_name": job.contact_name,
         },
     }
@@ -3830,168 +3787,113 @@ def suppliers_kpis(db: Session = Depends(get_db)):
     """
     from datetime import datetime, timedelta
 
-    # Calculate KPIs for Suppliers
-    # Active Subscriptions
-    active_subs = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Past Due
-    past_due = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "past_due",
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Credits Outstanding (current credits)
-    credits_outstanding = (
-        db.query(func.coalesce(func.sum(models.user.Subscriber.current_credits), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Unlocks Last 7 Days (leads unlocked by suppliers)
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    unlocks_last_7d = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.UnlockedLead.unlocked_at >= seven_days_ago,
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Credits Purchased - Total credits ever acquired (current + spent + frozen)
-    credits_purchased_result = (
-        db.query(
-            func.coalesce(
-                func.sum(
-                    models.user.Subscriber.current_credits
-                    + models.user.Subscriber.total_spending
-                    + models.user.Subscriber.frozen_credits
-                ),
-                0,
-            )
-        )
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    credits_purchased = int(credits_purchased_result) if credits_purchased_result else 0
-
-    # Credits Spent - Total credits spent on unlocking leads
-    credits_spent = (
-        db.query(func.coalesce(func.sum(models.user.Subscriber.total_spending), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Trial Credits Used - Total trial credits consumed by all suppliers
-    trial_credits_used_sum = (
-        db.query(func.coalesce(func.sum(25 - models.user.Subscriber.trial_credits), 0))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    trial_credits_used_count = (
-        int(trial_credits_used_sum) if trial_credits_used_sum else 0
-    )
-
-    # Leads Ingested Today (jobs created today)
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    leads_ingested_today = (
-        db.query(func.count(models.user.Job.id))
-        .filter(models.user.Job.created_at >= today_start)
-        .scalar()
-        or 0
-    )
-
-    # Leads Delivered (total posted jobs)
-    leads_delivered = (
-        db.query(func.count(models.user.Job.id))
-        .filter(models.user.Job.job_review_status == "posted")
-        .scalar()
-        or 0
-    )
-
-    # Leads Unlocked (total unlocks by suppliers)
-    leads_unlocked = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Calculate previous period values for percentage changes
     fourteen_days_ago = datetime.utcnow() - timedelta(days=14)
-
-    # Previous Unlocks (7-14 days ago)
-    unlocks_prev_7d = (
-        db.query(func.count(models.user.UnlockedLead.id))
-        .join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-        .filter(
-            models.user.UnlockedLead.unlocked_at >= fourteen_days_ago,
-            models.user.UnlockedLead.unlocked_at < seven_days_ago,
-            models.user.User.role == "Supplier",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Previous Leads Ingested (yesterday)
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     yesterday_start = today_start - timedelta(days=1)
-    leads_ingested_yesterday = (
-        db.query(func.count(models.user.Job.id))
-        .filter(
-            models.user.Job.created_at >= yesterday_start,
-            models.user.Job.created_at < today_start,
-        )
-        .scalar()
-        or 0
-    )
+
+    # Calculate KPIs for Suppliers: one pass per table with current and
+    # previous periods together (COUNT/SUM ... FILTER); the three passes run
+    # concurrently
+    kpis = query_fanout.rows(
+        {
+            "subscribers": db.query(
+                # Active Subscriptions
+                func.count(models.user.Subscriber.id)
+                .filter(models.user.Subscriber.is_active == True)
+                .label("active_subs"),
+                # Past Due
+                func.count(models.user.Subscriber.id)
+                .filter(models.user.Subscriber.subscription_status == "past_due")
+                .label("past_due"),
+                # Credits Outstanding (current credits)
+                func.coalesce(
+                    func.sum(models.user.Subscriber.current_credits), 0
+                ).label("credits_outstanding"),
+                # Credits Purchased - credits ever acquired (current + spent + frozen)
+                func.coalesce(
+                    func.sum(
+                        models.user.Subscriber.current_credits
+                        + models.user.Subscriber.total_spending
+                        + models.user.Subscriber.frozen_credits
+                    ),
+                    0,
+                ).label("credits_purchased"),
+                # Credits Spent - Total credits spent on unlocking leads
+                func.coalesce(
+                    func.sum(models.user.Subscriber.total_spending), 0
+                ).label("credits_spent"),
+                # Trial Credits Used - Total trial credits consumed by all suppliers
+                func.coalesce(
+                    func.sum(25 - models.user.Subscriber.trial_credits).filter(
+                        models.user.Subscriber.trial_credits_used == True
+                    ),
+                    0,
+                ).label("trial_credits_used"),
+            )
+            .join(
+                models.user.User,
+                models.user.Subscriber.user_id == models.user.User.id,
+            )
+            .filter(
+                models.user.User.role == "Supplier",
+                models.user.User.approved_by_admin == "approved",
+            ),
+            "unlocks": db.query(
+                # Unlocks Last 7 Days and previous 7 days (7-14 days ago)
+                func.count(models.user.UnlockedLead.id)
+                .filter(models.user.UnlockedLead.unlocked_at >= seven_days_ago)
+                .label("unlocks_last_7d"),
+                func.count(models.user.UnlockedLead.id)
+                .filter(
+                    models.user.UnlockedLead.unlocked_at >= fourteen_days_ago,
+                    models.user.UnlockedLead.unlocked_at < seven_days_ago,
+                )
+                .label("unlocks_prev_7d"),
+                # Leads Unlocked (total unlocks by suppliers)
+                func.count(models.user.UnlockedLead.id).label("leads_unlocked"),
+            )
+            .join(
+                models.user.User,
+                models.user.UnlockedLead.user_id == models.user.User.id,
+            )
+            .filter(
+                models.user.User.role == "Supplier",
+                models.user.User.approved_by_admin == "approved",
+            ),
+            "jobs": db.query(
+                # Leads Ingested Today (jobs created today) and yesterday
+                func.count(models.user.Job.id)
+                .filter(models.user.Job.created_at >= today_start)
+                .label("leads_ingested_today"),
+                func.count(models.user.Job.id)
+                .filter(
+                    models.user.Job.created_at >= yesterday_start,
+                    models.user.Job.created_at < today_start,
+                )
+                .label("leads_ingested_yesterday"),
+                # Leads Delivered (total posted jobs)
+                func.count(models.user.Job.id)
+                .filter(models.user.Job.job_review_status == "posted")
+                .label("leads_delivered"),
+            ),
+        },
+        db=db,
+    )
+    subscribers, unlocks, jobs = kpis["subscribers"], kpis["unlocks"], kpis["jobs"]
+
+    active_subs = subscribers.active_subs
+    past_due = subscribers.past_due
+    credits_outstanding = subscribers.credits_outstanding
+    credits_purchased = int(subscribers.credits_purchased)
+    credits_spent = subscribers.credits_spent
+    trial_credits_used_count = int(subscribers.trial_credits_used)
+    unlocks_last_7d = unlocks.unlocks_last_7d
+    unlocks_prev_7d = unlocks.unlocks_prev_7d
+    leads_unlocked = unlocks.leads_unlocked
+    leads_ingested_today = jobs.leads_ingested_today
+    leads_ingested_yesterday = jobs.leads_ingested_yesterday
+    leads_delivered = jobs.leads_delivered
 
     # Helper function to calculate percentage change
     def calc_percentage_change(current, previous):
@@ -4592,7 +4494,7 @@ async def upload_admin_user_profile_picture(
     Upload or update admin profile picture.
 
     Accepts image files (JPEG, PNG, GIF, WebP) up to 5MB.
-    Stores the image as binary data in the database.
+    Stores the image in the blob store.
     """
     allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
     if file.content_type not in allowed_types:
@@ -4621,7 +4523,9 @@ async def upload_admin_user_profile_picture(
         if not admin_user:
             raise HTTPException(status_code=404, detail="Admin not found")
 
-        admin_user.profile_picture_data = content
+        stored = await asyncio.to_thread(blob_store.put_bytes, content)
+        admin_user.profile_picture_blob = stored.sha256
+        admin_user.profile_picture_data = None
         admin_user.profile_picture_content_type = file.content_type
 
         db.commit()
@@ -4669,12 +4573,11 @@ async def get_admin_user_profile_picture(
         if not admin_user:
             raise HTTPException(status_code=404, detail="Admin not found")
 
-        if not admin_user.profile_picture_data:
+        picture = await asyncio.to_thread(profile_picture_bytes, admin_user)
+        if not picture:
             raise HTTPException(status_code=404, detail="No profile picture uploaded")
 
-        base64_encoded = base64.b64encode(admin_user.profile_picture_data).decode(
-            "utf-8"
-        )
+        base64_encoded = base64.b64encode(picture).decode("utf-8")
         content_type = admin_user.profile_picture_content_type or "image/jpeg"
 
         data_url = f"data:{content_type};base64,{base64_encoded}"
@@ -4682,7 +4585,7 @@ async def get_admin_user_profile_picture(
         return {
             "blob": data_url,
             "contentType": content_type,
-            "size": len(admin_user.profile_picture_data),
+            "size": len(picture),
             "name": admin_user.name,
             "email": admin_user.email,
             "role": getattr(admin_user, "role", None),
@@ -4723,9 +4626,10 @@ async def delete_admin_user_profile_picture(
         if not admin_user:
             raise HTTPException(status_code=404, detail="Admin not found")
 
-        if not admin_user.profile_picture_data:
+        if not has_profile_picture(admin_user):
             raise HTTPException(status_code=404, detail="No profile picture to delete")
 
+        admin_user.profile_picture_blob = None
         admin_user.profile_picture_data = None
         admin_user.profile_picture_content_type = None
 
@@ -5151,7 +5055,7 @@ def contractor_detail(contractor_id: int, db: Session = Depends(get_db)):
                 "content_type": file_obj.get("content_type"),
                 "file_index": idx,
                 "url": f"/admin/dashboard/contractors/{contractor_id}/image/{field_name}?file_index={idx}",
-                "data": file_obj.get("data"),  # Base64 encoded data
+                "data": with_data(file_obj).get("data"),  # Base64 encoded data
             }
             result.append(file_entry)
         return result
@@ -5338,7 +5242,7 @@ def supplier_detail(supplier_id: int, db: Session = Depends(get_db)):
                 "content_type": file_obj.get("content_type"),
                 "file_index": idx,
                 "url": f"/admin/dashboard/suppliers/{supplier_id}/image/{field_name}?file_index={idx}",
-                "data": file_obj.get("data"),  # Base64 encoded data
+                "data": with_data(file_obj).get("data"),  # Base64 encoded data
             }
             result.append(file_entry)
         return result
@@ -5431,6 +5335,7 @@ def supplier_detail(supplier_id: int, db: Session = Depends(get_db)):
 def supplier_image(
     supplier_id: int,
     field: str,
+    request: Request,
     file_index: int = Query(
         0, ge=0, description="Index of file in the array (0-based)"
     ),
@@ -5441,10 +5346,10 @@ def supplier_image(
     `field` must be one of: `license_picture`, `referrals`, `job_photos`.
     `file_index` specifies which file to retrieve from the JSON array (default: 0).
 
-    Files are stored as JSON arrays with base64-encoded data.
+    Files are stored as JSON arrays of blob store references (older entries
+    carry base64 data). Supports ``Range`` requests.
     Responds with raw binary and proper Content-Type so frontend can display or open.
     """
-    import base64
     import json
 
     allowed_fields = ["license_picture", "referrals", "job_photos"]
@@ -5488,19 +5393,9 @@ def supplier_image(
     # Get the specific file
     file_data = files_array[file_index]
 
-    # Decode base64 data
-    try:
-        blob = base64.b64decode(file_data.get("data", ""))
-        content_type = file_data.get("content_type", "application/octet-stream")
-        filename = file_data.get("filename", f"{field}-{supplier_id}-{file_index}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error decoding file: {str(e)}")
-
     # Stream raw bytes with correct Content-Type so browsers can render via <img src="...">.
-    return Response(
-        content=blob,
-        media_type=content_type,
-        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+    return file_response(
+        request, file_data, filename=f"{field}-{supplier_id}-{file_index}"
     )
 
 
@@ -5555,6 +5450,7 @@ def update_supplier_approval(
             user.note = data.note
 
         db.add(user)
+        response_cache.invalidate_on_commit(db, "users")
         db.commit()
         db.refresh(user)
 
@@ -5620,6 +5516,7 @@ def update_supplier_approval(
 def contractor_image(
     contractor_id: int,
     field: str,
+    request: Request,
     file_index: int = Query(
         0, ge=0, description="Index of file in the array (0-based)"
     ),
@@ -5630,10 +5527,10 @@ def contractor_image(
     `field` must be one of: `license_picture`, `referrals`, `job_photos`.
     `file_index` specifies which file to retrieve from the JSON array (default: 0).
 
-    Files are now stored as JSON arrays with base64-encoded data.
+    Files are stored as JSON arrays of blob store references (older entries
+    carry base64 data). Supports ``Range`` requests.
     Responds with raw binary and proper Content-Type so frontend can display or open.
     """
-    import base64
     import json
 
     allowed_fields = ["license_picture", "referrals", "job_photos"]
@@ -5677,19 +5574,9 @@ def contractor_image(
     # Get the specific file
     file_data = files_array[file_index]
 
-    # Decode base64 data
-    try:
-        blob = base64.b64decode(file_data.get("data", ""))
-        content_type = file_data.get("content_type", "application/octet-stream")
-        filename = file_data.get("filename", f"{field}-{contractor_id}-{file_index}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error decoding file: {str(e)}")
-
     # Stream raw bytes with correct Content-Type so browsers can render via <img src="...">.
-    return Response(
-        content=blob,
-        media_type=content_type,
-        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+    return file_response(
+        request, file_data, filename=f"{field}-{contractor_id}-{file_index}"
     )
 
 
@@ -5786,6 +5673,7 @@ def update_contractor_approval(
             user.note = data.note
 
         db.add(user)
+        response_cache.invalidate_on_commit(db, "users")
         db.commit()
         db.refresh(user)
 
@@ -6018,6 +5906,7 @@ def update_user_approval(
         # Update approval status
         old_status = user.approved_by_admin
         user.approved_by_admin = data.status
+        response_cache.invalidate_on_commit(db, "users")
         db.commit()
         db.refresh(user)
 
@@ -6265,6 +6154,42 @@ def _calculate_credits_flow(db: Session, period_start, period_end, filters: dict
     }
 
 
+def _live_timelines(db: Session, periods, filters: dict, has_payments: bool):
+    """Revenue, jobs, cumulative users and credits flow per period, from the
+    source tables. Used for buckets finer than a day, which the daily fact
+    tables cannot split."""
+    revenue_series, jobs_series, users_series, flow_series = [], [], [], []
+    for _, p_start, p_end in periods:
+        rev = 0
+        if has_payments:
+            rev = (
+                db.execute(
+                    text(
+                        "SELECT COALESCE(SUM(amount), 0) FROM payments "
+                        "WHERE payment_date >= :s AND payment_date < :e"
+                    ),
+                    {"s": p_start, "e": p_end},
+                ).scalar()
+                or 0
+            )
+        revenue_series.append({"revenue": rev})
+
+        jobs_query = db.query(func.count(models.user.Job.id)).filter(
+            models.user.Job.created_at >= p_start, models.user.Job.created_at < p_end
+        )
+        jobs_query = _apply_job_filters(jobs_query, filters)
+        jobs_series.append({"jobs_created": jobs_query.scalar() or 0})
+
+        users_query = db.query(func.count(models.user.User.id)).filter(
+            models.user.User.created_at < p_end
+        )
+        users_query = _apply_user_filters(db, users_query, filters)
+        users_series.append({"new_users": users_query.scalar() or 0})
+
+        flow_series.append(_calculate_credits_flow(db, p_start, p_end, filters))
+    return revenue_series, jobs_series, users_series, flow_series
+
+
 def _apply_user_filters(
     db: Session, query, filters: dict, base_model=None, subscriber_joined=False
 ):
@@ -6446,6 +6371,46 @@ def get_admin_analytics(
         - 2 Data tables (top categories, top jurisdictions) with pagination
         - Applied filters metadata
     """
+    filters = {
+        "time_range": time_range,
+        "state": state,
+        "country_city": country_city,
+        "user_type": user_type,
+        "subscription_tier": subscription_tier,
+        "date_from": date_from,
+        "date_to": date_to,
+        "page": page,
+        "per_page": per_page,
+    }
+    result = response_cache.get(
+        "admin.analytics",
+        filters,
+        lambda session: _get_admin_analytics(session, **filters),
+        db,
+        tags=("analytics", "subscriptions"),
+    )
+
+    # Set HTTP cache headers for proper browser caching
+    cache_key = f"analytics_{time_range}_{state}_{user_type}_{subscription_tier}"
+    response.headers["Cache-Control"] = "public, max-age=300"  # Cache for 5 minutes
+    response.headers["ETag"] = f'"{cache_key}"'  # Enable cache validation
+
+    return result
+
+
+def _get_admin_analytics(
+    db: Session,
+    time_range: str,
+    state: str,
+    country_city: Optional[str],
+    user_type: str,
+    subscription_tier: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    page: int,
+    per_page: int,
+):
+    """``get_admin_analytics`` without the response cache."""
 
     # Get date range and periods
     start_date, end_date, periods, bucket = _get_date_range_from_filter(
@@ -6460,98 +6425,208 @@ def get_admin_analytics(
         "subscription_tier": subscription_tier,
     }
 
+    # All figures are read from the daily fact tables (services/analytics_rollups.py)
+    user_where, user_params = user_fact_filters(filters)
+    job_where, job_params = job_fact_filters(filters)
+    # Revenue is not narrowed by the filters
+    all_where, all_params = user_fact_filters({})
+    # Unlocks of the selected user type (tables)
+    role_filter = {"Contractors": "Contractor", "Suppliers": "Supplier"}.get(user_type)
+    unlock_role = "role = :unlock_role" if role_filter else "TRUE"
+    job_params = {**job_params, "unlock_role": role_filter}
+    has_payments = schema_capabilities.has_table("payments")
+
     # ========================================================================
     # KPIs Calculation
     # ========================================================================
 
-    # Total Users (cumulative at end of period)
-    total_users_query = db.query(func.count(models.user.User.id)).filter(
-        models.user.User.created_at < end_date
-    )
-    total_users_query = _apply_user_filters(db, total_users_query, filters)
-    total_users = total_users_query.scalar() or 0
-
-    # Previous period users (for growth %)
     period_length = end_date - start_date
     prev_period_end = start_date
     prev_period_start = start_date - period_length
-    prev_users_query = db.query(func.count(models.user.User.id)).filter(
-        models.user.User.created_at < prev_period_end
-    )
-    prev_users_query = _apply_user_filters(db, prev_users_query, filters)
-    prev_users = prev_users_query.scalar() or 0
 
-    users_change = total_users - prev_users
-    users_growth_pct = (
-        ((users_change / prev_users * 100) if prev_users > 0 else 100.0)
-        if users_change != 0
-        else 0.0
+    # Every aggregate below is independent of the others: they are queued here
+    # and run concurrently (core/query_fanout.py), then read back by name
+    queries = {}
+
+    user_totals_sql = text(
+        f"""
+        SELECT
+            COALESCE(SUM(new_users) FILTER (WHERE day < :end_day), 0) AS total_users,
+            COALESCE(SUM(new_users) FILTER (WHERE day < :prev_end_day), 0) AS prev_users,
+            COALESCE(SUM(active_subscribers), 0) AS active_subs,
+            COALESCE(SUM(active_subscribers) FILTER (WHERE day < :prev_end_day), 0)
+                AS prev_active_subs,
+            COALESCE(SUM(saved_jobs), 0) AS saved,
+            COALESCE(SUM(not_interested_jobs), 0) AS not_interested
+        FROM daily_user_facts
+        WHERE {user_where}
+        """
     )
+    user_totals_params = {
+        **user_params,
+        "end_day": day_bound(end_date),
+        "prev_end_day": day_bound(prev_period_end),
+    }
+    queries["user_totals"] = lambda s: s.execute(
+        user_totals_sql, user_totals_params
+    ).first()
 
     # Total Revenue (from payments table if exists, else from subscriber.total_spending)
-    if _table_exists(db, "payments"):
-        revenue_query = text(
-            "SELECT COALESCE(SUM(amount), 0) FROM payments WHERE payment_date >= :start AND payment_date < :end"
-        )
-        total_revenue = (
-            db.execute(revenue_query, {"start": start_date, "end": end_date}).scalar()
-            or 0
-        )
-        prev_revenue = (
-            db.execute(
-                revenue_query, {"start": prev_period_start, "end": prev_period_end}
-            ).scalar()
-            or 0
+    if has_payments:
+        queries["revenue_kpi"] = lambda s: sum_by_period(
+            s,
+            "daily_credit_flow",
+            ("revenue",),
+            [
+                ("current", start_date, end_date),
+                ("previous", prev_period_start, prev_period_end),
+            ],
+            all_where,
+            all_params,
         )
     else:
         # Fallback: use total_spending from subscribers
-        total_revenue = (
-            db.query(
-                func.coalesce(func.sum(models.user.Subscriber.total_spending), 0)
-            ).scalar()
-            or 0
+        queries["revenue_kpi"] = lambda s: s.query(
+            func.coalesce(func.sum(models.user.Subscriber.total_spending), 0)
+        ).scalar()
+
+    # Charts 1-4: Revenue, Jobs Growth, User Growth (cumulative), Credits Flow
+    if is_day_aligned(periods):
+        if has_payments:
+            queries["revenue_series"] = lambda s: sum_by_period(
+                s, "daily_credit_flow", ("revenue",), periods, all_where, all_params
+            )
+        queries["jobs_series"] = lambda s: sum_by_period(
+            s,
+            "daily_job_facts",
+            ("jobs_created",),
+            periods,
+            f"{job_where} AND role = ''",
+            job_params,
+        )
+        queries["users_series"] = lambda s: sum_by_period(
+            s,
+            "daily_user_facts",
+            ("new_users",),
+            periods,
+            user_where,
+            user_params,
+            cumulative=True,
+        )
+        queries["flow_series"] = lambda s: sum_by_period(
+            s,
+            "daily_credit_flow",
+            ("granted", "purchased", "spent", "frozen"),
+            periods,
+            user_where,
+            user_params,
+        )
+    else:
+        # Hourly buckets ("today") are finer than the daily facts
+        queries["live_timelines"] = lambda s: _live_timelines(
+            s, periods, filters, has_payments
         )
-        prev_revenue = 0  # Can't calculate previous without timestamps
 
-    revenue_change = total_revenue - prev_revenue
-    revenue_growth_pct = (
-        ((revenue_change / prev_revenue * 100) if prev_revenue > 0 else 100.0)
-        if revenue_change != 0
-        else 0.0
+    # Chart 5: Marketplace Funnel (all time)
+    # Stage 1: Delivered (all posted jobs)
+    delivered_sql = text(
+        f"SELECT COALESCE(SUM(jobs_posted), 0) FROM daily_job_facts WHERE {job_where}"
     )
+    queries["delivered"] = lambda s: s.execute(delivered_sql, job_params).scalar()
 
-    # Active Subscriptions
-    active_subs_query = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .join(
-            models.user.Subscription,
-            models.user.Subscriber.subscription_id == models.user.Subscription.id,
-        )
-        .filter(models.user.Subscriber.is_active == True)
+    # Stage 2: Unlocked (all unlocked leads - includes deleted jobs!)
+    unlock_totals_sql = text(
+        f"""
+        SELECT COALESCE(SUM(unlocks), 0) AS unlocks, COALESCE(SUM(spent), 0) AS credits
+        FROM daily_credit_flow
+        WHERE {user_where}
+        """
+    )
+    queries["unlock_totals"] = lambda s: s.execute(
+        unlock_totals_sql, user_params
+    ).first()
+
+    # Chart 6: Subscription Distribution (Donut)
+    subscription_dist_sql = text(
+        f"""
+        SELECT tier, SUM(active_subscribers) AS count
+        FROM daily_user_facts
+        WHERE {user_where} AND tier <> ''
+        GROUP BY tier
+        HAVING SUM(active_subscribers) > 0
+        """
     )
-    active_subs_query = _apply_user_filters(
-        db, active_subs_query, filters, subscriber_joined=True
+    queries["subscription_dist"] = lambda s: s.execute(
+        subscription_dist_sql, user_params
+    ).fetchall()
+    queries["tier_prices"] = lambda s: (
+        s.query(models.user.Subscription.name, models.user.Subscription.price)
+        .order_by(models.user.Subscription.id)
+        .all()
     )
-    active_subs = active_subs_query.scalar() or 0
 
-    # Previous active subs (approximate - count those active before period start)
-    prev_active_subs_query = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .join(
-            models.user.Subscription,
-            models.user.Subscriber.subscription_id == models.user.Subscription.id,
-        )
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.Subscriber.subscription_start_date < prev_period_end,
-        )
+    # Chart 7 / Table 1: Category Performance (by user types)
+    category_sql = text(
+        f"""
+        SELECT category,
+               SUM(jobs_created) AS delivered,
+               SUM(unlocks) AS unlocked,
+               COALESCE(SUM(unlocks) FILTER (WHERE {unlock_role}), 0) AS role_unlocked,
+               COALESCE(SUM(unlock_credits) FILTER (WHERE {unlock_role}), 0)
+                   AS role_credits
+        FROM daily_job_facts
+        WHERE {job_where} AND category <> ''
+        GROUP BY category
+        """
     )
-    prev_active_subs_query = _apply_user_filters(
-        db, prev_active_subs_query, filters, subscriber_joined=True
+    queries["category_rows"] = lambda s: s.execute(category_sql, job_params).fetchall()
+
+    # Chart 8 / Table 2: Geographic Distribution
+    state_sql = text(
+        f"""
+        SELECT state,
+               SUM(jobs_created) AS jobs,
+               COALESCE(SUM(unlocks) FILTER (WHERE {unlock_role}), 0) AS unlocks
+        FROM daily_job_facts
+        WHERE {job_where} AND state <> ''
+        GROUP BY state
+        """
     )
-    prev_active_subs = prev_active_subs_query.scalar() or 0
+    queries["state_rows"] = lambda s: s.execute(state_sql, job_params).fetchall()
+
+    results = query_fanout.run(queries, db=db)
+    user_totals = results["user_totals"]
+
+    # Total Users (cumulative at end of period) vs previous period
+    total_users = int(user_totals.total_users)
+    prev_users = int(user_totals.prev_users)
+
+    users_change = total_users - prev_users
+    users_growth_pct = (
+        ((users_change / prev_users * 100) if prev_users > 0 else 100.0)
+        if users_change != 0
+        else 0.0
+    )
+
+    # Total Revenue
+    if has_payments:
+        revenue_kpi = results["revenue_kpi"]
+        total_revenue = float(revenue_kpi[0]["revenue"])
+        prev_revenue = float(revenue_kpi[1]["revenue"])
+    else:
+        total_revenue = results["revenue_kpi"] or 0
+        prev_revenue = 0  # Can't calculate previous without timestamps
+
+    revenue_change = total_revenue - prev_revenue
+    revenue_growth_pct = (
+        ((revenue_change / prev_revenue * 100) if prev_revenue > 0 else 100.0)
+        if revenue_change != 0
+        else 0.0
+    )
+
+    # Active Subscriptions (previous: those that started before the period)
+    active_subs = int(user_totals.active_subs)
+    prev_active_subs = int(user_totals.prev_active_subs)
 
     subs_change = active_subs - prev_active_subs
     subs_growth_pct = (
@@ -6564,18 +6639,23 @@ def get_admin_analytics(
     # Charts Data
     # ========================================================================
 
-    # Chart 1: Revenue Timeline
-    revenue_data = []
-    for label, p_start, p_end in periods:
-        if _table_exists(db, "payments"):
-            rev_q = text(
-                "SELECT COALESCE(SUM(amount), 0) FROM payments WHERE payment_date >= :s AND payment_date < :e"
-            )
-            rev = db.execute(rev_q, {"s": p_start, "e": p_end}).scalar() or 0
-        else:
-            rev = 0
-        revenue_data.append({"month": label, "value": int(rev)})
+    # Charts 1-4: Revenue, Jobs Growth, User Growth (cumulative), Credits Flow
+    if "live_timelines" in results:
+        revenue_series, jobs_series, users_series, flow_series = results[
+            "live_timelines"
+        ]
+    else:
+        revenue_series = results.get("revenue_series") or [
+            {"revenue": 0} for _ in periods
+        ]
+        jobs_series = results["jobs_series"]
+        users_series = results["users_series"]
+        flow_series = results["flow_series"]
 
+    revenue_data = [
+        {"month": label, "value": int(r["revenue"])}
+        for (label, _, _), r in zip(periods, revenue_series)
+    ]
     revenue_total = sum(r["value"] for r in revenue_data)
     revenue_peak = (
         max(revenue_data, key=lambda x: x["value"])
@@ -6583,45 +6663,27 @@ def get_admin_analytics(
         else {"month": None, "value": 0}
     )
 
-    # Chart 2: Jobs Growth
-    jobs_data = []
-    for label, p_start, p_end in periods:
-        jobs_query = db.query(func.count(models.user.Job.id)).filter(
-            models.user.Job.created_at >= p_start, models.user.Job.created_at < p_end
-        )
-        jobs_query = _apply_job_filters(jobs_query, filters)
-        jobs_count = jobs_query.scalar() or 0
-        jobs_data.append({"month": label, "value": int(jobs_count)})
-
+    jobs_data = [
+        {"month": label, "value": int(j["jobs_created"])}
+        for (label, _, _), j in zip(periods, jobs_series)
+    ]
     jobs_total = sum(j["value"] for j in jobs_data)
 
-    # Chart 3: User Growth (Cumulative)
-    users_growth_data = []
-    for label, p_start, p_end in periods:
-        users_cum_query = db.query(func.count(models.user.User.id)).filter(
-            models.user.User.created_at < p_end
-        )
-        users_cum_query = _apply_user_filters(db, users_cum_query, filters)
-        users_cum = users_cum_query.scalar() or 0
-        users_growth_data.append({"month": label, "value": int(users_cum)})
-
-    # Chart 4: Credits Flow (with daily/weekly/monthly toggle)
-    credits_flow_data = []
-
-    # Use monthly periods for credits flow
-    flow_periods = periods
+    users_growth_data = [
+        {"month": label, "value": int(u["new_users"])}
+        for (label, _, _), u in zip(periods, users_series)
+    ]
 
-    for label, p_start, p_end in flow_periods:
-        flow = _calculate_credits_flow(db, p_start, p_end, filters)
-        credits_flow_data.append(
-            {
-                "period": label,
-                "granted": flow["granted"],
-                "purchased": flow["purchased"],
-                "spent": flow["spent"],
-                "frozen": flow["frozen"],
-            }
-        )
+    credits_flow_data = [
+        {
+            "period": label,
+            "granted": int(flow["granted"]),
+            "purchased": int(flow["purchased"]),
+            "spent": int(flow["spent"]),
+            "frozen": int(flow["frozen"]),
+        }
+        for (label, _, _), flow in zip(periods, flow_series)
+    ]
 
     credits_totals = {
         "granted": sum(c["granted"] for c in credits_flow_data),
@@ -6630,108 +6692,53 @@ def get_admin_analytics(
         "frozen": sum(c["frozen"] for c in credits_flow_data),
     }
 
-    # Chart 5: Marketplace Funnel
+    # Chart 5: Marketplace Funnel (all time)
     # Stage 1: Delivered (all posted jobs)
-    delivered_query = db.query(func.count(models.user.Job.id)).filter(
-        models.user.Job.job_review_status == "posted"
-    )
-    delivered_query = _apply_job_filters(delivered_query, filters)
-    delivered_count = delivered_query.scalar() or 0
+    delivered_count = int(results["delivered"])
 
     # Stage 2: Unlocked (all unlocked leads - includes deleted jobs!)
-    unlocked_query = db.query(func.count(models.user.UnlockedLead.id)).join(
-        models.user.User, models.user.UnlockedLead.user_id == models.user.User.id
-    )
-    unlocked_query = _apply_user_filters(db, unlocked_query, filters)
-    unlocked_count = unlocked_query.scalar() or 0
-
-    unlocked_credits_query = db.query(
-        func.coalesce(func.sum(models.user.UnlockedLead.credits_spent), 0)
-    ).join(models.user.User, models.user.UnlockedLead.user_id == models.user.User.id)
-    unlocked_credits_query = _apply_user_filters(db, unlocked_credits_query, filters)
-    unlocked_credits = unlocked_credits_query.scalar() or 0
+    unlock_totals = results["unlock_totals"]
+    unlocked_count = int(unlock_totals.unlocks)
+    unlocked_credits = int(unlock_totals.credits)
 
-    # Stage 3: Saved
-    saved_query = db.query(func.count(models.user.SavedJob.id)).join(
-        models.user.User, models.user.SavedJob.user_id == models.user.User.id
-    )
-    saved_query = _apply_user_filters(db, saved_query, filters)
-    saved_count = saved_query.scalar() or 0
-
-    # Stage 4: Not Interested
-    not_interested_query = db.query(func.count(models.user.NotInterestedJob.id)).join(
-        models.user.User, models.user.NotInterestedJob.user_id == models.user.User.id
-    )
-    not_interested_query = _apply_user_filters(db, not_interested_query, filters)
-    not_interested_count = not_interested_query.scalar() or 0
+    # Stages 3-4: Saved, Not Interested
+    saved_count = int(user_totals.saved)
+    not_interested_count = int(user_totals.not_interested)
 
     conversion_rate = (
         (unlocked_count / delivered_count * 100) if delivered_count > 0 else 0.0
     )
 
     # Chart 6: Subscription Distribution (Donut)
-    subscription_dist_query = (
-        db.query(
-            models.user.Subscription.name,
-            func.count(models.user.Subscriber.id).label("count"),
-        )
-        .join(
-            models.user.Subscriber,
-            models.user.Subscriber.subscription_id == models.user.Subscription.id,
-        )
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(models.user.Subscriber.is_active == True)
-    )
-    subscription_dist_query = _apply_user_filters(
-        db, subscription_dist_query, filters, subscriber_joined=True
-    )
-    subscription_dist = subscription_dist_query.group_by(
-        models.user.Subscription.name
-    ).all()
+    subscription_dist = results["subscription_dist"]
+
+    # First plan of each name, as the revenue estimate uses its price
+    tier_prices = {}
+    for name, price in results["tier_prices"]:
+        tier_prices.setdefault(name, price)
 
     subscription_data = []
     for sub in subscription_dist:
         # Calculate revenue (count * price)
-        sub_obj = (
-            db.query(models.user.Subscription)
-            .filter(models.user.Subscription.name == sub.name)
-            .first()
-        )
-        price = (
-            float(sub_obj.price.replace("$", "").replace(",", ""))
-            if sub_obj and sub_obj.price
-            else 0
-        )
-        revenue = sub.count * price
+        price_text = tier_prices.get(sub.tier)
+        price = float(price_text.replace("$", "").replace(",", "")) if price_text else 0
+        count = int(sub.count)
         subscription_data.append(
-            {"tier": sub.name, "count": sub.count, "revenue": int(revenue)}
+            {"tier": sub.tier, "count": count, "revenue": int(count * price)}
         )
 
-    # Chart 7: Category Performance (by user types)
-    # Group by audience_type_names
-    category_query = (
-        db.query(
-            models.user.Job.audience_type_names.label("category"),
-            func.count(models.user.Job.id).label("delivered"),
-            func.count(models.user.UnlockedLead.id).label("unlocked"),
-        )
-        .outerjoin(
-            models.user.UnlockedLead,
-            models.user.Job.id == models.user.UnlockedLead.job_id,
-        )
-        .filter(models.user.Job.audience_type_names.isnot(None))
-    )
-    category_query = _apply_job_filters(category_query, filters)
-    category_query = category_query.group_by(models.user.Job.audience_type_names).all()
+    # Chart 7 / Table 1: Category Performance (by user types)
+    category_rows = results["category_rows"]
 
     category_data = []
-    for cat in category_query:
-        conv_pct = (cat.unlocked / cat.delivered * 100) if cat.delivered > 0 else 0.0
+    for cat in category_rows:
+        delivered, unlocked = int(cat.delivered), int(cat.unlocked)
+        conv_pct = (unlocked / delivered * 100) if delivered > 0 else 0.0
         category_data.append(
             {
                 "category": cat.category or "Unknown",
-                "delivered": cat.delivered,
-                "unlocked": cat.unlocked,
+                "delivered": delivered,
+                "unlocked": unlocked,
                 "conversionPct": round(conv_pct, 1),
             }
         )
@@ -6740,47 +6747,47 @@ def get_admin_analytics(
     category_data.sort(key=lambda x: x["unlocked"], reverse=True)
     category_data = category_data[:5]
 
-    # Chart 8: Geographic Distribution
-    geo_jobs_query = db.query(
-        models.user.Job.state.label("state"),
-        func.count(models.user.Job.id).label("jobs"),
-    ).filter(models.user.Job.state.isnot(None))
-    geo_jobs_query = _apply_job_filters(geo_jobs_query, filters)
-    geo_query = geo_jobs_query.group_by(models.user.Job.state).all()
-
-    geographic_data = []
-    for geo in geo_query:
-        # Count contractors and suppliers in this state (with filters applied)
-        contractors_query = (
-            db.query(func.count(func.distinct(models.user.Contractor.user_id)))
-            .join(
-                models.user.User, models.user.Contractor.user_id == models.user.User.id
-            )
-            .filter(models.user.Contractor.state.any(geo.state))
-        )
-        contractors_query = _apply_user_filters(
-            db, contractors_query, filters, base_model=models.user.Contractor
-        )
-        contractors = contractors_query.scalar() or 0
+    # Chart 8 / Table 2: Geographic Distribution
+    state_rows = results["state_rows"]
+    states = [row.state for row in state_rows]
 
-        suppliers_query = (
-            db.query(func.count(func.distinct(models.user.Supplier.user_id)))
-            .join(models.user.User, models.user.Supplier.user_id == models.user.User.id)
-            .filter(models.user.Supplier.service_states.any(geo.state))
-        )
-        suppliers_query = _apply_user_filters(
-            db, suppliers_query, filters, base_model=models.user.Supplier
-        )
-        suppliers = suppliers_query.scalar() or 0
+    # Contractors / suppliers listing each state: with the filters applied
+    # (chart) and without (table)
+    geo_where, geo_params = user_fact_filters(filters, by_state=True)
 
-        geographic_data.append(
-            {
-                "state": geo.state,
-                "jobs": geo.jobs,
-                "contractors": contractors,
-                "suppliers": suppliers,
-            }
+    def profile_count_query(where, params):
+        sql = text(
+            f"""
+            SELECT state, role, SUM(new_users) AS users
+            FROM daily_user_facts
+            WHERE state = ANY(:states) AND role IN ('Contractor', 'Supplier')
+              AND {where}
+            GROUP BY state, role
+            """
         )
+        return lambda s: s.execute(sql, {**params, "states": states}).fetchall()
+
+    profile_rows = query_fanout.run(
+        {
+            "filtered": profile_count_query(geo_where, geo_params),
+            "all": profile_count_query("county = :f_county", {"f_county": USER_ANY}),
+        },
+        db=db,
+    )
+    profile_counts = {}
+    for key, rows in profile_rows.items():
+        for row in rows:
+            profile_counts[(key, row.state, row.role)] = int(row.users)
+
+    geographic_data = [
+        {
+            "state": row.state,
+            "jobs": int(row.jobs),
+            "contractors": profile_counts.get(("filtered", row.state, "Contractor"), 0),
+            "suppliers": profile_counts.get(("filtered", row.state, "Supplier"), 0),
+        }
+        for row in state_rows
+    ]
 
     # Sort by jobs count (descending)
     geographic_data.sort(key=lambda x: x["jobs"], reverse=True)
@@ -6789,159 +6796,48 @@ def get_admin_analytics(
     # Data Tables
     # ========================================================================
 
-    # Table 1: Top Categories Performance
-    categories_table_query = (
-        db.query(
-            models.user.Job.audience_type_names.label("category"),
-            func.count(models.user.Job.id).label("delivered"),
-            func.count(models.user.UnlockedLead.id).label("unlocked"),
-            func.avg(models.user.UnlockedLead.credits_spent).label("avg_credits"),
-            func.sum(models.user.UnlockedLead.credits_spent).label("total_revenue"),
-        )
-        .outerjoin(
-            models.user.UnlockedLead,
-            models.user.Job.id == models.user.UnlockedLead.job_id,
-        )
-        .filter(models.user.Job.audience_type_names.isnot(None))
-    )
-
-    # Apply user_type filter to unlocks
-    if user_type and user_type != "All":
-        # Join User table to filter unlocks by user role
-        categories_table_query = categories_table_query.outerjoin(
-            models.user.User, models.user.UnlockedLead.user_id == models.user.User.id
-        )
-
-        if user_type == "Contractors":
-            categories_table_query = categories_table_query.filter(
-                or_(
-                    models.user.UnlockedLead.id.is_(
-                        None
-                    ),  # Include jobs with no unlocks
-                    models.user.User.role == "Contractor",
-                )
-            )
-        elif user_type == "Suppliers":
-            categories_table_query = categories_table_query.filter(
-                or_(
-                    models.user.UnlockedLead.id.is_(
-                        None
-                    ),  # Include jobs with no unlocks
-                    models.user.User.role == "Supplier",
-                )
-            )
-
-    categories_table_query = _apply_job_filters(categories_table_query, filters)
-    categories_table_query = categories_table_query.group_by(
-        models.user.Job.audience_type_names
-    )
-
-    # Get total count for pagination
-    categories_total = categories_table_query.count()
-
-    # Apply pagination and sorting - order by delivered (highest first) to match export
-    categories_table = (
-        categories_table_query.order_by(func.count(models.user.Job.id).desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
-    )
+    # Table 1: Top Categories Performance - order by delivered (highest first)
+    # to match export; unlocks by the selected user type only
+    categories_total = len(category_rows)
+    categories_page = sorted(category_rows, key=lambda c: c.delivered, reverse=True)[
+        (page - 1) * per_page : page * per_page
+    ]
 
     categories_table_data = []
-    for cat in categories_table:
-        conv_pct = (cat.unlocked / cat.delivered * 100) if cat.delivered > 0 else 0.0
+    for cat in categories_page:
+        delivered, unlocked = int(cat.delivered), int(cat.role_unlocked)
+        conv_pct = (unlocked / delivered * 100) if delivered > 0 else 0.0
         categories_table_data.append(
             {
                 "category": cat.category or "Unknown",
-                "delivered": cat.delivered,
-                "unlocked": cat.unlocked,
+                "delivered": delivered,
+                "unlocked": unlocked,
                 "conversionPct": round(conv_pct, 1),
-                "avgCredits": round(float(cat.avg_credits or 0), 1),
-                "totalRevenue": int(cat.total_revenue or 0),
+                "avgCredits": round(
+                    (int(cat.role_credits) / unlocked) if unlocked else 0.0, 1
+                ),
+                "totalRevenue": int(cat.role_credits),
             }
         )
 
-    # Table 2: Top Jurisdictions
-    jurisdictions_query = (
-        db.query(
-            models.user.Job.state.label("location"),
-            func.count(models.user.Job.id).label("jobs_delivered"),
-            func.count(models.user.UnlockedLead.id).label("unlocks"),
-        )
-        .outerjoin(
-            models.user.UnlockedLead,
-            models.user.Job.id == models.user.UnlockedLead.job_id,
-        )
-        .filter(models.user.Job.state.isnot(None))
-    )
-
-    # Apply user_type filter to unlocks
-    if user_type and user_type != "All":
-        # Join User table to filter unlocks by user role
-        jurisdictions_query = jurisdictions_query.outerjoin(
-            models.user.User, models.user.UnlockedLead.user_id == models.user.User.id
-        )
-
-        if user_type == "Contractors":
-            jurisdictions_query = jurisdictions_query.filter(
-                or_(
-                    models.user.UnlockedLead.id.is_(
-                        None
-                    ),  # Include jobs with no unlocks
-                    models.user.User.role == "Contractor",
-                )
-            )
-        elif user_type == "Suppliers":
-            jurisdictions_query = jurisdictions_query.filter(
-                or_(
-                    models.user.UnlockedLead.id.is_(
-                        None
-                    ),  # Include jobs with no unlocks
-                    models.user.User.role == "Supplier",
-                )
-            )
-
-    jurisdictions_query = _apply_job_filters(jurisdictions_query, filters)
-    jurisdictions_query = jurisdictions_query.group_by(models.user.Job.state)
-
-    jurisdictions_total = jurisdictions_query.count()
-
-    # Order by jobs delivered (highest first) to match export
-    jurisdictions_table = (
-        jurisdictions_query.order_by(func.count(models.user.Job.id).desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
-    )
+    # Table 2: Top Jurisdictions - order by jobs delivered (highest first) to match export
+    jurisdictions_total = len(state_rows)
+    jurisdictions_page = sorted(state_rows, key=lambda j: j.jobs, reverse=True)[
+        (page - 1) * per_page : page * per_page
+    ]
 
     jurisdictions_table_data = []
-    for jur in jurisdictions_table:
-        # Get contractors and suppliers count
-        contractors = (
-            db.query(func.count(func.distinct(models.user.Contractor.user_id)))
-            .filter(models.user.Contractor.state.any(jur.location))
-            .scalar()
-            or 0
-        )
-
-        suppliers = (
-            db.query(func.count(func.distinct(models.user.Supplier.user_id)))
-            .filter(models.user.Supplier.service_states.any(jur.location))
-            .scalar()
-            or 0
-        )
-
-        conv_pct = (
-            (jur.unlocks / jur.jobs_delivered * 100) if jur.jobs_delivered > 0 else 0.0
-        )
+    for jur in jurisdictions_page:
+        jobs_delivered, unlocks = int(jur.jobs), int(jur.unlocks)
+        conv_pct = (unlocks / jobs_delivered * 100) if jobs_delivered > 0 else 0.0
 
         jurisdictions_table_data.append(
             {
-                "location": jur.location,
-                "jobsDelivered": jur.jobs_delivered,
-                "contractors": contractors,
-                "suppliers": suppliers,
-                "unlocks": jur.unlocks,
+                "location": jur.state,
+                "jobsDelivered": jobs_delivered,
+                "contractors": profile_counts.get(("all", jur.state, "Contractor"), 0),
+                "suppliers": profile_counts.get(("all", jur.state, "Supplier"), 0),
+                "unlocks": unlocks,
                 "conversionPct": round(conv_pct, 1),
             }
         )
@@ -7036,14 +6932,20 @@ def get_admin_analytics(
         },
     }
 
-    # Set HTTP cache headers for proper browser caching
-    cache_key = f"analytics_{time_range}_{state}_{user_type}_{subscription_tier}"
-    response.headers["Cache-Control"] = "public, max-age=300"  # Cache for 5 minutes
-    response.headers["ETag"] = f'"{cache_key}"'  # Enable cache validation
-
     return response_dict
 
 
+@router.get("/cache-metrics", dependencies=[Depends(require_admin_token)])
+def get_response_cache_metrics():
+    """
+    Admin endpoint: response cache statistics for this instance.
+
+    Per cached endpoint: hits, stale hits, misses, hit ratio and recompute
+    time (average / max), plus entry count and invalidations per tag.
+    """
+    return response_cache.metrics()
+
+
 # ============================================================================
 # Dedicated Chart Endpoints (with Toggle Parameters)
 # ============================================================================
@@ -7121,10 +7023,20 @@ def get_credits_flow_chart(
         # Last 6 months, monthly buckets
         periods = _month_starts(6)
 
-    # Calculate credits flow for each period
+    # Calculate credits flow for each period (daily_credit_flow, one query)
+    where, params = user_fact_filters(filters)
+    flows = sum_by_period(
+        db,
+        "daily_credit_flow",
+        ("granted", "purchased", "spent", "frozen"),
+        periods,
+        where,
+        params,
+    )
+
     flow_data = []
-    for label, p_start, p_end in periods:
-        flow = _calculate_credits_flow(db, p_start, p_end, filters)
+    for (label, _, _), flow in zip(periods, flows):
+        flow = {key: int(value) for key, value in flow.items()}
         net = flow["granted"] + flow["purchased"] - flow["spent"] - flow["frozen"]
 
         flow_data.append(
@@ -7170,6 +7082,71 @@ def get_credits_flow_chart(
     }
 
 
+def _funnel_user_stages(db: Session, state, country_city, range_params: dict):
+    """(unlocked, saved, not interested) in the range by users listing
+    ``state`` OR ``country_city`` (both optional), from the daily fact tables."""
+    state = state if state and state != "All" else None
+    county = country_city if country_city and country_city != "All" else None
+
+    # (state, county) cells to add up: users in A or B = A + B - (A and B)
+    if state and county:
+        cells = {(state, USER_ANY): 1, (USER_ANY, county): 1, (state, county): -1}
+    else:
+        cells = {(state or USER_ANY, county or USER_ANY): 1}
+
+    rows = db.execute(
+        text(
+            """
+            SELECT state, county, SUM(unlocks) AS unlocked, 0 AS saved, 0 AS not_interested
+            FROM daily_credit_flow
+            WHERE day >= :start_day AND day < :end_day
+              AND state = ANY(:states) AND county = ANY(:counties)
+            GROUP BY state, county
+            UNION ALL
+            SELECT state, county, 0, SUM(saved_jobs), SUM(not_interested_jobs)
+            FROM daily_user_facts
+            WHERE day >= :start_day AND day < :end_day
+              AND state = ANY(:states) AND county = ANY(:counties)
+            GROUP BY state, county
+            """
+        ),
+        {
+            **range_params,
+            "states": list({s for s, _ in cells}),
+            "counties": list({c for _, c in cells}),
+        },
+    ).fetchall()
+
+    unlocked = saved = not_interested = 0
+    for row in rows:
+        sign = cells.get((row.state, row.county), 0)
+        unlocked += sign * int(row.unlocked)
+        saved += sign * int(row.saved)
+        not_interested += sign * int(row.not_interested)
+    return unlocked, saved, not_interested
+
+
+def _funnel_user_stages_live(db: Session, filtered_user_ids, start_date, end_date):
+    """(unlocked, saved, not interested) in the range by ``filtered_user_ids``
+    (None: all users), from the source tables."""
+    if filtered_user_ids == []:
+        return 0, 0, 0
+
+    counts = []
+    for model, column in (
+        (models.user.UnlockedLead, models.user.UnlockedLead.unlocked_at),
+        (models.user.SavedJob, models.user.SavedJob.saved_at),
+        (models.user.NotInterestedJob, models.user.NotInterestedJob.marked_at),
+    ):
+        query = db.query(func.count(model.id)).filter(
+            column >= start_date, column < end_date
+        )
+        if filtered_user_ids is not None:
+            query = query.filter(model.user_id.in_(filtered_user_ids))
+        counts.append(query.scalar() or 0)
+    return tuple(counts)
+
+
 @router.get("/charts/marketplace-funnel", dependencies=[Depends(require_admin_token)])
 def get_marketplace_funnel_chart(
     time_range: str = Query("6months", description="Time range filter"),
@@ -7252,7 +7229,7 @@ def get_marketplace_funnel_chart(
             # Get suppliers with this city
             supplier_ids = (
                 db.query(models.user.Supplier.user_id)
-                .filter(models.user.Supplier.service_county.any(country_city))
+                .filter(models.user.Supplier.country_city.any(country_city))
                 .all()
             )
             for row in supplier_ids:
@@ -7284,9 +7261,6 @@ def get_marketplace_funnel_chart(
 
         return list(user_ids) if user_ids else []
 
-    # Get filtered user IDs
-    filtered_user_ids = get_filtered_user_ids()
-
     # Base response structure
     response = {
         "metadata": {
@@ -7302,76 +7276,36 @@ def get_marketplace_funnel_chart(
     }
 
     # ========================================================================
-    # Funnel Stage Counts
+    # Funnel Stage Counts (daily fact tables, see services/analytics_rollups.py)
     # ========================================================================
 
-    # Stage 1: Delivered (all posted jobs)
-    delivered_query = db.query(func.count(models.user.Job.id)).filter(
-        models.user.Job.job_review_status == "posted",
-        models.user.Job.created_at >= start_date,
-        models.user.Job.created_at < end_date,
-    )
-
-    # Apply state filter to jobs
-    if state and state != "All":
-        delivered_query = delivered_query.filter(models.user.Job.state == state)
+    range_params = {"start_day": day_bound(start_date), "end_day": day_bound(end_date)}
 
-    # Apply country_city filter to jobs
-    if country_city and country_city != "All":
-        delivered_query = delivered_query.filter(
-            models.user.Job.country_city == country_city
-        )
-
-    delivered_count = delivered_query.scalar() or 0
-
-    # Stage 2: Unlocked (all unlocked leads)
-    unlocked_query = db.query(func.count(models.user.UnlockedLead.id)).filter(
-        models.user.UnlockedLead.unlocked_at >= start_date,
-        models.user.UnlockedLead.unlocked_at < end_date,
+    # Stage 1: Delivered (posted jobs created in the range, by job location)
+    job_where, job_params = job_fact_filters(filters)
+    delivered_count = int(
+        db.execute(
+            text(
+                f"""
+                SELECT COALESCE(SUM(jobs_posted), 0) FROM daily_job_facts
+                WHERE {job_where} AND day >= :start_day AND day < :end_day
+                """
+            ),
+            {**job_params, **range_params},
+        ).scalar()
     )
 
-    # Apply user filter if specified
-    if filtered_user_ids is not None:
-        if filtered_user_ids:  # Has specific users
-            unlocked_query = unlocked_query.filter(
-                models.user.UnlockedLead.user_id.in_(filtered_user_ids)
-            )
-        else:  # Empty list means no matching users
-            unlocked_count = 0
-            saved_count = 0
-            not_interested_count = 0
-
-    if filtered_user_ids != []:
-        unlocked_count = unlocked_query.scalar() or 0
-
-        # Stage 3: Saved (bookmarked jobs)
-        saved_query = db.query(func.count(models.user.SavedJob.id)).filter(
-            models.user.SavedJob.saved_at >= start_date,
-            models.user.SavedJob.saved_at < end_date,
+    # Stages 2-4: Unlocked, Saved, Not Interested
+    if user_type:
+        # Trades are not a fact dimension: resolve the matching users live
+        unlocked_count, saved_count, not_interested_count = _funnel_user_stages_live(
+            db, get_filtered_user_ids(), start_date, end_date
         )
-
-        if filtered_user_ids is not None and filtered_user_ids:
-            saved_query = saved_query.filter(
-                models.user.SavedJob.user_id.in_(filtered_user_ids)
-            )
-
-        saved_count = saved_query.scalar() or 0
-
-        # Stage 4: Not Interested (rejected jobs)
-        not_interested_query = db.query(
-            func.count(models.user.NotInterestedJob.id)
-        ).filter(
-            models.user.NotInterestedJob.marked_at >= start_date,
-            models.user.NotInterestedJob.marked_at < end_date,
+    else:
+        unlocked_count, saved_count, not_interested_count = _funnel_user_stages(
+            db, state, country_city, range_params
         )
 
-        if filtered_user_ids is not None and filtered_user_ids:
-            not_interested_query = not_interested_query.filter(
-                models.user.NotInterestedJob.user_id.in_(filtered_user_ids)
-            )
-
-        not_interested_count = not_interested_query.scalar() or 0
-
     # Build response
     response["data"] = {
         "delivered": delivered_count,
@@ -7425,6 +7359,39 @@ def search_categories(
     Returns paginated list of categories with delivered, unlocked, conversion %,
     avg credits, and total revenue.
     """
+    filters = {
+        "search": search,
+        "page": page,
+        "per_page": per_page,
+        "state": state,
+        "country_city": country_city,
+        "user_type": user_type,
+        "time_range": time_range,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    return response_cache.get(
+        "admin.tables.categories",
+        filters,
+        lambda session: _search_categories(session, **filters),
+        db,
+        tags=("jobs", "unlocks"),
+    )
+
+
+def _search_categories(
+    db: Session,
+    search: Optional[str],
+    page: int,
+    per_page: int,
+    state: Optional[str],
+    country_city: Optional[str],
+    user_type: Optional[str],
+    time_range: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+):
+    """``search_categories`` without the response cache."""
     from src.app.api.endpoints.admin_dashboard import _get_date_range_from_filter
 
     # Get date range
@@ -7453,11 +7420,18 @@ def search_categories(
             models.user.Job.country_city == country_city
         )
 
-    # Apply search filter (case-insensitive partial match)
+    # Apply search filter (case-insensitive partial match). Searching for a
+    # trade or trade category also matches jobs routed to those trades by slug.
     if search:
-        categories_query = categories_query.filter(
-            models.user.Job.audience_type_names.ilike(f"%{search}%")
-        )
+        search_conditions = [models.user.Job.audience_type_names.ilike(f"%{search}%")]
+        matching_slugs = [t.slug for t in trade_taxonomy.search(search)]
+        if matching_slugs:
+            search_conditions.append(
+                models.user.Job.audience_type_slugs.op("~")(
+                    rf"(^|,)\s*({'|'.join(matching_slugs)})\s*(,|$)"
+                )
+            )
+        categories_query = categories_query.filter(or_(*search_conditions))
 
     # Group by category
     categories_query = categories_query.group_by(models.user.Job.audience_type_names)
@@ -7573,11 +7547,14 @@ def export_categories_excel(
     time_range: str = Query("6months", description="Time range filter"),
     date_from: Optional[str] = Query(None, description="Custom start date"),
     date_to: Optional[str] = Query(None, description="Custom end date"),
+    export_format: str = Query("xlsx", alias="format", description="xlsx or csv"),
     db: Session = Depends(get_db),
 ):
     """
-    Export categories data to Excel file with formatting.
+    Export categories data to Excel (with formatting) or CSV, streamed.
     """
+    export_format = check_export_format(export_format)
+
     from src.app.api.endpoints.admin_dashboard import _get_date_range_from_filter
 
     # Get date range
@@ -7585,8 +7562,25 @@ def export_categories_excel(
         time_range, date_from, date_to
     )
 
+    # Unlocks in the period per category, over all of the category's jobs
+    unlocks = (
+        db.query(
+            models.user.Job.audience_type_names.label("category"),
+            func.count(models.user.UnlockedLead.id).label("unlocked"),
+            func.avg(models.user.UnlockedLead.credits_spent).label("avg_credits"),
+            func.sum(models.user.UnlockedLead.credits_spent).label("total_credits"),
+        )
+        .join(models.user.Job, models.user.Job.id == models.user.UnlockedLead.job_id)
+        .filter(
+            models.user.UnlockedLead.unlocked_at >= start_date,
+            models.user.UnlockedLead.unlocked_at < end_date,
+        )
+        .group_by(models.user.Job.audience_type_names)
+        .subquery()
+    )
+
     # Get all categories (no pagination for export)
-    categories_query = db.query(
+    delivered_query = db.query(
         models.user.Job.audience_type_names.label("category"),
         func.count(models.user.Job.id).label("delivered"),
     ).filter(
@@ -7598,120 +7592,61 @@ def export_categories_excel(
 
     # Apply filters
     if state and state != "All":
-        categories_query = categories_query.filter(models.user.Job.state == state)
+        delivered_query = delivered_query.filter(models.user.Job.state == state)
     if country_city and country_city != "All":
-        categories_query = categories_query.filter(
+        delivered_query = delivered_query.filter(
             models.user.Job.country_city == country_city
         )
 
-    categories_query = categories_query.group_by(models.user.Job.audience_type_names)
-    # Order by delivered count (highest first) - same as search endpoint
-    categories_query = categories_query.order_by(func.count(models.user.Job.id).desc())
-    categories_data = categories_query.all()
-
-    # Prepare data for DataFrame
-    data_rows = []
-    for cat in categories_data:
-        category = cat.category
-        delivered = cat.delivered
-
-        # Get unlocked count
-        unlocked = (
-            db.query(func.count(models.user.UnlockedLead.id))
-            .join(
-                models.user.Job, models.user.Job.id == models.user.UnlockedLead.job_id
-            )
-            .filter(
-                models.user.Job.audience_type_names == category,
-                models.user.UnlockedLead.unlocked_at >= start_date,
-                models.user.UnlockedLead.unlocked_at < end_date,
-            )
-            .scalar()
-            or 0
+    delivered = delivered_query.group_by(models.user.Job.audience_type_names).subquery()
+    # One query for every row; order by delivered count (highest first) - same
+    # as search endpoint
+    categories_query = (
+        db.query(
+            delivered.c.category,
+            delivered.c.delivered,
+            func.coalesce(unlocks.c.unlocked, 0).label("unlocked"),
+            unlocks.c.avg_credits,
+            unlocks.c.total_credits,
         )
+        .outerjoin(unlocks, unlocks.c.category == delivered.c.category)
+        .order_by(delivered.c.delivered.desc())
+    )
 
-        # Get credits data
-        credits_query = (
-            db.query(
-                func.avg(models.user.UnlockedLead.credits_spent).label("avg_credits"),
-                func.sum(models.user.UnlockedLead.credits_spent).label("total_credits"),
-            )
-            .join(
-                models.user.Job, models.user.Job.id == models.user.UnlockedLead.job_id
-            )
-            .filter(
-                models.user.Job.audience_type_names == category,
-                models.user.UnlockedLead.unlocked_at >= start_date,
-                models.user.UnlockedLead.unlocked_at < end_date,
+    def category_rows():
+        for cat in categories_query:
+            delivered_count = cat.delivered
+            conversion_pct = (
+                round((cat.unlocked / delivered_count * 100), 1)
+                if delivered_count > 0
+                else 0
             )
-            .first()
-        )
-
-        avg_credits = int(credits_query.avg_credits or 0)
-        total_revenue = int(credits_query.total_credits or 0)
-        conversion_pct = round((unlocked / delivered * 100), 1) if delivered > 0 else 0
 
-        data_rows.append(
-            {
-                "Category": category,
-                "Delivered": delivered,
-                "Unlocked": unlocked,
-                "Conversion %": conversion_pct,
-                "Avg. Credits": avg_credits,
-                "Total Revenue": total_revenue,
-            }
-        )
+            yield (
+                cat.category,
+                delivered_count,
+                cat.unlocked,
+                conversion_pct,
+                int(cat.avg_credits or 0),
+                int(cat.total_credits or 0),
+            )
 
-    # Create DataFrame
-    df = pd.DataFrame(data_rows)
-
-    # Create Excel file in memory with formatting
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Categories", index=False)
-
-        # Get workbook and worksheet for formatting
-        workbook = writer.book
-        worksheet = writer.sheets["Categories"]
-
-        # Set column widths
-        worksheet.column_dimensions["A"].width = 50  # Category
-        worksheet.column_dimensions["B"].width = 12  # Delivered
-        worksheet.column_dimensions["C"].width = 12  # Unlocked
-        worksheet.column_dimensions["D"].width = 15  # Conversion %
-        worksheet.column_dimensions["E"].width = 15  # Avg. Credits
-        worksheet.column_dimensions["F"].width = 15  # Total Revenue
-
-        # Format header row
-        from openpyxl.styles import Alignment, Font, PatternFill
-
-        header_fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
-        header_font = Font(bold=True, color="FFFFFF")
-
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Center align numeric columns
-        for row in worksheet.iter_rows(
-            min_row=2, max_row=worksheet.max_row, min_col=2, max_col=6
-        ):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-
-    # Prepare response
-    output.seek(0)
-    content = output.getvalue()
-    return Response(
-        content=content,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=categories_{time_range}.xlsx",
-            "Content-Length": str(len(content)),
-        },
+    return export_response(
+        export_format,
+        f"categories_{time_range}",
+        "Categories",
+        [
+            "Category",
+            "Delivered",
+            "Unlocked",
+            "Conversion %",
+            "Avg. Credits",
+            "Total Revenue",
+        ],
+        category_rows(),
+        column_widths=(50, 12, 12, 15, 15, 15),
+        header_color="4472C4",
+        center_from_column=2,
     )
 
 
@@ -7739,6 +7674,39 @@ def search_jurisdictions(
     Returns paginated list of jurisdictions with jobs delivered, contractors,
     suppliers, unlocks, and conversion %.
     """
+    filters = {
+        "search": search,
+        "page": page,
+        "per_page": per_page,
+        "state": state,
+        "country_city": country_city,
+        "user_type": user_type,
+        "time_range": time_range,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    return response_cache.get(
+        "admin.tables.jurisdictions",
+        filters,
+        lambda session: _search_jurisdictions(session, **filters),
+        db,
+        tags=("jobs", "unlocks", "users"),
+    )
+
+
+def _search_jurisdictions(
+    db: Session,
+    search: Optional[str],
+    page: int,
+    per_page: int,
+    state: Optional[str],
+    country_city: Optional[str],
+    user_type: Optional[str],
+    time_range: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+):
+    """``search_jurisdictions`` without the response cache."""
     from src.app.api.endpoints.admin_dashboard import _get_date_range_from_filter
 
     # Get date range
@@ -7879,11 +7847,14 @@ def export_jurisdictions_excel(
     time_range: str = Query("6months", description="Time range filter"),
     date_from: Optional[str] = Query(None, description="Custom start date"),
     date_to: Optional[str] = Query(None, description="Custom end date"),
+    export_format: str = Query("xlsx", alias="format", description="xlsx or csv"),
     db: Session = Depends(get_db),
 ):
     """
-    Export jurisdictions data to Excel file with formatting.
+    Export jurisdictions data to Excel (with formatting) or CSV, streamed.
     """
+    export_format = check_export_format(export_format)
+
     from src.app.api.endpoints.admin_dashboard import _get_date_range_from_filter
 
     # Get date range
@@ -7891,8 +7862,43 @@ def export_jurisdictions_excel(
         time_range, date_from, date_to
     )
 
+    def users_per_state(model, states_column):
+        # Distinct users listing each state in their (array) states column
+        listed = db.query(
+            model.user_id, func.unnest(states_column).label("location")
+        ).subquery()
+        return (
+            db.query(
+                listed.c.location,
+                func.count(func.distinct(listed.c.user_id)).label("users"),
+            )
+            .group_by(listed.c.location)
+            .subquery()
+        )
+
+    contractors = users_per_state(models.user.Contractor, models.user.Contractor.state)
+    suppliers = users_per_state(
+        models.user.Supplier, models.user.Supplier.service_states
+    )
+
+    # Unlocks in the period per state, over all of the state's jobs
+    unlocks_query = (
+        db.query(
+            models.user.Job.state.label("location"),
+            func.count(models.user.UnlockedLead.id).label("unlocks"),
+        )
+        .join(models.user.Job, models.user.Job.id == models.user.UnlockedLead.job_id)
+        .filter(
+            models.user.UnlockedLead.unlocked_at >= start_date,
+            models.user.UnlockedLead.unlocked_at < end_date,
+        )
+    )
+    if state and state != "All":
+        unlocks_query = unlocks_query.filter(models.user.Job.state == state)
+    unlocks = unlocks_query.group_by(models.user.Job.state).subquery()
+
     # Get all jurisdictions (no pagination for export)
-    jurisdictions_query = db.query(
+    delivered_query = db.query(
         models.user.Job.state.label("location"),
         func.count(models.user.Job.id).label("jobs_delivered"),
     ).filter(
@@ -7904,120 +7910,63 @@ def export_jurisdictions_excel(
 
     # Apply filters
     if state and state != "All":
-        jurisdictions_query = jurisdictions_query.filter(models.user.Job.state == state)
+        delivered_query = delivered_query.filter(models.user.Job.state == state)
     if country_city and country_city != "All":
-        jurisdictions_query = jurisdictions_query.filter(
+        delivered_query = delivered_query.filter(
             models.user.Job.country_city == country_city
         )
 
-    jurisdictions_query = jurisdictions_query.group_by(models.user.Job.state)
-    # Order by jobs delivered (highest first) - same as search endpoint
-    jurisdictions_query = jurisdictions_query.order_by(
-        func.count(models.user.Job.id).desc()
-    )
-    jurisdictions_data = jurisdictions_query.all()
-
-    # Prepare data for DataFrame
-    data_rows = []
-    for jur in jurisdictions_data:
-        location = jur.location
-        jobs_delivered = jur.jobs_delivered
-
-        # Get contractors and suppliers count
-        contractors = (
-            db.query(func.count(func.distinct(models.user.Contractor.user_id)))
-            .filter(models.user.Contractor.state.any(location))
-            .scalar()
-            or 0
-        )
-
-        suppliers = (
-            db.query(func.count(func.distinct(models.user.Supplier.user_id)))
-            .filter(models.user.Supplier.service_states.any(location))
-            .scalar()
-            or 0
-        )
-
-        # Get unlocks count
-        unlocks = (
-            db.query(func.count(models.user.UnlockedLead.id))
-            .join(
-                models.user.Job, models.user.Job.id == models.user.UnlockedLead.job_id
-            )
-            .filter(
-                models.user.Job.state == location,
-                models.user.UnlockedLead.unlocked_at >= start_date,
-                models.user.UnlockedLead.unlocked_at < end_date,
+    delivered = delivered_query.group_by(models.user.Job.state).subquery()
+    # One query for every row; order by jobs delivered (highest first) - same
+    # as search endpoint
+    jurisdictions_query = (
+        db.query(
+            delivered.c.location,
+            delivered.c.jobs_delivered,
+            func.coalesce(contractors.c.users, 0).label("contractors"),
+            func.coalesce(suppliers.c.users, 0).label("suppliers"),
+            func.coalesce(unlocks.c.unlocks, 0).label("unlocks"),
+        )
+        .outerjoin(contractors, contractors.c.location == delivered.c.location)
+        .outerjoin(suppliers, suppliers.c.location == delivered.c.location)
+        .outerjoin(unlocks, unlocks.c.location == delivered.c.location)
+        .order_by(delivered.c.jobs_delivered.desc())
+    )
+
+    def jurisdiction_rows():
+        for jur in jurisdictions_query:
+            jobs_delivered = jur.jobs_delivered
+            conversion_pct = (
+                round((jur.unlocks / jobs_delivered * 100), 1)
+                if jobs_delivered > 0
+                else 0
             )
-            .scalar()
-            or 0
-        )
-
-        conversion_pct = (
-            round((unlocks / jobs_delivered * 100), 1) if jobs_delivered > 0 else 0
-        )
 
-        data_rows.append(
-            {
-                "State/County": location,
-                "Jobs Delivered": jobs_delivered,
-                "Contractors": contractors,
-                "Suppliers": suppliers,
-                "Unlocks": unlocks,
-                "Conversion %": conversion_pct,
-            }
-        )
+            yield (
+                jur.location,
+                jobs_delivered,
+                jur.contractors,
+                jur.suppliers,
+                jur.unlocks,
+                conversion_pct,
+            )
 
-    # Create DataFrame
-    df = pd.DataFrame(data_rows)
-
-    # Create Excel file in memory with formatting
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Jurisdictions", index=False)
-
-        # Get workbook and worksheet for formatting
-        workbook = writer.book
-        worksheet = writer.sheets["Jurisdictions"]
-
-        # Set column widths
-        worksheet.column_dimensions["A"].width = 25  # State/County
-        worksheet.column_dimensions["B"].width = 15  # Jobs Delivered
-        worksheet.column_dimensions["C"].width = 15  # Contractors
-        worksheet.column_dimensions["D"].width = 15  # Suppliers
-        worksheet.column_dimensions["E"].width = 12  # Unlocks
-        worksheet.column_dimensions["F"].width = 15  # Conversion %
-
-        # Format header row
-        from openpyxl.styles import Alignment, Font, PatternFill
-
-        header_fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
-        header_font = Font(bold=True, color="FFFFFF")
-
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Center align numeric columns
-        for row in worksheet.iter_rows(
-            min_row=2, max_row=worksheet.max_row, min_col=2, max_col=6
-        ):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-
-    # Prepare response
-    output.seek(0)
-    content = output.getvalue()
-    return Response(
-        content=content,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=jurisdictions_{time_range}.xlsx",
-            "Content-Length": str(len(content)),
-        },
+    return export_response(
+        export_format,
+        f"jurisdictions_{time_range}",
+        "Jurisdictions",
+        [
+            "State/County",
+            "Jobs Delivered",
+            "Contractors",
+            "Suppliers",
+            "Unlocks",
+            "Conversion %",
+        ],
+        jurisdiction_rows(),
+        column_widths=(25, 15, 15, 15, 12, 15),
+        header_color="4472C4",
+        center_from_column=2,
     )
 
 
@@ -1,4 +1,4 @@
-import base64
+import asyncio
 import json
 import logging
 import os
@@ -20,10 +20,12 @@ from src.app.api.deps import (
 )
 from src.app.api.endpoints.auth import hash_password, verify_password
 from src.app.core.database import get_db
+from src.app.services.blob_store import BlobNotFound, BlobTooLarge
 from src.app.utils.email import (
     send_registration_completion_email,
     send_admin_new_registration_notification,
 )
+from src.app.utils.stored_files import file_bytes, has_file, store_file, with_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -352,7 +354,7 @@ def preview_contractor_documents(
 
                 filename = file_data.get("filename", f"document_{index}")
                 content_type = file_data.get("content_type", "application/octet-stream")
-                base64_data = file_data.get("data", "")
+                base64_data = with_data(file_data).get("data")
                 size = file_data.get("size", 0)
 
                 if base64_data:
@@ -1073,12 +1075,15 @@ def get_license_file_preview(
         raise HTTPException(status_code=404, detail="File not found")
 
     file_entry = files[index]
-    if not isinstance(file_entry, dict) or "data" not in file_entry:
+    if not has_file(file_entry):
         raise HTTPException(status_code=404, detail="File data not available")
 
     filename = file_entry.get("filename", "")
     content_type = file_entry.get("content_type", "")
-    raw_bytes = base64.b64decode(file_entry["data"])
+    try:
+        raw_bytes = file_bytes(file_entry)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="File data not available")
 
     ext = Path(filename).suffix.lower()
 
@@ -1168,20 +1173,21 @@ async def update_contractor_license_info(
                     status_code=400, detail=f"Invalid file type for {file_type}"
                 )
 
-            contents = await file.read()
-            if len(contents) > MAX_FILE_SIZE:
+            # Stream into the blob store off the event loop
+            try:
+                stored = await asyncio.to_thread(
+                    store_file,
+                    file.file,
+                    file.filename,
+                    file.content_type or "image/jpeg",
+                    MAX_FILE_SIZE,
+                )
+            except BlobTooLarge:
                 raise HTTPException(
                     status_code=400, detail=f"{file_type} file too large"
                 )
 
-            result.append(
-                {
-                    "filename": file.filename,
-                    "content_type": file.content_type or "image/jpeg",
-                    "data": base64.b64encode(contents).decode("utf-8"),
-                    "size": len(contents),
-                }
-            )
+            result.append(stored)
 
         return result
 
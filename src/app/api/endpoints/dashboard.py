@@ -15,6 +15,8 @@ from src.app.api.deps import (
     require_main_or_editor,
 )
 from src.app.core.database import get_db
+from src.app.services.job_archive import job_snapshot
+from src.app.services.unlock_counters import record_unlock
 
 # Configure logging to use uvicorn logger
 logger = logging.getLogger("uvicorn.error")
@@ -365,8 +367,25 @@ def get_dashboard(
         ]
         base_query = base_query.filter(or_(*city_conditions))
 
-    # Get all matched jobs for deduplication
-    all_jobs = base_query.order_by(models.user.Job.review_posted_at.desc()).all()
+    # Get all matched jobs for deduplication (only the columns used below)
+    all_jobs = (
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.project_description,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.audience_type_names,
+            models.user.Job.source_county,
+            models.user.Job.state,
+            models.user.Job.project_cost_total,
+            models.user.Job.property_type,
+            models.user.Job.trs_score,
+            models.user.Job.review_posted_at,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
+        .all()
+    )
 
     # Deduplicate jobs by (permit_type_norm, project_description, contractor_name, contractor_email)
     seen_jobs = set()
@@ -681,8 +700,25 @@ def get_more_matched_jobs(
         ]
         base_query = base_query.filter(or_(*city_conditions))
 
-    # Get all matched jobs for deduplication
-    all_jobs = base_query.order_by(models.user.Job.review_posted_at.desc()).all()
+    # Get all matched jobs for deduplication (only the columns used below)
+    all_jobs = (
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_type_norm,
+            models.user.Job.project_description,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_email,
+            models.user.Job.audience_type_names,
+            models.user.Job.source_county,
+            models.user.Job.state,
+            models.user.Job.project_cost_total,
+            models.user.Job.property_type,
+            models.user.Job.trs_score,
+            models.user.Job.review_posted_at,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
+        .all()
+    )
 
     # Deduplicate jobs by (permit_type_norm, project_description, contractor_name, contractor_email)
     seen_jobs = set()
@@ -968,9 +1004,12 @@ def unlock_job(
         user_id=current_user.id,
         job_id=job_id,
         credits_spent=credits_needed,
+        job_snapshot=job_snapshot(job),
     )
 
     db.add(unlocked_lead)
+    # Retires the job in this transaction if a trade reaches the unlock threshold
+    record_unlock(db, job, current_user.id)
     db.commit()
     db.refresh(subscriber)
 
@@ -1,10 +1,9 @@
-import json
+import asyncio
 import logging
 import os
 import re
 from typing import Any, Optional
 
-import requests
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr, Field, validator
 from sqlalchemy.orm import Session
@@ -12,6 +11,8 @@ from sqlalchemy.orm import Session
 from src.app import models
 from src.app.api.deps import get_current_user
 from src.app.core.database import get_db
+from src.app.services.email_template_pool import email_template_pool
+from src.app.services.groq_client import groq_client
 
 logger = logging.getLogger(__name__)
 
@@ -54,15 +55,27 @@ class GroqEmailResponse(BaseModel):
     body: str
 
 
+def format_location(data: dict) -> str:
+    """Human-readable job location used in the prompt and pooled templates."""
+    city_country = data.get("city_country")
+    state = data.get("state")
+    if city_country and state:
+        return f"{city_country}, {state}"
+    if city_country:
+        return city_country
+    if state:
+        return state
+    return data.get("address") or "your area"
+
+
 class GroqService:
-    """Service class for Groq API interactions using HTTP requests."""
+    """Service class for Groq API interactions via the shared pooled client."""
 
     DEFAULT_TIMEOUT = 30
 
     def __init__(self):
         self.api_key = os.getenv("GROQ_API_KEY")
         self.model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-        self.api_endpoint = "https://api.groq.com/openai/v1/chat/completions"
 
         if not self.api_key:
             raise HTTPException(
@@ -81,17 +94,7 @@ class GroqService:
             
         description = data.get('job_description') or 'your upcoming project'
         
-        # Build location
-        city_country = data.get('city_country')
-        state = data.get('state')
-        if city_country and state:
-            location = f"{city_country}, {state}"
-        elif city_country:
-            location = city_country
-        elif state:
-            location = state
-        else:
-            location = data.get('address') or 'your area'
+        location = format_location(data)
         
         cost = data.get('cost')
         
@@ -294,16 +297,13 @@ Use {{{{double curly braces}}}} for placeholders ONLY if sender information is n
 
         return prompt_template
 
-    def generate_email(self, payload_data: dict, user_role: str) -> tuple[str, str]:
-        """Generate email template using Groq API via HTTP requests."""
+    async def generate_email(
+        self, payload_data: dict, user_role: str
+    ) -> tuple[str, str]:
+        """Generate email template using the shared Groq client."""
         data = {**payload_data, "user_role": user_role}
         prompt = self._build_prompt(data)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
         # Allow prompt to request concrete sender info instead of placeholders.
         no_placeholders = bool(data.get("no_placeholders"))
         if no_placeholders:
@@ -345,94 +345,24 @@ Use {{{{double curly braces}}}} for placeholders ONLY if sender information is n
             "response_format": {"type": "json_object"},
         }
 
-        try:
-            logger.info("Calling Groq API endpoint: %s with model: %s", self.api_endpoint, self.model)
-            
-            response = requests.post(
-                self.api_endpoint,
-                json=request_body,
-                headers=headers,
-                timeout=self.DEFAULT_TIMEOUT
-            )
-            
-            if not response.ok:
-                error_text = response.text
-                logger.error("Groq API returned status %s: %s", response.status_code, error_text)
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Groq API error (status {response.status_code}): {error_text[:200]}",
-                )
-            
-            try:
-                response_json = response.json()
-            except json.JSONDecodeError as e:
-                logger.error("Failed to decode Groq JSON response: %s", str(e))
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Invalid JSON response from Groq service",
-                )
-            
-            logger.info("Groq API response received successfully")
-
-            if "choices" not in response_json or not response_json["choices"]:
-                logger.error("Groq response missing 'choices' field: %s", response_json)
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Invalid response structure from Groq API",
-                )
-            
-            first_choice = response_json["choices"][0]
-            message = first_choice.get("message", {})
-            content = message.get("content", "")
-            
-            if not content:
-                logger.error("Groq response missing content: %s", response_json)
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Empty content in Groq API response",
-                )
+        logger.info("Calling Groq API with model: %s", self.model)
+        email_data = await groq_client.chat_json(
+            self.api_key, request_body, deadline=self.DEFAULT_TIMEOUT
+        )
 
-            try:
-                email_data = json.loads(content)
-                subject = email_data.get("subject", "Regarding Construction Permit {permit_num}")
-                body = email_data.get("body", "")
-
-                if not body:
-                    logger.error("Groq response missing body content: %s", email_data)
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail="Failed to generate email body from Groq API",
-                    )
-
-                logger.info("Successfully generated email template with placeholders")
-                return subject, body
-
-            except json.JSONDecodeError as e:
-                logger.error(
-                    "Failed to parse Groq content as JSON: %s. Content: %s",
-                    str(e),
-                    content[:500],
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Invalid JSON format in Groq response content",
-                )
+        subject = email_data.get("subject", "Regarding Construction Permit {permit_num}")
+        body = email_data.get("body", "")
 
-        except requests.exceptions.RequestException as e:
-            logger.error("Groq API request failed: %s", str(e), exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Failed to contact Groq service: {str(e)}",
-            )
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error("Unexpected error during Groq API call: %s", str(e), exc_info=True)
+        if not body:
+            logger.error("Groq response missing body content: %s", email_data)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}",
+                detail="Failed to generate email body from Groq API",
             )
 
+        logger.info("Successfully generated email template with placeholders")
+        return subject, body
+
 
 def check_user_role(current_user, allowed_roles: list[str]) -> None:
     """Check if user has required role."""
@@ -445,8 +375,51 @@ def check_user_role(current_user, allowed_roles: list[str]) -> None:
         )
 
 
+def _enrich_payload_from_db(
+    db: Session, payload_data: dict, job_id: Optional[int], current_user, user_role: str
+) -> None:
+    """Fill ``payload_data`` in place with job and sender details from the DB."""
+    # Fetch job data from DB if job_id is provided to ensure we have the correct normalized type
+    if job_id:
+        try:
+            job = db.query(models.user.Job).filter(models.user.Job.id == job_id).first()
+            if job:
+                if job.permit_type_norm:
+                    payload_data["permit_type_norm"] = job.permit_type_norm
+                if job.project_description:
+                    payload_data["job_description"] = job.project_description
+        except Exception as e:
+            logger.error(f"Failed to fetch job data for job_id {job_id}: {e}")
+
+    # If the current user is a contractor, attempt to enrich the payload with
+    # contractor profile data from the `contractors` table so the LLM receives
+    # concrete sender information instead of placeholders.
+    try:
+        if user_role and user_role.lower() == "contractor":
+            contractor = (
+                db.query(models.user.Contractor)
+                .filter(models.user.Contractor.user_id == current_user.id)
+                .first()
+            )
+            if contractor:
+                # Prefer explicit contractor fields, fall back to payload values
+                payload_data["sender_name"] = (
+                    contractor.primary_contact_name or getattr(current_user, "name", None)
+                )
+                payload_data["company_name"] = contractor.company_name
+                # Use contractor phone if available
+                payload_data["phone_number"] = contractor.phone_number or payload_data.get("phone_number")
+                # Use the authenticated user's email as the sender email
+                payload_data["email_address"] = getattr(current_user, "email", payload_data.get("email_address"))
+                # Signal to prompt builder to avoid placeholders
+                payload_data["no_placeholders"] = True
+    except Exception:
+        # If enrichment fails, continue with original payload (do not block generation)
+        logger.exception("Failed to enrich payload with contractor profile; continuing with provided data")
+
+
 @router.post("/generate-send", response_model=GroqEmailResponse)
-def generate_email_template(
+async def generate_email_template(
     payload: GroqEmailRequest,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -466,7 +439,10 @@ def generate_email_template(
     - {{Phone Number}}
     - {{Email Address}}
 
-    Each generation produces a varied email to avoid repetitive content.
+    Each generation produces a varied email to avoid repetitive content. Emails
+    are served from a pool of pre-generated variants per (role, permit type,
+    cost bucket) with placeholders filled in locally; Groq is only called live
+    while that pool is empty.
 
     Required environment variables:
     - GROQ_API_KEY: API key for Groq service
@@ -474,6 +450,9 @@ def generate_email_template(
 
     Optional environment variables:
     - GROQ_MODEL: Model to use (default: llama-3.3-70b-versatile)
+    - GROQ_TIMEOUT_SECONDS / GROQ_MAX_CONCURRENCY: shared Groq client limits
+    - EMAIL_TEMPLATE_POOL_SIZE / EMAIL_TEMPLATE_TTL_HOURS / EMAIL_TEMPLATE_WARM_TOP_N:
+      template pool sizing
     """
 
     allowed_roles_env = os.getenv("GROQ_ALLOWED_ROLES", "Contractor,Supplier,Admin")
@@ -502,45 +481,21 @@ def generate_email_template(
         "job_description": payload.job_description,
     }
 
-    # Fetch job data from DB if job_id is provided to ensure we have the correct normalized type
-    if payload.job_id:
-        try:
-            job = db.query(models.user.Job).filter(models.user.Job.id == payload.job_id).first()
-            if job:
-                if job.permit_type_norm:
-                    payload_data["permit_type_norm"] = job.permit_type_norm
-                if job.project_description:
-                    payload_data["job_description"] = job.project_description
-        except Exception as e:
-            logger.error(f"Failed to fetch job data for job_id {payload.job_id}: {e}")
+    # DB lookups are synchronous; keep them off the event loop
+    await asyncio.to_thread(
+        _enrich_payload_from_db, db, payload_data, payload.job_id, current_user, user_role
+    )
 
-    # If the current user is a contractor, attempt to enrich the payload with
-    # contractor profile data from the `contractors` table so the LLM receives
-    # concrete sender information instead of placeholders.
-    try:
-        if user_role and user_role.lower() == "contractor":
-            contractor = (
-                db.query(models.user.Contractor)
-                .filter(models.user.Contractor.user_id == current_user.id)
-                .first()
-            )
-            if contractor:
-                # Prefer explicit contractor fields, fall back to payload values
-                payload_data["sender_name"] = (
-                    contractor.primary_contact_name or getattr(current_user, "name", None)
-                )
-                payload_data["company_name"] = contractor.company_name
-                # Use contractor phone if available
-                payload_data["phone_number"] = contractor.phone_number or payload_data.get("phone_number")
-                # Use the authenticated user's email as the sender email
-                payload_data["email_address"] = getattr(current_user, "email", payload_data.get("email_address"))
-                # Signal to prompt builder to avoid placeholders
-                payload_data["no_placeholders"] = True
-    except Exception:
-        # If enrichment fails, continue with original payload (do not block generation)
-        logger.exception("Failed to enrich payload with contractor profile; continuing with provided data")
+    # Serve a pre-generated variant for this (role, permit type, cost bucket)
+    # when one is pooled; only generate live while the pool is still empty
+    pooled = email_template_pool.render(
+        user_role, payload_data, format_location(payload_data)
+    )
+    if pooled is not None:
+        subject, body = pooled
+        return GroqEmailResponse(subject=subject, body=body)
 
     groq_service = GroqService()
-    subject, body = groq_service.generate_email(payload_data, user_role)
+    subject, body = await groq_service.generate_email(payload_data, user_role)
 
     return GroqEmailResponse(subject=subject, body=body)
\ No newline at end of file
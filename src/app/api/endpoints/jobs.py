@@ -3,10 +3,10 @@ import csv
 import io
 import json
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple, Union
 
-import pandas as pd
 from fastapi import (
     APIRouter,
     Body,
@@ -20,7 +20,7 @@ from fastapi import (
 )
 from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from src.app import models, schemas
 from src.app.api.deps import (
@@ -31,7 +31,20 @@ from src.app.api.deps import (
     require_admin_token,
 )
 from src.app.core.database import get_db
-from src.app.data import us_locations
+from src.app.core.response_cache import response_cache
+from src.app.data import trade_taxonomy, us_locations
+from src.app.services.ai_batch_matching import batch_matching_service
+from src.app.services.blob_store import BlobTooLarge
+from src.app.services.job_archive import job_snapshot
+from src.app.services.job_posted_push import record_job_posted
+from src.app.services.unlock_counters import record_unlock
+from src.app.utils.spreadsheet_export import check_export_format, export_response
+from src.app.utils.stored_files import (
+    file_bytes,
+    file_response,
+    files_with_data,
+    store_file,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -75,10 +88,29 @@ def convert_slug_to_audience_name(permit_type_norm: str) -> str:
     if not permit_type_norm:
         return None
 
+    # Known trades use their exact display name from the taxonomy
+    display_name = trade_taxonomy.display_name_for(permit_type_norm)
+    if display_name:
+        return display_name
+
     # Replace underscores with spaces and title case each word
     return permit_type_norm.replace("_", " ").title()
 
 
+def normalize_audience(slugs_value, names_value):
+    """
+    Canonicalise ingested audience columns through the trade taxonomy.
+
+    Display names in the slug column are converted to slugs, and
+    audience_type_names is derived from the slugs when it is missing.
+    Returns (audience_type_slugs, audience_type_names).
+    """
+    slugs = trade_taxonomy.to_slugs(trade_taxonomy.split_slugs(slugs_value))
+    if not slugs:
+        return None, names_value
+    return ",".join(slugs), names_value or trade_taxonomy.audience_names(slugs)
+
+
 # TRS (Total Relevance Score) Calculation Helper Functions
 def project_value_score(project_value):
     """
@@ -936,8 +968,8 @@ def get_draft_detail(
                 page_count = None
 
                 try:
-                    # Decode base64 data
-                    file_data = base64.b64decode(doc["data"])
+                    # From the blob store (or legacy base64)
+                    file_data = file_bytes(doc)
 
                     # Handle PDFs
                     if content_type == "application/pdf":
@@ -974,9 +1006,7 @@ def get_draft_detail(
                                 f"Error generating PDF thumbnail for {filename}: {str(e)}"
                             )
                             # Fallback: return full PDF data
-                            thumbnail_base64 = (
-                                f"data:application/pdf;base64,{doc['data']}"
-                            )
+                            thumbnail_base64 = f"data:application/pdf;base64,{base64.b64encode(file_data).decode('utf-8')}"
 
                     # Handle images
                     elif content_type in ["image/jpeg", "image/jpg", "image/png"]:
@@ -1488,6 +1518,36 @@ def delete_document_from_job(
     }
 
 
+@router.get("/job/{job_id}/documents/{document_id}")
+def download_job_document(
+    job_id: int,
+    document_id: str,
+    request: Request,
+    current_user: models.user.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream one document of a job (the same documents GET /jobs/job/{job_id}
+    returns inline as base64).
+
+    Supports Range requests (206 Partial Content) for large PDFs.
+    """
+    job = (
+        db.query(models.user.Job.job_documents)
+        .filter(models.user.Job.id == job_id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job with ID {job_id} not found")
+
+    for doc in job.job_documents or []:
+        if isinstance(doc, dict) and doc.get("document_id") == document_id:
+            return file_response(request, doc, filename=document_id)
+    raise HTTPException(
+        status_code=404, detail=f"Document '{document_id}' not found on this job"
+    )
+
+
 @router.get(
     "/my-uploaded-jobs",
     response_model=List[schemas.subscription.JobDetailResponse],
@@ -1510,8 +1570,10 @@ def get_my_uploaded_jobs(
 
     # Return jobs for the effective (main) account so sub-accounts see the same data
     # Do NOT deduplicate - return all jobs including each audience variant
+    # querystring is part of the response but deferred on the model
     all_jobs = (
         db.query(models.user.Job)
+        .options(undefer(models.user.Job.querystring))
         .filter(
             models.user.Job.uploaded_by_contractor.is_(True),
             models.user.Job.uploaded_by_user_id == effective_user.id,
@@ -1519,6 +1581,21 @@ def get_my_uploaded_jobs(
         .order_by(models.user.Job.created_at.desc())
         .all()
     )
+    # Include retired (archived) uploads so contractors keep their history
+    archived_jobs = (
+        db.query(models.user.JobArchive)
+        .filter(
+            models.user.JobArchive.uploaded_by_contractor.is_(True),
+            models.user.JobArchive.uploaded_by_user_id == effective_user.id,
+        )
+        .all()
+    )
+    if archived_jobs:
+        all_jobs = sorted(
+            all_jobs + archived_jobs,
+            key=lambda j: j.created_at or datetime.min,
+            reverse=True,
+        )
     # Return all uploaded jobs (do not deduplicate so each audience variant is returned)
     # Each job includes job_review_status and property_type fields
     logger.info(
@@ -1558,6 +1635,7 @@ def get_jobs_by_status(
     # Limit to jobs belonging to the effective (main) account so sub-accounts see the same data
     all_jobs = (
         db.query(models.user.Job)
+        .options(undefer(models.user.Job.querystring))
         .filter(
             models.user.Job.job_review_status == status,
             models.user.Job.uploaded_by_user_id == effective_user.id,
@@ -1589,6 +1667,47 @@ def get_jobs_by_status(
     return deduplicated_jobs
 
 
+def _awaits_audience_matching(job) -> bool:
+    """Bulk-ingested job that batch AI matching will assign an audience to."""
+    return (
+        os.getenv("AI_BATCH_MATCH_ON_INGEST", "true").lower() == "true"
+        and not job.audience_type_slugs
+    )
+
+
+def _record_ingested_jobs_posted(db: Session, created_jobs: list):
+    """Queue push fan-out for auto-posted jobs that already have an audience.
+
+    Jobs awaiting matching are queued by batch matching once their audience is
+    written, so they are not pushed before they can match any trade.
+    """
+    record_job_posted(
+        db,
+        [
+            job.id
+            for job in created_jobs
+            if job.job_review_status == "posted" and not _awaits_audience_matching(job)
+        ],
+    )
+
+
+def _schedule_audience_matching(db: Session, created_jobs: list):
+    """Queue bulk-ingested jobs without an audience for batch AI matching."""
+    unmatched = [job for job in created_jobs if _awaits_audience_matching(job)]
+    if not unmatched:
+        return
+    try:
+        batch_matching_service.schedule([job.id for job in unmatched])
+    except Exception as e:
+        # Never fail the upload because matching could not be scheduled; push
+        # the posted jobs without waiting for an audience instead
+        logger.error(f"Failed to schedule audience matching: {str(e)}")
+        record_job_posted(
+            db, [job.id for job in unmatched if job.job_review_status == "posted"]
+        )
+        db.commit()
+
+
 @router.post("/upload-leads", response_model=schemas.subscription.BulkUploadResponse)
 async def upload_leads_file(
     file: UploadFile = File(
@@ -1618,6 +1737,8 @@ async def upload_leads_file(
 
     Admin users with role 'admin' or 'editor' only.
     """
+    import pandas as pd
+
     try:
         # Validate file type
         allowed_extensions = [".json", ".csv", ".xlsx", ".xls"]
@@ -1784,6 +1905,11 @@ async def upload_leads_file(
                 else:
                     permit_type_normalized = None
 
+                audience_slugs, audience_names = normalize_audience(
+                    safe_str(get_value("audience_type_slugs")),
+                    safe_str(get_value("audience_type_names")),
+                )
+
                 job = models.user.Job(
                     queue_id=safe_int(get_value("queue_id")),
                     rule_id=safe_int(get_value("rule_id")),
@@ -1819,8 +1945,8 @@ async def upload_leads_file(
                     contractor_company=safe_str(get_value("contractor_company")),
                     contractor_email=safe_str(get_value("contractor_email")),
                     contractor_phone=safe_str(get_value("contractor_phone")),
-                    audience_type_slugs=safe_str(get_value("audience_type_slugs")),
-                    audience_type_names=safe_str(get_value("audience_type_names")),
+                    audience_type_slugs=audience_slugs,
+                    audience_type_names=audience_names,
                     state=safe_str(get_value("state")),
                     querystring=safe_str(get_value("querystring")),
                     trs_score=trs,
@@ -1857,6 +1983,9 @@ async def upload_leads_file(
                 logger.error(f"Error processing row {index + 2}: {str(e)}")
 
         # Commit all successful inserts
+        # Queue push fan-out for auto-posted jobs in the same transaction
+        db.flush()
+        _record_ingested_jobs_posted(db, created_jobs)
         db.commit()
 
         # Refresh all jobs to get their auto-generated IDs
@@ -1867,6 +1996,8 @@ async def upload_leads_file(
             f"Bulk upload completed: {successful} successful, {failed} failed out of {total_rows} total"
         )
 
+        _schedule_audience_matching(db, created_jobs)
+
         return {
             "total_rows": total_rows,
             "successful": successful,
@@ -1974,6 +2105,8 @@ async def upload_leads_json(
 
     No authentication required.
     """
+    import pandas as pd
+
     try:
         # Body is already parsed by FastAPI
         # Convert to list if single object
@@ -2116,6 +2249,11 @@ async def upload_leads_json(
                 else:
                     permit_type_normalized = None
 
+                audience_slugs, audience_names = normalize_audience(
+                    safe_str(get_value("audience_type_slugs")),
+                    safe_str(get_value("audience_type_names")),
+                )
+
                 job = models.user.Job(
                     queue_id=safe_int(get_value("queue_id")),
                     rule_id=safe_int(get_value("rule_id")),
@@ -2143,8 +2281,8 @@ async def upload_leads_json(
                     contractor_company=safe_str(get_value("contractor_company")),
                     contractor_email=safe_str(get_value("contractor_email")),
                     contractor_phone=safe_str(get_value("contractor_phone")),
-                    audience_type_slugs=safe_str(get_value("audience_type_slugs")),
-                    audience_type_names=safe_str(get_value("audience_type_names")),
+                    audience_type_slugs=audience_slugs,
+                    audience_type_names=audience_names,
                     state=safe_str(get_value("state")),
                     querystring=safe_str(get_value("querystring")),
                     trs_score=trs,
@@ -2178,6 +2316,9 @@ async def upload_leads_json(
                 errors.append(f"Row {index + 1}: {str(e)}")
                 logger.error(f"Error processing row {index + 1}: {str(e)}")
 
+        # Queue push fan-out for auto-posted jobs in the same transaction
+        db.flush()
+        _record_ingested_jobs_posted(db, created_jobs)
         db.commit()
 
         # Refresh all jobs to get their auto-generated IDs
@@ -2188,6 +2329,8 @@ async def upload_leads_json(
             f"JSON bulk upload completed: {successful} successful, {failed} failed out of {total_rows} total"
         )
 
+        _schedule_audience_matching(db, created_jobs)
+
         return {
             "total_rows": total_rows,
             "successful": successful,
@@ -2223,6 +2366,7 @@ def download_upload_template(
     - Location: state
     - Other: querystring
     """
+    import pandas as pd
 
     # Define all column headers for the template
     columns = [
@@ -2457,7 +2601,7 @@ def get_job_by_id(
         "review_posted_at": job.review_posted_at,
         "job_cost": job.job_cost,
         "property_type": job.property_type,
-        "job_documents": job.job_documents,
+        "job_documents": files_with_data(job.job_documents),
         "job_group_id": job.job_group_id,
         "project_number": job.project_number,
         "project_type": job.project_type,
@@ -2515,6 +2659,7 @@ def repost_declined_job(
     job.job_review_status = "pending"
     job.decline_note = None  # Clear the decline note on repost
     db.add(job)
+    response_cache.invalidate_on_commit(db, "jobs")
     db.commit()
 
     return {
@@ -2580,59 +2725,17 @@ def unlock_job(
     subscriber.current_credits -= credit_cost
     subscriber.total_spending += credit_cost
 
-    # Create job snapshot with all important fields
-    job_snapshot = {
-        "id": job.id,
-        "permit_number": job.permit_number,
-        "permit_status": job.permit_status,
-        "permit_type_norm": job.permit_type_norm,
-        "project_description": job.project_description,
-        "project_cost_total": job.project_cost_total,
-        "source_system": job.source_system,
-        "contractor_name": job.contractor_name,
-        "contractor_company": job.contractor_company,
-        "contractor_email": job.contractor_email,
-        "contractor_phone": job.contractor_phone,
-        "audience_type_names": job.audience_type_names,
-        "review_posted_at": (
-            job.review_posted_at.isoformat() if job.review_posted_at else None
-        ),
-        "state": job.state,
-        "source_county": job.source_county,
-        "project_status": job.project_status,
-        "trs_score": job.trs_score,
-        "permit_type": job.permit_type,
-        "country_city": job.country_city,
-        "property_type": job.property_type,
-        "job_review_status": job.job_review_status,
-        "job_cost": job.job_cost,
-        "job_address": job.job_address,
-        "email": job.email,
-        "phone_number": job.phone_number,
-        "contact_name": job.contact_name,
-        "bid_date": (
-            job.bid_date.isoformat()
-            if hasattr(job, "bid_date") and job.bid_date
-            else None
-        ),
-        "created_at": job.created_at.isoformat() if job.created_at else None,
-        "project_number": job.project_number,
-        "project_type": job.project_type,
-        "owner_name": job.owner_name,
-        "applicant_name": job.applicant_name,
-        "applicant_email": job.applicant_email,
-        "applicant_phone": job.applicant_phone,
-    }
-
     # Create unlocked lead record with snapshot
     unlocked_lead = models.user.UnlockedLead(
         user_id=effective_user.id,
         job_id=job_id,
         credits_spent=credit_cost,
-        job_snapshot=job_snapshot,
+        job_snapshot=job_snapshot(job),
     )
 
     db.add(unlocked_lead)
+    # Retires the job in this transaction if a trade reaches the unlock threshold
+    record_unlock(db, job, effective_user.id)
     db.commit()
     db.refresh(subscriber)
 
@@ -2741,6 +2844,8 @@ def get_job_feed(
         user_type_list = [ut.strip() for ut in user_type.split(",") if ut.strip()]
     else:
         user_type_list = user_profile.user_type if user_profile.user_type else []
+    # Profiles may hold display names; feeds match on taxonomy slugs
+    user_type_list = trade_taxonomy.to_slugs(user_type_list)
 
     # State
     if state:
@@ -2885,8 +2990,33 @@ def get_job_feed(
     # Get total count
     total_count = base_query.count()
 
-    # Get all results ordered by TRS score for deduplication
-    all_jobs = base_query.order_by(models.user.Job.review_posted_at.desc()).all()
+    # Get all results ordered by TRS score for deduplication; only the columns
+    # returned below, not whole rows with their deferred detail columns
+    all_jobs = (
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_number,
+            models.user.Job.permit_status,
+            models.user.Job.permit_type_norm,
+            models.user.Job.project_description,
+            models.user.Job.project_cost_total,
+            models.user.Job.source_system,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_company,
+            models.user.Job.contractor_email,
+            models.user.Job.contractor_phone,
+            models.user.Job.audience_type_names,
+            models.user.Job.review_posted_at,
+            models.user.Job.state,
+            models.user.Job.source_county,
+            models.user.Job.project_status,
+            models.user.Job.trs_score,
+            models.user.Job.property_type,
+            models.user.Job.job_review_status,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
+        .all()
+    )
 
     # Deduplicate jobs by (permit_type_norm, project_description, contractor_name, contractor_email)
     seen_jobs = set()
@@ -3134,7 +3264,7 @@ def get_my_saved_job_feed(
     # User Type
     user_type_list = []
     if user_type:
-        user_type_list = [ut.strip() for ut in user_type.split(",") if ut.strip()]
+        user_type_list = trade_taxonomy.to_slugs(user_type.split(","))
 
     # Get list of saved job IDs for this user
     saved_job_ids = (
@@ -3437,7 +3567,9 @@ def get_all_my_jobs_desktop_search(
     elif effective_user.role == "Supplier":
         user_profile = db.query(models.user.Supplier).filter(models.user.Supplier.user_id == effective_user.id).first()
         
-    user_types = user_profile.user_type if user_profile and user_profile.user_type else []
+    user_types = trade_taxonomy.to_slugs(
+        user_profile.user_type if user_profile and user_profile.user_type else []
+    )
     if user_types:
         user_type_conditions = [
             models.user.Job.audience_type_slugs.ilike(f"%{ut}%") for ut in user_types
@@ -3659,13 +3791,21 @@ def view_job_details(
 
     Returns all job information (same as export) plus editable notes field.
     User must have unlocked this job to view details.
+    Retired jobs are served from jobs_archive.
     """
-    # Check if user has unlocked this job
+    # Check if user has unlocked this job (job_id is cleared when the job is
+    # archived, the snapshot keeps the id)
     unlocked_lead = (
         db.query(models.user.UnlockedLead)
         .filter(
             models.user.UnlockedLead.user_id == effective_user.id,
-            models.user.UnlockedLead.job_id == job_id,
+            or_(
+                models.user.UnlockedLead.job_id == job_id,
+                and_(
+                    models.user.UnlockedLead.job_id.is_(None),
+                    models.user.UnlockedLead.job_snapshot["id"].astext == str(job_id),
+                ),
+            ),
         )
         .first()
     )
@@ -3676,13 +3816,17 @@ def view_job_details(
             detail="You have not unlocked this job. Please unlock it first to view details.",
         )
 
-    # Get the job details - only posted jobs
+    # Get the job details - only posted jobs, or the archived copy of a retired one
     job = (
         db.query(models.user.Job)
         .filter(
             models.user.Job.id == job_id, models.user.Job.job_review_status == "posted"
         )
         .first()
+    ) or (
+        db.query(models.user.JobArchive)
+        .filter(models.user.JobArchive.id == job_id)
+        .first()
     )
 
     if not job:
@@ -3739,12 +3883,18 @@ def update_job_notes(
     Notes are stored in the unlocked_leads table.
     """
     require_main_or_editor_for_jobs(current_user)
-    # Check if user has unlocked this job
+    # Check if user has unlocked this job (also matches archived jobs by snapshot id)
     unlocked_lead = (
         db.query(models.user.UnlockedLead)
         .filter(
             models.user.UnlockedLead.user_id == effective_user.id,
-            models.user.UnlockedLead.job_id == job_id,
+            or_(
+                models.user.UnlockedLead.job_id == job_id,
+                and_(
+                    models.user.UnlockedLead.job_id.is_(None),
+                    models.user.UnlockedLead.job_snapshot["id"].astext == str(job_id),
+                ),
+            ),
         )
         .first()
     )
@@ -3876,31 +4026,21 @@ def upload_temp_documents(
                 detail=f"File type {file.content_type} not allowed. Only PDF, JPG, PNG are supported.",
             )
 
-        # Read file content
-        file_content = file.file.read()
-
-        # Validate file size
-        if len(file_content) > max_file_size:
+        # Stream the file into the blob store; the row keeps only a reference
+        try:
+            stored = store_file(
+                file.file, file.filename, file.content_type, max_bytes=max_file_size
+            )
+        except BlobTooLarge:
             raise HTTPException(
                 status_code=400, detail=f"File {file.filename} exceeds 10MB limit"
             )
 
-        # Convert to base64
-        file_base64 = base64.b64encode(file_content).decode("utf-8")
-
         # Generate unique document ID
         doc_id = f"DOC-{uuid.uuid4().hex[:12].upper()}"
 
         # Store document metadata
-        documents.append(
-            {
-                "document_id": doc_id,
-                "filename": file.filename,
-                "content_type": file.content_type,
-                "size": len(file_content),
-                "data": file_base64,
-            }
-        )
+        documents.append({"document_id": doc_id, **stored})
 
     # Check if reusing existing upload session
     if temp_upload_id:
@@ -3930,16 +4070,11 @@ def upload_temp_documents(
                 status_code=400, detail=f"Upload session {temp_upload_id} has expired"
             )
 
-        # Append new documents to existing ones
-        existing_documents = temp_doc.documents or []
-        existing_documents.extend(documents)
+        # Append new documents to existing ones (entries are small references,
+        # so rewriting the array is cheap)
+        existing_documents = (temp_doc.documents or []) + documents
         temp_doc.documents = existing_documents
 
-        # Flag the JSON column as modified (important for SQLAlchemy to detect change)
-        from sqlalchemy.orm.attributes import flag_modified
-
-        flag_modified(temp_doc, "documents")
-
         # Extend expiration time only if not linked to job
         if not temp_doc.linked_to_job:
             temp_doc.expires_at = now_est + timedelta(hours=1)
@@ -4091,9 +4226,9 @@ def get_temp_document_preview(
         )
 
         try:
-            # Decode base64 data
-            logger.debug(f"Decoding base64 data for {doc_id}")
-            file_data = base64.b64decode(doc["data"])
+            # From the blob store (or legacy base64)
+            logger.debug(f"Reading file data for {doc_id}")
+            file_data = file_bytes(doc)
             file_size = doc["size"]
             logger.debug(f"Decoded file size: {file_size} bytes")
 
@@ -4155,7 +4290,7 @@ def get_temp_document_preview(
                     )
                     logger.warning(f"Falling back to full PDF data for {filename}")
                     # Fallback: return full PDF data
-                    thumbnail_base64 = f"data:application/pdf;base64,{doc['data']}"
+                    thumbnail_base64 = f"data:application/pdf;base64,{base64.b64encode(file_data).decode('utf-8')}"
                     page_count = None
 
             # Handle images (JPG, PNG)
@@ -4406,7 +4541,7 @@ def get_my_job_feed(
     # User Type
     user_type_list = []
     if user_type:
-        user_type_list = [ut.strip() for ut in user_type.split(",") if ut.strip()]
+        user_type_list = trade_taxonomy.to_slugs(user_type.split(","))
 
     # Get list of unlocked job IDs for this user
     unlocked_job_ids = (
@@ -4631,6 +4766,7 @@ def get_all_jobs(
     user_type_list = []
     for item in user_types_raw:
         user_type_list.extend([ut.strip() for ut in item.split(",") if ut.strip()])
+    user_type_list = trade_taxonomy.to_slugs(user_type_list)
 
     # Build search conditions
     search_conditions = []
@@ -4677,8 +4813,33 @@ def get_all_jobs(
         ]
         base_query = base_query.filter(or_(*user_type_conditions))
 
-    # Get all results ordered by TRS score for deduplication
-    all_jobs = base_query.order_by(models.user.Job.review_posted_at.desc()).all()
+    # Get all results ordered by TRS score for deduplication; only the columns
+    # returned below, not whole rows with their deferred detail columns
+    all_jobs = (
+        base_query.with_entities(
+            models.user.Job.id,
+            models.user.Job.permit_number,
+            models.user.Job.permit_status,
+            models.user.Job.permit_type_norm,
+            models.user.Job.project_description,
+            models.user.Job.project_cost_total,
+            models.user.Job.source_system,
+            models.user.Job.contractor_name,
+            models.user.Job.contractor_company,
+            models.user.Job.contractor_email,
+            models.user.Job.contractor_phone,
+            models.user.Job.audience_type_names,
+            models.user.Job.review_posted_at,
+            models.user.Job.state,
+            models.user.Job.source_county,
+            models.user.Job.project_status,
+            models.user.Job.trs_score,
+            models.user.Job.property_type,
+            models.user.Job.job_review_status,
+        )
+        .order_by(models.user.Job.review_posted_at.desc())
+        .all()
+    )
 
     # Deduplicate jobs by (permit_type_norm, project_description, contractor_name, contractor_email)
     seen_jobs = set()
@@ -4806,7 +4967,9 @@ def search_saved_jobs(
     elif effective_user.role == "Supplier":
         user_profile = db.query(models.user.Supplier).filter(models.user.Supplier.user_id == effective_user.id).first()
         
-    user_types = user_profile.user_type if user_profile and user_profile.user_type else []
+    user_types = trade_taxonomy.to_slugs(
+        user_profile.user_type if user_profile and user_profile.user_type else []
+    )
 
     # Build search query - keyword matches any field (case-insensitive)
     search_pattern = f"%{keyword.lower()}%"
@@ -4981,7 +5144,9 @@ def search_my_jobs(
     elif effective_user.role == "Supplier":
         user_profile = db.query(models.user.Supplier).filter(models.user.Supplier.user_id == effective_user.id).first()
         
-    user_types = user_profile.user_type if user_profile and user_profile.user_type else []
+    user_types = trade_taxonomy.to_slugs(
+        user_profile.user_type if user_profile and user_profile.user_type else []
+    )
 
     # Build search query - keyword matches any field (case-insensitive)
     search_pattern = f"%{keyword.lower()}%"
@@ -5220,7 +5385,9 @@ def search_jobs(
         base_query = base_query.filter(or_(*city_conditions))
         
     # Filter by user types
-    user_types = user_profile.user_type if user_profile and user_profile.user_type else []
+    user_types = trade_taxonomy.to_slugs(
+        user_profile.user_type if user_profile and user_profile.user_type else []
+    )
     if user_types:
         user_type_conditions = [
             models.user.Job.audience_type_slugs.ilike(f"%{ut}%") for ut in user_types
@@ -5390,86 +5557,81 @@ def get_my_unlocked_leads(
 
 @router.get("/export-unlocked-leads")
 def export_unlocked_leads(
+    export_format: str = Query("xlsx", alias="format", description="xlsx or csv"),
     current_user: models.user.User = Depends(get_current_user),
     effective_user: models.user.User = Depends(get_effective_user),
     db: Session = Depends(get_db),
 ):
-    """Export all unlocked leads to Excel file."""
-    # Get all unlocked leads with job details - only posted jobs
-    all_unlocked_leads = (
-        db.query(models.user.UnlockedLead, models.user.Job)
+    """Export all unlocked leads to an Excel (default) or CSV file, streamed."""
+    export_format = check_export_format(export_format)
+
+    # Leads count once per job details: the most recent unlock of each
+    # (permit type, description prefix, contractor name, contractor email).
+    # Deduplicated in SQL (DISTINCT ON) so nothing accumulates per row here.
+    def normalized(column):
+        # lower().strip() of the value, None as ""
+        return func.btrim(func.lower(func.coalesce(column, "")), " \t\n\r\f\v")
+
+    dedupe_key = (
+        normalized(models.user.Job.permit_type_norm),
+        func.left(normalized(models.user.Job.project_description), 200),
+        normalized(models.user.Job.contractor_name),
+        normalized(models.user.Job.contractor_email),
+    )
+    latest_per_job = (
+        db.query(models.user.UnlockedLead.id.label("lead_id"))
         .join(models.user.Job, models.user.UnlockedLead.job_id == models.user.Job.id)
         .filter(
             models.user.UnlockedLead.user_id == effective_user.id,
             models.user.Job.job_review_status == "posted",
         )
-        .order_by(models.user.UnlockedLead.unlocked_at.desc())
-        .all()
+        .distinct(*dedupe_key)
+        .order_by(*dedupe_key, models.user.UnlockedLead.unlocked_at.desc())
+        .subquery()
     )
 
-    # Deduplicate leads by job details
-    seen_jobs = set()
-    deduplicated_leads = []
-
-    for lead, job in all_unlocked_leads:
-        job_key = (
-            (job.permit_type_norm or "").lower().strip(),
-            (job.project_description or "").lower().strip()[:200],
-            (job.contractor_name or "").lower().strip(),
-            (job.contractor_email or "").lower().strip(),
-        )
-
-        if job_key not in seen_jobs:
-            seen_jobs.add(job_key)
-            deduplicated_leads.append((lead, job))
+    # Job's permit_type/job_cost/... are Python aliases; select the columns
+    columns = [
+        ("Permit Number", models.user.Job.permit_number),
+        ("Permit Type", models.user.Job.permit_type_norm),
+        # audience_type_names is the human-readable form
+        ("Permit Type Normalized", models.user.Job.audience_type_names),
+        ("Permit Status", models.user.Job.permit_status),
+        ("Job Cost", models.user.Job.project_cost_total),
+        ("Job Address", models.user.Job.job_address),
+        ("Country/City", models.user.Job.source_county),
+        ("State", models.user.Job.state),
+        ("Project Description", models.user.Job.project_description),
+        ("Project Cost Total", models.user.Job.project_cost_total),
+        ("Property Type", models.user.Job.property_type),
+        ("Job Review Status", models.user.Job.job_review_status),
+        ("Email", models.user.Job.contractor_email),
+        ("Phone Number", models.user.Job.contractor_phone),
+        ("Contractor Email", models.user.Job.contractor_email),
+        ("Contractor Phone", models.user.Job.contractor_phone),
+        ("Applicant Email", models.user.Job.applicant_email),
+        ("Applicant Phone", models.user.Job.applicant_phone),
+        ("Notes", models.user.UnlockedLead.notes),
+    ]
+    # Server-side cursor, 1000 rows per fetch
+    rows = (
+        db.query(*(column for _, column in columns))
+        .select_from(models.user.UnlockedLead)
+        .join(models.user.Job, models.user.UnlockedLead.job_id == models.user.Job.id)
+        .join(latest_per_job, latest_per_job.c.lead_id == models.user.UnlockedLead.id)
+        .order_by(models.user.UnlockedLead.unlocked_at.desc())
+        .yield_per(1000)
+    )
 
     logger.info(
-        f"/export-unlocked-leads: {len(all_unlocked_leads)} leads → {len(deduplicated_leads)} unique ({len(all_unlocked_leads) - len(deduplicated_leads)} duplicates removed)"
+        f"/export-unlocked-leads: streaming {export_format} for user {effective_user.id}"
     )
-
-    # Create DataFrame from deduplicated leads
-    data = []
-    for lead, job in deduplicated_leads:
-        data.append(
-            {
-                "Permit Number": job.permit_number,
-                "Permit Type": job.permit_type,
-                "Permit Type Normalized": job.audience_type_names,  # Use audience_type_names for human-readable format
-                "Permit Status": job.permit_status,
-                "Job Cost": job.job_cost,
-                "Job Address": job.job_address,
-                "Country/City": job.country_city,
-                "State": job.state,
-                "Project Description": job.project_description,
-                "Project Cost Total": job.project_cost_total,
-                "Property Type": job.property_type,
-                "Job Review Status": job.job_review_status,
-                "Email": job.email,
-                "Phone Number": job.phone_number,
-                "Contractor Email": job.contractor_email,
-                "Contractor Phone": job.contractor_phone,
-                "Applicant Email": job.applicant_email,
-                "Applicant Phone": job.applicant_phone,
-                "Notes": lead.notes,
-            }
-        )
-
-    df = pd.DataFrame(data)
-
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Unlocked Leads")
-
-    output.seek(0)
-    content = output.getvalue()
-    return Response(
-        content=content,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=unlocked_leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            "Content-Length": str(len(content)),
-        },
+    return export_response(
+        export_format,
+        f"unlocked_leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        "Unlocked Leads",
+        [title for title, _ in columns],
+        rows,
     )
 
 
@@ -1,15 +1,18 @@
+import asyncio
 import os
 import secrets
 from datetime import datetime, timedelta
 from typing import List
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from sqlalchemy.orm import Session
 
 from src.app import models, schemas
 from src.app.api.deps import get_current_user, get_effective_user
 from src.app.core.database import get_db
+from src.app.services.blob_store import BlobTooLarge, blob_store
 from src.app.utils.email_team_invitation_resend import send_team_invitation_email_resend
+from src.app.utils.stored_files import blob_response, has_profile_picture
 from src.app.utils.team_helpers import get_effective_user_id, is_main_account
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
@@ -741,7 +744,7 @@ async def upload_profile_picture(
     """
     Upload or update user's profile picture.
 
-    Stores the image as binary data in the database (works on Vercel).
+    Stores the image in the blob store.
     Supported formats: jpg, jpeg, png, gif, webp
     Max file size: 5MB
     """
@@ -752,18 +755,17 @@ async def upload_profile_picture(
             detail=f"Invalid file format. Allowed formats: {', '.join(ALLOWED_CONTENT_TYPES.values())}",
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
+    # Stream into the blob store, validating the size as it is read
+    try:
+        stored = await asyncio.to_thread(blob_store.put, file.file, MAX_FILE_SIZE)
+    except BlobTooLarge:
         raise HTTPException(
             status_code=400,
             detail=f"File size exceeds maximum limit of {MAX_FILE_SIZE / (1024 * 1024)}MB",
         )
 
-    # Store binary data in database
-    current_user.profile_picture_data = content
+    current_user.profile_picture_blob = stored.sha256
+    current_user.profile_picture_data = None
     current_user.profile_picture_content_type = file.content_type
     db.add(current_user)
     db.commit()
@@ -771,12 +773,13 @@ async def upload_profile_picture(
     return {
         "message": "Profile picture uploaded successfully",
         "content_type": file.content_type,
-        "size": len(content),
+        "size": stored.size,
     }
 
 
 @router.get("/picture")
 async def get_profile_picture(
+    request: Request,
     current_user: models.user.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -785,6 +788,10 @@ async def get_profile_picture(
     Returns 404 if the user has not uploaded their own picture.
     Viewers and editors each have their own independent picture.
     """
+    media_type = current_user.profile_picture_content_type or "image/jpeg"
+    if current_user.profile_picture_blob:
+        return blob_response(request, current_user.profile_picture_blob, media_type)
+
     if not current_user.profile_picture_data:
         raise HTTPException(status_code=404, detail="No profile picture found")
 
@@ -792,7 +799,7 @@ async def get_profile_picture(
 
     return Response(
         content=current_user.profile_picture_data,
-        media_type=current_user.profile_picture_content_type or "image/jpeg",
+        media_type=media_type,
     )
 
 
@@ -804,12 +811,13 @@ async def delete_profile_picture(
     """
     Delete the authenticated user's profile picture.
 
-    Removes the binary data from the database.
+    Removes the picture reference (and any legacy binary data).
     """
-    if not current_user.profile_picture_data:
+    if not has_profile_picture(current_user):
         raise HTTPException(status_code=404, detail="No profile picture found")
 
     # Clear profile picture data
+    current_user.profile_picture_blob = None
     current_user.profile_picture_data = None
     current_user.profile_picture_content_type = None
     db.add(current_user)
@@ -7,7 +7,6 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 
 import requests
-import stripe
 from dotenv import load_dotenv
 from fastapi import (
     APIRouter,
@@ -45,8 +44,13 @@ def admin_required(current_user=Depends(get_current_user)):
 
 
 from src.app.core.database import get_db
+from src.app.core.response_cache import response_cache
+from src.app.utils.lazy_import import lazy_import
 from src.app.utils.team_helpers import get_effective_user_id
 
+# Loaded on first use (slow import, only needed by the billing endpoints)
+stripe = lazy_import("stripe")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -539,6 +543,9 @@ async def stripe_webhook(
         f"Received Stripe webhook event: {event.get('type')} id={event.get('id')}"
     )
 
+    # Subscription / payment changes: drop cached admin views as handlers commit
+    response_cache.invalidate_on_commit(db, "subscriptions", "users")
+
     # Handle different event types inside a safe try/except so we log full stacktraces
     try:
         if event["type"] == "checkout.session.completed":
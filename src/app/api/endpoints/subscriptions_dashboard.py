@@ -2,7 +2,6 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-import stripe
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import String, case, func, or_
@@ -12,6 +11,10 @@ from src.app import models, schemas
 from src.app.api.deps import require_admin_or_billing, require_admin_token
 from src.app.api.endpoints.subscription import _update_all_tiers_pricing_impl
 from src.app.core.database import get_db
+from src.app.core.response_cache import response_cache
+from src.app.utils.lazy_import import lazy_import
+
+stripe = lazy_import("stripe")
 
 router = APIRouter(prefix="/admin/subscriptions", tags=["Admin - Subscriptions"])
 
@@ -95,6 +98,47 @@ def subscriptions_dashboard(
     - Monthly Cancellations
     - Average Lifetime Value
     """
+    filters = {
+        "subscription_status": subscription_status,
+        "plan_tier": plan_tier,
+        "credits_min": credits_min,
+        "credits_max": credits_max,
+        "spending_min": spending_min,
+        "spending_max": spending_max,
+        "renewal_quick_filter": renewal_quick_filter,
+        "renewal_from": renewal_from,
+        "renewal_to": renewal_to,
+        "user_role": user_role,
+        "audience_type": audience_type,
+        "page": page,
+        "per_page": per_page,
+    }
+    return response_cache.get(
+        "admin.subscriptions.dashboard",
+        filters,
+        lambda session: _subscriptions_dashboard(session, **filters),
+        db,
+        tags=("users", "subscriptions"),
+    )
+
+
+def _subscriptions_dashboard(
+    db: Session,
+    subscription_status: Optional[str],
+    plan_tier: Optional[str],
+    credits_min: Optional[int],
+    credits_max: Optional[int],
+    spending_min: Optional[int],
+    spending_max: Optional[int],
+    renewal_quick_filter: Optional[str],
+    renewal_from: Optional[str],
+    renewal_to: Optional[str],
+    user_role: Optional[str],
+    audience_type: Optional[str],
+    page: int,
+    per_page: int,
+):
+    """``subscriptions_dashboard`` without the response cache."""
 
     # ========================================================================
     # Helper Functions
@@ -117,70 +161,92 @@ def subscriptions_dashboard(
     # KPI Calculations
     # ========================================================================
 
-    # 1. Active Subscriptions (is_active = True)
-    active_subscriptions = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Active subscriptions 30 days ago (for comparison)
-    active_subscriptions_30d_ago = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-            models.user.Subscriber.subscription_start_date <= thirty_days_ago,
-        )
-        .scalar()
-        or 0
+    # All KPIs come from one pass over the approved users' subscribers; each
+    # KPI and its comparison value is a COUNT/SUM/AVG ... FILTER aggregate
+    is_active = models.user.Subscriber.is_active == True
+    started_30d_ago = models.user.Subscriber.subscription_start_date <= thirty_days_ago
+    started_60d_ago = models.user.Subscriber.subscription_start_date <= sixty_days_ago
+    canceled = models.user.Subscriber.subscription_status == "canceled"
+    trial_used = models.user.Subscriber.trial_credits_used == True
+    past_due_status = models.user.Subscriber.subscription_status == "past_due"
+    joined_30d_ago = models.user.User.created_at <= thirty_days_ago
+    plan_price = case(
+        (models.user.Subscription.name == "Starter", 49.99),
+        (models.user.Subscription.name == "Professional", 99.99),
+        (models.user.Subscription.name == "Enterprise", 199.99),
+        else_=0,
     )
 
-    # 2. MRR (Monthly Recurring Revenue) - Calculate from active subscriptions
-    # For active subscriptions, get their plan prices
-    mrr_result = (
+    kpis = (
         db.query(
-            func.sum(
-                case(
-                    (models.user.Subscription.name == "Starter", 49.99),
-                    (models.user.Subscription.name == "Professional", 99.99),
-                    (models.user.Subscription.name == "Enterprise", 199.99),
-                    else_=0,
-                )
+            # 1. Active Subscriptions (is_active = True), now and 30 days ago
+            func.count(models.user.Subscriber.id)
+            .filter(is_active)
+            .label("active_subscriptions"),
+            func.count(models.user.Subscriber.id)
+            .filter(is_active, started_30d_ago)
+            .label("active_subscriptions_30d_ago"),
+            # 2. MRR (Monthly Recurring Revenue) - plan prices of active
+            # subscriptions, now and 30 days ago
+            func.sum(plan_price).filter(is_active).label("mrr"),
+            func.sum(plan_price)
+            .filter(is_active, started_30d_ago)
+            .label("mrr_30d_ago"),
+            # 3. Churn Rate: subscriptions canceled in last 30 days (using
+            # frozen_at field) and 60-30 days ago, against those active then
+            func.count(models.user.Subscriber.id)
+            .filter(
+                canceled,
+                models.user.Subscriber.frozen_at >= thirty_days_ago,
+                models.user.Subscriber.frozen_at <= today,
             )
-        )
-        .select_from(models.user.Subscriber)
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .outerjoin(
-            models.user.Subscription,
-            models.user.Subscriber.subscription_id == models.user.Subscription.id,
-        )
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-    mrr = round(float(mrr_result), 2)
-
-    # MRR 30 days ago (for comparison)
-    mrr_30d_ago_result = (
-        db.query(
-            func.sum(
-                case(
-                    (models.user.Subscription.name == "Starter", 49.99),
-                    (models.user.Subscription.name == "Professional", 99.99),
-                    (models.user.Subscription.name == "Enterprise", 199.99),
-                    else_=0,
-                )
+            .label("churned_last_30_days"),
+            func.count(models.user.Subscriber.id)
+            .filter(
+                canceled,
+                models.user.Subscriber.frozen_at >= sixty_days_ago,
+                models.user.Subscriber.frozen_at < thirty_days_ago,
+            )
+            .label("churned_60_30_days"),
+            func.count(models.user.Subscriber.id)
+            .filter(is_active, started_60d_ago)
+            .label("active_60d_ago"),
+            # 4. Trial Conversion (users who activated subscription after trial
+            # period), and the same for users who converted 60-90 days ago
+            func.count(models.user.Subscriber.id)
+            .filter(trial_used, is_active)
+            .label("trial_conversions"),
+            func.count(models.user.Subscriber.id)
+            .filter(trial_used)
+            .label("total_trial_users"),
+            func.count(models.user.Subscriber.id)
+            .filter(
+                trial_used,
+                is_active,
+                started_60d_ago,
+                models.user.Subscriber.subscription_start_date > ninety_days_ago,
             )
+            .label("trial_conversions_prev"),
+            func.count(models.user.Subscriber.id)
+            .filter(trial_used, started_60d_ago)
+            .label("total_trial_users_prev"),
+            # 5. Average Credits (average current_credits for all approved users)
+            func.avg(models.user.Subscriber.current_credits).label("avg_credits"),
+            func.avg(models.user.Subscriber.current_credits)
+            .filter(joined_30d_ago)
+            .label("avg_credits_prev"),
+            # 6. Past Due (subscription_status = 'past_due')
+            func.count(models.user.Subscriber.id)
+            .filter(past_due_status)
+            .label("past_due"),
+            func.count(models.user.Subscriber.id)
+            .filter(past_due_status, joined_30d_ago)
+            .label("past_due_prev"),
+            # 8. Average Lifetime Value (average total_spending)
+            func.avg(models.user.Subscriber.total_spending).label("avg_ltv"),
+            func.avg(models.user.Subscriber.total_spending)
+            .filter(joined_30d_ago)
+            .label("avg_ltv_prev"),
         )
         .select_from(models.user.Subscriber)
         .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
@@ -188,31 +254,17 @@ def subscriptions_dashboard(
             models.user.Subscription,
             models.user.Subscriber.subscription_id == models.user.Subscription.id,
         )
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-            models.user.Subscriber.subscription_start_date <= thirty_days_ago,
-        )
-        .scalar()
-        or 0
+        .filter(models.user.User.approved_by_admin == "approved")
+        .one()
     )
-    mrr_30d_ago = round(float(mrr_30d_ago_result), 2)
 
-    # 3. Churn Rate (cancelled in last 30 days / active at start of period)
-    # Count subscriptions that were canceled in last 30 days (using frozen_at field)
-    churned_last_30_days = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "canceled",
-            models.user.Subscriber.frozen_at >= thirty_days_ago,
-            models.user.Subscriber.frozen_at <= today,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
+    active_subscriptions = kpis.active_subscriptions
+    active_subscriptions_30d_ago = kpis.active_subscriptions_30d_ago
+
+    mrr = round(float(kpis.mrr or 0), 2)
+    mrr_30d_ago = round(float(kpis.mrr_30d_ago or 0), 2)
 
+    churned_last_30_days = kpis.churned_last_30_days
     # Total active at start of period (30 days ago)
     active_at_start = active_subscriptions_30d_ago
     churn_rate = (
@@ -221,180 +273,44 @@ def subscriptions_dashboard(
         else 0
     )
 
-    # Churn rate 60-30 days ago (for comparison)
-    churned_60_30_days = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "canceled",
-            models.user.Subscriber.frozen_at >= sixty_days_ago,
-            models.user.Subscriber.frozen_at < thirty_days_ago,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    active_60d_ago = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-            models.user.Subscriber.subscription_start_date <= sixty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
+    churned_60_30_days = kpis.churned_60_30_days
+    active_60d_ago = kpis.active_60d_ago
     churn_rate_prev = (
         round((churned_60_30_days / active_60d_ago * 100), 1)
         if active_60d_ago > 0
         else 0
     )
 
-    # 4. Trial Conversion (users who activated subscription after trial period)
-    # Count users who have trial_credits_used = True and is_active = True
-    trial_conversions = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    # Total users who used trial
-    total_trial_users = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
+    trial_conversions = kpis.trial_conversions
+    total_trial_users = kpis.total_trial_users
     trial_conversion_rate = (
         round((trial_conversions / total_trial_users * 100), 1)
         if total_trial_users > 0
         else 0
     )
 
-    # Previous period trial conversion (users who converted 30-60 days ago)
-    trial_conversions_prev = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.Subscriber.is_active == True,
-            models.user.User.approved_by_admin == "approved",
-            models.user.Subscriber.subscription_start_date <= sixty_days_ago,
-            models.user.Subscriber.subscription_start_date > ninety_days_ago,
-        )
-        .scalar()
-        or 0
-    )
-
-    total_trial_users_prev = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.trial_credits_used == True,
-            models.user.User.approved_by_admin == "approved",
-            models.user.Subscriber.subscription_start_date <= sixty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
-
+    trial_conversions_prev = kpis.trial_conversions_prev
+    total_trial_users_prev = kpis.total_trial_users_prev
     trial_conversion_rate_prev = (
         round((trial_conversions_prev / total_trial_users_prev * 100), 1)
         if total_trial_users_prev > 0
         else 0
     )
 
-    # 5. Average Credits (average current_credits for all approved users)
-    avg_credits_result = (
-        db.query(func.avg(models.user.Subscriber.current_credits))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-    avg_credits = round(float(avg_credits_result), 1) if avg_credits_result else 0
-
-    # Previous period
-    avg_credits_prev_result = (
-        db.query(func.avg(models.user.Subscriber.current_credits))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.approved_by_admin == "approved",
-            models.user.User.created_at <= thirty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
+    avg_credits = round(float(kpis.avg_credits), 1) if kpis.avg_credits else 0
     avg_credits_prev = (
-        round(float(avg_credits_prev_result), 1) if avg_credits_prev_result else 0
+        round(float(kpis.avg_credits_prev), 1) if kpis.avg_credits_prev else 0
     )
 
-    # 6. Past Due (subscription_status = 'past_due')
-    past_due = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "past_due",
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-
-    past_due_prev = (
-        db.query(func.count(models.user.Subscriber.id))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.Subscriber.subscription_status == "past_due",
-            models.user.User.approved_by_admin == "approved",
-            models.user.User.created_at <= thirty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
+    past_due = kpis.past_due
+    past_due_prev = kpis.past_due_prev
 
     # 7. Cancellation Monthly (cancelled in last 30 days)
     cancellations_monthly = churned_last_30_days
     cancellations_prev_month = churned_60_30_days
 
-    # 8. Average Lifetime Value (average total_spending)
-    avg_ltv_result = (
-        db.query(func.avg(models.user.Subscriber.total_spending))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.approved_by_admin == "approved",
-        )
-        .scalar()
-        or 0
-    )
-    avg_ltv = round(float(avg_ltv_result), 2) if avg_ltv_result else 0
-
-    avg_ltv_prev_result = (
-        db.query(func.avg(models.user.Subscriber.total_spending))
-        .join(models.user.User, models.user.Subscriber.user_id == models.user.User.id)
-        .filter(
-            models.user.User.approved_by_admin == "approved",
-            models.user.User.created_at <= thirty_days_ago,
-        )
-        .scalar()
-        or 0
-    )
-    avg_ltv_prev = round(float(avg_ltv_prev_result), 2) if avg_ltv_prev_result else 0
+    avg_ltv = round(float(kpis.avg_ltv), 2) if kpis.avg_ltv else 0
+    avg_ltv_prev = round(float(kpis.avg_ltv_prev), 2) if kpis.avg_ltv_prev else 0
 
     # ========================================================================
     # Build Base Query for Data Table
@@ -1,4 +1,4 @@
-import base64
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -16,10 +16,12 @@ from src.app.api.deps import (
 )
 from src.app.api.endpoints.auth import hash_password, verify_password
 from src.app.core.database import get_db
+from src.app.services.blob_store import BlobTooLarge
 from src.app.utils.email import (
     send_registration_completion_email,
     send_admin_new_registration_notification,
 )
+from src.app.utils.stored_files import store_file, with_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -965,20 +967,21 @@ async def update_supplier_license_info(
                     status_code=400, detail=f"Invalid file type for {file_type}"
                 )
 
-            contents = await file.read()
-            if len(contents) > MAX_FILE_SIZE:
+            # Stream into the blob store off the event loop
+            try:
+                stored = await asyncio.to_thread(
+                    store_file,
+                    file.file,
+                    file.filename,
+                    file.content_type or "image/jpeg",
+                    MAX_FILE_SIZE,
+                )
+            except BlobTooLarge:
                 raise HTTPException(
                     status_code=400, detail=f"{file_type} file too large"
                 )
 
-            result.append(
-                {
-                    "filename": file.filename,
-                    "content_type": file.content_type or "image/jpeg",
-                    "data": base64.b64encode(contents).decode("utf-8"),
-                    "size": len(contents),
-                }
-            )
+            result.append(stored)
 
         return result
 
@@ -1302,7 +1305,7 @@ def preview_supplier_documents(
 
                 filename = file_data.get("filename", f"document_{index}")
                 content_type = file_data.get("content_type", "application/octet-stream")
-                base64_data = file_data.get("data", "")
+                base64_data = with_data(file_data).get("data")
                 size = file_data.get("size", 0)
 
                 if base64_data:
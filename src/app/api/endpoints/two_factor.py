@@ -32,7 +32,6 @@ from src.app.utils.two_factor import (
     verify_2fa_code,
     verify_backup_code,
 )
-import qrcode
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -99,6 +98,8 @@ def setup_2fa(
     Frontend usage:
     <img src="/auth/2fa/setup" />
     """
+    import qrcode
+
     # Check if 2FA is already enabled
     if current_user.two_factor_enabled:
         raise HTTPException(
@@ -0,0 +1,212 @@
+"""
+Schema Migrations
+
+``Base.metadata.create_all`` only creates missing tables; changes to existing
+tables are listed here as numbered steps and applied once, at startup, by
+``run_migrations``. Applied versions are recorded in ``schema_migrations`` so
+request handlers never have to run DDL or probe the catalog to find out
+whether a column is there (see core/schema_capabilities.py).
+
+Rules for new steps:
+
+- append with the next version number; never edit or reorder applied steps,
+- keep statements idempotent (``IF NOT EXISTS``): a step interrupted halfway
+  is re-run on the next start, and older deployments may have applied the
+  change by hand,
+- ``CREATE INDEX CONCURRENTLY`` cannot run in a transaction; put such
+  statements in a step with ``transactional=False``. An interrupted build
+  leaves an INVALID index that ``IF NOT EXISTS`` would then skip, so
+  ``_apply`` drops an invalid index of the same name before each of them.
+
+Several app instances starting together serialize on an advisory lock; the
+ones that wait find the steps already recorded.
+"""
+
+import logging
+import re
+import time
+from typing import NamedTuple, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("uvicorn.error")
+
+# pg_advisory_lock key shared by all instances ("tl_migr")
+_LOCK_KEY = 0x746C5F6D696772
+_LOCK_TIMEOUT_SECONDS = 300
+
+_CREATE_INDEX_CONCURRENTLY = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)",
+    re.IGNORECASE,
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+    transactional: bool = True
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "jobs.decline_note",
+        ("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS decline_note TEXT",),
+    ),
+    Migration(
+        2,
+        "admin_users verification, reset, logout and role columns",
+        (
+            # Larger than the ORM column so URL-safe reset tokens fit
+            "ALTER TABLE admin_users "
+            "ADD COLUMN IF NOT EXISTS verification_code VARCHAR(255), "
+            "ADD COLUMN IF NOT EXISTS code_expires_at TIMESTAMP NULL, "
+            "ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255) NULL, "
+            "ADD COLUMN IF NOT EXISTS reset_token VARCHAR(255) NULL, "
+            "ADD COLUMN IF NOT EXISTS reset_token_expires_at TIMESTAMP NULL, "
+            "ADD COLUMN IF NOT EXISTS last_logout_at TIMESTAMP NULL, "
+            "ADD COLUMN IF NOT EXISTS role VARCHAR(50) NULL",
+        ),
+    ),
+    Migration(
+        3,
+        "jobs indexes for the stale purge, posted feed and created_at ranges",
+        (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_jobs_stale_purge_review_posted_at ON jobs (review_posted_at) "
+            "WHERE job_review_status = 'posted' AND uploaded_by_contractor = false",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_posted_review_posted_at "
+            "ON jobs (review_posted_at) WHERE job_review_status = 'posted'",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_created_at "
+            "ON jobs (created_at)",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        4,
+        "profile picture blob store references",
+        (
+            "ALTER TABLE users "
+            "ADD COLUMN IF NOT EXISTS profile_picture_blob VARCHAR(64) NULL",
+            "ALTER TABLE admin_users "
+            "ADD COLUMN IF NOT EXISTS profile_picture_blob VARCHAR(64) NULL",
+        ),
+    ),
+    Migration(
+        5,
+        "push_subscriptions.last_job_push_at",
+        (
+            "ALTER TABLE push_subscriptions "
+            "ADD COLUMN IF NOT EXISTS last_job_push_at TIMESTAMP NULL",
+        ),
+    ),
+    Migration(
+        6,
+        "jobs index for approved jobs awaiting posting",
+        (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_approved_pending "
+            "ON jobs (review_posted_at) "
+            "WHERE job_review_status = 'pending' AND uploaded_by_contractor = false",
+        ),
+        transactional=False,
+    ),
+)
+
+
+def _acquire_lock(conn) -> bool:
+    # Polled rather than blocking: a backend blocked in pg_advisory_lock holds
+    # a snapshot, which CREATE INDEX CONCURRENTLY in the holder would wait on
+    deadline = time.monotonic() + _LOCK_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY}
+        ).scalar():
+            return True
+        time.sleep(1)
+    return False
+
+
+def _drop_invalid_index(conn, name: str):
+    # Left behind by an interrupted CREATE INDEX CONCURRENTLY; other instances
+    # cannot be building it, they wait for the migration lock
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid) "
+            "AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid is not None:
+        logger.warning(f"[Migrations] Dropping invalid index {name} to rebuild it")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def _apply(engine: Engine, conn, migration: Migration):
+    record = text(
+        "INSERT INTO schema_migrations (version, description) "
+        "VALUES (:version, :description) ON CONFLICT (version) DO NOTHING"
+    )
+    params = {"version": migration.version, "description": migration.description}
+    if migration.transactional:
+        # Statements and the record commit together
+        with engine.begin() as tx:
+            for statement in migration.statements:
+                tx.execute(text(statement))
+            tx.execute(record, params)
+    else:
+        # On the (autocommit) lock connection, one statement at a time
+        for statement in migration.statements:
+            index = _CREATE_INDEX_CONCURRENTLY.search(statement)
+            if index is not None:
+                _drop_invalid_index(conn, index.group(1))
+            conn.execute(text(statement))
+        conn.execute(record, params)
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply pending ``MIGRATIONS`` in order; returns how many were applied.
+
+    Stops at the first failing step (later steps may depend on it) and logs
+    it; the step is retried on the next start.
+    """
+    applied = 0
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version INTEGER PRIMARY KEY, "
+                "description TEXT NOT NULL, "
+                "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+            )
+        )
+        if not _acquire_lock(conn):
+            logger.error("[Migrations] Timed out waiting for another instance")
+            return 0
+        try:
+            done = set(
+                conn.execute(text("SELECT version FROM schema_migrations")).scalars()
+            )
+            for migration in MIGRATIONS:
+                if migration.version in done:
+                    continue
+                started = time.perf_counter()
+                try:
+                    _apply(engine, conn, migration)
+                except Exception as e:
+                    logger.error(
+                        f"[Migrations] {migration.version} "
+                        f"({migration.description}) failed: {str(e)}"
+                    )
+                    break
+                applied += 1
+                logger.info(
+                    f"[Migrations] Applied {migration.version} "
+                    f"({migration.description}) in "
+                    f"{time.perf_counter() - started:.1f}s"
+                )
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+    return applied
@@ -0,0 +1,167 @@
+"""
+Query Fan-out
+
+Admin dashboards compute a dozen or more independent aggregates per request.
+``QueryFanout`` runs them concurrently, each on its own pooled connection in a
+read-only transaction, instead of one after another on the request session:
+
+    results = query_fanout.scalars({
+        "active": db.query(func.count(Subscriber.id)).filter(...),
+        "past_due": db.query(func.count(Subscriber.id)).filter(...),
+    })
+
+``scalars`` and ``rows`` take ORM queries (built on any session; they are
+re-bound with ``Query.with_session``) and ``run`` takes callables that
+receive a session.
+
+Concurrency is bounded twice so a burst of dashboard requests cannot drain
+the engine pool: a shared worker pool sized to half of ``engine.pool`` and a
+per-request cap (``QUERY_FANOUT_MAX_CONCURRENCY``). With a cap of 1 the
+queries run sequentially on the caller's session, i.e. the old behaviour.
+
+The queries do not share a snapshot; that is fine for dashboard counts but
+not for reads that must be mutually consistent.
+"""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Query, Session, sessionmaker
+
+from src.app.core.database import engine
+
+logger = logging.getLogger("uvicorn.error")
+
+ReadonlySessionLocal = sessionmaker(
+    bind=engine.execution_options(postgresql_readonly=True),
+    autoflush=False,
+    autocommit=False,
+)
+
+
+def _pool_workers() -> int:
+    """Half of the engine's steady-state pool; the rest stays for requests."""
+    try:
+        return max(1, engine.pool.size() // 2)
+    except AttributeError:
+        # Pools without a fixed size (NullPool, StaticPool)
+        return 4
+
+
+class QueryFanout:
+    """Runs independent read-only queries concurrently on pooled connections."""
+
+    def __init__(self, max_workers: int, max_concurrency: int = 4):
+        """
+        Args:
+            max_workers: Connections used by fan-out across all requests
+            max_concurrency: Connections used by a single ``run`` call
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_concurrency = max(1, min(max_concurrency, self.max_workers))
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="query-fanout"
+            )
+        return self._executor
+
+    @staticmethod
+    def _run_one(func: Callable[[Session], Any]) -> Any:
+        session: Session = ReadonlySessionLocal()
+        try:
+            return func(session)
+        finally:
+            session.rollback()
+            session.close()
+
+    def run(
+        self,
+        queries: Dict[str, Callable[[Session], Any]],
+        db: Optional[Session] = None,
+    ) -> Dict[str, Any]:
+        """Call each ``func(session)`` and return the results by name.
+
+        At most ``max_concurrency`` queries are in flight; the first error is
+        re-raised once the queries already running have finished, and the
+        remaining ones are not started.
+        """
+        if self.max_concurrency == 1 or len(queries) < 2:
+            if db is not None:
+                return {name: func(db) for name, func in queries.items()}
+            return {name: self._run_one(func) for name, func in queries.items()}
+
+        executor = self._get_executor()
+        pending_items = iter(queries.items())
+        in_flight = {}
+        results = {}
+        error = None
+
+        def submit_next() -> bool:
+            item = next(pending_items, None)
+            if item is None:
+                return False
+            name, func = item
+            in_flight[executor.submit(self._run_one, func)] = name
+            return True
+
+        for _ in range(self.max_concurrency):
+            if not submit_next():
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = in_flight.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        logger.error(f"[Query Fan-out] Query '{name}' failed: {str(e)}")
+                        error = e
+                if error is None:
+                    submit_next()
+
+        if error is not None:
+            raise error
+        return {name: results[name] for name in queries}
+
+    def scalars(
+        self, queries: Dict[str, Query], db: Optional[Session] = None
+    ) -> Dict[str, Any]:
+        """Run ORM queries with ``.scalar()``; ``None`` results become 0."""
+        return self.run(
+            {
+                name: (lambda session, q=query: q.with_session(session).scalar() or 0)
+                for name, query in queries.items()
+            },
+            db=db,
+        )
+
+    def rows(
+        self, queries: Dict[str, Query], db: Optional[Session] = None
+    ) -> Dict[str, Any]:
+        """Run ORM queries with ``.one()`` (e.g. multi-column aggregates)."""
+        return self.run(
+            {
+                name: (lambda session, q=query: q.with_session(session).one())
+                for name, query in queries.items()
+            },
+            db=db,
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global fan-out instance
+query_fanout = QueryFanout(
+    max_workers=_pool_workers(),
+    max_concurrency=int(os.getenv("QUERY_FANOUT_MAX_CONCURRENCY", "4")),
+)
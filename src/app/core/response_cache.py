@@ -0,0 +1,286 @@
+"""
+Response Cache
+
+Admins keep the analytics, subscriptions, categories and jurisdictions views
+open and re-poll them; each poll used to recompute everything. ``ResponseCache``
+keeps the computed response per endpoint and normalized filter tuple:
+
+- fresh for ``ttl`` seconds: served from memory,
+- then stale for ``stale`` more seconds: still served, while one background
+  recompute (on its own session) replaces it,
+- after that, or once invalidated: recomputed in the request; concurrent
+  requests for the same key wait for that one computation.
+
+Entries carry tags naming the data they were built from. Write paths call
+``invalidate_on_commit(db, tag, ...)``; the tags are invalidated each time that
+session commits from then on (handlers that commit several times are covered),
+so a cached response does not outlive the write it depends on. A recompute
+that overlaps an invalidation of one of its tags is returned but not stored.
+
+Tags: "users" (accounts, approvals, profiles), "subscriptions" (subscriber
+rows, plans, payments), "jobs", "unlocks", "analytics" (daily fact tables).
+
+The cache is per process: with several instances, a write only invalidates
+the instance that handled it and the others catch up within ``ttl``.
+``RESPONSE_CACHE_TTL_SECONDS=0`` turns caching off.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.core.database import SessionLocal
+
+logger = logging.getLogger("uvicorn.error")
+
+# Session.info key holding the tags to invalidate when the session commits
+_PENDING_TAGS = "response_cache_tags"
+
+
+def normalize_filters(filters: Dict[str, Any]) -> tuple:
+    """Sorted (name, value) pairs; blank strings count as not given."""
+    normalized = []
+    for name, value in sorted(filters.items()):
+        if isinstance(value, str):
+            value = value.strip() or None
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+class _Entry:
+    __slots__ = ("value", "computed_at", "tags")
+
+    def __init__(self, value, computed_at: float, tags: tuple):
+        self.value = value
+        self.computed_at = computed_at
+        self.tags = tags
+
+
+class _EndpointStats:
+    __slots__ = (
+        "hits",
+        "stale_hits",
+        "misses",
+        "recomputes",
+        "recompute_seconds",
+        "max_recompute_seconds",
+        "background_refreshes",
+        "errors",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> dict:
+        served = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "hitRatio": (
+                round((self.hits + self.stale_hits) / served, 3) if served else 0.0
+            ),
+            "recomputes": self.recomputes,
+            "avgRecomputeMs": (
+                round(self.recompute_seconds / self.recomputes * 1000, 1)
+                if self.recomputes
+                else 0.0
+            ),
+            "maxRecomputeMs": round(self.max_recompute_seconds * 1000, 1),
+            "backgroundRefreshes": self.background_refreshes,
+            "errors": self.errors,
+        }
+
+
+class ResponseCache:
+    """In-process TTL cache for computed endpoint responses."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30,
+        stale_seconds: float = 120,
+        max_entries: int = 512,
+        refresh_workers: int = 2,
+    ):
+        """
+        Args:
+            ttl_seconds: Default time an entry is served as fresh (0 disables caching)
+            stale_seconds: Default time after that it is served while refreshing
+            max_entries: Least recently used entries beyond this are dropped
+            refresh_workers: Background recomputes running at once
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.refresh_workers = refresh_workers
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._refreshing = set()
+        self._tag_versions: Dict[str, int] = {}
+        self._stats: Dict[str, _EndpointStats] = {}
+        self._invalidations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(
+        self,
+        endpoint: str,
+        filters: Dict[str, Any],
+        compute: Callable[[Session], Any],
+        db: Session,
+        tags: Iterable[str],
+        ttl: Optional[float] = None,
+        stale: Optional[float] = None,
+    ) -> Any:
+        """Cached response for ``endpoint`` + ``filters``, else ``compute(db)``.
+
+        ``compute`` must build the response from the session it is given only
+        (background refreshes pass a session of their own).
+        """
+        ttl = self.ttl_seconds if ttl is None else ttl
+        stale = self.stale_seconds if stale is None else stale
+        tags = tuple(tags)
+        if ttl <= 0:
+            return compute(db)
+
+        key = (endpoint, normalize_filters(filters))
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, _EndpointStats())
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry.computed_at
+                if age < ttl:
+                    stats.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry.value
+                if age < ttl + stale:
+                    stats.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._get_executor().submit(
+                            self._refresh, key, endpoint, compute, tags
+                        )
+                    return entry.value
+            stats.misses += 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another request may have computed it while this one waited
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry.computed_at < ttl:
+                    return entry.value
+            return self._compute(key, endpoint, compute, db, tags)
+
+    def _compute(self, key, endpoint, compute, db, tags) -> Any:
+        with self._lock:
+            versions = [self._tag_versions.get(tag, 0) for tag in tags]
+
+        started = time.perf_counter()
+        try:
+            value = compute(db)
+        except Exception:
+            with self._lock:
+                self._stats[endpoint].errors += 1
+            raise
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            stats = self._stats[endpoint]
+            stats.recomputes += 1
+            stats.recompute_seconds += elapsed
+            stats.max_recompute_seconds = max(stats.max_recompute_seconds, elapsed)
+            # Invalidated while computing: the result may predate the write
+            if versions == [self._tag_versions.get(tag, 0) for tag in tags]:
+                self._entries[key] = _Entry(value, time.monotonic(), tags)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+        return value
+
+    def _refresh(self, key, endpoint, compute, tags):
+        db: Session = SessionLocal()
+        try:
+            self._compute(key, endpoint, compute, db, tags)
+            with self._lock:
+                self._stats[endpoint].background_refreshes += 1
+        except Exception as e:
+            logger.error(f"[Response Cache] Refresh of {endpoint} failed: {str(e)}")
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.refresh_workers, thread_name_prefix="response-cache"
+            )
+        return self._executor
+
+    def invalidate(self, *tags: str):
+        """Drop every entry built from any of ``tags``."""
+        tags = set(tags)
+        if not tags:
+            return
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                self._invalidations[tag] = self._invalidations.get(tag, 0) + 1
+            stale_keys = [
+                key for key, entry in self._entries.items() if tags & set(entry.tags)
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def invalidate_on_commit(self, db: Session, *tags: str):
+        """Invalidate ``tags`` whenever ``db`` commits from now on."""
+        db.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "staleSeconds": self.stale_seconds,
+                "refreshing": len(self._refreshing),
+                "endpoints": {
+                    name: stats.as_dict() for name, stats in sorted(self._stats.items())
+                },
+                "invalidations": dict(sorted(self._invalidations.items())),
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global cache instance
+response_cache = ResponseCache(
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30")),
+    stale_seconds=float(os.getenv("RESPONSE_CACHE_STALE_SECONDS", "120")),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session):
+    tags = session.info.get(_PENDING_TAGS)
+    if tags:
+        response_cache.invalidate(*tags)
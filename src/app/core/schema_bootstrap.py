@@ -0,0 +1,101 @@
+"""
+Schema Bootstrap
+
+Creates missing tables, seeds the unlock counters on first deploy, applies the
+pending migrations (core/migrations.py) and loads the schema capability cache.
+
+This used to run while ``src.app.main`` was being imported, so every cold
+start paid a catalog round trip per table before the app could serve. It now
+runs either in the FastAPI startup event (``SCHEMA_BOOTSTRAP_ON_STARTUP``,
+default on) or as a release step:
+
+    python -m src.app.core.schema_bootstrap
+
+With the startup flag off the app makes no schema changes; the capability
+cache then loads on its first lookup.
+"""
+
+import logging
+import os
+
+from sqlalchemy import inspect
+
+from src.app import models
+from src.app.core.database import SessionLocal, engine
+from src.app.core.migrations import run_migrations
+from src.app.core.schema_capabilities import schema_capabilities
+
+logger = logging.getLogger("uvicorn.error")
+
+EXPECTED_TABLES = (
+    "users",
+    "notifications",
+    "password_resets",
+    "contractors",
+    "suppliers",
+    "subscriptions",
+    "subscribers",
+    "jobs",
+    "unlocked_leads",
+)
+
+
+def bootstrap_on_startup() -> bool:
+    return os.getenv("SCHEMA_BOOTSTRAP_ON_STARTUP", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+def bootstrap_schema() -> bool:
+    """Bring the database schema up to date; returns False if it failed."""
+    logger.info("Initializing database tables...")
+    try:
+        # Get existing tables before creation
+        existing_tables = inspect(engine).get_table_names()
+
+        # Create all tables
+        models.Base.metadata.create_all(bind=engine)
+
+        # Seed the per-trade unlock counters from existing unlocks on first deploy
+        if "job_trade_unlock_counts" not in existing_tables:
+            from src.app.services.unlock_counters import backfill_unlock_counts
+
+            db = SessionLocal()
+            try:
+                retired = backfill_unlock_counts(db)
+                logger.info(f"✓ Unlock counters backfilled ({retired} job(s) retired)")
+            except Exception as backfill_error:
+                db.rollback()
+                logger.error(
+                    f"Unlock counter backfill failed, run backfill_unlock_counts manually: {str(backfill_error)}"
+                )
+            finally:
+                db.close()
+
+        # Column and index changes to existing tables (create_all only creates
+        # missing tables), then the schema snapshot request handlers consult
+        run_migrations(engine)
+        schema_capabilities.refresh()
+        final_tables = schema_capabilities.tables()
+
+        for table in EXPECTED_TABLES:
+            if table in final_tables:
+                if table not in existing_tables:
+                    logger.info(f"✓ Table created: {table}")
+                else:
+                    logger.info(f"✓ Table exists: {table}")
+            else:
+                logger.warning(f"✗ Table missing: {table}")
+
+        logger.info("Database initialization completed successfully")
+        return True
+    except Exception as e:
+        logger.error(f"Error initializing database: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(0 if bootstrap_schema() else 1)
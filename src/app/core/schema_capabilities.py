@@ -0,0 +1,75 @@
+"""
+Schema Capabilities
+
+Process-wide answer to "does this table / column exist?" so request handlers
+never query ``information_schema`` themselves. The catalog is read once (one
+query for every table and column of the current schema) right after the
+migrations run at startup; if the database was unreachable then, the first
+lookup loads it instead.
+
+    if schema_capabilities.has_table("payments"):
+        ...
+
+Call ``refresh()`` after changing the schema from a running process.
+"""
+
+import logging
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.app.core.database import engine as default_engine
+
+logger = logging.getLogger("uvicorn.error")
+
+_CATALOG_SQL = text(
+    "SELECT table_name, column_name FROM information_schema.columns "
+    "WHERE table_schema = current_schema()"
+)
+
+
+class SchemaCapabilities:
+    """Cached table and column names of the application schema."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._columns: Optional[Dict[str, Set[str]]] = None
+
+    def refresh(self) -> bool:
+        """Reload the catalog; returns False (and keeps the old one) on error."""
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(_CATALOG_SQL).all()
+        except Exception as e:
+            logger.error(f"[Schema] Catalog load failed: {str(e)}")
+            return False
+
+        columns: Dict[str, Set[str]] = {}
+        for table_name, column_name in rows:
+            columns.setdefault(table_name, set()).add(column_name)
+        self._columns = columns
+        return True
+
+    def _catalog(self) -> Dict[str, Set[str]]:
+        if self._columns is None:
+            # Not loaded at startup (database down); retried until it works
+            self.refresh()
+        return self._columns or {}
+
+    def tables(self) -> Set[str]:
+        return set(self._catalog())
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self._catalog()
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self._catalog().get(table_name, ())
+
+    def has_columns(self, table_name: str, *column_names: str) -> bool:
+        existing = self._catalog().get(table_name, set())
+        return all(name in existing for name in column_names)
+
+
+# Global capabilities instance
+schema_capabilities = SchemaCapabilities(default_engine)
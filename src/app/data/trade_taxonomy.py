@@ -0,0 +1,475 @@
+"""
+Trade taxonomy
+
+Single source of truth for the contractor and supplier trades jobs are routed
+by. Each trade has a stable numeric id, a role, a slug (stored in
+``jobs.audience_type_slugs`` and profile ``user_type`` arrays), a display name
+(stored in ``jobs.audience_type_names``) and a category.
+
+The table is compiled once at import into read-only mappings, so every lookup
+(slug -> trade, display name -> slug, id -> trade, category -> trades) is a
+single dict access. Numeric ids never change once assigned: add new trades at
+the end of ``_TRADE_ROWS`` with the next free id.
+"""
+
+import re
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Iterable, List, Optional
+
+Trade = namedtuple("Trade", ["id", "role", "slug", "display_name", "category"])
+
+CONTRACTOR = "contractor"
+SUPPLIER = "supplier"
+
+CONTRACTOR_CATEGORIES = (
+    "General / Prime Contractors",
+    "Structural, Concrete & Framing",
+    "Building Envelope, Openings & Exterior",
+    "Interiors & Finish Trades",
+    "Mechanical (HVAC, Refrigeration, Ductwork & TAB)",
+    "Plumbing, Gas & Water Systems",
+    "Electrical, Low Voltage, Controls & Security",
+    "Fire Protection & Life Safety",
+    "Sitework, Civil, Utilities & Logistics",
+    "Environmental, Hazmat & Remediation",
+    "Landscaping, Hardscape & Site Amenities",
+    "Specialty Equipment, Vertical Transport & Compliance",
+)
+
+SUPPLIER_CATEGORIES = (
+    "Structural, Concrete, Masonry & Metals",
+    "Lumber, Framing & Carpentry Materials",
+    "Roofing, Siding, Decking, Waterproofing & Sealants",
+    "Openings, Hardware, Glass & Storefront",
+    "Interior Finishes & Architectural Products",
+    "Electrical, Lighting, Security & Controls Supply",
+    "Mechanical & HVAC Equipment / Air Distribution",
+    "Plumbing, Water, Drainage & Venting",
+    "Gas Distribution, Regulators & Shutoff Controls",
+    "Fire Protection & Life Safety Systems",
+    "Refrigeration & Commercial Kitchen Supply",
+    "Medical Gas, Specialty Gas & Healthcare Systems",
+    "Vertical Transportation & Lifts",
+    "Site, Civil, Utilities & Erosion Control",
+    "Landscaping, Fencing, Rental, Safety & Environmental Support",
+)
+
+CATEGORIES = CONTRACTOR_CATEGORIES + SUPPLIER_CATEGORIES
+
+# (id, role, slug, display name, category)
+_TRADE_ROWS = (
+    (1, "contractor", "acoustical_contractor", "Acoustical Contractor", "Interiors & Finish Trades"),
+    (2, "contractor", "arborist", "Arborist", "Landscaping, Hardscape & Site Amenities"),
+    (3, "contractor", "backflow_tester_installer", "Backflow Tester/Installer", "Plumbing, Gas & Water Systems"),
+    (4, "contractor", "balancing_tab_contractor", "Balancing / TAB contractor", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (5, "contractor", "boiler_pressure_vessel", "Boiler/Pressure Vessel", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (6, "contractor", "cabinet_installer", "Cabinet Installer", "Interiors & Finish Trades"),
+    (7, "contractor", "commercial_kitchen_hood_installer_fabricator", "Commercial kitchen hood installer fabricator", "Specialty Equipment, Vertical Transport & Compliance"),
+    (8, "contractor", "concrete_contractor", "Concrete Contractor", "Structural, Concrete & Framing"),
+    (9, "contractor", "controls_bas_integrator", "Controls / BAS integrator", "Electrical, Low Voltage, Controls & Security"),
+    (10, "contractor", "controls_bms_integrator", "Controls / BMS integrator", "Electrical, Low Voltage, Controls & Security"),
+    (11, "contractor", "conveyance_lift_hoist_installer", "Conveyance/Lift/Hoist Installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (12, "contractor", "countertop_fabricator", "Countertop Fabricator", "Interiors & Finish Trades"),
+    (13, "contractor", "directional_boring_jack_bore_contractor", "Directional boring / jack & bore contractor", "Sitework, Civil, Utilities & Logistics"),
+    (14, "contractor", "door_hardware_access_control_contractor", "Door hardware / access control contractor", "Building Envelope, Openings & Exterior"),
+    (15, "contractor", "dry_chemical_foam_special_hazard_contractor", "Dry chemical / foam / special hazard contractor", "Fire Protection & Life Safety"),
+    (16, "contractor", "drywall_sheetrock_contractor", "Drywall / Sheetrock Contractor", "Interiors & Finish Trades"),
+    (17, "contractor", "electrical_contractor", "Electrical Contractor", "Electrical, Low Voltage, Controls & Security"),
+    (18, "contractor", "erosion_control_contractor", "Erosion Control Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (19, "contractor", "escalator_elevator", "Escalator/Elevator", "Specialty Equipment, Vertical Transport & Compliance"),
+    (20, "contractor", "event_assembly_installer", "Event/Assembly Installer", "Sitework, Civil, Utilities & Logistics"),
+    (21, "contractor", "excavation_trenching_contractor", "Excavation / Trenching Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (22, "contractor", "fence_railing_contractor", "Fence/Railing Contractor", "Landscaping, Hardscape & Site Amenities"),
+    (23, "contractor", "fire_alarm_contractor", "Fire Alarm Contractor", "Fire Protection & Life Safety"),
+    (24, "contractor", "fire_pump_testing_service_company", "Fire pump testing & service company", "Fire Protection & Life Safety"),
+    (25, "contractor", "fire_sprinkler_contractor", "Fire Sprinkler Contractor", "Fire Protection & Life Safety"),
+    (26, "contractor", "flooring_carpet_installers", "Flooring / Carpet Installers", "Interiors & Finish Trades"),
+    (27, "contractor", "flooring_epoxy_installer", "Flooring/Epoxy Installer", "Interiors & Finish Trades"),
+    (28, "contractor", "foundation_pier_installer", "Foundation / Pier Installer", "Structural, Concrete & Framing"),
+    (29, "contractor", "framing_contractor", "Framing Contractor", "Structural, Concrete & Framing"),
+    (30, "contractor", "fuel_gas_contractor", "Fuel Gas Contractor", "Plumbing, Gas & Water Systems"),
+    (31, "contractor", "garage_door_contractor", "Garage Door Contractor", "Building Envelope, Openings & Exterior"),
+    (32, "contractor", "gas_contractor", "Gas Contractor", "Plumbing, Gas & Water Systems"),
+    (33, "contractor", "gas_equipment_appliance_installer", "Gas Equipment Appliance Installer", "Plumbing, Gas & Water Systems"),
+    (34, "contractor", "gate_operator", "Gate Operator", "Building Envelope, Openings & Exterior"),
+    (35, "contractor", "general_contractor", "General Contractor", "General / Prime Contractors"),
+    (36, "contractor", "graywater_rainwater_system_installer", "Graywater/Rainwater System Installer", "Plumbing, Gas & Water Systems"),
+    (37, "contractor", "grease_duct_fabricator_installer", "Grease duct fabricator / installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (38, "contractor", "gunite_shotcrete_subcontractor", "Gunite/shotcrete subcontractor", "Landscaping, Hardscape & Site Amenities"),
+    (39, "contractor", "gutter_installer", "Gutter Installer", "Building Envelope, Openings & Exterior"),
+    (40, "contractor", "hood_mechanical_contractor", "Hood (Mechanical) Contractor", "Specialty Equipment, Vertical Transport & Compliance"),
+    (41, "contractor", "hood_suppression_contractor", "Hood Suppression Contractor", "Fire Protection & Life Safety"),
+    (42, "contractor", "hydronic_piping_contractor", "Hydronic Piping Contractor", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (43, "contractor", "insulation_contractor", "Insulation Contractor", "Building Envelope, Openings & Exterior"),
+    (44, "contractor", "irrigation_contractor", "Irrigation Contractor", "Landscaping, Hardscape & Site Amenities"),
+    (45, "contractor", "irrigation_contractors", "Irrigation Contractors", "Landscaping, Hardscape & Site Amenities"),
+    (46, "contractor", "kitchen_equipment_installer", "Kitchen equipment installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (47, "contractor", "land_clearing_contractor", "Land Clearing Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (48, "contractor", "landscape_contractor", "Landscape Contractor", "Landscaping, Hardscape & Site Amenities"),
+    (49, "contractor", "low_voltage_contractor", "Low Voltage Contractor", "Electrical, Low Voltage, Controls & Security"),
+    (50, "contractor", "masonry_contractor", "Masonry Contractor", "Structural, Concrete & Framing"),
+    (51, "contractor", "mechanical_hvac_contractor", "Mechanical / HVAC Contractor", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (52, "contractor", "medical_equipment_installer", "Medical equipment installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (53, "contractor", "medical_gas_contractor", "Medical Gas Contractor", "Specialty Equipment, Vertical Transport & Compliance"),
+    (54, "contractor", "painting_contractor", "Painting Contractor", "Interiors & Finish Trades"),
+    (55, "contractor", "paver_flatwork_contractors", "Paver / Flatwork Contractors", "Landscaping, Hardscape & Site Amenities"),
+    (56, "contractor", "pipe_insulation_contractor", "Pipe Insulation Contractor", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (57, "contractor", "plumbing_contractor", "Plumbing Contractor", "Plumbing, Gas & Water Systems"),
+    (58, "contractor", "pool_service_maintenance_company", "Pool service & maintenance company", "Landscaping, Hardscape & Site Amenities"),
+    (59, "contractor", "racking_shelving_installer", "Racking/shelving installer", "Interiors & Finish Trades"),
+    (60, "contractor", "refrigeration", "Refrigeration", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (61, "contractor", "retaining_wall_contractor", "Retaining Wall Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (62, "contractor", "roofing_contractor", "Roofing Contractor", "Building Envelope, Openings & Exterior"),
+    (63, "contractor", "scaffolding_contractor", "Scaffolding Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (64, "contractor", "septic_on_site_waste_water_installer", "Septic/On Site Waste Water Installer", "Plumbing, Gas & Water Systems"),
+    (65, "contractor", "shoring_underpinning_contractor", "Shoring/Underpinning Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (66, "contractor", "siding_trim_contractor", "Siding / Trim Contractor", "Building Envelope, Openings & Exterior"),
+    (67, "contractor", "site_work_grading_contractor", "Site Work/Grading Contractor", "Sitework, Civil, Utilities & Logistics"),
+    (68, "contractor", "spray_booth_installer", "Spray Booth Installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (69, "contractor", "structural_steel_equipment_support_fabricator", "Structural steel / equipment support fabricator", "Structural, Concrete & Framing"),
+    (70, "contractor", "stucco_contractor", "Stucco Contractor", "Building Envelope, Openings & Exterior"),
+    (71, "contractor", "test_balance_commissioning_agent", "Test & Balance / commissioning agent", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (72, "contractor", "tile_contractor", "Tile Contractor", "Interiors & Finish Trades"),
+    (73, "contractor", "traffic_control_company", "Traffic Control Company", "Sitework, Civil, Utilities & Logistics"),
+    (74, "contractor", "trim_carpenter", "Trim Carpenter", "Interiors & Finish Trades"),
+    (75, "contractor", "underground_utility_contractor", "underground utility contractor", "Sitework, Civil, Utilities & Logistics"),
+    (76, "contractor", "vacuum_pump_medical_air_system_installer", "Vacuum pump & medical air system installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (77, "contractor", "walk_in_cooler_freezer_builder", "Walk-in cooler/freezer builder", "Specialty Equipment, Vertical Transport & Compliance"),
+    (78, "contractor", "water_treatment_contractor", "Water treatment contractor", "Plumbing, Gas & Water Systems"),
+    (79, "contractor", "water_well_driller_pump_installer", "Water Well Driller/Pump Installer", "Plumbing, Gas & Water Systems"),
+    (80, "contractor", "waterproofing_air_barrier_contractor", "Waterproofing / Air Barrier Contractor", "Building Envelope, Openings & Exterior"),
+    (81, "contractor", "welding_contractor", "Welding Contractor", "Structural, Concrete & Framing"),
+    (82, "contractor", "window_door_contractor", "Window / Door Contractor", "Building Envelope, Openings & Exterior"),
+    (83, "supplier", "access_control_door_hardware_supplier", "Access control Door hardware supplier", "Openings, Hardware, Glass & Storefront"),
+    (84, "supplier", "acoustical_supplier", "Acoustical Supplier", "Interior Finishes & Architectural Products"),
+    (85, "supplier", "annunciator_graphic_panel_supplier", "Annunciator & graphic panel supplier", "Fire Protection & Life Safety Systems"),
+    (86, "supplier", "appliance_suppliers", "Appliance Suppliers", "Refrigeration & Commercial Kitchen Supply"),
+    (87, "supplier", "awning_canopy_materials_suppliers", "Awning/canopy materials suppliers", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (88, "supplier", "backflow_preventer_supplier", "Backflow preventer supplier", "Plumbing, Water, Drainage & Venting"),
+    (89, "supplier", "battery_exit_sign_component_suppliers", "Battery + exit sign component suppliers", "Fire Protection & Life Safety Systems"),
+    (90, "supplier", "boiler_furnace_equipment_supplier", "Boiler / furnace equipment supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (91, "supplier", "bulk_gas_supplier", "Bulk gas supplier (O₂, N₂O, N₂, CO₂, etc.)", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (92, "supplier", "cabinet_supplier", "Cabinet Supplier", "Lumber, Framing & Carpentry Materials"),
+    (93, "supplier", "chiller_manufacturer_distributor", "Chiller manufacturer / distributor", "Mechanical & HVAC Equipment / Air Distribution"),
+    (94, "supplier", "closet_system_vendor", "Closet System Vendor", "Lumber, Framing & Carpentry Materials"),
+    (95, "supplier", "cmu_block_supplier", "CMU block Supplier", "Structural, Concrete, Masonry & Metals"),
+    (96, "supplier", "composite_pvc_decking_distributor", "Composite/PVC decking distributor", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (97, "supplier", "concrete_supplier", "Concrete Supplier", "Structural, Concrete, Masonry & Metals"),
+    (98, "supplier", "condensate_pump_neutralizer_supplier", "Condensate pump & neutralizer supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (99, "supplier", "conduit_raceway_supplier", "Conduit & raceway supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (100, "supplier", "construction_trailer", "Construction Trailer", "Sitework, Civil, Utilities & Logistics"),
+    (101, "supplier", "controls_hardware_supplier", "Controls hardware supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (102, "supplier", "cooling_tower_fluid_cooler_supplier", "Cooling tower / fluid cooler supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (103, "supplier", "countertop_suppliers", "Countertop Suppliers", "Lumber, Framing & Carpentry Materials"),
+    (104, "supplier", "crane_service", "Crane Service", "Specialty Equipment, Vertical Transport & Compliance"),
+    (105, "supplier", "drainage_suppliers", "Drainage suppliers", "Plumbing, Water, Drainage & Venting"),
+    (106, "supplier", "drywall_sheetrock_supplier", "Drywall / Sheetrock Supplier", "Interior Finishes & Architectural Products"),
+    (107, "supplier", "dumpster_roll_off_supplier", "Dumpster / Roll Off Supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (108, "supplier", "electrical_gear_supplier", "Electrical gear supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (109, "supplier", "electrical_low_voltage_distributor", "Electrical / Low Voltage Distributor", "Electrical, Lighting, Security & Controls Supply"),
+    (110, "supplier", "electrical_supply_house", "Electrical Supply House", "Electrical, Lighting, Security & Controls Supply"),
+    (111, "supplier", "equipment_rental", "Equipment Rental", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (112, "supplier", "erosion_control_supplier", "Erosion control supplier", "Site, Civil, Utilities & Erosion Control"),
+    (113, "supplier", "erosion_materials", "Erosion materials", "Site, Civil, Utilities & Erosion Control"),
+    (114, "supplier", "ess_battery_system_supplier", "ESS / Battery System Supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (115, "supplier", "evaporator_coil_supplier", "Evaporator / coil supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (116, "supplier", "exhaust_fan_supplier", "Exhaust fan supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (117, "supplier", "explosives_storage_operator", "Explosives Storage Operator", "Environmental, Hazmat & Remediation"),
+    (118, "supplier", "extrusion_framing_system_suppliers", "Extrusion / framing system suppliers", "Openings, Hardware, Glass & Storefront"),
+    (119, "supplier", "fasteners_anchoring_suppliers", "Fasteners / anchoring suppliers", "Structural, Concrete, Masonry & Metals"),
+    (120, "supplier", "fence_material_suppliers_distributors", "Fence material suppliers/distributors", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (121, "supplier", "finish_carpentry_suppliers_interior_doors_trim", "Finish carpentry suppliers (Interior Doors & Trim)", "Lumber, Framing & Carpentry Materials"),
+    (122, "supplier", "fire_alarm_cable_supplier", "Fire alarm cable supplier", "Fire Protection & Life Safety Systems"),
+    (123, "supplier", "fire_alarm_equipment_supplier", "Fire alarm equipment supplier", "Fire Protection & Life Safety Systems"),
+    (124, "supplier", "fire_alarm_panel_manufacturer_distributor", "Fire alarm panel manufacturer / distributor", "Fire Protection & Life Safety Systems"),
+    (125, "supplier", "fire_protection_material_supplier", "Fire Protection Material Supplier", "Fire Protection & Life Safety Systems"),
+    (126, "supplier", "fire_pump_controller_suppliers", "Fire pump controller suppliers", "Fire Protection & Life Safety Systems"),
+    (127, "supplier", "fire_pump_manufacturers_authorized_distributors", "Fire pump manufacturers / authorized distributors", "Fire Protection & Life Safety Systems"),
+    (128, "supplier", "fire_sprinkler_material_house", "Fire sprinkler material house", "Fire Protection & Life Safety Systems"),
+    (129, "supplier", "flooring_distributor", "Flooring Distributor (Tile, LVP, Wood & Carpet)", "Interior Finishes & Architectural Products"),
+    (130, "supplier", "fuel_shutoff_valve_supplier", "Fuel shutoff valve supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (131, "supplier", "garage_door_supplier", "Garage Door Supplier", "Openings, Hardware, Glass & Storefront"),
+    (132, "supplier", "gas_appliance_supplier", "Gas Appliance Supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (133, "supplier", "gas_pipe_fittings_supplier", "Gas Pipe & Fittings Supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (134, "supplier", "gas_regulator_meter_set_supplier", "Gas Regulator & Meter Set Supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (135, "supplier", "gate_door_operator_barrier_supplier", "Gate/door operator & barrier supplier", "Openings, Hardware, Glass & Storefront"),
+    (136, "supplier", "glass_fabricator", "Glass fabricator", "Openings, Hardware, Glass & Storefront"),
+    (137, "supplier", "grease_duct_fittings_supplier", "Grease duct & fittings supplier", "Refrigeration & Commercial Kitchen Supply"),
+    (138, "supplier", "gutter_supplier", "Gutter Supplier", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (139, "supplier", "headwall_boom_manufacturer_dealer", "Headwall & boom manufacturer / dealer", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (140, "supplier", "hood_suppression_equipment_distributor", "Hood suppression equipment distributor", "Fire Protection & Life Safety Systems"),
+    (141, "supplier", "hvac_distributor", "HVAC Distributor", "Mechanical & HVAC Equipment / Air Distribution"),
+    (142, "supplier", "hydronic_components_supplier", "Hydronic components supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (143, "supplier", "instrument_air_system_supplier", "Instrument air system supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (144, "supplier", "instrumentation_controls_supplier", "Instrumentation & controls supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (145, "supplier", "insulation_suppliers", "Insulation Suppliers", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (146, "supplier", "interface_module_supplier", "Interface module supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (147, "supplier", "inverter_bos_supplier", "Inverter + BOS Supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (148, "supplier", "irrigation_suppliers", "Irrigation Suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (149, "supplier", "kitchen_hood_manufacturer_dealer", "kitchen hood manufacturer / dealer", "Refrigeration & Commercial Kitchen Supply"),
+    (150, "supplier", "landscape_suppliers", "Landscape Suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (151, "supplier", "leak_detection_testing_equipment_supplier", "Leak Detection & Testing Equipment Supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (152, "supplier", "lighting_distributors_commercial", "Lighting distributors / commercial", "Electrical, Lighting, Security & Controls Supply"),
+    (153, "supplier", "lighting_led_module_suppliers", "Lighting/LED module suppliers", "Electrical, Lighting, Security & Controls Supply"),
+    (154, "supplier", "low_voltage_cable_device_supplier", "Low-voltage cable & device supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (155, "supplier", "lumber_supplier", "Lumber Supplier", "Lumber, Framing & Carpentry Materials"),
+    (156, "supplier", "makeup_air_unit_supplier", "Makeup air unit (MAU) supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (157, "supplier", "manifold_cylinder_system_supplier", "Manifold & cylinder system supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (158, "supplier", "masonry_supplier", "Masonry Supplier", "Structural, Concrete, Masonry & Metals"),
+    (159, "supplier", "material_hoist_manlift", "Material Hoist/Manlift", "Specialty Equipment, Vertical Transport & Compliance"),
+    (160, "supplier", "medical_air_compressor_system_supplier", "Medical air compressor system supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (161, "supplier", "medical_gas_and_equipment_suppliers", "medical Gas and equipment Suppliers", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (162, "supplier", "medical_gas_copper_tube_supplier", "Medical gas copper tube supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (163, "supplier", "medical_gas_fittings_brazing_materials_supplier", "Medical gas fittings & brazing materials supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (164, "supplier", "medical_gas_outlet_inlet_terminal_supplier", "Medical gas outlet / inlet terminal supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (165, "supplier", "medical_vacuum_system_supplier", "Medical vacuum system supplier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (166, "supplier", "monitoring_company_central_station_integrator", "Monitoring company / central station integrator", "Electrical, Low Voltage, Controls & Security"),
+    (167, "supplier", "nfpa_99_medical_gas_verification_agency_verifier", "NFPA 99 medical gas verification agency / verifier", "Specialty Equipment, Vertical Transport & Compliance"),
+    (168, "supplier", "notification_appliance_supplier", "Notification appliance supplier", "Fire Protection & Life Safety Systems"),
+    (169, "supplier", "paint_coatings_suppliers", "Paint / Coatings Suppliers", "Interior Finishes & Architectural Products"),
+    (170, "supplier", "paver_flatwork_suppliers", "Paver / Flatwork Suppliers", "Site, Civil, Utilities & Erosion Control"),
+    (171, "supplier", "pipe_fittings_suppliers", "Pipe/fittings suppliers", "Plumbing, Water, Drainage & Venting"),
+    (172, "supplier", "pipe_insulation_supplier", "Pipe insulation supplier", "Mechanical & HVAC Equipment / Air Distribution"),
+    (173, "supplier", "plumbing_supplier", "Plumbing Supplier", "Plumbing, Water, Drainage & Venting"),
+    (174, "supplier", "pool_equipment_supplier_distributor", "Pool equipment supplier / distributor", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (175, "supplier", "portable_sanitation_rental", "Portable Sanitation Rental", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (176, "supplier", "pressure_regulator_line_regulator_supplier", "Pressure regulator & line regulator supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (177, "supplier", "rack_condensing_unit_supplier", "Rack & condensing unit supplier", "Refrigeration & Commercial Kitchen Supply"),
+    (178, "supplier", "racking_mounting_supplier_solar", "Racking and Mounting Supplier (solar)", "Electrical, Lighting, Security & Controls Supply"),
+    (179, "supplier", "railing_system_suppliers", "Railing system suppliers", "Interior Finishes & Architectural Products"),
+    (180, "supplier", "rebar_fabrication_shop", "Rebar/Fabrication Shop", "Structural, Concrete, Masonry & Metals"),
+    (181, "supplier", "rebar_structural_hardware_supplier", "Rebar & structural hardware", "Structural, Concrete, Masonry & Metals"),
+    (182, "supplier", "rebar_structural_hardware_vapor_barrier_under_slab_suppliers", "rebar & structural hardware; vapor barrier & under-slab Suppliers", "Structural, Concrete, Masonry & Metals"),
+    (183, "supplier", "refrigerant_specialty_gas_supplier", "Refrigerant & specialty gas supplier", "Refrigeration & Commercial Kitchen Supply"),
+    (184, "supplier", "refrigeration_valves_fittings_supplier", "Refrigeration valves & fittings supplier.", "Refrigeration & Commercial Kitchen Supply"),
+    (185, "supplier", "riser_assembly_supplier", "Riser assembly supplier", "Fire Protection & Life Safety Systems"),
+    (186, "supplier", "roofing_materials_distributor", "Roofing Materials Distributor", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (187, "supplier", "safety_compliance_suppliers", "Safety compliance suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (188, "supplier", "safety_fall_protection_vendor", "Safety/fall protection vendor", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (189, "supplier", "scaffolding_vendor", "Scaffolding Vendor", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (190, "supplier", "sealant_adhesive_suppliers", "Sealant /adhesive suppliers", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (191, "supplier", "security_system_supplier", "Security system supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (192, "supplier", "seismic_bracing_hanger_hardware_supplier", "Seismic bracing & hanger hardware supplier", "Structural, Concrete, Masonry & Metals"),
+    (193, "supplier", "seismic_gas_shutoff_valve_supplier", "Seismic Gas Shutoff Valve Supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (194, "supplier", "shoring_trench_safety_rental_suppliers", "shoring/trench safety rental suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (195, "supplier", "shotcrete_gunite_materials_supplier", "Shotcrete/gunite materials supplier", "Structural, Concrete, Masonry & Metals"),
+    (196, "supplier", "shower_glass_supplier", "Shower Glass Supplier", "Openings, Hardware, Glass & Storefront"),
+    (197, "supplier", "siding_trim_supplier", "Siding / Trim Supplier", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (198, "supplier", "sign_component_suppliers", "Sign component suppliers", "Interior Finishes & Architectural Products"),
+    (199, "supplier", "smart_gas_control_supplier", "Smart Gas Control Supplier", "Gas Distribution, Regulators & Shutoff Controls"),
+    (200, "supplier", "sod_grass_suppliers", "Sod / grass Suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (201, "supplier", "solar_module_supplier", "Solar Module Supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (202, "supplier", "solar_pv_equipment_supplier", "Solar/PV Equipment Supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (203, "supplier", "sprinkler_head_manufacturer_distributor", "Sprinkler head manufacturer / distributor", "Fire Protection & Life Safety Systems"),
+    (204, "supplier", "steel_supplier_structural_metals_distributor", "Steel supplier / structural metals distributor", "Structural, Concrete, Masonry & Metals"),
+    (205, "supplier", "stone_aggregate_supplier", "Stone / Aggregate Supplier", "Structural, Concrete, Masonry & Metals"),
+    (206, "supplier", "stone_quartz_slab_supplier", "Stone/Quartz Slab Supplier", "Lumber, Framing & Carpentry Materials"),
+    (207, "supplier", "storefront_curtain_wall_system_manufacturers_distributors", "Storefront/curtain wall system manufacturers / distributors", "Openings, Hardware, Glass & Storefront"),
+    (208, "supplier", "structural_connector_hardware_suppliers", "structural connector & hardware Suppliers", "Structural, Concrete, Masonry & Metals"),
+    (209, "supplier", "temporary_fencing_supplier", "Temporary Fencing Supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (210, "supplier", "thermostat_controls_supplier", "Thermostat & controls supplier", "Electrical, Lighting, Security & Controls Supply"),
+    (211, "supplier", "third_party_verifier_certifier", "Third-party verifier / certifier", "Specialty Equipment, Vertical Transport & Compliance"),
+    (212, "supplier", "tile_suppliers", "Tile Suppliers", "Interior Finishes & Architectural Products"),
+    (213, "supplier", "tool_supplier", "Tool Supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (214, "supplier", "tower_crane_erector", "Tower Crane Erector", "Specialty Equipment, Vertical Transport & Compliance"),
+    (215, "supplier", "tracer_wire_marking_materials_supplier", "Tracer Wire & Marking Materials Supplier", "Plumbing, Water, Drainage & Venting"),
+    (216, "supplier", "tree_removal_service", "Tree Removal Service", "Landscaping, Hardscape & Site Amenities"),
+    (217, "supplier", "truss_company", "Truss Company", "Lumber, Framing & Carpentry Materials"),
+    (218, "supplier", "underground_piping_fittings_supplier", "Underground piping & fittings supplier", "Plumbing, Water, Drainage & Venting"),
+    (219, "supplier", "valves_specialty_fittings_supplier", "Valves & specialty fittings supplier", "Plumbing, Water, Drainage & Venting"),
+    (220, "supplier", "vapor_barrier_under_slab_suppliers", "Vapor barrier & under-slab suppliers", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (221, "supplier", "venting_system_supplier", "Venting system supplier", "Plumbing, Water, Drainage & Venting"),
+    (222, "supplier", "vinyl_fence_suppliers", "Vinyl fence suppliers", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (223, "supplier", "waste_roll_off_service", "Waste/Roll-Off Service", "Sitework, Civil, Utilities & Logistics"),
+    (224, "supplier", "waterproofing_air_barrier_suppliers", "Waterproofing / Air Barrier Suppliers", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (225, "supplier", "window_door_glass_distributors", "Window / Door / Glass Distributors", "Openings, Hardware, Glass & Storefront"),
+    (226, "supplier", "anchor_bolts_embeds_supplier", "Anchor bolts/embeds supplier", "Structural, Concrete, Masonry & Metals"),
+    (227, "supplier", "asbestos_abatement_material_supplier", "Asbestos abatement material supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (228, "supplier", "commercial_hardware_supplier", "Commercial hardware supplier", "Openings, Hardware, Glass & Storefront"),
+    (229, "supplier", "decking_material_supplier", "Decking material supplier (treated wood/composite/PVC)", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (230, "supplier", "dock_lighting_supplier", "Dock lighting supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (231, "supplier", "dock_system_supplier", "Dock system manufacturer/supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (232, "supplier", "drying_equipment_rental", "Drying equipment rental (dehumidifiers, air movers, heaters)", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (233, "supplier", "duct_supply_supplier", "Duct supply (duct board/metal duct, registers, dampers)", "Mechanical & HVAC Equipment / Air Distribution"),
+    (234, "supplier", "elevator_fixtures_interior_supplier", "Elevator fixtures/interior supplier (COP, buttons, lanterns, cab finishes)", "Vertical Transportation & Lifts"),
+    (235, "supplier", "elevator_parts_supplier", "Elevator parts supplier (if independent/mod: controller packages, drives, fixtures)", "Vertical Transportation & Lifts"),
+    (236, "supplier", "escalator_handrail_supplier", "Escalator Handrail supplier (handrail belts—common replacement item)", "Vertical Transportation & Lifts"),
+    (237, "supplier", "escalator_moving_walk_oem_manufacturer", "Escalator / moving-walk OEM / manufacturer (unit package)", "Vertical Transportation & Lifts"),
+    (238, "supplier", "escalator_parts_supplier", "Escalator parts supplier (modernization components, drives, controllers)", "Vertical Transportation & Lifts"),
+    (239, "supplier", "fertilizer_seed_supplier", "Fertilizer/seed supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (240, "supplier", "fill_dirt_soil_supplier", "Fill Dirt / Soil", "Site, Civil, Utilities & Erosion Control"),
+    (241, "supplier", "generator_oem_dealer", "Generator OEM / Dealer", "Electrical, Lighting, Security & Controls Supply"),
+    (242, "supplier", "hazmat_disposal_transporter", "Hazmat disposal supplier / transporter", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (243, "supplier", "hvac_parts_supplier", "HVAC Parts supplier (capacitors, contactors, disconnects, whip, pad, vibration isolators)", "Mechanical & HVAC Equipment / Air Distribution"),
+    (244, "supplier", "interior_doors_frames_hardware_supplier", "Interior doors/frames/hardware supplier", "Openings, Hardware, Glass & Storefront"),
+    (245, "supplier", "kitchen_equipment_supplier", "Kitchen equipment supplier", "Refrigeration & Commercial Kitchen Supply"),
+    (246, "supplier", "marine_hardware_supplier", "Marine hardware supplier (cleats, brackets, bolts, hangers)", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (247, "supplier", "metal_stud_track_supplier", "Metal stud/track supplier", "Interior Finishes & Architectural Products"),
+    (248, "supplier", "modular_ramp_system_supplier", "Modular ramp system supplier (aluminum ramp kits, landings)", "Openings, Hardware, Glass & Storefront"),
+    (249, "supplier", "mulch_supplier", "Mulch Supplier", "Site, Civil, Utilities & Erosion Control"),
+    (250, "supplier", "overhead_door_equipment_supplier", "Overhead door equipment supplier", "Openings, Hardware, Glass & Storefront"),
+    (251, "supplier", "piles_supplier_timber_steel_concrete", "Piles supplier (timber/steel/concrete)", "Structural, Concrete, Masonry & Metals"),
+    (252, "supplier", "plant_nursery_supplier", "Plant nursery supplier (trees/shrubs/perennials)", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (253, "supplier", "platform_lift_oem_manufacturer", "Platform lift OEM / manufacturer", "Vertical Transportation & Lifts"),
+    (254, "supplier", "plywood_sheathing_supplier_deck_repairs", "Plywood/sheathing supplier (deck repairs)", "Lumber, Framing & Carpentry Materials"),
+    (255, "supplier", "ppe_safety_supplier", "PPE / safety supplier", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (256, "supplier", "safety_equipment_supplier", "Safety equipment supplier (PPE, signage, cones, fire extinguishers)", "Landscaping, Fencing, Rental, Safety & Environmental Support"),
+    (257, "supplier", "topsoil_supplier", "Topsoil supplier", "Site, Civil, Utilities & Erosion Control"),
+    (258, "supplier", "underlayment_supplier", "Underlayment supplier (synthetic felt, ice & water shield)", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (259, "supplier", "walk_in_cooler_freezer_supplier", "Walk-in cooler/freezer supplier", "Refrigeration & Commercial Kitchen Supply"),
+    (260, "supplier", "weatherproofing_sealants_supplier", "Weatherproofing/sealants supplier (flashing tape, sealant, gaskets)", "Roofing, Siding, Decking, Waterproofing & Sealants"),
+    (261, "supplier", "asbestos_abatement_contractor", "Asbestos abatement contractor", "Environmental, Hazmat & Remediation"),
+    (262, "supplier", "boat_lift_installer", "Boat Lift Installer", "Specialty Equipment, Vertical Transport & Compliance"),
+    (263, "supplier", "building_contractor", "Building Contractor", "General / Prime Contractors"),
+    (264, "supplier", "commercial_framing_contractor", "Commercial Framing Contractor", "Structural, Concrete & Framing"),
+    (265, "supplier", "commercial_roofing_contractor", "Commercial Roofing contractor", "Building Envelope, Openings & Exterior"),
+    (266, "supplier", "contents_packout_cleaning_company", "Contents pack-out / cleaning company", "Environmental, Hazmat & Remediation"),
+    (267, "supplier", "demolition_contractor", "Demolition Contractor", "Environmental, Hazmat & Remediation"),
+    (268, "supplier", "drilling_caisson_contractor", "Drilling / caisson contractor", "Sitework, Civil, Utilities & Logistics"),
+    (269, "supplier", "exterior_cladding_contractor", "Exterior cladding contractor", "Building Envelope, Openings & Exterior"),
+    (270, "supplier", "lead_shielding_contractor", "Lead shielding contractor (imaging/X-ray)", "Specialty Equipment, Vertical Transport & Compliance"),
+    (271, "supplier", "millwork_installer", "Millwork installer (counters, displays, back bar)", "Interiors & Finish Trades"),
+    (272, "supplier", "mold_remediation_contractor", "Mold remediation contractor", "Environmental, Hazmat & Remediation"),
+    (273, "supplier", "monument_sign_fabricator", "Monument sign fabricator", "Landscaping, Hardscape & Site Amenities"),
+    (274, "supplier", "overhead_door_storefront_entry_door_installer", "Overhead door / storefront entry door installer", "Building Envelope, Openings & Exterior"),
+    (275, "supplier", "pest_control_termite", "Pest Control / Termite", "Environmental, Hazmat & Remediation"),
+    (276, "supplier", "recycling_salvage_contractor", "Recycling / salvage contractor", "Sitework, Civil, Utilities & Logistics"),
+    (277, "supplier", "sheet_metal_contractor", "Sheet metal contractor (edge metal, copings, custom flashings)", "Building Envelope, Openings & Exterior"),
+    (278, "supplier", "sheet_metal_ductwork_contractor", "Sheet metal / ductwork contractor", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (279, "supplier", "site_security_installer", "Site Security installer", "Electrical, Low Voltage, Controls & Security"),
+    (280, "supplier", "stair_guardrail_handrail_contractor", "Stair / guardrail / handrail contractor", "Structural, Concrete & Framing"),
+    (281, "supplier", "storefront_glazing_curtain_wall_contractor", "Storefront / glazing / curtain wall contractor", "Building Envelope, Openings & Exterior"),
+    (282, "supplier", "striping_signage_installer", "Striping/signage installer", "Landscaping, Hardscape & Site Amenities"),
+    (283, "supplier", "tab_contractor_air_balancing", "TAB contractor (air balancing)", "Mechanical (HVAC, Refrigeration, Ductwork & TAB)"),
+    (284, "supplier", "third_party_nfpa99_medical_gas_verifier", "Third-party verifier / certifier; NFPA 99 medical gas verification agency / verifier", "Medical Gas, Specialty Gas & Healthcare Systems"),
+    (285, "supplier", "water_mitigation_company", "Water mitigation company", "Environmental, Hazmat & Remediation"),
+    (286, "supplier", "zone_valve_box_supplier", "Zone valve box supplier", "Plumbing, Water, Drainage & Venting"),
+    (287, "supplier", "doors_frames_hardware_supplier", "Doors/frames/hardware supplier", "Openings, Hardware, Glass & Storefront"),
+    (288, "supplier", "elevator_oem_manufacturer", "Elevator OEM / manufacturer (cab, controller, machine, doors, rails)", "Vertical Transportation & Lifts"),
+)
+
+
+def _lookup_key(name: str) -> str:
+    """Spelling-insensitive key: 'Window/Door Contractor' == 'window / door contractor'."""
+    return re.sub(r"[^a-z0-9]", "", name.casefold().replace("&", "and"))
+
+
+TRADES = tuple(Trade(*row) for row in _TRADE_ROWS)
+
+BY_ID = MappingProxyType({t.id: t for t in TRADES})
+BY_SLUG = MappingProxyType({t.slug: t for t in TRADES})
+BY_DISPLAY_NAME = MappingProxyType({t.display_name: t for t in TRADES})
+_BY_LOOKUP_KEY = MappingProxyType(
+    {
+        **{_lookup_key(t.slug): t for t in TRADES},
+        **{_lookup_key(t.display_name): t for t in TRADES},
+    }
+)
+
+CONTRACTOR_TRADES = tuple(t for t in TRADES if t.role == CONTRACTOR)
+SUPPLIER_TRADES = tuple(t for t in TRADES if t.role == SUPPLIER)
+
+BY_CATEGORY = MappingProxyType(
+    {c: tuple(t for t in TRADES if t.category == c) for c in CATEGORIES}
+)
+
+# Display name -> slug, per role (the shape the AI matching endpoints use)
+CONTRACTOR_SLUG_DISPLAY_MAP = MappingProxyType(
+    {t.display_name: t.slug for t in CONTRACTOR_TRADES}
+)
+SUPPLIER_SLUG_DISPLAY_MAP = MappingProxyType(
+    {t.display_name: t.slug for t in SUPPLIER_TRADES}
+)
+
+
+def trades_for_role(role: str) -> tuple:
+    return CONTRACTOR_TRADES if role.lower() == CONTRACTOR else SUPPLIER_TRADES
+
+
+def find_trade(name_or_slug: Optional[str]) -> Optional[Trade]:
+    """Resolve a slug or display name (exact first, then spelling-insensitive)."""
+    if not name_or_slug:
+        return None
+    value = name_or_slug.strip()
+    trade = BY_SLUG.get(value) or BY_DISPLAY_NAME.get(value)
+    if trade is None:
+        trade = _BY_LOOKUP_KEY.get(_lookup_key(value))
+    return trade
+
+
+def slug_for(display_name: Optional[str]) -> Optional[str]:
+    trade = find_trade(display_name)
+    return trade.slug if trade else None
+
+
+def display_name_for(slug: Optional[str]) -> Optional[str]:
+    trade = find_trade(slug)
+    return trade.display_name if trade else None
+
+
+def split_slugs(audience_type_slugs: Optional[str]) -> List[str]:
+    """Split a comma-separated ``audience_type_slugs`` value."""
+    if not audience_type_slugs:
+        return []
+    return [s.strip() for s in audience_type_slugs.split(",") if s.strip()]
+
+
+def to_slugs(values: Iterable[str]) -> List[str]:
+    """Canonicalise slugs/display names to slugs; unknown values pass through unchanged."""
+    result = []
+    for value in values or []:
+        trade = find_trade(value)
+        slug = trade.slug if trade else (value or "").strip()
+        if slug and slug not in result:
+            result.append(slug)
+    return result
+
+
+def slug_lookup_keys() -> dict:
+    """Spelling-insensitive lookup key -> slug, for canonicalising profile values in SQL.
+
+    The SQL equivalent of the key is
+    ``regexp_replace(replace(lower(value), '&', 'and'), '[^a-z0-9]', '', 'g')``.
+    """
+    return {key: trade.slug for key, trade in _BY_LOOKUP_KEY.items()}
+
+
+def audience_names(slugs: Iterable[str]) -> Optional[str]:
+    """Build an ``audience_type_names`` value (" | " separated) for known slugs."""
+    names = [t.display_name for t in (find_trade(s) for s in slugs) if t]
+    return " | ".join(names) if names else None
+
+
+def ids_for_slugs(slugs: Iterable[str]) -> List[int]:
+    """Compact integer form of an audience (unknown slugs are dropped)."""
+    return [t.id for t in (find_trade(s) for s in slugs) if t]
+
+
+def slugs_for_ids(ids: Iterable[int]) -> List[str]:
+    return [BY_ID[i].slug for i in ids if i in BY_ID]
+
+
+def search(term: Optional[str], role: Optional[str] = None) -> List[Trade]:
+    """Trades whose display name, slug or category contains ``term`` (case-insensitive)."""
+    trades = trades_for_role(role) if role else TRADES
+    if not term:
+        return list(trades)
+    needle = term.casefold()
+    return [
+        t
+        for t in trades
+        if needle in t.display_name.casefold()
+        or needle in t.slug
+        or needle in t.category.casefold()
+    ]
+
+
+def catalog_text(role: str) -> str:
+    """Role catalog grouped by category, one line per category (used in prompts)."""
+    lines = []
+    for category in CATEGORIES:
+        names = [t.display_name for t in BY_CATEGORY[category] if t.role == role]
+        if names:
+            lines.append(f"{category}: " + "; ".join(names))
+    return "\n".join(lines)
@@ -6,77 +6,21 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from sqlalchemy import inspect, text
-from src.app import models
 from src.app.api.api import api_router
-from src.app.core.database import engine
+from src.app.core.query_fanout import query_fanout
+from src.app.core.response_cache import response_cache
+from src.app.core.schema_bootstrap import bootstrap_on_startup, bootstrap_schema
+from src.app.services.background_tasks import register_background_tasks
+from src.app.services.email_outbox import email_outbox_sender
+from src.app.services.email_template_pool import email_template_pool
+from src.app.services.groq_client import groq_client
+from src.app.services.loop_watchdog import event_loop_watchdog
+from src.app.services.scheduler import run_blocking, scheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize database tables
-logger.info("Initializing database tables...")
-try:
-    # Get existing tables before creation
-    inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
-
-    # Create all tables
-    models.Base.metadata.create_all(bind=engine)
-
-    # Auto-migration: Add missing columns if tables exist (if needed in future)
-    # Uncomment and modify this section if you need to add new columns to existing tables
-    # with engine.connect() as conn:
-    #     try:
-    #         conn.execute(text("ALTER TABLE table_name ADD COLUMN IF NOT EXISTS column_name TYPE"))
-    #         conn.commit()
-    #         logger.info("✓ Column migration completed")
-    #     except Exception as col_error:
-    #         logger.warning(f"Column migration note: {str(col_error)}")
-    #         conn.rollback()
-
-    # Get tables after creation
-    inspector = inspect(engine)
-    final_tables = inspector.get_table_names()
-
-    # Log the results
-    expected_tables = [
-        "users",
-        "notifications",
-        "password_resets",
-        "contractors",
-        "suppliers",
-        "subscriptions",
-        "subscribers",
-        "jobs",
-        "unlocked_leads",
-    ]
-    for table in expected_tables:
-        if table in final_tables:
-            if table not in existing_tables:
-                logger.info(f"✓ Table created: {table}")
-            else:
-                logger.info(f"✓ Table exists: {table}")
-        else:
-            logger.warning(f"✗ Table missing: {table}")
-
-    logger.info("Database initialization completed successfully")
-except Exception as e:
-    logger.error(f"Error initializing database: {str(e)}")
-    # Don't raise here to allow the app to start for local development or debugging
-    # when the database is temporarily unreachable. In production you may want to
-    # re-raise to fail fast.
-    logger.warning(
-        "Continuing without database connection. Some endpoints may fail until DB is available."
-    )
-
-import stripe
-from src.app.services.job_cleanup_service import job_cleanup_service
-from src.app.services.job_status_service import job_status_service
-from src.app.services.push_notification_service import push_notification_service
-from src.app.services.trial_expiry_service import trial_expiry_service
-
 app = FastAPI(
     title="TigerLeads API",
     swagger_ui_parameters={"persistAuthorization": True},
@@ -117,30 +61,37 @@ app.openapi = custom_openapi
 @app.on_event("startup")
 async def startup_event():
     """Start background services when the application starts."""
+    if bootstrap_on_startup():
+        # Off the event loop; requests are served once the schema is current
+        if not await run_blocking(bootstrap_schema):
+            # Don't raise here to allow the app to start for local development
+            # or debugging when the database is temporarily unreachable.
+            logger.warning(
+                "Continuing without database connection. Some endpoints may fail until DB is available."
+            )
+
     logger.info("Starting background services...")
     try:
-        await job_cleanup_service.start()
-        logger.info("✓ Job cleanup service started successfully")
+        await event_loop_watchdog.start()
     except Exception as e:
-        logger.error(f"Failed to start job cleanup service: {str(e)}")
+        logger.error(f"Failed to start event loop watchdog: {str(e)}")
 
     try:
-        await trial_expiry_service.start()
-        logger.info("✓ Trial expiry service started successfully")
+        register_background_tasks(scheduler)
+        await scheduler.start()
+        logger.info("✓ Background scheduler started successfully")
     except Exception as e:
-        logger.error(f"Failed to start trial expiry service: {str(e)}")
+        logger.error(f"Failed to start background scheduler: {str(e)}")
 
     try:
-        await job_status_service.start()
-        logger.info("✓ Job status service started successfully")
+        await email_template_pool.start()
     except Exception as e:
-        logger.error(f"Failed to start job status service: {str(e)}")
+        logger.error(f"Failed to start email template pool: {str(e)}")
 
     try:
-        await push_notification_service.start()
-        logger.info("✓ Push notification service started successfully")
+        await email_outbox_sender.start()
     except Exception as e:
-        logger.error(f"Failed to start push notification service: {str(e)}")
+        logger.error(f"Failed to start email outbox sender: {str(e)}")
 
 
 # Shutdown event: Stop background services
@@ -149,39 +100,35 @@ async def shutdown_event():
     """Stop background services when the application shuts down."""
     logger.info("Stopping background services...")
     try:
-        await job_cleanup_service.stop()
-        logger.info("✓ Job cleanup service stopped successfully")
+        await scheduler.stop()
+        logger.info("✓ Background scheduler stopped successfully")
     except Exception as e:
-        logger.error(f"Failed to stop job cleanup service: {str(e)}")
+        logger.error(f"Failed to stop background scheduler: {str(e)}")
 
     try:
-        await trial_expiry_service.stop()
-        logger.info("✓ Trial expiry service stopped successfully")
+        await email_template_pool.stop()
+        logger.info("✓ Email template pool stopped successfully")
     except Exception as e:
-        logger.error(f"Failed to stop trial expiry service: {str(e)}")
+        logger.error(f"Failed to stop email template pool: {str(e)}")
 
     try:
-        await job_status_service.stop()
-        logger.info("✓ Job status service stopped successfully")
+        await email_outbox_sender.stop()
     except Exception as e:
-        logger.error(f"Failed to stop job status service: {str(e)}")
+        logger.error(f"Failed to stop email outbox sender: {str(e)}")
 
     try:
-        await push_notification_service.stop()
-        logger.info("✓ Push notification service stopped successfully")
+        await event_loop_watchdog.stop()
     except Exception as e:
-        logger.error(f"Failed to stop push notification service: {str(e)}")
+        logger.error(f"Failed to stop event loop watchdog: {str(e)}")
 
+    try:
+        await groq_client.aclose()
+        logger.info("✓ Groq HTTP client closed")
+    except Exception as e:
+        logger.error(f"Failed to close Groq HTTP client: {str(e)}")
 
-# Log Stripe package info at startup to detect corrupted installs
-try:
-    logger.info(
-        "stripe.__version__=%s stripe.apps_type=%s",
-        getattr(stripe, "__version__", None),
-        type(getattr(stripe, "apps", None)),
-    )
-except Exception:
-    logger.exception("Failed to introspect stripe package at startup")
+    query_fanout.shutdown()
+    response_cache.shutdown()
 
 
 # Temporary request/response logging middleware to help debug webhook deliveries
@@ -270,5 +217,11 @@ def stripe_status():
     return {"stripe_version": version, "subscription_py_sha1": sha1}
 
 
+@app.get("/__event_loop_lag")
+def event_loop_lag():
+    """Event loop lag measured by the watchdog (blocking calls on the loop show up here)."""
+    return event_loop_watchdog.snapshot()
+
+
 # Note: File uploads have been disabled for Vercel deployment
 # For production, configure cloud storage (S3, Vercel Blob, etc.)
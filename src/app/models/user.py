@@ -5,12 +5,17 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
+    Numeric,
     String,
+    Table,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from src.app.core.database import Base
@@ -41,9 +46,14 @@ class User(Base):
     )
     stripe_customer_id = Column(String(255), nullable=True, unique=True, index=True)
     note = Column(Text, nullable=True)  # Admin notes about the user
-    profile_picture_data = Column(
-        LargeBinary, nullable=True
-    )  # Profile picture binary data
+    # Deferred: only the profile picture endpoints need the bytes, not every
+    # auth lookup
+    profile_picture_data = deferred(
+        Column(LargeBinary, nullable=True)
+    )  # Legacy picture bytes, moved to the blob store by blob_extraction
+    profile_picture_blob = Column(
+        String(64), nullable=True
+    )  # SHA-256 of the picture in the blob store (services/blob_store.py)
     profile_picture_content_type = Column(
         String(50), nullable=True
     )  # MIME type (e.g., 'image/jpeg')
@@ -161,11 +171,20 @@ class Contractor(Base):
     license_status = Column(
         JSON, nullable=True
     )  # Array of statuses: ["Active", "Pending"]
-    license_picture = Column(JSON, nullable=True)  # Store multiple files as JSON array
+    # Uploaded files (JSON arrays of blob store references; base64 on rows not
+    # yet extracted) are deferred and load together on first access, so
+    # profile and list queries don't pull them
+    license_picture = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
 
     # Optional: Referrals and Job Photos (Step 2)
-    referrals = Column(JSON, nullable=True)  # Store multiple files as JSON array
-    job_photos = Column(JSON, nullable=True)  # Store multiple files as JSON array
+    referrals = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
+    job_photos = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
 
     # Step 3: Trade Information
     # `user_type` stores multiple user types for the contractor as
@@ -220,9 +239,16 @@ class Supplier(Base):
     license_status = Column(
         JSON, nullable=True
     )  # Array of statuses: ["Active", "Pending"]
-    license_picture = Column(JSON, nullable=True)  # Store multiple files as JSON array
-    referrals = Column(JSON, nullable=True)  # Store multiple files as JSON array
-    job_photos = Column(JSON, nullable=True)  # Store multiple files as JSON array
+    # Deferred like Contractor's uploads
+    license_picture = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
+    referrals = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
+    job_photos = deferred(
+        Column(JSON, nullable=True), group="uploads"
+    )  # Store multiple files as JSON array
 
     # Step 4: User Type
     # `user_type` stores multiple user types for the supplier as
@@ -362,9 +388,14 @@ class AdminUser(Base):
         Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
     note = Column(String(255), nullable=True)
-    profile_picture_data = Column(
-        LargeBinary, nullable=True
-    )  # Profile picture binary data
+    # Deferred: only the profile picture endpoints need the bytes, not every
+    # auth lookup
+    profile_picture_data = deferred(
+        Column(LargeBinary, nullable=True)
+    )  # Legacy picture bytes, moved to the blob store by blob_extraction
+    profile_picture_blob = Column(
+        String(64), nullable=True
+    )  # SHA-256 of the picture in the blob store (services/blob_store.py)
     profile_picture_content_type = Column(
         String(50), nullable=True
     )  # MIME type (e.g., 'image/jpeg')
@@ -390,7 +421,42 @@ class AdminSettings(Base):
     created_at = Column(DateTime, server_default=func.now())
 
 
-class Job(Base):
+class JobAliasesMixin:
+    """Property aliases for backward compatibility with endpoint code
+    (shared by Job and JobArchive)."""
+
+    @property
+    def permit_type(self):
+        """Alias for permit_type_norm"""
+        return self.permit_type_norm
+
+    @property
+    def email(self):
+        """Alias for contractor_email"""
+        return self.contractor_email
+
+    @property
+    def phone_number(self):
+        """Alias for contractor_phone"""
+        return self.contractor_phone
+
+    @property
+    def job_cost(self):
+        """Alias for project_cost_total"""
+        return self.project_cost_total
+
+    @property
+    def country_city(self):
+        """Alias for source_county"""
+        return self.source_county
+
+    @property
+    def user_type(self):
+        """Alias for audience_type_names for API responses"""
+        return self.audience_type_names
+
+
+class Job(JobAliasesMixin, Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -425,7 +491,9 @@ class Job(Base):
     contact_name = Column(String(255), nullable=True)  # Contact person name
     audience_type_slugs = Column(Text, nullable=True)
     audience_type_names = Column(Text, nullable=True)
-    querystring = Column(Text, nullable=True)
+    # Detail-only columns are deferred (group "detail", loaded together on
+    # first access); listings select the columns they show
+    querystring = deferred(Column(Text, nullable=True), group="detail")
     trs_score = Column(Integer, nullable=True)
     uploaded_by_contractor = Column(Boolean, default=False, nullable=False)
     uploaded_by_user_id = Column(
@@ -437,8 +505,8 @@ class Job(Base):
     job_group_id = Column(
         String(100), nullable=True, index=True
     )  # Links jobs from same submission
-    job_documents = Column(
-        JSON, nullable=True
+    job_documents = deferred(
+        Column(JSON, nullable=True), group="detail"
     )  # Store multiple uploaded files as JSON array
     property_type = Column(String(20), nullable=True)  # Residential or Commercial
 
@@ -455,41 +523,65 @@ class Job(Base):
     applicant_name = Column(String(255), nullable=True)  # Applicant name
     applicant_email = Column(String(255), nullable=True)  # Applicant email
     applicant_phone = Column(String(20), nullable=True)  # Applicant phone
-    contractor_company_and_address = Column(
-        Text, nullable=True
+    contractor_company_and_address = deferred(
+        Column(Text, nullable=True), group="detail"
     )  # Contractor company and address
-    permit_raw = Column(Text, nullable=True)  # Raw permit type description
-
-    # Property aliases for backward compatibility with endpoint code
-    @property
-    def permit_type(self):
-        """Alias for permit_type_norm"""
-        return self.permit_type_norm
-
-    @property
-    def email(self):
-        """Alias for contractor_email"""
-        return self.contractor_email
+    permit_raw = deferred(
+        Column(Text, nullable=True), group="detail"
+    )  # Raw permit type description
 
-    @property
-    def phone_number(self):
-        """Alias for contractor_phone"""
-        return self.contractor_phone
+    __table_args__ = (
+        # Serves the stale-job purge (posted, never unlocked, older than N days)
+        Index(
+            "ix_jobs_stale_purge_review_posted_at",
+            "review_posted_at",
+            postgresql_where=text(
+                "job_review_status = 'posted' AND uploaded_by_contractor = false"
+            ),
+        ),
+        # Serves the targeted push (posted jobs since a user's last notification)
+        Index(
+            "ix_jobs_posted_review_posted_at",
+            "review_posted_at",
+            postgresql_where=text("job_review_status = 'posted'"),
+        ),
+        # Serves the analytics rollup refresh (jobs created in recent days)
+        Index("ix_jobs_created_at", "created_at"),
+        # Serves the posting of approved jobs (job_status.post_due)
+        Index(
+            "ix_jobs_approved_pending",
+            "review_posted_at",
+            postgresql_where=text(
+                "job_review_status = 'pending' AND uploaded_by_contractor = false"
+            ),
+        ),
+    )
 
-    @property
-    def job_cost(self):
-        """Alias for project_cost_total"""
-        return self.project_cost_total
 
-    @property
-    def country_city(self):
-        """Alias for source_county"""
-        return self.source_county
+class JobArchive(JobAliasesMixin, Base):
+    """
+    Cold storage for retired jobs: same columns as ``jobs`` plus when and why
+    the row was archived (see services/job_archive.py). Columns added to
+    ``jobs`` must be added here too on existing databases.
+    """
 
-    @property
-    def user_type(self):
-        """Alias for audience_type_names for API responses"""
-        return self.audience_type_names
+    __table__ = Table(
+        "jobs_archive",
+        Base.metadata,
+        *[
+            Column(
+                c.name,
+                c.type,
+                primary_key=c.primary_key,
+                autoincrement=False,
+                nullable=c.primary_key is False,
+            )
+            for c in Job.__table__.columns
+        ],
+        Column("archived_at", DateTime, server_default=func.now(), nullable=False),
+        Column("archive_reason", String(50), nullable=True),
+        Index("ix_jobs_archive_uploaded_by_user_id", "uploaded_by_user_id"),
+    )
 
 
 class UnlockedLead(Base):
@@ -508,6 +600,22 @@ class UnlockedLead(Base):
     job_snapshot = Column(JSON, nullable=True)  # Snapshot of job data at unlock time
 
 
+class JobTradeUnlockCount(Base):
+    """
+    Number of distinct users of each trade (contractor/supplier user_type) that
+    unlocked a job. Maintained by unlock_job in the same transaction as the
+    unlock (see services/unlock_counters.py).
+    """
+
+    __tablename__ = "job_trade_unlock_counts"
+
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    trade = Column(String(255), primary_key=True)
+    unlock_count = Column(Integer, nullable=False, default=0)
+
+
 class NotInterestedJob(Base):
     __tablename__ = "not_interested_jobs"
 
@@ -678,3 +786,205 @@ class PushSubscription(Base):
     last_notified_at = Column(
         DateTime, nullable=True
     )  # Track when last notification was sent
+    last_job_push_at = Column(
+        DateTime, nullable=True
+    )  # Last real-time "new leads" push (rate cap), separate from the weekly one
+
+
+class CreditLedgerEntry(Base):
+    """
+    Audit trail of credit balance changes made by the system (e.g. trial
+    expiry). ``credits_delta`` is negative for credits removed.
+    """
+
+    __tablename__ = "credit_ledger_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    subscriber_id = Column(
+        Integer, ForeignKey("subscribers.id", ondelete="SET NULL"), nullable=True
+    )
+    entry_type = Column(String(50), nullable=False)  # trial_expired, ...
+    credits_delta = Column(Integer, nullable=False)
+    balance_after = Column(Integer, nullable=True)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_credit_ledger_entries_user_id_created_at", "user_id", "created_at"),
+    )
+
+
+class JobPostedEvent(Base):
+    """
+    Outbox of jobs that became 'posted', written in the same transaction as
+    the status change and consumed by services/job_posted_push.py.
+    """
+
+    __tablename__ = "job_posted_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_job_posted_outbox_pending",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
+
+
+class JobPushPending(Base):
+    """
+    Posted jobs matched to a user but not yet pushed to them (the user was
+    rate-capped), drained by services/job_posted_push.py.
+    """
+
+    __tablename__ = "job_push_pending"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing transactional emails, delivered by the background sender in
+    services/email_outbox.py. ``dedup_key`` keeps the same email from being
+    queued twice within the dedup window and doubles as the Resend
+    idempotency key.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dedup_key = Column(String(128), nullable=False, unique=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    html = Column(Text, nullable=True)
+    text_body = Column(Text, nullable=True)  # Plain-text fallback
+    reply_to = Column(String(255), nullable=True)
+    status = Column(String(20), default="pending", nullable=False)  # pending, sent, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    provider_id = Column(String(100), nullable=True)  # Resend email id
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+
+class DailyUserFact(Base):
+    """
+    Daily rollup of user activity for the admin analytics dashboard,
+    maintained by services/analytics_rollups.py.
+
+    ``state`` / ``county`` come from the user's profile (contractor state /
+    supplier service_states, and country_city). A user listing several of
+    them is counted once under each, and once more under '*' (any), so a
+    filter reads exactly one value per dimension without double counting.
+    ``role`` is the user's role and ``tier`` their subscription name ('' for
+    none); both are single-valued, so "All" sums over them.
+    """
+
+    __tablename__ = "daily_user_facts"
+
+    day = Column(Date, primary_key=True)
+    state = Column(String(100), primary_key=True)
+    county = Column(String(100), primary_key=True)
+    role = Column(String(20), primary_key=True)
+    tier = Column(String(50), primary_key=True)
+    new_users = Column(Integer, nullable=False, default=0)  # users.created_at
+    # Currently active subscribers, by subscription_start_date (9999-12-31 if unset)
+    active_subscribers = Column(Integer, nullable=False, default=0)
+    saved_jobs = Column(Integer, nullable=False, default=0)  # saved_jobs.saved_at
+    not_interested_jobs = Column(Integer, nullable=False, default=0)  # marked_at
+
+
+class DailyCreditFlow(Base):
+    """
+    Daily credits granted / purchased / spent / frozen, plus unlocks and
+    payment revenue, keyed like daily_user_facts by the acting user.
+    Maintained by services/analytics_rollups.py.
+    """
+
+    __tablename__ = "daily_credit_flow"
+
+    day = Column(Date, primary_key=True)
+    state = Column(String(100), primary_key=True)
+    county = Column(String(100), primary_key=True)
+    role = Column(String(20), primary_key=True)
+    tier = Column(String(50), primary_key=True)
+    granted = Column(Integer, nullable=False, default=0)  # trial credits, by start date
+    purchased = Column(Integer, nullable=False, default=0)  # plan credits, by start date
+    spent = Column(Integer, nullable=False, default=0)  # unlocked_leads.credits_spent
+    frozen = Column(Integer, nullable=False, default=0)  # by frozen_at
+    unlocks = Column(Integer, nullable=False, default=0)  # by unlocked_at
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)  # payments.amount (USD)
+
+
+class DailyJobFact(Base):
+    """
+    Daily rollup of jobs by the job's state, county (source_county) and
+    category (audience_type_names), maintained by
+    services/analytics_rollups.py. Job rows (jobs created that day) have
+    role = tier = ''; unlock rows (unlocks made that day) carry the
+    unlocking user's role and tier.
+    """
+
+    __tablename__ = "daily_job_facts"
+
+    day = Column(Date, primary_key=True)
+    state = Column(String(100), primary_key=True)
+    county = Column(String(100), primary_key=True)
+    category = Column(Text, primary_key=True)
+    role = Column(String(20), primary_key=True)
+    tier = Column(String(50), primary_key=True)
+    jobs_created = Column(Integer, nullable=False, default=0)
+    jobs_posted = Column(Integer, nullable=False, default=0)  # currently 'posted'
+    unlocks = Column(Integer, nullable=False, default=0)
+    unlock_credits = Column(Integer, nullable=False, default=0)
+
+
+class SchedulerRun(Base):
+    """
+    One row per run of a background scheduler task (see services/scheduler.py).
+    Also used to decide whether a task is due, so each task runs once per
+    interval across all instances.
+    """
+
+    __tablename__ = "scheduler_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(100), nullable=False)
+    instance_id = Column(String(255), nullable=True)  # hostname:pid that ran it
+    status = Column(
+        String(20), nullable=False, default="running"
+    )  # running, success, failed, timeout
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    rows_affected = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scheduler_runs_job_name_started_at", "job_name", "started_at"),
+    )
@@ -0,0 +1,443 @@
+"""
+Batch AI Matching Service
+
+Assigns audiences to bulk-ingested jobs that arrived without
+``audience_type_slugs``. Instead of one LLM call per job per role, the pipeline:
+
+1. Loads the unmatched jobs and groups them by a feature hash, so identical
+   permits (same type, property, cost bucket and description) share one answer.
+2. Packs several unique jobs into each prompt.
+3. Runs prompts with bounded concurrency through the shared Groq client.
+4. Writes ``audience_type_slugs``/``audience_type_names``/``day_offset`` back
+   for every job in a single set-based UPDATE.
+5. For jobs queued by bulk ingest, queues push fan-out of the posted ones
+   (services/job_posted_push.py), which ingest leaves to this step.
+
+Progress, token usage and estimated cost of the current/last run are exposed
+through ``batch_matching_service.progress``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import or_, text
+
+from src.app import models
+from src.app.core.database import SessionLocal
+from src.app.data.trade_taxonomy import (
+    CONTRACTOR_SLUG_DISPLAY_MAP,
+    SUPPLIER_SLUG_DISPLAY_MAP,
+)
+from src.app.services.groq_client import groq_client
+from src.app.services.job_posted_push import JOB_POSTED_OUTBOX_SQL
+
+logger = logging.getLogger("uvicorn.error")
+
+# USD per million tokens, used only for the reported cost estimate
+PRICE_INPUT_PER_M = float(os.getenv("GROQ_PRICE_INPUT_PER_M", "0.59"))
+PRICE_OUTPUT_PER_M = float(os.getenv("GROQ_PRICE_OUTPUT_PER_M", "0.79"))
+
+ROLES = ("contractor", "supplier")
+
+
+def cost_bucket(cost) -> str:
+    """Coarse project-cost bucket so near-identical permits share a hash.
+
+    Accepts ints as well as display strings such as "$450,000".
+    """
+    if isinstance(cost, str):
+        cost = re.sub(r"[^\d.]", "", cost)
+    try:
+        value = int(float(cost))
+    except (TypeError, ValueError):
+        return "unknown"
+    for limit, label in (
+        (10_000, "<10k"),
+        (50_000, "10k-50k"),
+        (250_000, "50k-250k"),
+        (1_000_000, "250k-1m"),
+    ):
+        if value < limit:
+            return label
+    return "1m+"
+
+
+def _normalize(value: Optional[str], limit: int = 400) -> str:
+    return " ".join((value or "").lower().split())[:limit]
+
+
+def job_feature_hash(job) -> str:
+    """Stable hash of the job fields the matcher actually looks at."""
+    parts = [
+        _normalize(job.permit_type_norm),
+        _normalize(job.property_type),
+        _normalize(job.permit_status),
+        cost_bucket(job.project_cost_total),
+        _normalize(job.project_description),
+    ]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+class BatchMatchingService:
+    """Deduplicated, packed and concurrent AI audience matching for jobs."""
+
+    def __init__(self, jobs_per_prompt: int = 8, max_concurrency: int = 4):
+        self.jobs_per_prompt = jobs_per_prompt
+        self.max_concurrency = max_concurrency
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._pending_ids: set = set()
+        self.progress = self._empty_progress()
+
+    @staticmethod
+    def _empty_progress() -> dict:
+        return {
+            "state": "idle",
+            "started_at": None,
+            "finished_at": None,
+            "jobs_total": 0,
+            "unique_features": 0,
+            "prompts_total": 0,
+            "prompts_done": 0,
+            "prompts_failed": 0,
+            "jobs_matched": 0,
+            "jobs_unmatched": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "estimated_cost_usd": 0.0,
+            "error": None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    # ------------------------------------------------------------------
+    # DB helpers (synchronous; run via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def _load_unmatched_jobs(self, job_ids: Optional[List[int]], limit: int) -> list:
+        db = SessionLocal()
+        try:
+            Job = models.user.Job
+            query = db.query(
+                Job.id,
+                Job.permit_type_norm,
+                Job.property_type,
+                Job.permit_status,
+                Job.project_cost_total,
+                Job.project_description,
+            ).filter(
+                Job.uploaded_by_contractor == False,
+                or_(Job.audience_type_slugs.is_(None), Job.audience_type_slugs == ""),
+            )
+            if job_ids:
+                query = query.filter(Job.id.in_(job_ids))
+            return query.order_by(Job.id).limit(limit).all()
+        finally:
+            db.close()
+
+    def _write_back(self, rows: List[tuple]) -> int:
+        """Bulk-update audiences with one UPDATE ... FROM unnest(...)."""
+        if not rows:
+            return 0
+        ids, slugs, names, offsets = (list(col) for col in zip(*rows))
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                text(
+                    """
+                    UPDATE jobs AS j
+                    SET audience_type_slugs = v.slugs,
+                        audience_type_names = v.names,
+                        day_offset = v.day_offset
+                    FROM unnest(
+                        CAST(:ids AS integer[]),
+                        CAST(:slugs AS text[]),
+                        CAST(:names AS text[]),
+                        CAST(:offsets AS integer[])
+                    ) AS v(id, slugs, names, day_offset)
+                    WHERE j.id = v.id
+                    AND (j.audience_type_slugs IS NULL OR j.audience_type_slugs = '')
+                    """
+                ),
+                {"ids": ids, "slugs": slugs, "names": names, "offsets": offsets},
+            )
+            db.commit()
+            return result.rowcount
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _queue_posted(self, job_ids: List[int]):
+        """Queue push fan-out for the posted jobs among ``job_ids``, matched or not."""
+        db = SessionLocal()
+        try:
+            db.execute(
+                text(
+                    "WITH posted AS (SELECT id FROM jobs "
+                    "WHERE id = ANY(:job_ids) AND job_review_status = 'posted') "
+                    + JOB_POSTED_OUTBOX_SQL
+                ),
+                {"job_ids": job_ids},
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Batch Matching] Failed to queue job push fan-out: {str(e)}")
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Prompting
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _catalog(role: str) -> dict:
+        return (
+            CONTRACTOR_SLUG_DISPLAY_MAP if role == "contractor" else SUPPLIER_SLUG_DISPLAY_MAP
+        )
+
+    @staticmethod
+    def _prompt_catalog(role: str) -> tuple:
+        """Return (static prompt prefix, numbered catalog) shared with /suggest-*."""
+        # Imported lazily: the endpoint module imports this service
+        from src.app.api.endpoints.ai_job_matching import (
+            CONTRACTOR_PROMPT_PREFIX,
+            CONTRACTOR_PROMPT_TYPES,
+            SUPPLIER_PROMPT_PREFIX,
+            SUPPLIER_PROMPT_TYPES,
+        )
+
+        if role == "contractor":
+            return CONTRACTOR_PROMPT_PREFIX, CONTRACTOR_PROMPT_TYPES
+        return SUPPLIER_PROMPT_PREFIX, SUPPLIER_PROMPT_TYPES
+
+    def _build_system_prompt(self, role: str) -> str:
+        prefix, _ = self._prompt_catalog(role)
+        return (
+            f"{prefix}\n\n"
+            'Return ONLY valid JSON with one entry per job number: '
+            '{"results": [{"job": 1, "matches": [[id, offset_days], ...]}]}'
+        )
+
+    def _build_batch_prompt(self, role: str, jobs: list) -> str:
+        lines = ["JOBS:"]
+        for idx, job in enumerate(jobs, start=1):
+            lines.append(
+                f"{idx}. Project Type: {job.permit_type_norm or 'construction project'}"
+                f" | Property: {job.property_type or 'property'}"
+                f" | Budget: {cost_bucket(job.project_cost_total)}"
+                f" | Permit Status: {job.permit_status or 'unknown'}"
+                f" | Description: {_normalize(job.project_description, 300) or 'construction work'}"
+            )
+        return "\n".join(lines)
+
+    def _record_usage(self, usage: Optional[dict]):
+        if not usage:
+            return
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        self.progress["prompt_tokens"] += prompt_tokens
+        self.progress["completion_tokens"] += completion_tokens
+        self.progress["estimated_cost_usd"] = round(
+            self.progress["prompt_tokens"] / 1_000_000 * PRICE_INPUT_PER_M
+            + self.progress["completion_tokens"] / 1_000_000 * PRICE_OUTPUT_PER_M,
+            6,
+        )
+
+    async def _match_batch(
+        self, role: str, jobs: list, api_key: str, model: str, semaphore: asyncio.Semaphore
+    ) -> dict:
+        """Return {position_in_batch: [match, ...]} for one packed prompt."""
+        request_body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": self._build_system_prompt(role)},
+                {"role": "user", "content": self._build_batch_prompt(role, jobs)},
+            ],
+            "temperature": 0.3,
+            # ~40 [id, offset] pairs per job at ~6 tokens each
+            "max_tokens": min(8000, 250 * len(jobs)),
+            "response_format": {"type": "json_object"},
+        }
+        async with semaphore:
+            try:
+                response_json = await groq_client.chat_completion(
+                    api_key, request_body, deadline=60
+                )
+                self._record_usage(response_json.get("usage"))
+                result = groq_client.parse_json_content(response_json)
+            except HTTPException as e:
+                self.progress["prompts_failed"] += 1
+                logger.error(
+                    "[Batch Matching] %s prompt of %d job(s) failed: %s",
+                    role,
+                    len(jobs),
+                    e.detail,
+                )
+                return {}
+            finally:
+                self.progress["prompts_done"] += 1
+
+        from src.app.api.endpoints.ai_job_matching import decode_catalog_matches
+
+        _, prompt_types = self._prompt_catalog(role)
+        by_position = {}
+        for entry in result.get("results", []) or []:
+            try:
+                position = int(entry.get("job")) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= position < len(jobs):
+                by_position[position] = decode_catalog_matches(
+                    entry.get("matches"), prompt_types
+                )
+        return by_position
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    def schedule(self, job_ids: List[int]):
+        """Queue jobs for matching in the background (used by bulk ingest).
+
+        Ids arriving while a run is in progress are picked up by a follow-up run.
+        """
+        self._pending_ids.update(job_ids)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain_pending())
+            logger.info(f"[Batch Matching] Scheduled matching for {len(job_ids)} job(s)")
+
+    def start(self, job_ids: Optional[List[int]] = None, limit: int = 5000):
+        """Start a run in the background (admin-triggered sweep)."""
+        self._sweep_task = asyncio.create_task(self.run(job_ids=job_ids, limit=limit))
+
+    async def _drain_pending(self):
+        while self._pending_ids:
+            # Wait for a run in progress (e.g. an admin sweep) instead of being
+            # refused by run(), which would drop the queued ids
+            async with self._lock:
+                job_ids = sorted(self._pending_ids)
+                self._pending_ids.clear()
+                await self._tracked_run(job_ids, len(job_ids))
+            # Push fan-out now that the audiences are written (or failed to be)
+            await asyncio.to_thread(self._queue_posted, job_ids)
+
+    async def run(self, job_ids: Optional[List[int]] = None, limit: int = 5000) -> dict:
+        """Match unmatched ingested jobs (optionally restricted to ``job_ids``)."""
+        if self._lock.locked():
+            logger.warning("[Batch Matching] A run is already in progress")
+            return self.progress
+
+        async with self._lock:
+            await self._tracked_run(job_ids, limit)
+        return self.progress
+
+    async def _tracked_run(self, job_ids: Optional[List[int]], limit: int):
+        """``_run`` with progress bookkeeping; the caller holds ``_lock``."""
+        self.progress = self._empty_progress()
+        self.progress["state"] = "running"
+        self.progress["started_at"] = datetime.utcnow().isoformat()
+        try:
+            await self._run(job_ids, limit)
+            self.progress["state"] = "completed"
+        except Exception as e:
+            self.progress["state"] = "failed"
+            self.progress["error"] = str(e)
+            logger.error(f"[Batch Matching] Run failed: {str(e)}")
+        finally:
+            self.progress["finished_at"] = datetime.utcnow().isoformat()
+
+    async def _run(self, job_ids: Optional[List[int]], limit: int):
+        api_key = os.getenv("GROQ_API_KEY")
+        model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+        if not api_key:
+            raise RuntimeError("GROQ_API_KEY is not configured")
+
+        jobs = await asyncio.to_thread(self._load_unmatched_jobs, job_ids, limit)
+        self.progress["jobs_total"] = len(jobs)
+        if not jobs:
+            logger.info("[Batch Matching] No unmatched jobs to process")
+            return
+
+        # Dedupe: one representative job per feature hash
+        groups: dict = {}
+        for job in jobs:
+            groups.setdefault(job_feature_hash(job), []).append(job)
+        hashes = list(groups.keys())
+        representatives = [groups[h][0] for h in hashes]
+        self.progress["unique_features"] = len(hashes)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = list(_chunks(list(range(len(hashes))), self.jobs_per_prompt))
+        self.progress["prompts_total"] = len(batches) * len(ROLES)
+
+        tasks = []
+        for role in ROLES:
+            for batch in batches:
+                batch_jobs = [representatives[i] for i in batch]
+                tasks.append(
+                    (role, batch, self._match_batch(role, batch_jobs, api_key, model, semaphore))
+                )
+        results = await asyncio.gather(*(t[2] for t in tasks))
+
+        # Collect matches per feature hash across both roles
+        matches_by_hash: dict = {h: [] for h in hashes}
+        for (role, batch, _), by_position in zip(tasks, results):
+            catalog = self._catalog(role)
+            for position, matches in by_position.items():
+                feature = hashes[batch[position]]
+                for m in matches:
+                    slug = catalog.get(m["user_type"])
+                    if slug:
+                        matches_by_hash[feature].append(
+                            (m["user_type"], slug, m["offset_days"])
+                        )
+
+        rows = []
+        for feature, matches in matches_by_hash.items():
+            if not matches:
+                self.progress["jobs_unmatched"] += len(groups[feature])
+                continue
+            seen = set()
+            unique = []
+            for display_name, slug, offset in sorted(matches, key=lambda m: m[2]):
+                if slug not in seen:
+                    seen.add(slug)
+                    unique.append((display_name, slug, offset))
+            slugs = ",".join(u[1] for u in unique)
+            names = " | ".join(u[0] for u in unique)
+            # The job becomes visible when its earliest audience is due
+            day_offset = unique[0][2]
+            for job in groups[feature]:
+                rows.append((job.id, slugs, names, day_offset))
+
+        updated = await asyncio.to_thread(self._write_back, rows)
+        self.progress["jobs_matched"] = updated
+        logger.info(
+            f"[Batch Matching] ✓ Matched {updated}/{len(jobs)} jobs "
+            f"({len(hashes)} unique, {self.progress['prompts_total']} prompts, "
+            f"~${self.progress['estimated_cost_usd']})"
+        )
+
+
+# Global service instance
+batch_matching_service = BatchMatchingService(
+    jobs_per_prompt=int(os.getenv("AI_BATCH_JOBS_PER_PROMPT", "8")),
+    max_concurrency=int(os.getenv("AI_BATCH_MAX_CONCURRENCY", "4")),
+)
@@ -0,0 +1,368 @@
+"""
+Analytics Rollups
+
+Daily fact tables behind the admin analytics dashboard, so its endpoints sum
+a few pre-aggregated rows instead of scanning users, subscribers,
+unlocked_leads, jobs and payments per request:
+
+- ``daily_user_facts``: new users, active subscribers, saved and
+  not-interested jobs,
+- ``daily_credit_flow``: credits granted / purchased / spent / frozen,
+  unlocks and payment revenue,
+- ``daily_job_facts``: jobs created / posted and unlocks per job category.
+
+All are keyed by (day, state, county, role, tier); daily_job_facts also by
+category. User-side facts take state/county from the acting user's profile,
+which can list several, so each user is counted under every state/county
+they list and once more under '*' (any). A filter then reads exactly one
+value per dimension (``USER_ANY`` when not filtering) and never counts a
+user twice.
+
+Maintenance (scheduler tasks, see services/background_tasks.py):
+
+- ``refresh_recent`` recomputes the last ``ANALYTICS_ROLLUP_REFRESH_DAYS``
+  days every few minutes (plus the creation days of jobs posted within that
+  window), so today's numbers stay current,
+- ``rebuild`` recomputes everything every few hours, which picks up changes
+  to older rows (profile edits, deactivated subscriptions, purged jobs).
+
+Each refresh replaces its days in one transaction under an advisory lock.
+"""
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.app.core.database import SessionLocal
+from src.app.core.response_cache import response_cache
+from src.app.core.schema_capabilities import schema_capabilities
+from src.app.services.scheduler import advisory_lock_key, run_blocking
+
+logger = logging.getLogger("uvicorn.error")
+
+ANALYTICS_ROLLUP_REFRESH_DAYS = int(os.getenv("ANALYTICS_ROLLUP_REFRESH_DAYS", "3"))
+
+# Dimension value meaning "any" for user-side facts
+USER_ANY = "*"
+# Day under which active subscribers without a subscription_start_date are kept
+UNDATED_DAY = date(9999, 12, 31)
+# ``since`` for a full rebuild
+EPOCH = datetime(1970, 1, 1)
+
+_ROLLUP_LOCK_KEY = advisory_lock_key("analytics_rollups")
+
+# Role, tier and profile locations of every user (sub-accounts use their own)
+USER_DIMS_CTE = """
+    user_dims AS (
+        SELECT u.id AS user_id,
+               COALESCE(u.role, '') AS role,
+               COALESCE(sub.name, '') AS tier,
+               CASE WHEN u.role = 'Contractor' THEN c.state ELSE s.service_states END AS states,
+               CASE WHEN u.role = 'Contractor' THEN c.country_city ELSE s.country_city END AS counties
+        FROM users u
+        LEFT JOIN contractors c ON u.role = 'Contractor' AND c.user_id = u.id
+        LEFT JOIN suppliers s ON u.role = 'Supplier' AND s.user_id = u.id
+        LEFT JOIN subscribers sb ON sb.user_id = u.id
+        LEFT JOIN subscriptions sub ON sub.id = sb.subscription_id
+    )
+"""
+
+# One row per listed state/county plus '*', for user-side events
+USER_DIMS_EXPAND = """
+    LEFT JOIN user_dims d ON d.user_id = e.user_id
+    CROSS JOIN LATERAL (
+        SELECT '*' UNION SELECT LEFT(v, 100) FROM unnest(d.states) v WHERE v <> ''
+    ) st(state)
+    CROSS JOIN LATERAL (
+        SELECT '*' UNION SELECT LEFT(v, 100) FROM unnest(d.counties) v WHERE v <> ''
+    ) ct(county)
+"""
+
+REFRESH_USER_FACTS_SQL = f"""
+    WITH {USER_DIMS_CTE},
+    events AS (
+        SELECT id AS user_id, created_at::date AS day,
+               1 AS new_users, 0 AS active_subscribers, 0 AS saved_jobs, 0 AS not_interested_jobs
+        FROM users WHERE created_at >= :since
+        UNION ALL
+        SELECT sb.user_id, COALESCE(sb.subscription_start_date::date, :undated_day), 0, 1, 0, 0
+        FROM subscribers sb
+        JOIN subscriptions sub ON sub.id = sb.subscription_id
+        WHERE sb.is_active = TRUE
+          AND (sb.subscription_start_date >= :since OR sb.subscription_start_date IS NULL)
+        UNION ALL
+        SELECT user_id, saved_at::date, 0, 0, 1, 0 FROM saved_jobs WHERE saved_at >= :since
+        UNION ALL
+        SELECT user_id, marked_at::date, 0, 0, 0, 1
+        FROM not_interested_jobs WHERE marked_at >= :since
+    )
+    INSERT INTO daily_user_facts
+        (day, state, county, role, tier,
+         new_users, active_subscribers, saved_jobs, not_interested_jobs)
+    SELECT e.day, st.state, ct.county, COALESCE(d.role, ''), COALESCE(d.tier, ''),
+           SUM(e.new_users), SUM(e.active_subscribers),
+           SUM(e.saved_jobs), SUM(e.not_interested_jobs)
+    FROM events e
+    {USER_DIMS_EXPAND}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+# Appended to the credit-flow events when the payments table exists
+PAYMENT_EVENTS_SQL = """
+        UNION ALL
+        SELECT sb.user_id, p.payment_date::date, 0, 0, 0, 0, 0, p.amount
+        FROM payments p
+        LEFT JOIN subscribers sb ON sb.id = p.subscriber_id
+        WHERE p.payment_date >= :since
+"""
+
+REFRESH_CREDIT_FLOW_SQL = f"""
+    WITH {USER_DIMS_CTE},
+    events AS (
+        SELECT sb.user_id, sb.subscription_start_date::date AS day,
+               CASE WHEN sb.trial_credits_used THEN COALESCE(sb.trial_credits, 0) ELSE 0 END
+                   AS granted,
+               COALESCE(sub.credits, 0) AS purchased,
+               0 AS spent, 0 AS frozen, 0 AS unlocks, 0::numeric AS revenue
+        FROM subscribers sb
+        JOIN subscriptions sub ON sub.id = sb.subscription_id
+        WHERE sb.subscription_start_date >= :since
+        UNION ALL
+        SELECT sb.user_id, sb.frozen_at::date, 0, 0, 0, COALESCE(sb.frozen_credits, 0), 0, 0
+        FROM subscribers sb
+        JOIN subscriptions sub ON sub.id = sb.subscription_id
+        WHERE sb.frozen_at >= :since
+        UNION ALL
+        SELECT user_id, unlocked_at::date, 0, 0, COALESCE(credits_spent, 0), 0, 1, 0
+        FROM unlocked_leads WHERE unlocked_at >= :since
+        {{payments}}
+    )
+    INSERT INTO daily_credit_flow
+        (day, state, county, role, tier, granted, purchased, spent, frozen, unlocks, revenue)
+    SELECT e.day, st.state, ct.county, COALESCE(d.role, ''), COALESCE(d.tier, ''),
+           SUM(e.granted), SUM(e.purchased), SUM(e.spent), SUM(e.frozen),
+           SUM(e.unlocks), SUM(e.revenue)
+    FROM events e
+    {USER_DIMS_EXPAND}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+REFRESH_JOB_FACTS_SQL = f"""
+    WITH {USER_DIMS_CTE},
+    events AS (
+        SELECT j.created_at::date AS day, j.state, j.source_county AS county,
+               j.audience_type_names AS category, '' AS role, '' AS tier,
+               1 AS jobs_created,
+               CASE WHEN j.job_review_status = 'posted' THEN 1 ELSE 0 END AS jobs_posted,
+               0 AS unlocks, 0 AS unlock_credits
+        FROM jobs j
+        WHERE j.created_at >= :since
+        UNION ALL
+        SELECT ul.unlocked_at::date, j.state, j.source_county, j.audience_type_names,
+               COALESCE(d.role, ''), COALESCE(d.tier, ''),
+               0, 0, 1, COALESCE(ul.credits_spent, 0)
+        FROM unlocked_leads ul
+        JOIN jobs j ON j.id = ul.job_id
+        LEFT JOIN user_dims d ON d.user_id = ul.user_id
+        WHERE ul.unlocked_at >= :since
+    )
+    INSERT INTO daily_job_facts
+        (day, state, county, category, role, tier,
+         jobs_created, jobs_posted, unlocks, unlock_credits)
+    SELECT day, COALESCE(LEFT(state, 100), ''), COALESCE(LEFT(county, 100), ''),
+           COALESCE(category, ''), role, tier,
+           SUM(jobs_created), SUM(jobs_posted), SUM(unlocks), SUM(unlock_credits)
+    FROM events
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+ROLLUP_TABLES = {
+    "daily_user_facts": REFRESH_USER_FACTS_SQL,
+    "daily_credit_flow": REFRESH_CREDIT_FLOW_SQL,
+    "daily_job_facts": REFRESH_JOB_FACTS_SQL,
+}
+
+
+def day_bound(moment: datetime) -> date:
+    """First day not covered by ``< moment`` (a partial day counts as covered)."""
+    day = moment.date()
+    if moment == datetime.combine(day, datetime.min.time()):
+        return day
+    return day + timedelta(days=1)
+
+
+def is_day_aligned(periods) -> bool:
+    """True if every (label, start, end) period starts and ends at midnight."""
+    return all(
+        moment.time() == datetime.min.time()
+        for _, start, end in periods
+        for moment in (start, end)
+    )
+
+
+def user_fact_filters(filters: dict, by_state: bool = False) -> Tuple[str, dict]:
+    """WHERE conditions on a user-keyed fact table for the dashboard filters.
+
+    ``filters`` has state, country_city, user_type (Contractors/Suppliers)
+    and subscription_tier; None or "All" means not filtered. With
+    ``by_state`` the state condition is left to the caller (to group by it).
+    """
+
+    def selected(key):
+        value = filters.get(key)
+        return value if value and value not in ("All", "all") else None
+
+    conditions = ["county = :f_county"]
+    params = {"f_county": selected("country_city") or USER_ANY}
+    if not by_state:
+        conditions.insert(0, "state = :f_state")
+        params["f_state"] = selected("state") or USER_ANY
+    role = {"Contractors": "Contractor", "Suppliers": "Supplier"}.get(
+        selected("user_type")
+    )
+    if role:
+        conditions.append("role = :f_role")
+        params["f_role"] = role
+    if selected("subscription_tier"):
+        conditions.append("tier = :f_tier")
+        params["f_tier"] = selected("subscription_tier")
+    return " AND ".join(conditions), params
+
+
+def job_fact_filters(filters: dict) -> Tuple[str, dict]:
+    """WHERE conditions on daily_job_facts for the job state / county filters."""
+    conditions, params = ["TRUE"], {}
+    state = filters.get("state")
+    if state and state not in ("All", "all"):
+        conditions.append("state = :f_state")
+        params["f_state"] = state
+    county = filters.get("country_city")
+    if county and county not in ("All", "all"):
+        conditions.append("county = :f_county")
+        params["f_county"] = county
+    return " AND ".join(conditions), params
+
+
+def sum_by_period(
+    db: Session,
+    table: str,
+    measures: Tuple[str, ...],
+    periods,
+    where: str,
+    params: dict,
+    cumulative: bool = False,
+) -> list:
+    """Sum ``measures`` of ``table`` over each (label, start, end) period in one query.
+
+    ``cumulative`` sums everything before each period's end instead.
+    Returns one dict per period, in order.
+    """
+    sums = ", ".join(f"COALESCE(SUM(f.{m}), 0) AS {m}" for m in measures)
+    rows = db.execute(
+        text(
+            f"""
+            SELECT p.idx, {sums}
+            FROM unnest(CAST(:starts AS date[]), CAST(:ends AS date[]))
+                 WITH ORDINALITY AS p(start_day, end_day, idx)
+            LEFT JOIN {table} f
+                ON f.day >= p.start_day AND f.day < p.end_day AND {where}
+            GROUP BY p.idx
+            ORDER BY p.idx
+            """
+        ),
+        {
+            **params,
+            "starts": [
+                date.min if cumulative else day_bound(start) for _, start, _ in periods
+            ],
+            "ends": [day_bound(end) for _, _, end in periods],
+        },
+    ).fetchall()
+    return [{m: getattr(row, m) for m in measures} for row in rows]
+
+
+class AnalyticsRollupService:
+    """Maintains the daily analytics fact tables."""
+
+    def __init__(self, refresh_days: int = ANALYTICS_ROLLUP_REFRESH_DAYS):
+        """
+        Args:
+            refresh_days: Days (including today) recomputed by refresh_recent
+        """
+        self.refresh_days = max(1, refresh_days)
+
+    async def refresh_recent(self) -> int:
+        """Recompute the recent days on a scheduler worker thread."""
+        return await run_blocking(self._refresh_recent_sync)
+
+    async def rebuild(self) -> int:
+        """Recompute all days on a scheduler worker thread."""
+        return await run_blocking(self.refresh_sync, None)
+
+    def _refresh_recent_sync(self) -> int:
+        since = datetime.combine(
+            datetime.utcnow().date() - timedelta(days=self.refresh_days - 1),
+            datetime.min.time(),
+        )
+        return self.refresh_sync(since)
+
+    def refresh_sync(self, since: Optional[datetime]) -> int:
+        """Replace the fact rows from ``since``'s day on (all rows if None).
+
+        Returns the number of fact rows written.
+        """
+        db: Session = SessionLocal()
+        try:
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ROLLUP_LOCK_KEY})
+            since = since or EPOCH
+
+            # Jobs posted in the window count on their creation day
+            oldest_posted = db.execute(
+                text(
+                    "SELECT MIN(created_at) FROM jobs "
+                    "WHERE review_posted_at >= :since AND created_at < :since"
+                ),
+                {"since": since},
+            ).scalar()
+            job_since = min(since, oldest_posted) if oldest_posted else since
+
+            has_payments = schema_capabilities.has_table("payments")
+
+            written = 0
+            for table, sql in ROLLUP_TABLES.items():
+                table_since = job_since if table == "daily_job_facts" else since
+                if table == "daily_credit_flow":
+                    sql = sql.replace("{payments}", PAYMENT_EVENTS_SQL if has_payments else "")
+                params = {
+                    "since": datetime.combine(table_since.date(), datetime.min.time()),
+                    "undated_day": UNDATED_DAY,
+                }
+                db.execute(
+                    text(f"DELETE FROM {table} WHERE day >= :since_day"),
+                    {"since_day": table_since.date()},
+                )
+                written += db.execute(text(sql), params).rowcount or 0
+            # Cached analytics responses are rebuilt from the refreshed facts
+            response_cache.invalidate_on_commit(db, "analytics")
+            db.commit()
+
+            logger.info(
+                f"[Analytics Rollups] ✓ {written} fact row(s) written from "
+                f"{since.date() if since != EPOCH else 'the beginning'}"
+            )
+            return written
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Analytics Rollups] Error refreshing fact tables: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+
+# Global service instance
+analytics_rollup_service = AnalyticsRollupService()
@@ -0,0 +1,137 @@
+"""
+Background Task Registry
+
+Declares every periodic task the scheduler runs (see services/scheduler.py).
+Each task runs once per interval across all app instances; its history is
+kept in ``scheduler_runs``.
+
+To add a task, add a ``scheduler.register(...)`` call below. Task functions
+are async, return the number of rows they affected, and raise on failure.
+"""
+
+from src.app.services.analytics_rollups import analytics_rollup_service
+from src.app.services.email_outbox import email_outbox_sender
+from src.app.services.job_cleanup_service import job_cleanup_service
+from src.app.services.job_posted_push import (
+    JOB_PUSH_COALESCE_SECONDS,
+    job_posted_push_service,
+)
+from src.app.services.job_status_service import job_status_service
+from src.app.services.push_notification_service import push_notification_service
+from src.app.services.scheduler import Scheduler
+from src.app.services.trial_expiry_service import trial_expiry_service
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def register_background_tasks(scheduler: Scheduler):
+    """Register all periodic background tasks on ``scheduler``."""
+    # Job cleanup (hourly). Jobs unlocked by 5+ users of one trade are retired
+    # by unlock_job itself (services/unlock_counters.py)
+    scheduler.register(
+        "job_cleanup.temp_documents",
+        job_cleanup_service._cleanup_temp_documents,
+        interval_seconds=HOUR,
+        jitter_seconds=60,
+        timeout_seconds=10 * 60,
+    )
+    scheduler.register(
+        "job_cleanup.stale_jobs",
+        job_cleanup_service._delete_stale_jobs,
+        interval_seconds=HOUR,
+        jitter_seconds=60,
+        timeout_seconds=15 * 60,
+    )
+
+    # Move long-'Complete' contractor jobs to jobs_archive (daily)
+    scheduler.register(
+        "job_cleanup.archive_completed",
+        job_cleanup_service._archive_completed_jobs,
+        interval_seconds=DAY,
+        jitter_seconds=5 * 60,
+        timeout_seconds=30 * 60,
+    )
+
+    # Post approved jobs once their day_offset has passed, on the push coalesce
+    # interval so they are fanned out within seconds
+    scheduler.register(
+        "job_status.post_due",
+        job_status_service._post_due_jobs,
+        interval_seconds=JOB_PUSH_COALESCE_SECONDS,
+        jitter_seconds=5,
+        timeout_seconds=5 * 60,
+    )
+
+    # Job status: temp document cleanup (hourly)
+    scheduler.register(
+        "job_status.process",
+        job_status_service._process_jobs,
+        interval_seconds=HOUR,
+        jitter_seconds=60,
+        timeout_seconds=10 * 60,
+    )
+
+    # Trial expiry (daily)
+    scheduler.register(
+        "trial_expiry",
+        trial_expiry_service._expire_trial_credits,
+        interval_seconds=DAY,
+        jitter_seconds=5 * 60,
+        timeout_seconds=30 * 60,
+    )
+
+    # Weekly push notifications (every 7 days; the run history keeps restarts
+    # from re-sending within the week)
+    scheduler.register(
+        "push_notifications.weekly",
+        push_notification_service._send_weekly_notifications,
+        interval_seconds=7 * DAY,
+        jitter_seconds=5 * 60,
+        timeout_seconds=60 * 60,
+    )
+
+    # Push newly posted jobs to matching users; each run coalesces the jobs
+    # posted since the previous one into one push per user
+    scheduler.register(
+        "push_notifications.job_posted",
+        job_posted_push_service._process_outbox,
+        interval_seconds=JOB_PUSH_COALESCE_SECONDS,
+        jitter_seconds=5,
+        timeout_seconds=5 * 60,
+    )
+
+    # Admin analytics fact tables: recent days every 5 minutes, everything
+    # every 6 hours (picks up edits to older rows)
+    scheduler.register(
+        "analytics.rollup_recent",
+        analytics_rollup_service.refresh_recent,
+        interval_seconds=5 * 60,
+        jitter_seconds=15,
+        timeout_seconds=5 * 60,
+    )
+    scheduler.register(
+        "analytics.rollup_full",
+        analytics_rollup_service.rebuild,
+        interval_seconds=6 * HOUR,
+        jitter_seconds=5 * 60,
+        timeout_seconds=30 * 60,
+    )
+
+    # Delete old sent/failed emails from email_outbox (daily)
+    scheduler.register(
+        "email_outbox.prune",
+        email_outbox_sender.prune,
+        interval_seconds=DAY,
+        jitter_seconds=5 * 60,
+        timeout_seconds=10 * 60,
+    )
+
+    # Trim the run history kept in scheduler_runs (daily)
+    scheduler.register(
+        "scheduler.prune_runs",
+        scheduler.prune_runs,
+        interval_seconds=DAY,
+        jitter_seconds=5 * 60,
+        timeout_seconds=10 * 60,
+    )
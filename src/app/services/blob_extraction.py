@@ -0,0 +1,174 @@
+"""
+Blob Extraction
+
+Moves files still stored in the database into the blob store
+(services/blob_store.py):
+
+- file entries with base64 ``data`` in ``temp_documents.documents``,
+  ``jobs.job_documents``, ``jobs_archive.job_documents`` and the contractor /
+  supplier ``license_picture``, ``referrals`` and ``job_photos`` arrays get a
+  ``blob`` reference instead,
+- ``users`` / ``admin_users.profile_picture_data`` moves to
+  ``profile_picture_blob``.
+
+Run as a release step, with ``BLOB_STORE_DIR`` pointing at the same storage
+the app uses:
+
+    python -m src.app.services.blob_extraction
+
+Rows are walked in primary key order and committed in batches of
+``BLOB_EXTRACTION_BATCH_SIZE`` (default 50), and entries that already
+reference a blob are left alone, so an interrupted run can simply be started
+again. The app reads both forms meanwhile (see utils/stored_files.py).
+"""
+
+import base64
+import binascii
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import String, cast, or_
+
+from src.app import models
+from src.app.core.database import SessionLocal
+from src.app.services.blob_store import blob_store
+
+logger = logging.getLogger("uvicorn.error")
+
+# (model, JSON columns holding arrays of file entries)
+FILE_COLUMNS = (
+    (models.user.TempDocument, ("documents",)),
+    (models.user.Job, ("job_documents",)),
+    (models.user.JobArchive, ("job_documents",)),
+    (models.user.Contractor, ("license_picture", "referrals", "job_photos")),
+    (models.user.Supplier, ("license_picture", "referrals", "job_photos")),
+)
+PICTURE_MODELS = (models.user.User, models.user.AdminUser)
+
+
+def _batch_size() -> int:
+    return int(os.getenv("BLOB_EXTRACTION_BATCH_SIZE", "50"))
+
+
+def extract_entry(entry):
+    """File entry with its base64 ``data`` moved to the blob store.
+
+    Returns the entry unchanged if it holds no inline data or the data is
+    not valid base64.
+    """
+    if not isinstance(entry, dict) or "data" not in entry:
+        return entry
+    result = {key: value for key, value in entry.items() if key != "data"}
+    if result.get("blob") or not entry["data"]:
+        return result
+    try:
+        content = base64.b64decode(entry["data"], validate=True)
+    except (binascii.Error, TypeError, ValueError):
+        logger.warning(
+            f"[Blob Extraction] Skipping undecodable file {entry.get('filename')!r}"
+        )
+        return entry
+    stored = blob_store.put_bytes(content)
+    result["size"] = stored.size
+    result["blob"] = stored.sha256
+    return result
+
+
+def extract_file_columns(db, model, column_names, batch_size: int) -> int:
+    """Move inline file data of one table; returns the number of rows updated."""
+    columns = [getattr(model, name) for name in column_names]
+    has_inline_data = [cast(column, String).like('%"data"%') for column in columns]
+
+    table = model.__table__.name
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(model.id, *columns)
+            .filter(model.id > last_id, or_(*has_inline_data))
+            .order_by(model.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for row in rows:
+            values = {}
+            for name, files in zip(column_names, row[1:]):
+                if not isinstance(files, list):
+                    continue
+                extracted = [extract_entry(entry) for entry in files]
+                if extracted != files:
+                    values[name] = extracted
+            if values:
+                db.query(model).filter(model.id == row.id).update(
+                    values, synchronize_session=False
+                )
+                updated += 1
+        db.commit()
+        last_id = rows[-1].id
+        logger.info(f"[Blob Extraction] {table}: {updated} row(s) up to id {last_id}")
+    return updated
+
+
+def extract_profile_pictures(db, model, batch_size: int) -> int:
+    """Move ``profile_picture_data`` of one table; returns the number of rows moved."""
+    table = model.__table__.name
+    moved = 0
+    while True:
+        # Moved rows drop out of the filter, so each batch starts at the front
+        rows = (
+            db.query(model.id, model.profile_picture_data)
+            .filter(model.profile_picture_data.isnot(None))
+            .order_by(model.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for row in rows:
+            stored = blob_store.put_bytes(bytes(row.profile_picture_data))
+            db.query(model).filter(model.id == row.id).update(
+                {
+                    model.profile_picture_blob: stored.sha256,
+                    model.profile_picture_data: None,
+                },
+                synchronize_session=False,
+            )
+        db.commit()
+        moved += len(rows)
+        logger.info(f"[Blob Extraction] {table}: {moved} profile picture(s) moved")
+    return moved
+
+
+def extract_all(batch_size: Optional[int] = None) -> bool:
+    """Move every inline file into the blob store; returns False if it failed."""
+    batch_size = batch_size or _batch_size()
+    db = SessionLocal()
+    try:
+        for model, column_names in FILE_COLUMNS:
+            updated = extract_file_columns(db, model, column_names, batch_size)
+            logger.info(
+                f"[Blob Extraction] ✓ {model.__table__.name}: {updated} row(s) updated"
+            )
+        for model in PICTURE_MODELS:
+            moved = extract_profile_pictures(db, model, batch_size)
+            logger.info(
+                f"[Blob Extraction] ✓ {model.__table__.name}: "
+                f"{moved} profile picture(s) moved"
+            )
+        return True
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[Blob Extraction] Failed, safe to re-run: {str(e)}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(0 if extract_all() else 1)
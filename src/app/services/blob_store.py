@@ -0,0 +1,163 @@
+"""
+Blob Store
+
+Uploaded files (job documents, license pictures, referrals, job photos,
+profile pictures) used to be stored in the database: base64 inside JSON
+columns, or bytea. Rows now hold a reference, the hex SHA-256 of the file,
+and the bytes live in a content-addressed store:
+
+- identical files are stored once,
+- uploads stream to a temp file while being hashed and are renamed into
+  place, so a blob is never visible half-written,
+- blobs never change once written, so they can be served in ranges and
+  cached by digest.
+
+``LocalBlobStore`` keeps blobs on the filesystem under ``BLOB_STORE_DIR``
+(default ``uploads/blobs``), sharded as ``ab/cd/abcd...``. Every app instance
+must see the same directory (on Cloud Run, a mounted volume).
+
+Deleting a document only drops its reference; blobs may be shared by several
+rows, so unreferenced blobs are left for a separate sweep.
+
+Existing base64 data is moved here by ``python -m src.app.services.blob_extraction``.
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+_CHUNK_BYTES = 64 * 1024
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobNotFound(Exception):
+    pass
+
+
+class BlobTooLarge(Exception):
+    pass
+
+
+class StoredBlob(NamedTuple):
+    sha256: str
+    size: int
+
+
+class BlobStore(ABC):
+    """Backend interface; subclasses implement the abstract methods."""
+
+    @abstractmethod
+    def put(self, stream: BinaryIO, max_bytes: Optional[int] = None) -> StoredBlob:
+        """Store everything read from ``stream``.
+
+        Raises BlobTooLarge (and stores nothing) once more than ``max_bytes``
+        have been read.
+        """
+
+    @abstractmethod
+    def open(self, sha256: str) -> BinaryIO:
+        """Binary file object positioned at the start; BlobNotFound if missing."""
+
+    @abstractmethod
+    def size(self, sha256: str) -> int:
+        """Size in bytes; BlobNotFound if missing."""
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        """Whether the blob is in the store."""
+
+    def put_bytes(self, data: bytes) -> StoredBlob:
+        return self.put(io.BytesIO(data))
+
+    def read_bytes(self, sha256: str) -> bytes:
+        with self.open(sha256) as blob:
+            return blob.read()
+
+    def iter_range(
+        self, sha256: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Chunks of bytes ``start``..``end`` (inclusive; None = to the end)."""
+        with self.open(sha256) as blob:
+            blob.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = blob.read(
+                    _CHUNK_BYTES if remaining is None else min(_CHUNK_BYTES, remaining)
+                )
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, sha256: str) -> Path:
+        # Digests come from rows and URLs; never let one name another path
+        if not _DIGEST.match(sha256 or ""):
+            raise BlobNotFound(sha256)
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def put(self, stream: BinaryIO, max_bytes: Optional[int] = None) -> StoredBlob:
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"more than {max_bytes} bytes")
+                    digest.update(chunk)
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+
+            sha256 = digest.hexdigest()
+            path = self._path(sha256)
+            if path.exists():
+                os.unlink(tmp_path)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return StoredBlob(sha256, size)
+
+    def open(self, sha256: str) -> BinaryIO:
+        try:
+            return open(self._path(sha256), "rb")
+        except FileNotFoundError:
+            raise BlobNotFound(sha256)
+
+    def size(self, sha256: str) -> int:
+        try:
+            return self._path(sha256).stat().st_size
+        except FileNotFoundError:
+            raise BlobNotFound(sha256)
+
+    def exists(self, sha256: str) -> bool:
+        try:
+            return self._path(sha256).is_file()
+        except BlobNotFound:
+            return False
+
+
+# Global blob store instance
+blob_store = LocalBlobStore(os.getenv("BLOB_STORE_DIR", "uploads/blobs"))
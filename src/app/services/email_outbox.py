@@ -0,0 +1,386 @@
+"""
+Email Outbox
+
+Transactional emails are queued in ``email_outbox`` (``enqueue_email``)
+instead of being sent inline, so request handlers never wait on Resend and an
+email survives a Resend error or a restart. ``EmailOutboxSender`` delivers
+them in the background:
+
+- due rows are claimed with ``FOR UPDATE SKIP LOCKED`` and leased for a few
+  minutes, so several app instances can send without doubling up,
+- claimed rows go out through the Resend batch API (up to 100 per call), with
+  ``EMAIL_SEND_CONCURRENCY`` calls in flight,
+- a failed batch is retried per email so one bad address cannot hold back the
+  rest; failures are retried with exponential backoff until
+  ``MAX_ATTEMPTS``, then marked 'failed',
+- each row's ``dedup_key`` is unique and is sent as the Resend idempotency
+  key. By default it covers recipient, subject and body within an
+  ``EMAIL_DEDUP_WINDOW_SECONDS`` window, so an accidental double submit
+  queues one email while a legitimate repeat later on is sent again; callers
+  can pass their own key instead,
+- sent and failed rows are deleted after ``EMAIL_OUTBOX_RETENTION_DAYS`` by
+  a daily scheduler task (``prune``).
+
+Async handlers use ``enqueue_email_async``, which runs the enqueue (and the
+direct-send fallback) on a worker thread.
+
+``EMAIL_TRANSPORT=stub`` swaps Resend for the in-memory StubTransport
+(see utils/email_resend.py).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.app.core.database import SessionLocal
+from src.app.services.scheduler import run_blocking
+from src.app.utils.email_resend import (
+    build_params,
+    get_transport,
+    html_to_text,
+    send_email_resend,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+# A claimed row is retried if its sender has not finished within the lease
+LEASE_SECONDS = 300
+# Identical emails (same recipient, subject and body) queued within one window
+# are sent once
+DEDUP_WINDOW_SECONDS = int(os.getenv("EMAIL_DEDUP_WINDOW_SECONDS", "600"))
+RETENTION_DAYS = int(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "30"))
+
+ENQUEUE_SQL = """
+    INSERT INTO email_outbox (dedup_key, to_email, subject, html, text_body, reply_to)
+    VALUES (:dedup_key, :to_email, :subject, :html, :text_body, :reply_to)
+    ON CONFLICT (dedup_key) DO NOTHING
+    RETURNING id
+"""
+
+CLAIM_SQL = """
+    WITH due AS (
+        SELECT id FROM email_outbox
+        WHERE status = 'pending' AND next_attempt_at <= NOW()
+        ORDER BY next_attempt_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE email_outbox e
+    SET attempts = e.attempts + 1,
+        next_attempt_at = NOW() + make_interval(secs => :lease_seconds)
+    FROM due
+    WHERE e.id = due.id
+    RETURNING e.id, e.dedup_key, e.to_email, e.subject, e.html, e.text_body, e.reply_to
+"""
+
+MARK_SENT_SQL = """
+    UPDATE email_outbox e
+    SET status = 'sent', sent_at = NOW(), provider_id = s.provider_id, last_error = NULL
+    FROM UNNEST(CAST(:ids AS integer[]), CAST(:provider_ids AS text[])) AS s(id, provider_id)
+    WHERE e.id = s.id
+"""
+
+MARK_FAILED_SQL = """
+    UPDATE email_outbox e
+    SET status = CASE WHEN e.attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+        next_attempt_at = NOW() + make_interval(
+            secs => LEAST(:base_seconds * power(2, e.attempts - 1), :max_seconds)
+        ),
+        last_error = f.error
+    FROM UNNEST(CAST(:ids AS integer[]), CAST(:errors AS text[])) AS f(id, error)
+    WHERE e.id = f.id
+"""
+
+
+def default_dedup_key(
+    to_email: str, subject: str, html: str, now: Optional[float] = None
+) -> str:
+    """Same recipient, subject and body in the same dedup window -> same key."""
+    window = int((time.time() if now is None else now) // DEDUP_WINDOW_SECONDS)
+    digest = hashlib.sha256(
+        f"{to_email}\0{subject}\0{html}\0{window}".encode("utf-8")
+    )
+    return f"sha256:{digest.hexdigest()}"
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    html: str,
+    reply_to: Optional[str] = None,
+    dedup_key: Optional[str] = None,
+    db: Optional[Session] = None,
+    text_body: Optional[str] = None,
+) -> bool:
+    """Queue an email for background delivery.
+
+    With ``db`` the row is written in the caller's transaction (the caller
+    commits); otherwise it is committed in its own short transaction.
+    ``text_body`` is the plain-text part (derived from ``html`` when not
+    given). If the outbox cannot be written (database unavailable), the email
+    is sent directly so it is not lost.
+
+    Returns False if an email with the same dedup key was already queued
+    (and is kept in the outbox), i.e. this one will not be sent.
+    """
+    params = {
+        "dedup_key": dedup_key or default_dedup_key(to_email, subject, html),
+        "to_email": to_email,
+        "subject": subject,
+        "html": html,
+        "text_body": text_body if text_body is not None else html_to_text(html),
+        "reply_to": reply_to,
+    }
+
+    if db is not None:
+        queued = db.execute(text(ENQUEUE_SQL), params).first() is not None
+        _log_duplicate(queued, to_email, params["dedup_key"])
+        email_outbox_sender.wake()
+        return queued
+
+    session: Session = SessionLocal()
+    try:
+        queued = session.execute(text(ENQUEUE_SQL), params).first() is not None
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(
+            f"[Email Outbox] Could not queue email to {to_email}, sending directly: {str(e)}"
+        )
+        send_email_resend(to_email, subject, html, reply_to, params["text_body"])
+        return True
+    finally:
+        session.close()
+
+    _log_duplicate(queued, to_email, params["dedup_key"])
+    email_outbox_sender.wake()
+    return queued
+
+
+async def enqueue_email_async(
+    to_email: str,
+    subject: str,
+    html: str,
+    reply_to: Optional[str] = None,
+    dedup_key: Optional[str] = None,
+    text_body: Optional[str] = None,
+) -> bool:
+    """``enqueue_email`` in its own transaction, off the event loop."""
+    return await asyncio.to_thread(
+        enqueue_email,
+        to_email,
+        subject,
+        html,
+        reply_to=reply_to,
+        dedup_key=dedup_key,
+        text_body=text_body,
+    )
+
+
+def _log_duplicate(queued: bool, to_email: str, dedup_key: str):
+    if not queued:
+        logger.info(
+            f"[Email Outbox] Email to {to_email} already queued ({dedup_key}), skipped"
+        )
+
+
+class EmailOutboxSender:
+    """Background delivery of email_outbox rows."""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        poll_interval_seconds: float = 5,
+        transport=None,
+    ):
+        """
+        Args:
+            concurrency: Batch calls to the email provider in flight at once
+            poll_interval_seconds: How often to look for due rows when not woken
+            transport: Defaults to get_transport() (EMAIL_TRANSPORT)
+        """
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.transport = transport or get_transport()
+        self.is_running = False
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._executor = None
+
+    def wake(self):
+        """Start a delivery round now (safe to call from any thread)."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self):
+        if self.is_running:
+            logger.warning("Email outbox sender is already running")
+            return
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency + 1, thread_name_prefix="email-outbox"
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Email outbox sender started ({type(self.transport).__name__}, "
+            f"{self.concurrency} concurrent batch call(s))"
+        )
+
+    async def stop(self):
+        """Stop sending; queued rows stay in the outbox for the next start."""
+        self.is_running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._loop = self._wake = self._task = self._executor = None
+        logger.info("Email outbox sender stopped")
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=self.poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                loop = asyncio.get_running_loop()
+                # Keep going while full rounds come back (a backlog)
+                while await loop.run_in_executor(self._executor, self.deliver_due):
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in email outbox sender: {str(e)}")
+                await asyncio.sleep(30)
+
+    def deliver_due(self) -> bool:
+        """Claim and send one round of due emails; True if the round was full."""
+        limit = self.transport.max_batch_size * self.concurrency
+        db: Session = SessionLocal()
+        try:
+            rows = db.execute(
+                text(CLAIM_SQL), {"limit": limit, "lease_seconds": LEASE_SECONDS}
+            ).fetchall()
+            db.commit()
+            if not rows:
+                return False
+
+            size = self.transport.max_batch_size
+            chunks = [rows[i : i + size] for i in range(0, len(rows), size)]
+            if self._executor is not None and len(chunks) > 1:
+                results = list(self._executor.map(self._send_chunk, chunks))
+            else:
+                results = [self._send_chunk(chunk) for chunk in chunks]
+            outcomes = [outcome for result in results for outcome in result]
+
+            sent = [(row_id, pid) for row_id, pid, error in outcomes if error is None]
+            failed = [(row_id, error) for row_id, pid, error in outcomes if error is not None]
+            if sent:
+                db.execute(
+                    text(MARK_SENT_SQL),
+                    {
+                        "ids": [row_id for row_id, _ in sent],
+                        "provider_ids": [pid for _, pid in sent],
+                    },
+                )
+            if failed:
+                db.execute(
+                    text(MARK_FAILED_SQL),
+                    {
+                        "ids": [row_id for row_id, _ in failed],
+                        "errors": [error[:1000] for _, error in failed],
+                        "max_attempts": MAX_ATTEMPTS,
+                        "base_seconds": RETRY_BASE_SECONDS,
+                        "max_seconds": RETRY_MAX_SECONDS,
+                    },
+                )
+            db.commit()
+
+            logger.info(
+                f"[Email Outbox] {len(sent)} sent, {len(failed)} failed "
+                f"in {len(chunks)} batch(es)"
+            )
+            return len(rows) >= limit
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _prune_sync(self) -> int:
+        db: Session = SessionLocal()
+        try:
+            result = db.execute(
+                text(
+                    """
+                    DELETE FROM email_outbox
+                    WHERE status IN ('sent', 'failed')
+                      AND created_at < NOW() - make_interval(days => :days)
+                    """
+                ),
+                {"days": RETENTION_DAYS},
+            )
+            db.commit()
+            return result.rowcount
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def prune(self) -> int:
+        """Delete sent/failed rows older than the retention; returns how many."""
+        return await run_blocking(self._prune_sync)
+
+    def _send_chunk(self, rows) -> list:
+        """Send rows in one batch call; returns (id, provider_id, error) per row."""
+        params = [
+            build_params(r.to_email, r.subject, r.html, r.text_body, r.reply_to)
+            for r in rows
+        ]
+        try:
+            if len(rows) == 1:
+                provider_ids = [self.transport.send(params[0], rows[0].dedup_key)]
+            else:
+                batch_key = hashlib.sha256(
+                    "\0".join(r.dedup_key for r in rows).encode("utf-8")
+                ).hexdigest()
+                provider_ids = self.transport.send_batch(params, f"batch:{batch_key}")
+            return [(r.id, pid, None) for r, pid in zip(rows, provider_ids)]
+        except Exception as e:
+            if len(rows) == 1:
+                logger.warning(
+                    f"[Email Outbox] Failed to send email {rows[0].id} to {rows[0].to_email}: {str(e)}"
+                )
+                return [(rows[0].id, None, str(e))]
+            # A batch fails as a whole (e.g. one invalid address): retry one by one
+            logger.warning(
+                f"[Email Outbox] Batch of {len(rows)} failed, sending individually: {str(e)}"
+            )
+            return [outcome for row in rows for outcome in self._send_chunk([row])]
+
+
+# Global sender instance
+email_outbox_sender = EmailOutboxSender(
+    concurrency=int(os.getenv("EMAIL_SEND_CONCURRENCY", "4")),
+)
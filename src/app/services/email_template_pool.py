@@ -0,0 +1,317 @@
+"""
+Outreach Email Template Pool
+
+``/groq/generate-send`` used to call Groq for every outreach email, although
+emails for the same role, permit type and budget are near-identical. This
+service keeps a small pool of pre-generated template variants per
+``(role, permit_type_norm, cost bucket)``:
+
+- variants are generated with ``{{Placeholder}}`` fields only (sender details
+  and ``{{Location}}``) and filled in locally per request,
+- variants are served round-robin so consecutive emails still differ,
+- pools are topped up by a background task, both on demand (first request
+  for a key) and periodically for the most common recent permit types,
+- variants older than the TTL are retired so the wording keeps changing.
+
+The endpoint falls back to live generation only while a key's pool is empty.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.app.core.database import SessionLocal
+from src.app.services.ai_batch_matching import cost_bucket
+
+logger = logging.getLogger("uvicorn.error")
+
+# Placeholder name (lowercased) -> key in the endpoint's payload data
+PLACEHOLDER_FIELDS = {
+    "your name": "sender_name",
+    "company name": "company_name",
+    "phone number": "phone_number",
+    "email address": "email_address",
+    "location": "location",
+}
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+WARM_ROLES = ("Contractor", "Supplier")
+
+
+def normalize_permit_type(permit_type: Optional[str]) -> str:
+    """Same rule as the prompt builder: permit numbers fall back to 'Construction'."""
+    permit_type = (permit_type or "").strip()
+    if not permit_type or re.search(r"\d{3,}", permit_type):
+        return "Construction"
+    return permit_type
+
+
+def fill_placeholders(template: str, values: dict) -> str:
+    """Replace known ``{{Placeholder}}`` fields; unknown or empty ones are kept."""
+
+    def _replace(match):
+        field = PLACEHOLDER_FIELDS.get(match.group(1).strip().lower())
+        value = values.get(field) if field else None
+        return str(value) if value else match.group(0)
+
+    return PLACEHOLDER_PATTERN.sub(_replace, template)
+
+
+class EmailTemplatePool:
+    """In-process pools of pre-generated outreach email templates."""
+
+    def __init__(
+        self,
+        pool_size: int = 6,
+        ttl_hours: float = 24,
+        max_keys: int = 500,
+        warm_interval_hours: float = 6,
+        warm_top_n: int = 20,
+    ):
+        """
+        Args:
+            pool_size: Variants kept per (role, permit type, cost bucket)
+            ttl_hours: Age after which a variant is retired and regenerated
+            max_keys: Least recently used keys are evicted beyond this
+            warm_interval_hours: How often popular keys are pre-generated
+            warm_top_n: Number of popular (permit type, cost bucket) pairs to warm
+        """
+        self.pool_size = pool_size
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_keys = max_keys
+        self.warm_interval_hours = warm_interval_hours
+        self.warm_top_n = warm_top_n
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        # key -> {"variants": [(subject, body, created_at)], "cursor": int}
+        self._pools: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._filling: dict = {}
+        self.stats = {"hits": 0, "misses": 0, "generated": 0, "failed": 0}
+
+    @staticmethod
+    def key_for(user_role: Optional[str], permit_type: Optional[str], cost) -> tuple:
+        return (
+            (user_role or "").strip().lower(),
+            normalize_permit_type(permit_type).lower(),
+            cost_bucket(cost),
+        )
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def next_variant(
+        self, user_role: str, permit_type: Optional[str], cost
+    ) -> Optional[tuple]:
+        """Return the next (subject, body) template for the key, or None if empty.
+
+        Also schedules a background top-up when the pool is short.
+        """
+        key = self.key_for(user_role, permit_type, cost)
+        pool = self._pools.get(key)
+        if pool is not None:
+            self._pools.move_to_end(key)
+            self._drop_expired(pool)
+
+        self._schedule_fill(key, user_role, permit_type, cost)
+
+        if not pool or not pool["variants"]:
+            self.stats["misses"] += 1
+            return None
+
+        variants = pool["variants"]
+        subject, body, _ = variants[pool["cursor"] % len(variants)]
+        pool["cursor"] = (pool["cursor"] + 1) % len(variants)
+        self.stats["hits"] += 1
+        return subject, body
+
+    def _drop_expired(self, pool: dict):
+        now = time.time()
+        pool["variants"] = [v for v in pool["variants"] if now - v[2] < self.ttl_seconds]
+
+    def render(
+        self, user_role: str, payload_data: dict, location: str
+    ) -> Optional[tuple]:
+        """Pick a pooled variant and fill its placeholders from ``payload_data``."""
+        variant = self.next_variant(
+            user_role, payload_data.get("permit_type_norm"), payload_data.get("cost")
+        )
+        if variant is None:
+            return None
+        values = {**payload_data, "location": location}
+        subject, body = variant
+        return fill_placeholders(subject, values), fill_placeholders(body, values)
+
+    # ------------------------------------------------------------------
+    # Filling
+    # ------------------------------------------------------------------
+
+    def _schedule_fill(self, key: tuple, user_role: str, permit_type, cost):
+        pool = self._pools.get(key)
+        if pool is not None and len(pool["variants"]) >= self.pool_size:
+            return
+        task = self._filling.get(key)
+        if task is not None and not task.done():
+            return
+        self._filling[key] = asyncio.create_task(
+            self.fill(user_role, permit_type, cost)
+        )
+
+    async def _generate_variant(
+        self, user_role: str, permit_type: str, bucket: str
+    ) -> tuple:
+        # Imported lazily: the endpoint module imports this service
+        from src.app.api.endpoints.groq_email import GroqService
+
+        payload_data = {
+            "permit_type_norm": permit_type,
+            "job_description": f"a typical {permit_type} project",
+            "city_country": "{{Location}}",
+        }
+        if bucket != "unknown":
+            payload_data["cost"] = bucket
+        return await GroqService().generate_email(payload_data, user_role)
+
+    async def fill(self, user_role: str, permit_type: Optional[str], cost) -> int:
+        """Generate variants until the key's pool is full; returns how many were added."""
+        key = self.key_for(user_role, permit_type, cost)
+        pool = self._pools.setdefault(key, {"variants": [], "cursor": 0})
+        self._pools.move_to_end(key)
+        while len(self._pools) > self.max_keys:
+            self._pools.popitem(last=False)
+
+        self._drop_expired(pool)
+        missing = self.pool_size - len(pool["variants"])
+        if missing <= 0:
+            return 0
+
+        results = await asyncio.gather(
+            *(
+                self._generate_variant(
+                    user_role, normalize_permit_type(permit_type), key[2]
+                )
+                for _ in range(missing)
+            ),
+            return_exceptions=True,
+        )
+        # Backdate all but the first new variant by a growing share of the TTL
+        # so a freshly filled pool expires one variant at a time, and the
+        # periodic warm-up replaces them, instead of all at once
+        stagger = self.ttl_seconds / self.pool_size
+        now = time.time()
+        added = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                self.stats["failed"] += 1
+                logger.warning(
+                    f"[Email Templates] Variant generation failed for {key}: {result}"
+                )
+                continue
+            subject, body = result
+            pool["variants"].append((subject, body, now - added * stagger))
+            added += 1
+        # An on-demand fill and the warm-up may race on the same key
+        del pool["variants"][: -self.pool_size]
+        self.stats["generated"] += added
+        if added:
+            logger.info(f"[Email Templates] Added {added} variant(s) for {key}")
+        return added
+
+    # ------------------------------------------------------------------
+    # Background warming
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start periodic pre-generation for the most common permit types."""
+        if self.is_running:
+            logger.warning("Email template pool is already running")
+            return
+        if not os.getenv("GROQ_API_KEY"):
+            logger.info("Email template pool not started (GROQ_API_KEY not set)")
+            return
+
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Email template pool started (warming every {self.warm_interval_hours} hour(s))"
+        )
+
+    async def stop(self):
+        """Stop warming and cancel in-flight fills."""
+        self.is_running = False
+        tasks = [t for t in [self._task, *self._filling.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._filling.clear()
+        logger.info("Email template pool stopped")
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                await self._warm()
+                await asyncio.sleep(self.warm_interval_hours * 3600)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in email template pool: {str(e)}")
+                await asyncio.sleep(60)
+
+    def _popular_keys(self) -> list:
+        """Most common (permit type, representative cost per bucket) pairs of the last 30 days."""
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                text(
+                    """
+                    SELECT permit_type_norm,
+                           CASE
+                               WHEN project_cost_total IS NULL THEN NULL
+                               WHEN project_cost_total < 10000 THEN 5000
+                               WHEN project_cost_total < 50000 THEN 25000
+                               WHEN project_cost_total < 250000 THEN 100000
+                               WHEN project_cost_total < 1000000 THEN 500000
+                               ELSE 1000000
+                           END AS bucket_cost,
+                           COUNT(*) AS jobs
+                    FROM jobs
+                    WHERE created_at >= NOW() - INTERVAL '30 days'
+                      AND permit_type_norm IS NOT NULL
+                    GROUP BY 1, 2
+                    ORDER BY jobs DESC
+                    LIMIT :limit
+                    """
+                ),
+                {"limit": self.warm_top_n},
+            ).fetchall()
+            return [(row[0], row[1]) for row in rows]
+        finally:
+            db.close()
+
+    async def _warm(self):
+        keys = await asyncio.to_thread(self._popular_keys)
+        logger.info(f"[Email Templates] Warming {len(keys)} popular permit type(s)")
+        added = 0
+        for permit_type, cost in keys:
+            for role in WARM_ROLES:
+                added += await self.fill(role, permit_type, cost)
+        logger.info(f"[Email Templates] ✓ Warm-up complete: {added} variant(s) generated")
+
+
+# Global pool instance
+email_template_pool = EmailTemplatePool(
+    pool_size=int(os.getenv("EMAIL_TEMPLATE_POOL_SIZE", "6")),
+    ttl_hours=float(os.getenv("EMAIL_TEMPLATE_TTL_HOURS", "24")),
+    warm_top_n=int(os.getenv("EMAIL_TEMPLATE_WARM_TOP_N", "20")),
+)
@@ -0,0 +1,297 @@
+"""
+Shared Groq HTTP Client
+
+All Groq chat-completion calls go through one pooled ``httpx.AsyncClient`` so
+TLS connections are reused instead of re-established per request. Calls are:
+
+- bounded by a semaphore so a slow Groq cannot pin every worker,
+- given a per-call deadline that covers all retry attempts,
+- retried with jittered exponential backoff on transient failures,
+- guarded by a circuit breaker that fails fast with a 503 while Groq is down.
+
+Set ``GROQ_API_BASE`` to point the client at a local fake Groq server.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+GROQ_API_BASE = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1")
+GROQ_CHAT_ENDPOINT = f"{GROQ_API_BASE.rstrip('/')}/chat/completions"
+
+# Upstream statuses worth retrying (rate limited or transient server errors)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Simple consecutive-failure circuit breaker.
+
+    closed    -> calls flow normally
+    open      -> calls are rejected until ``reset_timeout`` has elapsed
+    half_open -> a single trial call is let through; success closes the
+                 breaker, failure re-opens it
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._trial_started_at = None
+        # half_open: only one trial call at a time (a trial that never reported
+        # back, e.g. because it was cancelled, is abandoned after reset_timeout)
+        now = time.monotonic()
+        if (
+            self._trial_started_at is not None
+            and now - self._trial_started_at < self.reset_timeout
+        ):
+            return False
+        self._trial_started_at = now
+        return True
+
+    def record_success(self):
+        if self.state != "closed":
+            logger.info("[Groq] Circuit breaker closed")
+        self.state = "closed"
+        self.failures = 0
+        self._trial_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_started_at = None
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(
+                    "[Groq] Circuit breaker opened after %d consecutive failure(s)",
+                    self.failures,
+                )
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class GroqClient:
+    """Pooled async client for the Groq chat-completions API."""
+
+    def __init__(
+        self,
+        endpoint: str = GROQ_CHAT_ENDPOINT,
+        max_concurrency: int = 8,
+        default_deadline: float = 30.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4.0,
+    ):
+        self.endpoint = endpoint
+        self.max_concurrency = max_concurrency
+        self.default_deadline = default_deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                timeout=httpx.Timeout(self.default_deadline, connect=5.0),
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when sent."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        cap = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, cap)
+
+    async def _post(
+        self, request_body: dict, headers: dict, timeout: float
+    ) -> httpx.Response:
+        async with self._get_semaphore():
+            return await self._get_client().post(
+                self.endpoint, json=request_body, headers=headers, timeout=timeout
+            )
+
+    async def aclose(self):
+        """Close pooled connections (called on application shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def chat_completion(
+        self,
+        api_key: str,
+        request_body: dict,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """POST a chat-completion request and return the decoded response JSON.
+
+        Args:
+            api_key: Groq API key
+            request_body: OpenAI-compatible chat-completions payload
+            deadline: Total seconds allowed for the call, including retries
+
+        Raises:
+            HTTPException: 503 when the breaker is open, 504 when the deadline
+                is exceeded, 502 for upstream errors
+        """
+        if not self.breaker.allow():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="AI service is temporarily unavailable. Please try again shortly.",
+                headers={"Retry-After": str(int(self.breaker.reset_timeout))},
+            )
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        budget = deadline or self.default_deadline
+        expires_at = time.monotonic() + budget
+        last_error = "unknown error"
+
+        for attempt in range(self.max_retries + 1):
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+
+            retry_after = None
+            try:
+                # The deadline covers both waiting for a concurrency slot and
+                # the request itself
+                response = await asyncio.wait_for(
+                    self._post(request_body, headers, remaining), timeout=remaining
+                )
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                last_error = str(e) or type(e).__name__
+                logger.warning(
+                    "[Groq] Attempt %d failed: %s", attempt + 1, last_error
+                )
+            else:
+                if response.status_code < 400:
+                    try:
+                        data = response.json()
+                    except json.JSONDecodeError:
+                        self.breaker.record_failure()
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail="Invalid JSON response from Groq service",
+                        )
+                    self.breaker.record_success()
+                    return data
+
+                last_error = f"status {response.status_code}"
+                logger.error(
+                    "[Groq] API returned status %s: %s",
+                    response.status_code,
+                    response.text[:500],
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # Client-side errors are not a sign of Groq being unhealthy
+                    self.breaker.record_success()
+                    raise HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY,
+                        detail=f"Groq API error (status {response.status_code})",
+                    )
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                if time.monotonic() + delay >= expires_at:
+                    break
+                await asyncio.sleep(delay)
+
+        self.breaker.record_failure()
+        if time.monotonic() >= expires_at:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Groq service did not respond within {budget:g}s",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to contact Groq service: {last_error}",
+        )
+
+    def parse_json_content(self, response_json: dict) -> dict:
+        """Parse the first choice's message content of a Groq response as JSON."""
+        choices = response_json.get("choices") or []
+        if not choices:
+            logger.error("[Groq] Response missing 'choices' field")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Invalid response structure from Groq API",
+            )
+
+        content = (choices[0].get("message") or {}).get("content") or ""
+        if not content:
+            logger.error("[Groq] Response missing content")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Empty content in Groq API response",
+            )
+
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            logger.error(
+                "[Groq] Failed to parse content as JSON: %s. Content: %s",
+                str(e),
+                content[:500],
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Invalid JSON response from AI service",
+            )
+
+    async def chat_json(
+        self,
+        api_key: str,
+        request_body: dict,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Call Groq and parse the first choice's message content as JSON."""
+        response_json = await self.chat_completion(api_key, request_body, deadline)
+        return self.parse_json_content(response_json)
+
+
+# Global client instance shared by all Groq callers
+groq_client = GroqClient(
+    max_concurrency=int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+    default_deadline=float(os.getenv("GROQ_TIMEOUT_SECONDS", "30")),
+)
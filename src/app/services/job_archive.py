@@ -0,0 +1,168 @@
+"""
+Job Archive
+
+Retired jobs are moved from the hot ``jobs`` table into ``jobs_archive``
+instead of being hard-deleted:
+- jobs retired at the unlock threshold (services/unlock_counters.py),
+- stale jobs nobody unlocked (job cleanup, ``STALE_JOBS_MODE``),
+- contractor jobs that have been 'Complete' for a while (job cleanup).
+
+Rows are moved with one ``INSERT ... SELECT`` + ``DELETE`` statement per
+batch, so each batch is a short transaction that only locks the rows it
+moves. Readers that look a job up by id use ``find_job``, which falls back to
+the archive, so detail pages and unlocked leads keep working.
+"""
+
+import logging
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.app.core.response_cache import response_cache
+from src.app.models.user import Job, JobArchive
+
+logger = logging.getLogger("uvicorn.error")
+
+# Columns copied from jobs into jobs_archive
+JOB_COLUMNS = ", ".join(c.name for c in Job.__table__.columns)
+
+# A job archived before (same id) is overwritten by its newest copy
+ARCHIVE_UPSERT_SET = ", ".join(
+    f"{c.name} = EXCLUDED.{c.name}"
+    for c in Job.__table__.columns
+    if c.name != "id"
+)
+
+
+def purge_batch(
+    db: Session,
+    candidates_sql: str,
+    params: dict,
+    archive: bool = False,
+    reason: Optional[str] = None,
+) -> List[int]:
+    """Delete (or archive, then delete) one batch of jobs.
+
+    Args:
+        db: Session; the caller commits
+        candidates_sql: SELECT returning the ``id`` of the jobs in this batch.
+            It should end in ``LIMIT ... FOR UPDATE SKIP LOCKED`` so batches
+            never wait on rows other transactions are using.
+        params: Bind parameters for ``candidates_sql``
+        archive: Copy the rows into jobs_archive before deleting them. An
+            archived copy with the same id is replaced, and only jobs whose
+            copy was written are deleted.
+        reason: Stored in jobs_archive.archive_reason
+
+    Returns:
+        IDs of the jobs removed from ``jobs``; cached "jobs" responses are
+        invalidated when the caller commits
+    """
+    if archive:
+        sql = f"""
+            WITH batch AS ({candidates_sql}),
+            archived AS (
+                INSERT INTO jobs_archive ({JOB_COLUMNS}, archived_at, archive_reason)
+                SELECT {JOB_COLUMNS}, NOW(), :archive_reason
+                FROM jobs
+                WHERE id IN (SELECT id FROM batch)
+                ON CONFLICT (id) DO UPDATE SET
+                    {ARCHIVE_UPSERT_SET},
+                    archived_at = EXCLUDED.archived_at,
+                    archive_reason = EXCLUDED.archive_reason
+                RETURNING id
+            )
+            DELETE FROM jobs
+            WHERE id IN (SELECT id FROM archived)
+            RETURNING id
+        """
+        params = {**params, "archive_reason": reason}
+    else:
+        sql = f"""
+            WITH batch AS ({candidates_sql})
+            DELETE FROM jobs
+            WHERE id IN (SELECT id FROM batch)
+            RETURNING id
+        """
+    removed = list(db.execute(text(sql), params).scalars().all())
+    if removed:
+        response_cache.invalidate_on_commit(db, "jobs")
+    return removed
+
+
+def archive_jobs(db: Session, job_ids: Iterable[int], reason: str) -> List[int]:
+    """Move the given jobs to jobs_archive (the caller commits); returns the moved IDs."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return []
+    return purge_batch(
+        db,
+        "SELECT id FROM jobs WHERE id = ANY(:job_ids) FOR UPDATE",
+        {"job_ids": job_ids},
+        archive=True,
+        reason=reason,
+    )
+
+
+def find_job(db: Session, job_id: int, **filters) -> Optional[Union[Job, JobArchive]]:
+    """Return the live job, or its archived copy when it has been retired.
+
+    ``filters`` are extra ``column=value`` conditions (``None`` means IS NULL)
+    applied to whichever table is searched.
+    """
+    for model in (Job, JobArchive):
+        query = db.query(model).filter(model.id == job_id)
+        for name, value in filters.items():
+            column = getattr(model, name)
+            query = query.filter(column.is_(None) if value is None else column == value)
+        job = query.first()
+        if job is not None:
+            return job
+    return None
+
+
+def job_snapshot(job) -> dict:
+    """Snapshot of a job's important fields, stored on UnlockedLead at unlock time."""
+    return {
+        "id": job.id,
+        "permit_number": job.permit_number,
+        "permit_status": job.permit_status,
+        "permit_type_norm": job.permit_type_norm,
+        "project_description": job.project_description,
+        "project_cost_total": job.project_cost_total,
+        "source_system": job.source_system,
+        "contractor_name": job.contractor_name,
+        "contractor_company": job.contractor_company,
+        "contractor_email": job.contractor_email,
+        "contractor_phone": job.contractor_phone,
+        "audience_type_names": job.audience_type_names,
+        "review_posted_at": (
+            job.review_posted_at.isoformat() if job.review_posted_at else None
+        ),
+        "state": job.state,
+        "source_county": job.source_county,
+        "project_status": job.project_status,
+        "trs_score": job.trs_score,
+        "permit_type": job.permit_type,
+        "country_city": job.country_city,
+        "property_type": job.property_type,
+        "job_review_status": job.job_review_status,
+        "job_cost": job.job_cost,
+        "job_address": job.job_address,
+        "email": job.email,
+        "phone_number": job.phone_number,
+        "contact_name": job.contact_name,
+        "bid_date": (
+            job.bid_date.isoformat()
+            if hasattr(job, "bid_date") and job.bid_date
+            else None
+        ),
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "project_number": job.project_number,
+        "project_type": job.project_type,
+        "owner_name": job.owner_name,
+        "applicant_name": job.applicant_name,
+        "applicant_email": job.applicant_email,
+        "applicant_phone": job.applicant_phone,
+    }
@@ -1,187 +1,88 @@
 """
 Background Job Cleanup Service
 
-This service runs automatically in the background when the FastAPI application starts.
-It checks every hour for jobs that need to be deleted based on user type unlock count.
-Jobs are deleted when 5 or more users of the SAME user type have unlocked them
-(e.g., 5 electricians, or 5 plumbers, etc.).
+Hourly cleanup tasks, run by the background scheduler (see
+services/background_tasks.py):
+- expired temporary documents are removed,
+- posted jobs nobody unlocked within 10 days are removed,
+- contractor jobs 'Complete' for 90+ days are moved to jobs_archive.
+
+Each task returns the number of rows it affected and re-raises errors so the
+scheduler records them in the run history. The queries run in the ``*_sync``
+methods on scheduler worker threads, never on the event loop.
 """
 
-import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Optional
 
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.app import models
 from src.app.core.database import SessionLocal
+from src.app.services.job_archive import purge_batch
+from src.app.services.scheduler import run_blocking
 
 logger = logging.getLogger("uvicorn.error")
 
+# One batch of stale jobs. NOT EXISTS plans as an anti-join and the
+# range scan uses the partial index ix_jobs_stale_purge_review_posted_at.
+STALE_JOB_CANDIDATES_SQL = """
+    SELECT j.id
+    FROM jobs j
+    WHERE j.job_review_status = 'posted'
+      AND j.uploaded_by_contractor = FALSE
+      AND j.review_posted_at <= :cutoff
+      AND NOT EXISTS (
+          SELECT 1 FROM unlocked_leads ul WHERE ul.job_id = j.id
+      )
+    ORDER BY j.review_posted_at
+    LIMIT :batch_size
+    FOR UPDATE OF j SKIP LOCKED
+"""
+
+# One batch of contractor jobs that have been 'Complete' since before :cutoff
+COMPLETED_JOB_CANDIDATES_SQL = """
+    SELECT j.id
+    FROM jobs j
+    WHERE j.job_review_status = 'Complete'
+      AND COALESCE(j.updated_at, j.review_posted_at, j.created_at) <= :cutoff
+    LIMIT :batch_size
+    FOR UPDATE OF j SKIP LOCKED
+"""
+
 
 class JobCleanupService:
     """Background service for automatic job cleanup."""
-    
-    def __init__(self, check_interval_hours: int = 1):
+
+    def __init__(
+        self,
+        stale_after_days: int = 10,
+        stale_batch_size: int = 500,
+        stale_batch_pause_seconds: float = 0.2,
+        stale_jobs_mode: str = "archive",
+        completed_archive_after_days: int = 90,
+    ):
         """
-        Initialize the cleanup service.
-        
         Args:
-            check_interval_hours: How often to check for jobs to delete (default: every 1 hour)
-        """
-        self.check_interval_hours = check_interval_hours
-        self.is_running = False
-        self._task: Optional[asyncio.Task] = None
-    
-    async def start(self):
-        """Start the background cleanup service."""
-        if self.is_running:
-            logger.warning("Job cleanup service is already running")
-            return
-        
-        self.is_running = True
-        self._task = asyncio.create_task(self._run())
-        logger.info(f"Job cleanup service started (checking every {self.check_interval_hours} hour(s))")
-    
-    async def stop(self):
-        """Stop the background cleanup service."""
-        if not self.is_running:
-            return
-        
-        self.is_running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Job cleanup service stopped")
-    
-    async def _run(self):
-        """Main loop that runs the cleanup periodically."""
-        # Run immediately on startup, then every interval
-        await self._cleanup_jobs_by_unlock_count()
-        await self._cleanup_temp_documents()
-        await self._delete_stale_jobs()
-        
-        while self.is_running:
-            try:
-                # Wait for the interval
-                await asyncio.sleep(self.check_interval_hours * 3600)
-                
-                # Run cleanup
-                await self._cleanup_jobs_by_unlock_count()
-                await self._cleanup_temp_documents()
-                await self._delete_stale_jobs()
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in job cleanup service: {str(e)}")
-                # Continue running even if one iteration fails
-    
-    async def _cleanup_jobs_by_unlock_count(self):
-        """Delete jobs that have been unlocked by 5 or more users of the SAME user type.
-        
-        This ensures jobs are removed when they've been accessed by enough users
-        of a single type (e.g., 5 electricians, or 5 plumbers), indicating the
-        lead has been widely distributed within that user type category.
+            stale_after_days: Posted jobs never unlocked for this long are purged
+            stale_batch_size: Jobs removed per transaction
+            stale_batch_pause_seconds: Pause between batches
+            stale_jobs_mode: "archive" (move rows to jobs_archive) or "delete"
+            completed_archive_after_days: 'Complete' jobs are archived after this long
         """
-        db: Session = SessionLocal()
-        try:
-            logger.info("[Job Cleanup] Starting unlock-based cleanup check (by user type)")
-            
-            # Find jobs where ANY single user type has 5 or more unlocks
-            # This query:
-            # 1. Joins unlocked_leads with users to get user_id
-            # 2. Joins with contractors and suppliers to get user_type arrays
-            # 3. Unnests the user_type arrays to get individual types
-            # 4. Groups by job_id AND user_type
-            # 5. Counts distinct users per user type
-            # 6. Returns jobs where ANY user type has 5+ distinct users
-            query = text("""
-                WITH user_types_unlocked AS (
-                    SELECT 
-                        ul.job_id,
-                        ul.user_id,
-                        UNNEST(COALESCE(c.user_type, s.user_type, ARRAY[]::text[])) as user_type
-                    FROM unlocked_leads ul
-                    INNER JOIN users u ON ul.user_id = u.id
-                    LEFT JOIN contractors c ON u.id = c.user_id
-                    LEFT JOIN suppliers s ON u.id = s.user_id
-                    WHERE c.user_type IS NOT NULL OR s.user_type IS NOT NULL
-                ),
-                user_type_counts AS (
-                    SELECT 
-                        job_id,
-                        user_type,
-                        COUNT(DISTINCT user_id) as user_count
-                    FROM user_types_unlocked
-                    GROUP BY job_id, user_type
-                )
-                SELECT DISTINCT
-                    job_id,
-                    MAX(user_count) as max_users_in_type,
-                    STRING_AGG(user_type || ':' || user_count::text, ', ' ORDER BY user_count DESC) as type_breakdown
-                FROM user_type_counts
-                WHERE user_count >= 5
-                GROUP BY job_id
-            """)
-            
-            result = db.execute(query)
-            jobs_to_delete = result.fetchall()
-            
-            if not jobs_to_delete:
-                logger.info("[Job Cleanup] No jobs to delete (no user type has 5+ users)")
-                return
-            
-            count = len(jobs_to_delete)
-            deleted_ids = []
-            completed_ids = []
-            
-            # Process jobs that meet the threshold
-            for row in jobs_to_delete:
-                job_id = row.job_id
-                max_users = row.max_users_in_type
-                breakdown = row.type_breakdown
-                
-                # Get the job
-                job = db.query(models.user.Job).filter(models.user.Job.id == job_id).first()
-                if job:
-                    # If uploaded by contractor, mark as Complete instead of deleting
-                    if job.uploaded_by_contractor:
-                        job.job_review_status = "Complete"
-                        completed_ids.append(job_id)
-                        logger.debug(f"[Job Cleanup] Marking contractor job {job_id} as Complete (max {max_users} users in one type: {breakdown})")
-                    else:
-                        # Delete non-contractor jobs
-                        deleted_ids.append(job_id)
-                        db.delete(job)
-                        logger.debug(f"[Job Cleanup] Deleting job {job_id} (max {max_users} users in one type: {breakdown})")
-            
-            db.commit()
-            
-            # Log summary
-            if deleted_ids:
-                logger.info(f"[Job Cleanup] ✓ Successfully deleted {len(deleted_ids)} jobs (5+ users in same type)")
-                logger.info(f"[Job Cleanup] Deleted job IDs: {deleted_ids[:20]}{'...' if len(deleted_ids) > 20 else ''}")
-            
-            if completed_ids:
-                logger.info(f"[Job Cleanup] ✓ Successfully marked {len(completed_ids)} contractor jobs as Complete (5+ users in same type)")
-                logger.info(f"[Job Cleanup] Completed job IDs: {completed_ids[:20]}{'...' if len(completed_ids) > 20 else ''}")
-            
-            if not deleted_ids and not completed_ids:
-                logger.info(f"[Job Cleanup] No jobs processed (found {count} candidates but none were valid)")
-            
-        except Exception as e:
-            db.rollback()
-            logger.error(f"[Job Cleanup] Error during cleanup: {str(e)}")
-        finally:
-            db.close()
-    
-    async def _cleanup_temp_documents(self):
+        self.stale_after_days = stale_after_days
+        self.stale_batch_size = stale_batch_size
+        self.stale_batch_pause_seconds = stale_batch_pause_seconds
+        self.stale_jobs_mode = stale_jobs_mode
+        self.completed_archive_after_days = completed_archive_after_days
+
+    async def _cleanup_temp_documents(self) -> int:
+        """Run the temp-document cleanup on a scheduler worker thread."""
+        return await run_blocking(self._cleanup_temp_documents_sync)
+
+    def _cleanup_temp_documents_sync(self) -> int:
         """Delete expired temporary documents that are not linked to jobs or drafts."""
         db: Session = SessionLocal()
         try:
@@ -196,7 +97,7 @@ class JobCleanupService:
             
             if not expired_docs:
                 logger.info("[Temp Docs Cleanup] No expired temp documents to delete")
-                return
+                return 0
             
             count = len(expired_docs)
             deleted_ids = []
@@ -210,15 +111,21 @@ class JobCleanupService:
             
             logger.info(f"[Temp Docs Cleanup] ✓ Successfully deleted {count} expired temp documents")
             logger.info(f"[Temp Docs Cleanup] Deleted IDs: {deleted_ids[:10]}{'...' if len(deleted_ids) > 10 else ''}")
-            
+            return count
+
         except Exception as e:
             db.rollback()
             logger.error(f"[Temp Docs Cleanup] Error during cleanup: {str(e)}")
+            raise
         finally:
             db.close()
 
 
-    async def _delete_stale_jobs(self):
+    async def _delete_stale_jobs(self) -> int:
+        """Run the stale-job purge on a scheduler worker thread."""
+        return await run_blocking(self._delete_stale_jobs_sync)
+
+    def _delete_stale_jobs_sync(self) -> int:
         """Delete posted jobs that have not been unlocked by any user within 10 days.
 
         A job is deleted when ALL of these are true:
@@ -227,45 +134,102 @@ class JobCleanupService:
         - no row exists in unlocked_leads for this job_id
 
         Contractor-uploaded jobs are excluded (they follow a different lifecycle).
+
+        Jobs are removed in batches of ``stale_batch_size``, each in its own
+        short transaction, with a pause between batches so the purge never
+        holds long row locks. With ``stale_jobs_mode="archive"`` the rows are
+        moved to jobs_archive instead of being dropped.
         """
+        cutoff = datetime.utcnow() - timedelta(days=self.stale_after_days)
+        archive = self.stale_jobs_mode == "archive"
+        removed = []
+
         db: Session = SessionLocal()
         try:
-            cutoff = datetime.utcnow() - timedelta(days=10)
-
-            result = db.execute(
-                text("""
-                    DELETE FROM jobs
-                    WHERE job_review_status = 'posted'
-                    AND uploaded_by_contractor = FALSE
-                    AND review_posted_at IS NOT NULL
-                    AND review_posted_at <= :cutoff
-                    AND id NOT IN (
-                        SELECT DISTINCT job_id
-                        FROM unlocked_leads
-                        WHERE job_id IS NOT NULL
-                    )
-                    RETURNING id, permit_number, audience_type_slugs, review_posted_at
-                """),
-                {"cutoff": cutoff},
-            )
-            deleted = result.fetchall()
-            db.commit()
+            while True:
+                batch = purge_batch(
+                    db,
+                    STALE_JOB_CANDIDATES_SQL,
+                    {"cutoff": cutoff, "batch_size": self.stale_batch_size},
+                    archive=archive,
+                    reason="stale",
+                )
+                db.commit()
+                removed.extend(batch)
+                if len(batch) < self.stale_batch_size:
+                    break
+                time.sleep(self.stale_batch_pause_seconds)
 
-            if deleted:
-                ids = [r.id for r in deleted]
+            if removed:
                 logger.info(
-                    f"[Stale Jobs] \u2713 Deleted {len(deleted)} stale job(s) "
-                    f"(posted 10+ days ago, never unlocked): {ids[:20]}"
+                    f"[Stale Jobs] \u2713 {'Archived' if archive else 'Deleted'} {len(removed)} stale job(s) "
+                    f"(posted {self.stale_after_days}+ days ago, never unlocked): {removed[:20]}"
                 )
             else:
                 logger.info("[Stale Jobs] No stale jobs to delete")
+            return len(removed)
 
         except Exception as e:
             db.rollback()
-            logger.error(f"[Stale Jobs] Error deleting stale jobs: {str(e)}")
+            logger.error(
+                f"[Stale Jobs] Error deleting stale jobs after {len(removed)} removed: {str(e)}"
+            )
+            raise
+        finally:
+            db.close()
+
+
+    async def _archive_completed_jobs(self) -> int:
+        """Run the 'Complete' job archival on a scheduler worker thread."""
+        return await run_blocking(self._archive_completed_jobs_sync)
+
+    def _archive_completed_jobs_sync(self) -> int:
+        """Move contractor jobs that have been 'Complete' for a while to jobs_archive.
+
+        Complete jobs are never shown in feeds, but kept in the hot table they
+        slow down every scan of it. Moved in batches like the stale purge.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=self.completed_archive_after_days)
+        archived = []
+
+        db: Session = SessionLocal()
+        try:
+            while True:
+                batch = purge_batch(
+                    db,
+                    COMPLETED_JOB_CANDIDATES_SQL,
+                    {"cutoff": cutoff, "batch_size": self.stale_batch_size},
+                    archive=True,
+                    reason="completed",
+                )
+                db.commit()
+                archived.extend(batch)
+                if len(batch) < self.stale_batch_size:
+                    break
+                time.sleep(self.stale_batch_pause_seconds)
+
+            if archived:
+                logger.info(
+                    f"[Completed Jobs] \u2713 Archived {len(archived)} job(s) "
+                    f"(Complete for {self.completed_archive_after_days}+ days): {archived[:20]}"
+                )
+            else:
+                logger.info("[Completed Jobs] No completed jobs to archive")
+            return len(archived)
+
+        except Exception as e:
+            db.rollback()
+            logger.error(
+                f"[Completed Jobs] Error archiving completed jobs after {len(archived)} archived: {str(e)}"
+            )
+            raise
         finally:
             db.close()
 
 
 # Global service instance
-job_cleanup_service = JobCleanupService(check_interval_hours=1)
+job_cleanup_service = JobCleanupService(
+    stale_batch_size=int(os.getenv("STALE_JOBS_BATCH_SIZE", "500")),
+    stale_jobs_mode=os.getenv("STALE_JOBS_MODE", "archive"),
+    completed_archive_after_days=int(os.getenv("COMPLETED_JOBS_ARCHIVE_DAYS", "90")),
+)
@@ -0,0 +1,366 @@
+"""
+Job-Posted Push Fan-out
+
+When a job becomes 'posted', a row is written to ``job_posted_outbox`` in the
+same transaction as the status change (``record_job_posted``, or
+``JOB_POSTED_OUTBOX_SQL`` for set-based status updates). Bulk-ingested jobs
+that still need an audience are queued by batch AI matching once their
+``audience_type_slugs`` are written (services/ai_batch_matching.py), so they
+are not fanned out before they can match any trade. A scheduler task drains
+the outbox every ``JOB_PUSH_COALESCE_SECONDS`` and:
+
+- resolves matching subscribers through an in-memory audience index
+  (trade slug -> users, plus each user's states and cities/counties), built
+  from the profiles of users with push subscriptions and refreshed every
+  ``AUDIENCE_INDEX_TTL_SECONDS``, so no job scans the user tables,
+- records each (user, job) match in ``job_push_pending``, in the same
+  transaction that claims the events,
+- sends every user whose subscriptions were not pushed within
+  ``JOB_PUSH_MIN_INTERVAL_MINUTES`` (rate cap) one "N new leads" push for all
+  of their pending jobs, and removes them from ``job_push_pending`` once a
+  push was sent; the jobs of capped users stay pending until the cap
+  expires, and those of users whose push failed are retried for 7 days.
+
+Matching follows /jobs/feed: profile trades are canonicalised to slugs, and
+states / cities match the job's state / source_county case-insensitively as
+substrings (an empty list does not filter). Real-time pushes set
+``last_job_push_at``, not the weekly push's ``last_notified_at``, so the
+weekly push still counts every job since the last weekly push.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.app.core.database import SessionLocal
+from src.app.data import trade_taxonomy
+from src.app.services.push_service import SENT, new_jobs_payload, push_engine
+from src.app.services.scheduler import run_blocking
+
+logger = logging.getLogger("uvicorn.error")
+
+JOB_PUSH_COALESCE_SECONDS = int(os.getenv("JOB_PUSH_COALESCE_SECONDS", "60"))
+JOB_PUSH_MIN_INTERVAL_MINUTES = int(os.getenv("JOB_PUSH_MIN_INTERVAL_MINUTES", "60"))
+AUDIENCE_INDEX_TTL_SECONDS = 300
+
+# Append to a data-modifying CTE named ``posted`` that RETURNs the posted job ids
+JOB_POSTED_OUTBOX_SQL = "INSERT INTO job_posted_outbox (job_id) SELECT id FROM posted"
+
+CLAIM_EVENTS_SQL = """
+    WITH batch AS (
+        SELECT id FROM job_posted_outbox
+        WHERE processed_at IS NULL
+        ORDER BY id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE job_posted_outbox o
+    SET processed_at = NOW()
+    FROM batch b
+    WHERE o.id = b.id
+    RETURNING o.job_id
+"""
+
+# Feed profile (role-specific trades, states, cities) of every user with a
+# push subscription; sub-accounts resolve to their main account
+SUBSCRIBER_PROFILES_SQL = """
+    SELECT DISTINCT ON (eu.id)
+           eu.id AS user_id,
+           CASE WHEN eu.role = 'Contractor' THEN c.user_type ELSE s.user_type END AS trades,
+           CASE WHEN eu.role = 'Contractor' THEN c.state ELSE s.service_states END AS states,
+           CASE WHEN eu.role = 'Contractor' THEN c.country_city ELSE s.country_city END AS cities
+    FROM push_subscriptions ps
+    JOIN users u ON u.id = ps.user_id
+    LEFT JOIN users parent ON parent.id = u.parent_user_id
+    JOIN users eu ON eu.id = COALESCE(parent.id, u.id)
+    LEFT JOIN contractors c ON eu.role = 'Contractor' AND c.user_id = eu.id
+    LEFT JOIN suppliers s ON eu.role = 'Supplier' AND s.user_id = eu.id
+    WHERE c.id IS NOT NULL OR s.id IS NOT NULL
+    ORDER BY eu.id
+"""
+
+QUEUE_PENDING_SQL = """
+    INSERT INTO job_push_pending (user_id, job_id)
+    SELECT * FROM UNNEST(CAST(:user_ids AS integer[]), CAST(:job_ids AS integer[]))
+    ON CONFLICT (user_id, job_id) DO NOTHING
+"""
+
+# Pending jobs of every (effective) user none of whose subscriptions got a
+# real-time push since :cap_cutoff
+DUE_PENDING_SQL = """
+    SELECT p.user_id, p.job_id
+    FROM job_push_pending p
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM push_subscriptions ps
+        JOIN users u ON u.id = ps.user_id
+        LEFT JOIN users parent ON parent.id = u.parent_user_id
+        WHERE COALESCE(parent.id, u.id) = p.user_id
+          AND ps.last_job_push_at > :cap_cutoff
+    )
+"""
+
+DELETE_PENDING_SQL = """
+    DELETE FROM job_push_pending p
+    USING UNNEST(CAST(:user_ids AS integer[]), CAST(:job_ids AS integer[]))
+        AS d(user_id, job_id)
+    WHERE p.user_id = d.user_id AND p.job_id = d.job_id
+"""
+
+# Subscriptions of the given (effective) users
+SUBSCRIPTIONS_FOR_USERS_SQL = """
+    SELECT ps.id, ps.user_id, ps.endpoint, ps.p256dh_key, ps.auth_key,
+           COALESCE(parent.id, u.id) AS effective_user_id
+    FROM push_subscriptions ps
+    JOIN users u ON u.id = ps.user_id
+    LEFT JOIN users parent ON parent.id = u.parent_user_id
+    WHERE COALESCE(parent.id, u.id) = ANY(:user_ids)
+"""
+
+POSTED_JOBS_SQL = """
+    SELECT id, audience_type_slugs, state, source_county,
+           permit_type_norm, project_description,
+           contractor_name, contractor_email
+    FROM jobs
+    WHERE id = ANY(:job_ids) AND job_review_status = 'posted'
+"""
+
+
+def _job_key(job) -> tuple:
+    """The feed's dedup key, so duplicates of a job count once."""
+    return (
+        (job.permit_type_norm or "").lower().strip(),
+        (job.project_description or "").lower().strip()[:200],
+        (job.contractor_name or "").lower().strip(),
+        (job.contractor_email or "").lower().strip(),
+    )
+
+
+def record_job_posted(db: Session, job_ids: Iterable[int]):
+    """Queue push fan-out for newly posted jobs (the caller commits)."""
+    job_ids = [job_id for job_id in job_ids if job_id is not None]
+    if not job_ids:
+        return
+    db.execute(
+        text(
+            "INSERT INTO job_posted_outbox (job_id) "
+            "SELECT UNNEST(CAST(:job_ids AS integer[]))"
+        ),
+        {"job_ids": job_ids},
+    )
+
+
+class AudienceIndex:
+    """Trade slug -> subscribed users, plus each user's location filters."""
+
+    def __init__(self, profiles: Iterable):
+        self.by_slug = defaultdict(set)
+        self.any_trade = set()  # users without trades see every job
+        self.locations = {}
+
+        for profile in profiles:
+            slugs = trade_taxonomy.to_slugs(profile.trades or [])
+            if slugs:
+                for slug in slugs:
+                    self.by_slug[slug].add(profile.user_id)
+            else:
+                self.any_trade.add(profile.user_id)
+            self.locations[profile.user_id] = (
+                [v.lower() for v in profile.states or [] if v],
+                [v.lower() for v in profile.cities or [] if v],
+            )
+
+    def users_for(self, job) -> set:
+        """Users whose feed would show ``job``."""
+        candidates = set(self.any_trade)
+        for slug in trade_taxonomy.split_slugs(job.audience_type_slugs):
+            candidates |= self.by_slug.get(slug, set())
+
+        state = (job.state or "").lower()
+        county = (job.source_county or "").lower()
+        matched = set()
+        for user_id in candidates:
+            states, cities = self.locations[user_id]
+            if states and not (state and any(s in state for s in states)):
+                continue
+            if cities and not (county and any(c in county for c in cities)):
+                continue
+            matched.add(user_id)
+        return matched
+
+
+class JobPostedPushService:
+    """Drains job_posted_outbox into coalesced, rate-capped pushes."""
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        Args:
+            batch_size: Outbox events claimed per statement
+        """
+        self.batch_size = batch_size
+        self._index = None
+        self._index_built_at = 0.0
+        self._index_lock = threading.Lock()
+
+    async def _process_outbox(self) -> int:
+        """Run the outbox consumer on a scheduler worker thread."""
+        return await run_blocking(self._process_outbox_sync)
+
+    def _audience_index(self, db: Session) -> AudienceIndex:
+        with self._index_lock:
+            if (
+                self._index is None
+                or time.monotonic() - self._index_built_at > AUDIENCE_INDEX_TTL_SECONDS
+            ):
+                self._index = AudienceIndex(
+                    db.execute(text(SUBSCRIBER_PROFILES_SQL)).fetchall()
+                )
+                self._index_built_at = time.monotonic()
+            return self._index
+
+    def _queue_pending(self, db: Session, job_ids: list) -> int:
+        """Record the matching users of claimed jobs; returns the number of matches."""
+        if not job_ids:
+            return 0
+        jobs = db.execute(
+            text(POSTED_JOBS_SQL), {"job_ids": list(set(job_ids))}
+        ).fetchall()
+        index = self._audience_index(db)
+        pairs = [(user_id, job.id) for job in jobs for user_id in index.users_for(job)]
+        if pairs:
+            user_ids, matched_job_ids = (list(col) for col in zip(*pairs))
+            db.execute(
+                text(QUEUE_PENDING_SQL),
+                {"user_ids": user_ids, "job_ids": matched_job_ids},
+            )
+        return len(pairs)
+
+    def _process_outbox_sync(self) -> int:
+        """Queue newly posted jobs per user and push every user not rate-capped.
+
+        Returns the number of pushes sent.
+        """
+        db: Session = SessionLocal()
+        try:
+            claimed_total = matched_total = 0
+            while True:
+                # Claim and pending rows commit together
+                claimed = db.execute(
+                    text(CLAIM_EVENTS_SQL), {"batch_size": self.batch_size}
+                ).scalars().all()
+                matched_total += self._queue_pending(db, claimed)
+                db.commit()
+                claimed_total += len(claimed)
+                if len(claimed) < self.batch_size:
+                    break
+
+            db.execute(
+                text(
+                    "DELETE FROM job_posted_outbox "
+                    "WHERE processed_at < NOW() - INTERVAL '7 days'"
+                )
+            )
+            # Gives up on pushes that kept failing; the weekly push counts them
+            db.execute(
+                text(
+                    "DELETE FROM job_push_pending "
+                    "WHERE created_at < NOW() - INTERVAL '7 days'"
+                )
+            )
+            db.commit()
+
+            if claimed_total:
+                logger.info(
+                    f"[Job Push] {claimed_total} newly posted job event(s), "
+                    f"{matched_total} subscriber match(es) queued"
+                )
+
+            due = db.execute(
+                text(DUE_PENDING_SQL),
+                {
+                    # last_job_push_at is written in UTC by the push engine
+                    "cap_cutoff": datetime.utcnow()
+                    - timedelta(minutes=JOB_PUSH_MIN_INTERVAL_MINUTES),
+                },
+            ).fetchall()
+            if not due:
+                return 0
+
+            # Coalesce: distinct pending jobs per user (by the feed's dedup key)
+            jobs = {
+                job.id: job
+                for job in db.execute(
+                    text(POSTED_JOBS_SQL),
+                    {"job_ids": list({row.job_id for row in due})},
+                ).fetchall()
+            }
+            new_jobs = defaultdict(set)
+            for row in due:
+                job = jobs.get(row.job_id)
+                if job is not None:
+                    new_jobs[row.user_id].add(_job_key(job))
+
+            subscriptions = []
+            if new_jobs:
+                subscriptions = db.execute(
+                    text(SUBSCRIPTIONS_FOR_USERS_SQL), {"user_ids": list(new_jobs)}
+                ).fetchall()
+            stats = {SENT: 0, "sent_ids": []}
+            if subscriptions:
+                stats = push_engine.deliver(
+                    db,
+                    subscriptions,
+                    lambda sub: new_jobs_payload(len(new_jobs[sub.effective_user_id])),
+                    mark_notified=True,
+                    label="job posted",
+                    notified_column="last_job_push_at",
+                )
+
+            # Done: pushed users, users without subscriptions and jobs no
+            # longer posted. Users whose pushes all failed stay pending.
+            sent_ids = set(stats["sent_ids"])
+            subscribed = {sub.effective_user_id for sub in subscriptions}
+            pushed = {
+                sub.effective_user_id for sub in subscriptions if sub.id in sent_ids
+            }
+            done = [
+                row
+                for row in due
+                if row.job_id not in jobs
+                or row.user_id in pushed
+                or row.user_id not in subscribed
+            ]
+            if done:
+                db.execute(
+                    text(DELETE_PENDING_SQL),
+                    {
+                        "user_ids": [row.user_id for row in done],
+                        "job_ids": [row.job_id for row in done],
+                    },
+                )
+                db.commit()
+
+            logger.info(
+                f"[Job Push] ✓ {len(new_jobs)} user(s) with pending jobs; "
+                f"{stats[SENT]} push(es) sent to {len(subscriptions)} subscription(s), "
+                f"{len(due) - len(done)} match(es) left pending"
+            )
+            return stats[SENT]
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Job Push] Error processing job_posted_outbox: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+
+# Global service instance
+job_posted_push_service = JobPostedPushService()
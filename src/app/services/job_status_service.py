@@ -1,13 +1,15 @@
 """
 Background service to manage job statuses and cleanup expired jobs.
-Runs every hour to:
-1. Update job_review_status based on timing (scheduled -> posted, posted -> expired)
-2. Delete jobs with 'expired' status
+Runs via the background scheduler (see services/background_tasks.py) to:
+1. Post approved jobs whose day_offset has passed (pending -> posted), every
+   ``JOB_PUSH_COALESCE_SECONDS`` so they reach the push fan-out within
+   seconds; newly posted jobs are queued in the same statement
+   (services/job_posted_push.py)
+2. Clean up unlinked temporary documents (hourly)
 
 All times are compared in EST timezone.
 """
 
-import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
@@ -16,61 +18,71 @@ from zoneinfo import ZoneInfo
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
+from src.app.core.database import SessionLocal
+from src.app.core.response_cache import response_cache
+from src.app.services.job_posted_push import JOB_POSTED_OUTBOX_SQL
+from src.app.services.scheduler import run_blocking
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Approved jobs (uploaded_by_contractor = FALSE, status = pending) whose
+# day_offset has passed; the outbox row for the push fan-out is written in the
+# same statement
+POST_DUE_JOBS_SQL = f"""
+    WITH posted AS (
+        UPDATE jobs
+        SET job_review_status = 'posted'
+        WHERE uploaded_by_contractor = FALSE
+        AND job_review_status = 'pending'
+        AND review_posted_at IS NOT NULL
+        AND review_posted_at + (COALESCE(day_offset, 0) || ' days')::INTERVAL <= :now
+        RETURNING id
+    )
+    {JOB_POSTED_OUTBOX_SQL}
+"""
+
 
 class JobStatusService:
     """Service to manage job statuses and cleanup expired jobs"""
 
-    def __init__(self):
-        self.task = None
-        self.running = False
-        self.interval_hours = 1  # Run every 1 hour
-
-    async def start(self):
-        """Start the job status service"""
-        if self.running:
-            logger.warning("Job status service is already running")
-            return
-
-        self.running = True
-        self.task = asyncio.create_task(self._run())
-        logger.info(
-            f"Job status service started (runs every {self.interval_hours} hour)"
-        )
-
-    async def stop(self):
-        """Stop the job status service"""
-        self.running = False
-        if self.task:
-            self.task.cancel()
-            try:
-                await self.task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Job status service stopped")
-
-    async def _run(self):
-        """Main loop that runs every hour"""
-        while self.running:
-            try:
-                await self._process_jobs()
-            except Exception as e:
-                logger.error(f"Error in job status service: {str(e)}")
+    async def _post_due_jobs(self) -> int:
+        """Post due approved jobs on a scheduler worker thread."""
+        return await run_blocking(self._post_due_jobs_sync)
+
+    def _post_due_jobs_sync(self) -> int:
+        """Flip approved pending jobs whose day_offset has passed to 'posted'."""
+        db = SessionLocal()
+        try:
+            # review_posted_at is stored in EST
+            now = datetime.now(ZoneInfo("America/New_York")).replace(tzinfo=None)
+            posted = db.execute(text(POST_DUE_JOBS_SQL), {"now": now}).rowcount
+            if posted:
+                response_cache.invalidate_on_commit(db, "jobs")
+            db.commit()
+            if posted:
+                logger.info(f"Posted {posted} approved job(s) based on offset_days")
+            return posted
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error posting due jobs: {str(e)}")
+            raise
+        finally:
+            db.close()
 
-            # Wait 1 hour before next run
-            await asyncio.sleep(self.interval_hours * 3600)
+    async def _process_jobs(self) -> int:
+        """Run job status processing on a scheduler worker thread."""
+        return await run_blocking(self._process_jobs_sync)
 
-    async def _process_jobs(self):
-        """Process all jobs: update statuses and delete expired"""
+    def _process_jobs_sync(self) -> int:
+        """Hourly job maintenance (due jobs are posted by ``_post_due_jobs``)"""
         try:
             # Get database URL from environment
             database_url = os.getenv("DATABASE_URL")
             if not database_url:
                 logger.error("DATABASE_URL not found in environment")
-                return
+                return 0
 
             # Create engine and session
             engine = create_engine(database_url)
@@ -84,29 +96,10 @@ class JobStatusService:
 
                 logger.info(f"Starting job status processing at {now} EST")
 
-                # 1. Post contractor-uploaded jobs based on offset_days
-                # (Jobs where admin approved: uploaded_by_contractor = False, status = pending)
-                post_contractor_jobs_query = text(
-                    """
-                    UPDATE jobs
-                    SET job_review_status = 'posted'
-                    WHERE uploaded_by_contractor = FALSE
-                    AND job_review_status = 'pending'
-                    AND review_posted_at IS NOT NULL
-                    AND review_posted_at + (COALESCE(day_offset, 0) || ' days')::INTERVAL <= :now
-                """
-                )
-                result = session.execute(post_contractor_jobs_query, {"now": now})
-                contractor_posted_count = result.rowcount
-                session.commit()
-                logger.info(
-                    f"Posted {contractor_posted_count} contractor-uploaded jobs based on offset_days"
-                )
-
                 # Note: Jobs are NOT marked as expired or auto-deleted based on due_at
                 # Only jobs with 5+ unlocks of the same user type are deleted (via job_cleanup_service)
 
-                # 3. Clean up unlinked temporary documents (older than 1 hour, not linked to jobs)
+                # Clean up unlinked temporary documents (older than 1 hour, not linked to jobs)
                 cleanup_temp_docs_query = text(
                     """
                     DELETE FROM temp_documents
@@ -123,9 +116,9 @@ class JobStatusService:
 
                 logger.info(
                     f"Job status processing completed: "
-                    f"{contractor_posted_count} contractor jobs posted, "
                     f"{cleaned_temp_count} temp docs cleaned"
                 )
+                return cleaned_temp_count
 
             finally:
                 session.close()
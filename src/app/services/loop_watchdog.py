@@ -0,0 +1,126 @@
+"""
+Event Loop Lag Watchdog
+
+Measures how late the event loop wakes up from a short sleep. Any blocking
+call made on the loop (a synchronous query or HTTP request inside an
+``async def``) shows up as lag, because every request handled by the worker
+is stalled for the same time.
+
+Lag above ``warn_threshold_ms`` is logged together with the tasks that were
+running, and ``snapshot()`` (served at ``/__event_loop_lag``) reports the
+latest, worst and recent-p99 lag so regressions can be spotted.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class EventLoopWatchdog:
+    """Samples event loop lag in the background."""
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.5,
+        warn_threshold_ms: float = 250,
+        window: int = 600,
+    ):
+        """
+        Args:
+            interval_seconds: How often the loop is sampled
+            warn_threshold_ms: Lag above this is logged as a warning
+            window: Number of recent samples kept for percentiles
+        """
+        self.interval_seconds = interval_seconds
+        self.warn_threshold_ms = warn_threshold_ms
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        self._samples: deque = deque(maxlen=window)
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+
+    async def start(self):
+        """Start sampling."""
+        if self.is_running:
+            logger.warning("Event loop watchdog is already running")
+            return
+
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Event loop watchdog started (warning above {self.warn_threshold_ms:g} ms)"
+        )
+
+    async def stop(self):
+        """Stop sampling."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Event loop watchdog stopped")
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                expected = time.monotonic() + self.interval_seconds
+                await asyncio.sleep(self.interval_seconds)
+                self.record(max(0.0, (time.monotonic() - expected) * 1000))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in event loop watchdog: {str(e)}")
+
+    def record(self, lag_ms: float):
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self._samples.append(lag_ms)
+        if lag_ms >= self.warn_threshold_ms:
+            self.stalls += 1
+            logger.warning(
+                f"[Event Loop] Blocked for {lag_ms:.0f} ms; running tasks: {self._running_tasks()}"
+            )
+
+    @staticmethod
+    def _running_tasks(limit: int = 5) -> list:
+        try:
+            current = asyncio.current_task()
+            names = []
+            for task in asyncio.all_tasks():
+                if task is current:
+                    continue
+                coro = task.get_coro()
+                names.append(getattr(coro, "__qualname__", None) or task.get_name())
+            return sorted(names)[:limit]
+        except RuntimeError:
+            return []
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0.0
+        return {
+            "running": self.is_running,
+            "last_lag_ms": round(self.last_lag_ms, 1),
+            "p99_lag_ms": round(p99, 1),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "stalls": self.stalls,
+            "warn_threshold_ms": self.warn_threshold_ms,
+            "samples": len(samples),
+        }
+
+
+# Global watchdog instance
+event_loop_watchdog = EventLoopWatchdog(
+    warn_threshold_ms=float(os.getenv("EVENT_LOOP_LAG_WARN_MS", "250")),
+)
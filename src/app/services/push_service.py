@@ -2,19 +2,46 @@
 Web Push Notification Service
 
 Handles sending push notifications to users about new jobs.
+
+The weekly push only goes to users with posted jobs matching their feed since
+their last notification, with the count in the message (``TARGETED_JOBS_SQL``
+computes the counts for all subscriptions in one query).
+
+Deliveries go through ``PushDeliveryEngine``:
+- pushes are sent concurrently from a bounded thread pool over one pooled
+  HTTP session (pywebpush is synchronous),
+- the VAPID key is parsed once and the signed VAPID headers are reused per
+  push-service origin until shortly before they expire,
+- subscriptions are processed in chunks; per chunk, expired endpoints
+  (404/410) are removed with one DELETE and the notified timestamp
+  (``last_notified_at``, or ``last_job_push_at`` for real-time job pushes) is
+  set with one UPDATE ... WHERE id = ANY(...),
+- every run reports throughput (sends per second) and outcome counts.
+
+Set ``PUSH_MAX_CONCURRENCY`` to change the number of concurrent sends.
 """
 
 import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Iterable, List, Optional
+from urllib.parse import urlparse
 
-from pywebpush import WebPushException, webpush
-from sqlalchemy import or_
+import requests
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from src.app.data import trade_taxonomy
 from src.app.models.user import PushSubscription, User
+from src.app.utils.lazy_import import lazy_import
+
+# Loaded on the first push
+py_vapid = lazy_import("py_vapid")
+pywebpush = lazy_import("pywebpush")
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +71,363 @@ else:
 VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY")
 VAPID_CLAIM_EMAIL = os.getenv("VAPID_CLAIM_EMAIL", "mailto:admin@tigerleads.ai")
 
+# Signed VAPID tokens are valid for 12 hours; re-sign an hour before expiry
+VAPID_TOKEN_TTL_SECONDS = 12 * 3600
+VAPID_TOKEN_REFRESH_MARGIN_SECONDS = 3600
+
+# Delivery outcomes
+SENT = "sent"
+GONE = "gone"  # 404/410: the subscription no longer exists
+FAILED = "failed"
+
+# Timestamps ``deliver`` can set on notified subscriptions: the weekly push
+# cursor and the real-time job push rate cap (services/job_posted_push.py)
+NOTIFIED_COLUMNS = ("last_notified_at", "last_job_push_at")
+
+# Spelling-insensitive trade key, same as trade_taxonomy._lookup_key
+_TRADE_KEY_SQL = "regexp_replace(replace(lower({0}), '&', 'and'), '[^a-z0-9]', '', 'g')"
+
+# Every subscription due a weekly push, with the number of posted jobs that
+# match its (effective) user's feed since the last notification. Matching
+# mirrors /jobs/feed: role profile trades (canonicalised to slugs), states and
+# cities/counties as ANY-of ILIKE filters (an empty list does not filter), and
+# not-interested / saved / unlocked jobs (incl. duplicates of unlocked jobs)
+# excluded. Counts are of distinct jobs by the feed's dedup key.
+TARGETED_JOBS_SQL = f"""
+    WITH trade_map AS (
+        SELECT * FROM UNNEST(
+            CAST(:trade_keys AS text[]), CAST(:trade_slugs AS text[])
+        ) AS m(lookup_key, slug)
+    ),
+    subs AS (
+        SELECT ps.id, ps.user_id, ps.endpoint, ps.p256dh_key, ps.auth_key,
+               COALESCE(parent.id, u.id) AS effective_user_id,
+               COALESCE(ps.last_notified_at, ps.created_at, :cutoff) AS since
+        FROM push_subscriptions ps
+        JOIN users u ON u.id = ps.user_id
+        LEFT JOIN users parent ON parent.id = u.parent_user_id
+        WHERE ps.last_notified_at IS NULL OR ps.last_notified_at <= :cutoff
+    ),
+    profiles AS (
+        SELECT eu.id AS user_id,
+               CASE WHEN eu.role = 'Contractor' THEN c.state ELSE s.service_states END AS states,
+               CASE WHEN eu.role = 'Contractor' THEN c.country_city ELSE s.country_city END AS cities,
+               (
+                   SELECT ARRAY_AGG(DISTINCT COALESCE(m.slug, btrim(t.value)))
+                   FROM UNNEST(
+                       CASE WHEN eu.role = 'Contractor' THEN c.user_type ELSE s.user_type END
+                   ) AS t(value)
+                   LEFT JOIN trade_map m ON m.lookup_key = {_TRADE_KEY_SQL.format("t.value")}
+                   WHERE btrim(t.value) <> ''
+               ) AS slugs
+        FROM users eu
+        LEFT JOIN contractors c ON eu.role = 'Contractor' AND c.user_id = eu.id
+        LEFT JOIN suppliers s ON eu.role = 'Supplier' AND s.user_id = eu.id
+        WHERE eu.id IN (SELECT effective_user_id FROM subs)
+          AND (c.id IS NOT NULL OR s.id IS NOT NULL)
+    ),
+    targets AS (
+        SELECT DISTINCT effective_user_id, since FROM subs
+    ),
+    recent_jobs AS (
+        SELECT id, review_posted_at, audience_type_slugs, state, source_county,
+               project_description, permit_type_norm, project_cost_total,
+               contractor_name, contractor_email, contractor_phone
+        FROM jobs
+        WHERE job_review_status = 'posted'
+          AND review_posted_at > (SELECT MIN(since) FROM targets)
+    ),
+    matches AS (
+        SELECT t.effective_user_id, t.since,
+               COUNT(DISTINCT (
+                   lower(btrim(COALESCE(j.permit_type_norm, ''))),
+                   left(lower(btrim(COALESCE(j.project_description, ''))), 200),
+                   lower(btrim(COALESCE(j.contractor_name, ''))),
+                   lower(btrim(COALESCE(j.contractor_email, '')))
+               )) AS new_jobs
+        FROM targets t
+        JOIN profiles p ON p.user_id = t.effective_user_id
+        JOIN recent_jobs j ON j.review_posted_at > t.since
+        WHERE (COALESCE(cardinality(p.slugs), 0) = 0 OR EXISTS (
+                  SELECT 1 FROM UNNEST(p.slugs) AS sl(slug)
+                  WHERE j.audience_type_slugs ILIKE '%' || sl.slug || '%'))
+          AND (COALESCE(cardinality(p.states), 0) = 0 OR EXISTS (
+                  SELECT 1 FROM UNNEST(p.states) AS st(state)
+                  WHERE j.state ILIKE '%' || st.state || '%'))
+          AND (COALESCE(cardinality(p.cities), 0) = 0 OR EXISTS (
+                  SELECT 1 FROM UNNEST(p.cities) AS ci(city)
+                  WHERE j.source_county ILIKE '%' || ci.city || '%'))
+          AND NOT EXISTS (
+                  SELECT 1 FROM not_interested_jobs ni
+                  WHERE ni.user_id = t.effective_user_id AND ni.job_id = j.id)
+          AND NOT EXISTS (
+                  SELECT 1 FROM saved_jobs sj
+                  WHERE sj.user_id = t.effective_user_id AND sj.job_id = j.id)
+          -- The unlocked job itself and any duplicate of it
+          AND NOT EXISTS (
+                  SELECT 1 FROM unlocked_leads ul
+                  JOIN jobs uj ON uj.id = ul.job_id
+                  WHERE ul.user_id = t.effective_user_id
+                    AND uj.project_description IS NOT DISTINCT FROM j.project_description
+                    AND uj.permit_type_norm IS NOT DISTINCT FROM j.permit_type_norm
+                    AND uj.project_cost_total IS NOT DISTINCT FROM j.project_cost_total
+                    AND uj.contractor_email IS NOT DISTINCT FROM j.contractor_email
+                    AND uj.contractor_phone IS NOT DISTINCT FROM j.contractor_phone)
+        GROUP BY t.effective_user_id, t.since
+    )
+    SELECT s.id, s.user_id, s.endpoint, s.p256dh_key, s.auth_key,
+           COALESCE(m.new_jobs, 0) AS new_jobs
+    FROM subs s
+    LEFT JOIN matches m
+      ON m.effective_user_id = s.effective_user_id AND m.since = s.since
+"""
+
+
+class PushDeliveryEngine:
+    """Concurrent web-push sender with per-origin VAPID header reuse."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        chunk_size: int = 500,
+        timeout_seconds: float = 10.0,
+    ):
+        """
+        Args:
+            max_concurrency: Pushes in flight at once
+            chunk_size: Subscriptions loaded and committed per chunk
+            timeout_seconds: Per-push HTTP timeout
+        """
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.timeout_seconds = timeout_seconds
+        self._vapid = None  # py_vapid.Vapid, parsed on first use
+        self._vapid_headers: dict = {}  # origin -> (headers, expires_at)
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Shared resources
+    # ------------------------------------------------------------------
+
+    def _get_vapid(self):
+        if self._vapid is None:
+            if os.path.isfile(VAPID_PRIVATE_KEY):
+                self._vapid = py_vapid.Vapid.from_file(private_key_file=VAPID_PRIVATE_KEY)
+            else:
+                self._vapid = py_vapid.Vapid.from_string(private_key=VAPID_PRIVATE_KEY)
+        return self._vapid
+
+    def vapid_headers(self, origin: str) -> dict:
+        """Signed VAPID headers for a push-service origin, reused until near expiry."""
+        now = time.time()
+        with self._lock:
+            cached = self._vapid_headers.get(origin)
+            if cached and cached[1] - VAPID_TOKEN_REFRESH_MARGIN_SECONDS > now:
+                return cached[0]
+            expires_at = int(now) + VAPID_TOKEN_TTL_SECONDS
+            headers = self._get_vapid().sign(
+                {"sub": VAPID_CLAIM_EMAIL, "aud": origin, "exp": expires_at}
+            )
+            self._vapid_headers[origin] = (headers, expires_at)
+            return headers
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.max_concurrency,
+                pool_maxsize=self.max_concurrency,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # LazyLoader is not thread-safe before Python 3.12.3: load pywebpush
+            # here, before the workers race to first touch it
+            pywebpush.WebPusher
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="webpush"
+            )
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    def send_one(self, subscription, payload: dict) -> str:
+        """Send one push; returns SENT, GONE or FAILED (never raises)."""
+        parsed_endpoint = urlparse(subscription.endpoint or "")
+        if not parsed_endpoint.scheme or not parsed_endpoint.netloc:
+            logger.warning(
+                f"Skipping subscription {subscription.id} - invalid endpoint: {subscription.endpoint}"
+            )
+            return FAILED
+        origin = f"{parsed_endpoint.scheme}://{parsed_endpoint.netloc}"
+
+        subscription_info = {
+            "endpoint": subscription.endpoint,
+            "keys": {"p256dh": subscription.p256dh_key, "auth": subscription.auth_key},
+        }
+        try:
+            response = pywebpush.WebPusher(
+                subscription_info, requests_session=self._get_session()
+            ).send(
+                json.dumps(payload),
+                self.vapid_headers(origin),
+                timeout=self.timeout_seconds,
+            )
+        except pywebpush.WebPushException as e:
+            logger.error(
+                f"Failed to send push notification to subscription {subscription.id}: {e}"
+            )
+            return FAILED
+        except ValueError as e:
+            # VAPID key format error
+            logger.error(
+                f"ValueError sending push notification to subscription {subscription.id}: {e}"
+            )
+            return FAILED
+        except Exception as e:
+            logger.error(f"Unexpected error sending push notification: {e}")
+            return FAILED
+
+        if response.status_code in (404, 410):
+            logger.info(f"Subscription {subscription.id} is gone ({response.status_code})")
+            return GONE
+        if response.status_code > 202:
+            logger.error(
+                f"Push to subscription {subscription.id} failed: "
+                f"{response.status_code} {response.text[:200]}"
+            )
+            return FAILED
+        return SENT
+
+    def send_many(self, subscriptions: list, payload_for: Callable) -> List[str]:
+        """Send to all ``subscriptions`` concurrently; returns outcomes in order."""
+        if not subscriptions:
+            return []
+        executor = self._get_executor()
+        return list(
+            executor.map(lambda sub: self.send_one(sub, payload_for(sub)), subscriptions)
+        )
+
+    def deliver(
+        self,
+        db: Session,
+        subscriptions: Iterable,
+        payload_for: Callable,
+        mark_notified: bool = False,
+        label: str = "push",
+        notified_column: str = "last_notified_at",
+    ) -> dict:
+        """Send to ``subscriptions`` chunk by chunk and apply batched state updates.
+
+        Args:
+            db: Session used for the batched DELETE/UPDATE (committed per chunk)
+            subscriptions: Rows with id, user_id, endpoint, p256dh_key, auth_key
+            payload_for: Builds the payload dict for a subscription
+            mark_notified: Set ``notified_column`` on successfully notified rows
+            label: Name used in the metrics log line
+            notified_column: One of ``NOTIFIED_COLUMNS``
+
+        Returns:
+            Counts (total, sent, gone, failed), throughput metrics and the ids
+            of the subscriptions sent to (sent_ids)
+        """
+        if notified_column not in NOTIFIED_COLUMNS:
+            raise ValueError(f"Unknown notified column: {notified_column}")
+        mark_column = notified_column if mark_notified else None
+        stats = {"total": 0, SENT: 0, GONE: 0, FAILED: 0, "sent_ids": []}
+        started = time.monotonic()
+
+        if not VAPID_PRIVATE_KEY or not VAPID_PUBLIC_KEY:
+            logger.error("VAPID keys not configured. Cannot send push notifications.")
+            subscriptions = list(subscriptions)
+            stats["total"] = stats[FAILED] = len(subscriptions)
+            return self._with_metrics(stats, started, label)
+
+        chunk = []
+        for subscription in subscriptions:
+            chunk.append(subscription)
+            if len(chunk) >= self.chunk_size:
+                self._deliver_chunk(db, chunk, payload_for, mark_column, stats)
+                chunk = []
+        if chunk:
+            self._deliver_chunk(db, chunk, payload_for, mark_column, stats)
+
+        return self._with_metrics(stats, started, label)
+
+    def _deliver_chunk(self, db, chunk, payload_for, mark_column, stats):
+        outcomes = self.send_many(chunk, payload_for)
+        sent_ids = [sub.id for sub, outcome in zip(chunk, outcomes) if outcome == SENT]
+        gone_ids = [sub.id for sub, outcome in zip(chunk, outcomes) if outcome == GONE]
+
+        try:
+            if gone_ids:
+                db.execute(
+                    text("DELETE FROM push_subscriptions WHERE id = ANY(:ids)"),
+                    {"ids": gone_ids},
+                )
+            if mark_column and sent_ids:
+                db.execute(
+                    text(
+                        f"UPDATE push_subscriptions SET {mark_column} = :now "
+                        "WHERE id = ANY(:ids)"
+                    ),
+                    {"now": datetime.utcnow(), "ids": sent_ids},
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to update push subscription state: {e}")
+
+        stats["total"] += len(chunk)
+        stats[SENT] += len(sent_ids)
+        stats["sent_ids"].extend(sent_ids)
+        stats[GONE] += len(gone_ids)
+        stats[FAILED] += len(chunk) - len(sent_ids) - len(gone_ids)
+
+    @staticmethod
+    def _with_metrics(stats: dict, started: float, label: str) -> dict:
+        elapsed = time.monotonic() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["per_second"] = round(stats["total"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"[Push] {label}: {stats[SENT]} sent, {stats[GONE]} gone, {stats[FAILED]} failed "
+            f"of {stats['total']} in {stats['elapsed_seconds']}s ({stats['per_second']}/s)"
+        )
+        return stats
+
+
+# Global engine instance
+push_engine = PushDeliveryEngine(
+    max_concurrency=int(os.getenv("PUSH_MAX_CONCURRENCY", "32")),
+)
+
+
+# Plain rows (not ORM instances) so per-chunk commits never reload them
+_DELIVERY_COLUMNS = (
+    PushSubscription.id,
+    PushSubscription.user_id,
+    PushSubscription.endpoint,
+    PushSubscription.p256dh_key,
+    PushSubscription.auth_key,
+)
+
+
+def _payload(title: str, body: str, icon: Optional[str], url: Optional[str]) -> dict:
+    return {
+        "title": title,
+        "body": body,
+        "icon": icon or "https://tigerleads.ai/logo.png",
+        "url": url or "https://tigerleads.ai",
+    }
+
 
 def send_push_notification(
     subscription: PushSubscription,
@@ -72,74 +456,19 @@ def send_push_notification(
         logger.error("VAPID keys not configured. Cannot send push notifications.")
         return False
 
-    subscription_info = {
-        "endpoint": subscription.endpoint,
-        "keys": {"p256dh": subscription.p256dh_key, "auth": subscription.auth_key},
-    }
-
-    payload = {
-        "title": title,
-        "body": body,
-        "icon": icon or "https://tigerleads.ai/logo.png",
-        "url": url or "https://tigerleads.ai",
-    }
-
-    try:
-        # Extract the origin (scheme + host) from the endpoint for 'aud' claim
-        from urllib.parse import urlparse
-
-        parsed_endpoint = urlparse(subscription.endpoint)
-        audience = f"{parsed_endpoint.scheme}://{parsed_endpoint.netloc}"
-
-        # Validate that we have a proper audience URL
-        if not parsed_endpoint.scheme or not parsed_endpoint.netloc:
-            logger.warning(
-                f"Skipping subscription {subscription.id} - invalid endpoint: {subscription.endpoint}"
-            )
-            return False
+    outcome = push_engine.send_one(subscription, _payload(title, body, icon, url))
 
-        logger.info(
-            f"Sending push to subscription {subscription.id} with aud={audience}"
-        )
-
-        webpush(
-            subscription_info=subscription_info,
-            data=json.dumps(payload),
-            vapid_private_key=VAPID_PRIVATE_KEY,
-            vapid_claims={"sub": VAPID_CLAIM_EMAIL, "aud": audience},
-        )
-        logger.info(
-            f"Push notification sent to subscription {subscription.id} (user {subscription.user_id})"
-        )
-        return True
-
-    except WebPushException as e:
-        logger.error(
-            f"Failed to send push notification to subscription {subscription.id}: {e}"
-        )
-
-        # If subscription is invalid/expired (404 or 410), delete it
-        if e.response and e.response.status_code in [404, 410]:
-            logger.info(f"Removing invalid subscription {subscription.id}")
-            if db:
-                try:
-                    db.delete(subscription)
-                    db.commit()
-                    logger.info(f"Deleted expired subscription {subscription.id}")
-                except Exception as delete_error:
-                    logger.error(f"Failed to delete subscription: {delete_error}")
-                    db.rollback()
+    # If subscription is invalid/expired (404 or 410), delete it
+    if outcome == GONE and db:
+        try:
+            db.delete(subscription)
+            db.commit()
+            logger.info(f"Deleted expired subscription {subscription.id}")
+        except Exception as delete_error:
+            logger.error(f"Failed to delete subscription: {delete_error}")
+            db.rollback()
 
-        return False
-    except ValueError as e:
-        # VAPID key format error
-        logger.error(
-            f"ValueError sending push notification to subscription {subscription.id}: {e}"
-        )
-        return False
-    except Exception as e:
-        logger.error(f"Unexpected error sending push notification: {e}")
-        return False
+    return outcome == SENT
 
 
 def send_push_to_users(
@@ -166,92 +495,85 @@ def send_push_to_users(
     """
 
     subscriptions = (
-        db.query(PushSubscription).filter(PushSubscription.user_id.in_(user_ids)).all()
+        db.query(*_DELIVERY_COLUMNS).filter(PushSubscription.user_id.in_(user_ids)).all()
     )
-
-    success_count = 0
-    failed_count = 0
-
-    for subscription in subscriptions:
-        if send_push_notification(subscription, title, body, icon, url, db):
-            success_count += 1
-        else:
-            failed_count += 1
-
-    logger.info(
-        f"Push notification batch: {success_count} sent, {failed_count} failed out of {len(subscriptions)} total"
+    payload = _payload(title, body, icon, url)
+    stats = push_engine.deliver(
+        db, subscriptions, lambda _sub: payload, label="send_push_to_users"
     )
 
     return {
-        "total": len(subscriptions),
-        "success": success_count,
-        "failed": failed_count,
+        "total": stats["total"],
+        "success": stats[SENT],
+        "failed": stats[GONE] + stats[FAILED],
+        "elapsed_seconds": stats["elapsed_seconds"],
+        "per_second": stats["per_second"],
     }
 
 
+def new_jobs_payload(new_jobs: int) -> dict:
+    """Push payload announcing ``new_jobs`` new matching leads."""
+    leads, match = ("lead", "Matches") if new_jobs == 1 else ("leads", "Match")
+    return _payload(
+        f"{new_jobs} New {leads.title()} {match} Your Trades",
+        f"{new_jobs} new {leads} in your area since we last checked in. "
+        "These go fast — be the first to unlock them before the competition does.",
+        "https://tigerleads.ai/job-icon.png",
+        "https://tigerleads.ai/jobs",
+    )
+
+
 def send_weekly_job_notifications(db: Session) -> dict:
     """
-    Send weekly job notifications to users who haven't been notified in 7+ days.
+    Send weekly job notifications to users with new matching jobs.
 
     This function:
-    1. Finds subscriptions that haven't been notified in 7+ days
-    2. Sends push notification about new jobs
-    3. Updates last_notified_at timestamp
+    1. Finds subscriptions that haven't been notified in 7+ days and, in the
+       same query, counts the posted jobs matching each user's feed since
+       their last notification (TARGETED_JOBS_SQL)
+    2. Sends a push with the personalised count (concurrently), only to
+       subscriptions with at least one match
+    3. Updates last_notified_at timestamp (one UPDATE per chunk); users
+       without matches keep theirs, so their next count starts from the same point
 
     Args:
         db: Database session
 
     Returns:
-        Dictionary with stats: checked, notified, skipped
+        Dictionary with stats: checked, notified, skipped (+ no_matches, throughput)
     """
 
-    # Get subscriptions that need weekly notification
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-
-    subscriptions = (
-        db.query(PushSubscription)
-        .filter(
-            or_(
-                PushSubscription.last_notified_at == None,
-                PushSubscription.last_notified_at <= seven_days_ago,
-            )
-        )
-        .all()
-    )
+    trade_keys = trade_taxonomy.slug_lookup_keys()
+
+    rows = db.execute(
+        text(TARGETED_JOBS_SQL),
+        {
+            "cutoff": seven_days_ago,
+            "trade_keys": list(trade_keys),
+            "trade_slugs": list(trade_keys.values()),
+        },
+    ).fetchall()
+    subscriptions = [row for row in rows if row.new_jobs > 0]
 
     logger.info(
-        f"Found {len(subscriptions)} subscriptions eligible for weekly notification"
+        f"Found {len(rows)} subscriptions eligible for weekly notification, "
+        f"{len(subscriptions)} with new matching jobs"
     )
 
-    notified_count = 0
-    skipped_count = 0
-
-    for subscription in subscriptions:
-        # Send notification
-        success = send_push_notification(
-            subscription=subscription,
-            title="Fresh Leads Just Dropped — Act Fast!",
-            body="New jobs matching your profile are live. These leads go fast — be the first to unlock them before the competition does.",
-            icon="https://tigerleads.ai/job-icon.png",
-            url="https://tigerleads.ai/jobs",
-            db=db,
-        )
-
-        if success:
-            # Update last notified timestamp
-            subscription.last_notified_at = datetime.utcnow()
-            db.commit()
-            notified_count += 1
-            logger.info(f"Sent weekly notification to user {subscription.user_id}")
-        else:
-            skipped_count += 1
-
-    logger.info(
-        f"Weekly job notifications: {notified_count} sent, {skipped_count} skipped"
+    stats = push_engine.deliver(
+        db,
+        subscriptions,
+        lambda sub: new_jobs_payload(sub.new_jobs),
+        mark_notified=True,
+        label="weekly job notifications",
     )
 
     return {
-        "checked": len(subscriptions),
-        "notified": notified_count,
-        "skipped": skipped_count,
+        "checked": len(rows),
+        "notified": stats[SENT],
+        "skipped": len(rows) - stats[SENT],
+        "no_matches": len(rows) - len(subscriptions),
+        "elapsed_seconds": stats["elapsed_seconds"],
+        "per_second": stats["per_second"],
     }
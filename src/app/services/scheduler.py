@@ -0,0 +1,380 @@
+"""
+Background Task Scheduler
+
+Single scheduler for all periodic background work. Tasks are registered
+declaratively with an interval, a start-up jitter and a timeout, and every
+instance of the app runs the same scheduler loop. Before a task runs, the
+instance must:
+
+1. take a Postgres session-level advisory lock for the task
+   (``pg_try_advisory_lock``), so two instances never run it concurrently, and
+2. find no successful run of the task within the current interval in
+   ``scheduler_runs``, so it runs once per interval across the fleet instead
+   of once per worker.
+
+Each run is recorded in ``scheduler_runs`` with status, duration and the
+number of rows the task reports as affected. ``prune_runs`` (registered as a
+daily task) deletes rows older than ``SCHEDULER_RUNS_RETENTION_DAYS``.
+
+Task bodies do their blocking database and HTTP work through
+``run_blocking``, which runs it on a worker thread of the task's own, so a
+long scan never stalls API requests on the event loop, never takes the
+default executor's threads that request handlers use, and never delays
+another task. A body that times out keeps its thread (threads cannot be
+interrupted); the task holds its lock until that thread returns, so the next
+interval cannot start a second copy.
+
+Set ``SCHEDULER_ENABLED=false`` to keep an instance out of the rotation.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import random
+import socket
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from sqlalchemy import text
+
+from src.app.core.database import engine
+
+logger = logging.getLogger("uvicorn.error")
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# A task counts as done for the interval if it succeeded within this fraction
+# of the interval (leaves room for jitter and timer drift between instances)
+DUE_FRACTION = 0.9
+
+DAY_SECONDS = 24 * 3600
+
+# Worker threads for blocking work outside scheduled tasks (e.g. the schema
+# bootstrap); each scheduled task has a thread of its own
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCHEDULER_WORKER_THREADS", "2")),
+    thread_name_prefix="scheduler",
+)
+
+# The task whose body is running in the current asyncio context
+_current_task: ContextVar[Optional["ScheduledTask"]] = ContextVar(
+    "scheduler_current_task", default=None
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking function on the current task's worker thread.
+
+    A task that times out stops being awaited, but its thread finishes the
+    current call, so blocking bodies should commit in bounded steps.
+    """
+    task = _current_task.get()
+    executor = task.executor() if task is not None else _executor
+    future = executor.submit(partial(func, *args, **kwargs))
+    if task is not None:
+        task.in_flight.add(future)
+        future.add_done_callback(task.in_flight.discard)
+    return await asyncio.wrap_future(future)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a task name."""
+    digest = hashlib.sha1(f"scheduler:{name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class ScheduledTask:
+    """A periodic task. ``func`` returns the number of rows affected (or None)."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Optional[int]]],
+        interval_seconds: float,
+        jitter_seconds: float = 0,
+        timeout_seconds: Optional[float] = None,
+        run_on_start: bool = True,
+    ):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.timeout_seconds = timeout_seconds
+        self.run_on_start = run_on_start
+        self.lock_key = advisory_lock_key(name)
+        self.in_flight: Set[Future] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"scheduler-{self.name}"
+            )
+        return self._executor
+
+    async def wait_for_threads(self):
+        """Wait until blocking calls the task's body left running have returned."""
+        if self.in_flight:
+            await asyncio.wait([asyncio.wrap_future(f) for f in list(self.in_flight)])
+
+
+class Scheduler:
+    """Runs registered tasks on every instance, but each task once per interval fleet-wide."""
+
+    def __init__(self):
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.is_running = False
+        self._loops: Dict[str, asyncio.Task] = {}
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Optional[int]]],
+        interval_seconds: float,
+        jitter_seconds: float = 0,
+        timeout_seconds: Optional[float] = None,
+        run_on_start: bool = True,
+    ) -> ScheduledTask:
+        """Register a task; names must be unique (they key the lock and run history)."""
+        if name in self.tasks:
+            raise ValueError(f"Scheduled task '{name}' is already registered")
+        task = ScheduledTask(
+            name,
+            func,
+            interval_seconds,
+            jitter_seconds=jitter_seconds,
+            timeout_seconds=timeout_seconds,
+            run_on_start=run_on_start,
+        )
+        self.tasks[name] = task
+        return task
+
+    async def start(self):
+        """Start one loop per registered task."""
+        if self.is_running:
+            logger.warning("Scheduler is already running")
+            return
+        if os.getenv("SCHEDULER_ENABLED", "true").lower() not in ("1", "true", "yes"):
+            logger.info("Scheduler disabled on this instance (SCHEDULER_ENABLED)")
+            return
+
+        self.is_running = True
+        for task in self.tasks.values():
+            self._loops[task.name] = asyncio.create_task(self._loop(task))
+        logger.info(
+            f"Scheduler started on {INSTANCE_ID} with {len(self.tasks)} task(s): "
+            f"{', '.join(self.tasks)}"
+        )
+
+    async def stop(self):
+        """Cancel all task loops (a task that is mid-run is cancelled too)."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        for loop in self._loops.values():
+            loop.cancel()
+        for loop in self._loops.values():
+            try:
+                await loop
+            except asyncio.CancelledError:
+                pass
+        self._loops.clear()
+        logger.info("Scheduler stopped")
+
+    def _next_delay(self, task: ScheduledTask, first: bool) -> float:
+        jitter = random.uniform(0, task.jitter_seconds) if task.jitter_seconds else 0
+        if first and task.run_on_start:
+            return jitter
+        return task.interval_seconds + jitter
+
+    async def _loop(self, task: ScheduledTask):
+        delay = self._next_delay(task, first=True)
+        while self.is_running:
+            try:
+                await asyncio.sleep(delay)
+                await self.run_task(task)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[Scheduler] Unexpected error in task '{task.name}': {str(e)}")
+            delay = self._next_delay(task, first=False)
+
+    # ------------------------------------------------------------------
+    # Leader election and run history (blocking, run in a worker thread)
+    # ------------------------------------------------------------------
+
+    def _claim(self, task: ScheduledTask):
+        """Take the task's advisory lock and open a run row if the task is due.
+
+        Returns (connection, run_id) while holding the lock, or None.
+        """
+        conn = engine.connect()
+        try:
+            locked = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": task.lock_key}
+            ).scalar()
+            if not locked:
+                conn.close()
+                return None
+
+            recent = conn.execute(
+                text(
+                    """
+                    SELECT 1 FROM scheduler_runs
+                    WHERE job_name = :name
+                      AND status = 'success'
+                      AND started_at > NOW() - make_interval(secs => :window)
+                    LIMIT 1
+                    """
+                ),
+                {"name": task.name, "window": task.interval_seconds * DUE_FRACTION},
+            ).scalar()
+            if recent:
+                self._release(conn, task)
+                return None
+
+            run_id = conn.execute(
+                text(
+                    """
+                    INSERT INTO scheduler_runs (job_name, instance_id, status, started_at)
+                    VALUES (:name, :instance, 'running', NOW())
+                    RETURNING id
+                    """
+                ),
+                {"name": task.name, "instance": INSTANCE_ID},
+            ).scalar()
+            conn.commit()
+            return conn, run_id
+        except Exception:
+            conn.rollback()
+            self._release(conn, task)
+            raise
+
+    def _finish(
+        self,
+        conn,
+        task: ScheduledTask,
+        run_id: int,
+        status: str,
+        duration_ms: int,
+        rows_affected: Optional[int],
+        error: Optional[str],
+    ):
+        try:
+            conn.execute(
+                text(
+                    """
+                    UPDATE scheduler_runs
+                    SET status = :status,
+                        finished_at = NOW(),
+                        duration_ms = :duration_ms,
+                        rows_affected = :rows_affected,
+                        error = :error
+                    WHERE id = :run_id
+                    """
+                ),
+                {
+                    "status": status,
+                    "duration_ms": duration_ms,
+                    "rows_affected": rows_affected,
+                    "error": error[:2000] if error else None,
+                    "run_id": run_id,
+                },
+            )
+            conn.commit()
+        finally:
+            self._release(conn, task)
+
+    @staticmethod
+    def _release(conn, task: ScheduledTask):
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": task.lock_key})
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"[Scheduler] Failed to release lock for '{task.name}': {str(e)}")
+        finally:
+            conn.close()
+
+    def _prune_runs_sync(self) -> int:
+        # Never drop history a task still needs to decide whether it is due
+        longest = max((t.interval_seconds for t in self.tasks.values()), default=0)
+        keep_days = max(
+            int(os.getenv("SCHEDULER_RUNS_RETENTION_DAYS", "14")),
+            math.ceil(longest / DAY_SECONDS) + 1,
+        )
+        with engine.begin() as conn:
+            result = conn.execute(
+                text(
+                    """
+                    DELETE FROM scheduler_runs
+                    WHERE started_at < NOW() - make_interval(days => :days)
+                    """
+                ),
+                {"days": keep_days},
+            )
+        return result.rowcount
+
+    async def prune_runs(self) -> int:
+        """Delete old ``scheduler_runs`` rows; returns how many were deleted."""
+        return await run_blocking(self._prune_runs_sync)
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    async def run_task(self, task: ScheduledTask) -> Optional[str]:
+        """Run ``task`` if this instance wins the lock and it is due.
+
+        Returns the run status, or None when the run was skipped.
+        """
+        claim = await asyncio.to_thread(self._claim, task)
+        if claim is None:
+            logger.debug(f"[Scheduler] '{task.name}' skipped (not due or running elsewhere)")
+            return None
+
+        conn, run_id = claim
+        started = time.monotonic()
+        status, rows_affected, error = "success", None, None
+        context_token = _current_task.set(task)
+        try:
+            result = await asyncio.wait_for(task.func(), timeout=task.timeout_seconds)
+            rows_affected = result if isinstance(result, int) else None
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"Timed out after {task.timeout_seconds}s"
+            # Keep the lock until the body's thread is done
+            await task.wait_for_threads()
+        except asyncio.CancelledError:
+            status, error = "failed", "Cancelled"
+            raise
+        except Exception as e:
+            status, error = "failed", str(e)
+        finally:
+            _current_task.reset(context_token)
+            duration_ms = int((time.monotonic() - started) * 1000)
+            try:
+                await asyncio.shield(
+                    asyncio.to_thread(
+                        self._finish, conn, task, run_id, status, duration_ms, rows_affected, error
+                    )
+                )
+            except Exception as e:
+                logger.error(f"[Scheduler] Failed to record run of '{task.name}': {str(e)}")
+
+        if status == "success":
+            logger.info(
+                f"[Scheduler] ✓ '{task.name}' finished in {duration_ms} ms"
+                f" ({rows_affected if rows_affected is not None else 'n/a'} row(s))"
+            )
+        else:
+            logger.error(f"[Scheduler] '{task.name}' {status} after {duration_ms} ms: {error}")
+        return status
+
+
+# Global scheduler instance (tasks are registered in services/background_tasks.py)
+scheduler = Scheduler()
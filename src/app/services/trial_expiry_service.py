@@ -1,18 +1,27 @@
 """
 Background service to automatically expire trial credits after 14 days.
 
-This service runs daily and:
-- Checks for trial subscribers whose trial_credits_expires_at has passed
+This task runs daily via the background scheduler (see
+services/background_tasks.py) and:
+- Expires trial subscribers whose trial_credits_expires_at has passed with one
+  set-based UPDATE ... RETURNING per batch (no ORM loading)
 - Sets current_credits to 0 if they haven't upgraded to paid subscription
+- Writes a credit_ledger_entries row per expiry with the credits removed
 - Keeps trial_credits_used flag for tracking purposes
+- Invalidates the cached "subscriptions" and "users" admin responses when a
+  batch expired anyone
+- Hands the expired users to an async notifier (in-app notification + push)
+  that runs after the task so notifications never hold up the expiry
 """
 
 import asyncio
 import logging
 from datetime import datetime, timezone
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from src.app.models.user import Subscriber
+from src.app.core.response_cache import response_cache
+from src.app.services.push_service import send_push_to_users
+from src.app.services.scheduler import run_blocking
 import os
 from dotenv import load_dotenv
 
@@ -34,89 +43,97 @@ if not DATABASE_URL:
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# One batch: expire, record the removed credits in the ledger, return who expired
+EXPIRE_TRIALS_SQL = """
+    WITH batch AS (
+        SELECT id, current_credits
+        FROM subscribers
+        WHERE subscription_status = 'trial'
+          AND trial_credits_expires_at <= :now
+          AND current_credits > 0
+        ORDER BY id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    expired AS (
+        UPDATE subscribers s
+        SET current_credits = 0,
+            is_active = FALSE,
+            subscription_status = 'trial_expired'
+        FROM batch b
+        WHERE s.id = b.id
+        RETURNING s.id, s.user_id, b.current_credits AS credits_removed
+    ),
+    ledger AS (
+        INSERT INTO credit_ledger_entries
+            (user_id, subscriber_id, entry_type, credits_delta, balance_after, note)
+        SELECT user_id, id, 'trial_expired', -credits_removed, 0, 'Trial credits expired'
+        FROM expired
+    )
+    SELECT id, user_id, credits_removed FROM expired
+"""
+
+TRIAL_EXPIRED_TITLE = "Your free trial has ended"
+TRIAL_EXPIRED_MESSAGE = (
+    "Your trial credits have expired. Choose a plan to keep unlocking new leads."
+)
+
 
 class TrialExpiryService:
     """Background service to expire trial credits after 14 days."""
-    
-    def __init__(self):
-        self.running = False
-        self.task = None
-    
-    async def start(self):
-        """Start the background service."""
-        if self.running:
-            logger.warning("Trial expiry service is already running")
-            return
-        
-        self.running = True
-        self.task = asyncio.create_task(self._run_expiry_loop())
-        logger.info("Trial expiry service started")
-    
-    async def stop(self):
-        """Stop the background service."""
-        if not self.running:
-            return
-        
-        self.running = False
-        if self.task:
-            self.task.cancel()
-            try:
-                await self.task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Trial expiry service stopped")
-    
-    async def _run_expiry_loop(self):
-        """Main loop that checks for expired trials daily."""
-        while self.running:
-            try:
-                await self._expire_trial_credits()
-                
-                # Wait 24 hours before next check
-                await asyncio.sleep(86400)  # 24 hours in seconds
-                
-            except asyncio.CancelledError:
-                logger.info("Trial expiry service loop cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in trial expiry loop: {str(e)}", exc_info=True)
-                # Wait 1 hour before retrying on error
-                await asyncio.sleep(3600)
-    
-    async def _expire_trial_credits(self):
-        """Expire trial credits for subscribers whose trial period has ended."""
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        Args:
+            batch_size: Subscribers expired per statement/transaction
+        """
+        self.batch_size = batch_size
+        self._notify_tasks: set = set()
+
+    async def _expire_trial_credits(self) -> int:
+        """Run trial expiry on a scheduler worker thread, then hand off notifications."""
+        user_ids = await run_blocking(self._expire_trial_credits_sync)
+        if user_ids:
+            task = asyncio.create_task(self._notify_expired(user_ids))
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+        return len(user_ids)
+
+    def _expire_trial_credits_sync(self) -> list:
+        """Expire trial credits for subscribers whose trial period has ended.
+
+        Returns the user ids of the expired subscribers.
+        """
         db: Session = SessionLocal()
+        user_ids = []
+        credits_removed = 0
         try:
             now = datetime.now(timezone.utc)
-            
-            # Find subscribers with expired trials still on trial status
-            expired_trials = db.query(Subscriber).filter(
-                Subscriber.subscription_status == "trial",
-                Subscriber.trial_credits_expires_at <= now,
-                Subscriber.current_credits > 0
-            ).all()
-            
-            if not expired_trials:
+
+            while True:
+                rows = db.execute(
+                    text(EXPIRE_TRIALS_SQL),
+                    {"now": now, "batch_size": self.batch_size},
+                ).fetchall()
+                if rows:
+                    response_cache.invalidate_on_commit(db, "subscriptions", "users")
+                db.commit()
+
+                user_ids.extend(row.user_id for row in rows)
+                credits_removed += sum(row.credits_removed or 0 for row in rows)
+                if len(rows) < self.batch_size:
+                    break
+
+            if not user_ids:
                 logger.info("No expired trials found")
-                return
-            
-            expired_count = 0
-            for subscriber in expired_trials:
-                # Zero out credits for expired trials
-                credits_removed = subscriber.current_credits
-                subscriber.current_credits = 0
-                subscriber.is_active = False
-                subscriber.subscription_status = "trial_expired"
-                
-                logger.info(
-                    f"Expired trial for subscriber {subscriber.id}: "
-                    f"Removed {credits_removed} credits"
-                )
-                expired_count += 1
-            
-            db.commit()
-            logger.info(f"Expired {expired_count} trial subscriptions")
-            
+                return []
+
+            logger.info(
+                f"Expired {len(user_ids)} trial subscriptions "
+                f"({credits_removed} credits removed)"
+            )
+            return user_ids
+
         except Exception as e:
             db.rollback()
             logger.error(f"Error expiring trial credits: {str(e)}", exc_info=True)
@@ -124,16 +141,53 @@ class TrialExpiryService:
         finally:
             db.close()
 
+    async def _notify_expired(self, user_ids: list):
+        """Tell users their trial ended: one in-app notification each, plus a push."""
+        try:
+            await run_blocking(self._create_notifications_sync, user_ids)
+        except Exception as e:
+            logger.error(f"Failed to create trial expiry notifications: {str(e)}")
 
-# Global instance
-trial_expiry_service = TrialExpiryService()
+        try:
+            def _push():
+                db: Session = SessionLocal()
+                try:
+                    return send_push_to_users(
+                        db,
+                        user_ids,
+                        title=TRIAL_EXPIRED_TITLE,
+                        body=TRIAL_EXPIRED_MESSAGE,
+                        url="https://tigerleads.ai/subscription",
+                    )
+                finally:
+                    db.close()
 
+            result = await run_blocking(_push)
+            logger.info(
+                f"Trial expiry push: {result['success']} sent, {result['failed']} failed"
+            )
+        except Exception as e:
+            logger.error(f"Failed to send trial expiry push notifications: {str(e)}")
 
-async def start_trial_expiry_service():
-    """Start the trial expiry background service."""
-    await trial_expiry_service.start()
+    def _create_notifications_sync(self, user_ids: list):
+        db: Session = SessionLocal()
+        try:
+            db.execute(
+                text(
+                    """
+                    INSERT INTO notifications (user_id, type, message, is_read)
+                    SELECT UNNEST(CAST(:user_ids AS integer[])), 'trial_expired', :message, FALSE
+                    """
+                ),
+                {"user_ids": user_ids, "message": TRIAL_EXPIRED_MESSAGE},
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
 
 
-async def stop_trial_expiry_service():
-    """Stop the trial expiry background service."""
-    await trial_expiry_service.stop()
+# Global instance
+trial_expiry_service = TrialExpiryService()
@@ -0,0 +1,167 @@
+"""
+Per-job, per-trade unlock counters
+
+Jobs are retired once UNLOCK_RETIRE_THRESHOLD users of the SAME trade (e.g. 5
+electricians, or 5 plumbers) have unlocked them. Instead of recounting every
+unlock periodically, ``unlock_job`` bumps ``job_trade_unlock_counts`` in the
+same transaction as the unlock and retires the job as soon as one of the
+unlocking user's trades reaches the threshold:
+
+- contractor-uploaded jobs are marked 'Complete',
+- all other jobs are moved to jobs_archive (see services/job_archive.py).
+"""
+
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from src.app.core.response_cache import response_cache
+from src.app.services.job_archive import purge_batch
+
+logger = logging.getLogger("uvicorn.error")
+
+UNLOCK_RETIRE_THRESHOLD = 5
+
+# Trades of the unlocking user (its contractor or supplier user_type array)
+_USER_TRADES_SQL = """
+    SELECT DISTINCT t.trade
+    FROM users u
+    LEFT JOIN contractors c ON c.user_id = u.id
+    LEFT JOIN suppliers s ON s.user_id = u.id
+    CROSS JOIN LATERAL UNNEST(
+        COALESCE(c.user_type, s.user_type, ARRAY[]::text[])
+    ) AS t(trade)
+    WHERE u.id = :user_id
+"""
+
+
+def record_unlock(db: Session, job, user_id: int) -> Optional[str]:
+    """Count a new unlock of ``job`` by ``user_id`` and retire the job at the threshold.
+
+    Runs in the caller's transaction (the caller commits). Must be called once
+    per (user, job) pair, i.e. only for new unlocks, so counts stay distinct
+    users per trade.
+
+    Returns "completed" or "archived" when the job was retired, else None. An
+    archived job is expunged from the session so the caller can still build its
+    response from the already-loaded attributes.
+    """
+    # Unlock counts, job status and the user's credits change with this commit
+    response_cache.invalidate_on_commit(db, "unlocks", "jobs", "subscriptions")
+
+    # The unlock row must exist before the job may be archived (its FK is SET NULL)
+    db.flush()
+
+    counts = db.execute(
+        text(
+            f"""
+            INSERT INTO job_trade_unlock_counts (job_id, trade, unlock_count)
+            SELECT :job_id, trade, 1 FROM ({_USER_TRADES_SQL}) user_trades
+            ON CONFLICT (job_id, trade)
+            DO UPDATE SET unlock_count = job_trade_unlock_counts.unlock_count + 1
+            RETURNING trade, unlock_count
+            """
+        ),
+        {"job_id": job.id, "user_id": user_id},
+    ).fetchall()
+
+    reached = [row.trade for row in counts if row.unlock_count >= UNLOCK_RETIRE_THRESHOLD]
+    if not reached:
+        return None
+
+    # An archived job is detached below; load its deferred columns while the
+    # row still exists so the caller's response can read them
+    state = inspect(job)
+    unloaded = state.unloaded & set(state.mapper.column_attrs.keys())
+    if unloaded:
+        db.refresh(job, attribute_names=sorted(unloaded))
+
+    completed, archived = retire_jobs(db, [job.id])
+    if archived:
+        db.expunge(job)
+        logger.info(
+            f"[Unlock Counters] Archived job {job.id} ({UNLOCK_RETIRE_THRESHOLD}+ unlocks by {', '.join(reached)})"
+        )
+        return "archived"
+    if completed:
+        logger.info(
+            f"[Unlock Counters] Marked contractor job {job.id} as Complete ({UNLOCK_RETIRE_THRESHOLD}+ unlocks by {', '.join(reached)})"
+        )
+        return "completed"
+    return None
+
+
+def retire_jobs(db: Session, job_ids: Iterable[int]) -> tuple:
+    """Retire jobs set-based: contractor uploads become 'Complete', the rest are archived.
+
+    Returns (completed_ids, archived_ids). Does not commit.
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return [], []
+
+    completed = db.execute(
+        text(
+            """
+            UPDATE jobs SET job_review_status = 'Complete', updated_at = NOW()
+            WHERE id = ANY(:ids)
+              AND uploaded_by_contractor IS TRUE
+              AND job_review_status IS DISTINCT FROM 'Complete'
+            RETURNING id
+            """
+        ),
+        {"ids": job_ids},
+    ).scalars().all()
+    archived = purge_batch(
+        db,
+        """
+        SELECT id FROM jobs
+        WHERE id = ANY(:ids) AND uploaded_by_contractor IS NOT TRUE
+        FOR UPDATE
+        """,
+        {"ids": job_ids},
+        archive=True,
+        reason="unlock_threshold",
+    )
+    return list(completed), archived
+
+
+def backfill_unlock_counts(db: Session) -> int:
+    """Rebuild the counters from unlocked_leads and retire jobs already over the threshold.
+
+    Run once when the counters table is created; returns the number of jobs retired.
+    """
+    db.execute(text("DELETE FROM job_trade_unlock_counts"))
+    db.execute(
+        text(
+            """
+            INSERT INTO job_trade_unlock_counts (job_id, trade, unlock_count)
+            SELECT ul.job_id, t.trade, COUNT(DISTINCT ul.user_id)
+            FROM unlocked_leads ul
+            JOIN jobs j ON j.id = ul.job_id
+            LEFT JOIN contractors c ON c.user_id = ul.user_id
+            LEFT JOIN suppliers s ON s.user_id = ul.user_id
+            CROSS JOIN LATERAL UNNEST(
+                COALESCE(c.user_type, s.user_type, ARRAY[]::text[])
+            ) AS t(trade)
+            GROUP BY ul.job_id, t.trade
+            """
+        )
+    )
+    over_threshold = db.execute(
+        text(
+            """
+            SELECT DISTINCT c.job_id
+            FROM job_trade_unlock_counts c
+            JOIN jobs j ON j.id = c.job_id
+            WHERE c.unlock_count >= :threshold
+              AND j.job_review_status IS DISTINCT FROM 'Complete'
+            """
+        ),
+        {"threshold": UNLOCK_RETIRE_THRESHOLD},
+    ).scalars().all()
+    completed, archived = retire_jobs(db, over_threshold)
+    db.commit()
+    return len(completed) + len(archived)
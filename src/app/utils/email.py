@@ -3,10 +3,13 @@ import logging
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
-# Import Resend helper
-from src.app.utils.email_resend import send_email_resend
+# Emails are queued in email_outbox and delivered in the background
+from src.app.services.email_outbox import enqueue_email_async
+from src.app.utils.email_templates import email_templates
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -14,6 +17,19 @@ logger = logging.getLogger(__name__)
 # Logo path
 LOGO_PATH = Path("app/static/logo.png")
 
+
+@lru_cache(maxsize=1)
+def load_logo_base64() -> Optional[str]:
+    """Logo as base64 (read once), or None if it is missing."""
+    if not LOGO_PATH.exists():
+        return None
+    try:
+        with open(LOGO_PATH, "rb") as img_file:
+            return base64.b64encode(img_file.read()).decode("utf-8")
+    except Exception as e:
+        logger.warning(f"Could not load logo: {e}")
+        return None
+
 # Frontend base URL — used in email CTAs
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://app.tigerleads.ai")
 
@@ -45,14 +61,7 @@ async def send_admin_invitation_email(
     subject = f"Admin Invitation to Tiger Leads.ai — Role: {role}"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            logo_base64 = None
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width:160px;height:auto;" />'
@@ -62,93 +71,22 @@ async def send_admin_invitation_email(
 
     signup_link = f"{signup_url}?token={token}"
 
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1.0"><title>Admin Invitation</title></head>
-<body style="margin:0;padding:0;background-color:#f4f4f7;font-family:Arial,sans-serif;">
-  <table width="100%" cellpadding="0" cellspacing="0" style="background:#f4f4f7;padding:40px 0;">
-    <tr><td align="center">
-      <table width="600" cellpadding="0" cellspacing="0" style="background:#ffffff;border-radius:10px;overflow:hidden;box-shadow:0 2px 12px rgba(0,0,0,0.08);">
-
-        <!-- Header -->
-        <tr>
-          <td style="background:#1a1a2e;padding:32px 40px;text-align:center;">
-            {logo_html}
-          </td>
-        </tr>
-
-        <!-- Orange accent bar -->
-        <tr><td style="background:#f58220;height:4px;"></td></tr>
-
-        <!-- Body -->
-        <tr>
-          <td style="padding:40px 40px 32px;">
-            <h2 style="margin:0 0 8px;font-size:22px;color:#1a1a2e;">You've been invited to Tiger Leads.ai</h2>
-            <p style="margin:0 0 24px;font-size:15px;color:#555;">
-              <strong style="color:#1a1a2e;">{inviter_name}</strong> has invited you to join the admin team.
-            </p>
-
-            <!-- Role badge -->
-            <table cellpadding="0" cellspacing="0" style="margin-bottom:28px;">
-              <tr>
-                <td style="background:#fff4e8;border:1px solid #f58220;border-radius:6px;padding:10px 18px;">
-                  <span style="font-size:12px;color:#999;text-transform:uppercase;letter-spacing:1px;">Assigned Role</span><br>
-                  <span style="font-size:18px;font-weight:bold;color:#f58220;text-transform:capitalize;">{role}</span>
-                </td>
-              </tr>
-            </table>
-
-            <p style="margin:0 0 24px;font-size:14px;color:#555;">
-              Click the button below to accept your invitation and complete your admin account setup.
-              This link expires in <strong>7 days</strong>.
-            </p>
-
-            <!-- CTA Button -->
-            <table cellpadding="0" cellspacing="0" style="margin-bottom:32px;">
-              <tr>
-                <td style="background:#f58220;border-radius:7px;">
-                  <a href="{signup_link}" style="display:inline-block;padding:14px 32px;font-size:15px;font-weight:bold;color:#ffffff;text-decoration:none;letter-spacing:0.3px;">
-                    Accept Invitation &rarr;
-                  </a>
-                </td>
-              </tr>
-            </table>
-
-            <!-- Fallback URL -->
-            <p style="margin:0 0 6px;font-size:13px;color:#888;">If the button doesn't work, copy and paste this link into your browser:</p>
-            <p style="margin:0 0 24px;word-break:break-all;background:#f8f9fa;border-left:3px solid #f58220;padding:10px 14px;border-radius:4px;font-size:13px;color:#f58220;">{signup_link}</p>
-
-            <!-- Token box -->
-            <table width="100%" cellpadding="0" cellspacing="0" style="background:#f8f9fa;border-radius:6px;margin-bottom:8px;">
-              <tr>
-                <td style="padding:14px 18px;">
-                  <span style="font-size:12px;color:#999;text-transform:uppercase;letter-spacing:1px;">Your Signup Token</span><br>
-                  <span style="font-size:20px;font-weight:bold;color:#1a1a2e;letter-spacing:3px;">{token}</span>
-                </td>
-              </tr>
-            </table>
-            <p style="margin:0 0 0;font-size:12px;color:#aaa;">Use this token on the signup page if prompted.</p>
-          </td>
-        </tr>
-
-        <!-- Footer -->
-        <tr>
-          <td style="background:#f8f9fa;border-top:1px solid #eee;padding:20px 40px;text-align:center;">
-            <p style="margin:0 0 4px;font-size:13px;color:#888;">Thanks,<br><strong style="color:#1a1a2e;">The Tiger Leads.ai Team</strong></p>
-            <p style="margin:8px 0 0;font-size:11px;color:#bbb;">&copy; {year} Tiger Leads.ai &mdash; All rights reserved</p>
-          </td>
-        </tr>
-
-      </table>
-    </td></tr>
-  </table>
-</body>
-</html>"""
+    rendered = email_templates.render(
+        "admin_invitation",
+        inviter_name=inviter_name,
+        logo_html=logo_html,
+        role=role,
+        signup_link=signup_link,
+        token=token,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Admin invitation email sent successfully to {recipient_email} via Resend"
+            f"Admin invitation email queued for {recipient_email}"
         )
         return True, None
     except Exception as e:
@@ -172,14 +110,7 @@ async def send_verification_email(recipient_email: str, code: str):
     subject = "Verify Your Email – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            logo_base64 = None
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -187,50 +118,19 @@ async def send_verification_email(recipient_email: str, code: str):
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222;">Welcome to Tiger Leads.ai!</h2>
-                    <p style="line-height: 1.6;">
-                        Thank you for signing up. To complete your registration and verify your email address, please use the verification code below:
-                    </p>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <div style="background-color: #f8f9fa; border: 2px dashed #f58220; border-radius: 8px; padding: 20px; display: inline-block;">
-                            <p style="margin: 0; font-size: 14px; color: #666; font-weight: 500;">Your Verification Code</p>
-                            <p style="margin: 10px 0 0 0; font-size: 32px; font-weight: bold; color: #f58220; letter-spacing: 4px; font-family: 'Courier New', monospace;">{code}</p>
-                        </div>
-                    </div>
-
-                    <p style="color: #d35400; font-weight: bold; text-align: center;">⏱️ This code will expire in 10 minutes</p>
-
-                    <p style="margin-top: 30px; line-height: 1.6;">
-                        Enter this code on the verification page to activate your account and start using Tiger Leads.ai.
-                    </p>
-
-                    <p style="margin-top: 30px;">Best regards,<br><strong>The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 15px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "verification",
+        code=code,
+        logo_html=logo_html,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Verification email sent successfully to {recipient_email} via Resend"
+            f"Verification email queued for {recipient_email}"
         )
         return True, None
     except Exception as e:
@@ -263,14 +163,7 @@ async def send_team_invitation_email(
     year = datetime.utcnow().year
     login_link = f"{frontend_url}/login"
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -278,89 +171,21 @@ async def send_team_invitation_email(
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">You're Invited to Join a Team!</h2>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Hi there,
-                    </p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        <strong style="color: #f58220;">{inviter_name}</strong> has invited you to join their team on <strong>Tigerleads.ai</strong>
-                    </p>
-
-                    <div style="background-color: #fff3e0; border-left: 4px solid #f58220; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 12px 0; font-size: 15px; color: #e65100; font-weight: 600;">📧 To Accept This Invitation:</p>
-                        <p style="margin: 0; font-size: 14px; color: #333; line-height: 1.8;">
-                            <strong>Login with this email:</strong> <span style="color: #f58220; font-weight: 600;">{recipient_email}</span><br>
-                            <strong>Enter your password</strong> (or create one if you don't have an account yet)<br>
-                            <strong>You will be redirected to {inviter_name}'s dashboard</strong>
-                        </p>
-                    </div>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{login_link}" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 16px 40px; border-radius: 6px; font-weight: 600; display: inline-block; font-size: 16px; box-shadow: 0 2px 8px rgba(245, 130, 32, 0.3);">
-                            Login to Accept Invitation
-                        </a>
-                    </div>
-
-                    <div style="background-color: #e8f5e9; border-radius: 6px; padding: 20px; margin: 25px 0;">
-                        <p style="margin: 0 0 12px 0; font-weight: 600; color: #2e7d32; font-size: 15px;">✨ What Happens Next:</p>
-                        <ul style="margin: 0; padding-left: 20px; line-height: 2;">
-                            <li style="margin-bottom: 8px;">Click the button above to go to the login page</li>
-                            <li style="margin-bottom: 8px;">If you already have an account: Login with <strong>{recipient_email}</strong> and your password</li>
-                            <li style="margin-bottom: 8px;">If you don't have an account: Click "Sign Up" and create one using <strong>{recipient_email}</strong></li>
-                            <li style="margin-bottom: 8px;">After logging in, you'll automatically be redirected to <strong>{inviter_name}'s dashboard</strong></li>
-                            <li style="margin-bottom: 0;">You'll have access to shared leads and team resources</li>
-                        </ul>
-                    </div>
-
-                    <div style="background-color: #fff3e0; border-radius: 6px; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 0; font-size: 14px; color: #e65100; line-height: 1.6;">
-                            <strong>⚠️ Important:</strong> You must use the email address <strong>{recipient_email}</strong> to accept this invitation. This email will be linked to {inviter_name}'s account.
-                        </p>
-                    </div>
-
-                    <p style="line-height: 1.6; color: #666; font-size: 14px;">
-                        <strong>Good news:</strong> This invitation never expires. You can accept it whenever you're ready!
-                    </p>
-
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-
-                    <p style="font-size: 14px; color: #777; margin-bottom: 8px;">
-                        If the button doesn't work, copy and paste this link into your browser:
-                    </p>
-                    <p style="word-break: break-all; font-size: 13px; background-color: #f8f9fa; padding: 10px; border-radius: 4px;">
-                        <a href="{login_link}" style="color: #f58220; text-decoration: none;">{login_link}</a>
-                    </p>
-
-                    <p style="margin-top: 30px; line-height: 1.6; color: #666;">
-                        Questions? Reply to this email or contact our support team.
-                    </p>
-
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tigerleads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "team_invitation",
+        inviter_name=inviter_name,
+        login_link=login_link,
+        logo_html=logo_html,
+        recipient_email=recipient_email,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Team invitation email sent successfully to {recipient_email} via Resend"
+            f"Team invitation email queued for {recipient_email}"
         )
         return True, None
     except Exception as e:
@@ -384,14 +209,7 @@ async def send_password_reset_email(recipient_email: str, reset_link: str):
     subject = "Reset Your Password – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64 for Vercel compatibility
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -399,58 +217,19 @@ async def send_password_reset_email(recipient_email: str, reset_link: str):
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222;">Password Reset Request</h2>
-                    <p style="line-height: 1.6;">
-                        Hello,<br><br>
-                        We received a request to reset your password for your <strong>Tiger Leads.ai</strong> account.
-                        If you made this request, click the button below to set a new password.
-                    </p>
-
-                    <p style="color: #d35400; font-weight: bold;">This link will expire in 20 minutes.</p>
-
-                    <div style="text-align: center; margin: 25px 0;">
-                        <a href="{reset_link}" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 12px 24px; border-radius: 6px; font-weight: 600; display: inline-block;">
-                            Reset Password
-                        </a>
-                    </div>
-
-                    <p style="font-size: 14px; color: #555;">
-                        If the button doesn't work, copy and paste this link into your browser:
-                    </p>
-                    <p style="word-break: break-all;">
-                        <a href="{reset_link}" style="color: #f58220;">{reset_link}</a>
-                    </p>
-
-                    <p style="margin-top: 30px;">
-                        If you didn't request a password reset, you can safely ignore this email.
-                    </p>
-
-                    <p>Best regards,<br><strong>The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 15px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "password_reset",
+        logo_html=logo_html,
+        reset_link=reset_link,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Password reset email sent successfully to {recipient_email} via Resend"
+            f"Password reset email queued for {recipient_email}"
         )
         return True, None
     except Exception as e:
@@ -482,14 +261,7 @@ async def send_registration_completion_email(
     subject = f"Registration Complete – Welcome to Tiger Leads.ai!"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -497,84 +269,21 @@ async def send_registration_completion_email(
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">🎉 Thank You for Registering!</h2>
-                    
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Hi <strong style="color: #f58220;">{user_name}</strong>,
-                    </p>
-
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Thank you for completing your <strong>{role}</strong> registration on <strong>Tiger Leads.ai</strong>! 
-                        We're excited to have you join our platform.
-                    </p>
-
-                    <div style="background-color: #fff3e0; border-left: 4px solid #f58220; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 12px 0; font-size: 15px; color: #e65100; font-weight: 600;">📋 What's Next?</p>
-                        <p style="margin: 0; font-size: 14px; color: #333; line-height: 1.8;">
-                            Your account is currently <strong style="color: #f58220;">pending approval</strong> from our team. 
-                            We review all new registrations to ensure the quality and security of our platform.
-                        </p>
-                    </div>
-
-                    <div style="background-color: #e8f5e9; border-radius: 6px; padding: 20px; margin: 25px 0;">
-                        <p style="margin: 0 0 12px 0; font-weight: 600; color: #2e7d32; font-size: 15px;">✨ Once Approved, You'll Be Able To:</p>
-                        <ul style="margin: 0; padding-left: 20px; line-height: 2;">
-                            <li style="margin-bottom: 8px;">Access exclusive leads tailored to your business</li>
-                            <li style="margin-bottom: 8px;">Connect with potential clients in your service area</li>
-                            <li style="margin-bottom: 8px;">Manage your profile and preferences</li>
-                            <li style="margin-bottom: 0;">Grow your business with Tiger Leads.ai</li>
-                        </ul>
-                    </div>
-
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        We'll notify you via email as soon as your account is approved. This typically takes <strong>1-2 business days</strong>.
-                    </p>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{login_url}" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 16px 40px; border-radius: 6px; font-weight: 600; display: inline-block; font-size: 16px; box-shadow: 0 2px 8px rgba(245, 130, 32, 0.3);">
-                            Go to Login
-                        </a>
-                    </div>
-
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-
-                    <p style="font-size: 14px; color: #777; margin-bottom: 8px;">
-                        If the button doesn't work, copy and paste this link into your browser:
-                    </p>
-                    <p style="word-break: break-all; font-size: 13px; background-color: #f8f9fa; padding: 10px; border-radius: 4px;">
-                        <a href="{login_url}" style="color: #f58220; text-decoration: none;">{login_url}</a>
-                    </p>
-
-                    <p style="margin-top: 30px; line-height: 1.6; color: #666;">
-                        Questions? Feel free to reply to this email or contact our support team.
-                    </p>
-
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "registration_completion",
+        login_url=login_url,
+        logo_html=logo_html,
+        role=role,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Registration completion email sent successfully to {recipient_email} for {role} via Resend"
+            f"Registration completion email queued for {recipient_email} for {role}"
         )
         return True, None
     except Exception as e:
@@ -615,14 +324,7 @@ async def send_admin_new_registration_notification(
     subject = f"🎉 New {role} Registration – {company_name}"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -630,88 +332,24 @@ async def send_admin_new_registration_notification(
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">🎉 New {role} Registration</h2>
-                    
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        A new <strong style="color: #f58220;">{role}</strong> has completed registration on Tiger Leads.ai and is awaiting approval.
-                    </p>
-
-                    <div style="background-color: #f8f9fa; border-radius: 8px; padding: 20px; margin: 25px 0;">
-                        <p style="margin: 0 0 15px 0; font-weight: 600; color: #222; font-size: 15px;">📋 Registration Details:</p>
-                        <table style="width: 100%; border-collapse: collapse;">
-                            <tr>
-                                <td style="padding: 8px 0; color: #666; font-size: 14px; width: 40%;">Company Name:</td>
-                                <td style="padding: 8px 0; color: #222; font-weight: 600; font-size: 14px;">{company_name}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #666; font-size: 14px;">Contact Name:</td>
-                                <td style="padding: 8px 0; color: #222; font-weight: 600; font-size: 14px;">{user_name}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #666; font-size: 14px;">Email:</td>
-                                <td style="padding: 8px 0; color: #222; font-weight: 600; font-size: 14px;">{user_email}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #666; font-size: 14px;">Role:</td>
-                                <td style="padding: 8px 0; color: #f58220; font-weight: 600; font-size: 14px;">{role}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #666; font-size: 14px;">Registration Date:</td>
-                                <td style="padding: 8px 0; color: #222; font-weight: 600; font-size: 14px;">{registration_date}</td>
-                            </tr>
-                        </table>
-                    </div>
-
-                    <div style="background-color: #fff3e0; border-left: 4px solid #f58220; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 8px 0; font-size: 15px; color: #e65100; font-weight: 600;">⏰ Action Required</p>
-                        <p style="margin: 0; font-size: 14px; color: #333; line-height: 1.6;">
-                            Please review this registration and approve or reject the account from your admin dashboard.
-                        </p>
-                    </div>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{dashboard_url}" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 16px 40px; border-radius: 6px; font-weight: 600; display: inline-block; font-size: 16px; box-shadow: 0 2px 8px rgba(245, 130, 32, 0.3);">
-                            Review in Dashboard →
-                        </a>
-                    </div>
-
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-
-                    <p style="font-size: 14px; color: #777; margin-bottom: 8px;">
-                        If the button doesn't work, copy and paste this link into your browser:
-                    </p>
-                    <p style="word-break: break-all; font-size: 13px; background-color: #f8f9fa; padding: 10px; border-radius: 4px;">
-                        <a href="{dashboard_url}" style="color: #f58220; text-decoration: none;">{dashboard_url}</a>
-                    </p>
-
-                    <p style="margin-top: 25px; font-size: 14px; color: #666;">
-                        This is an automated notification from Tiger Leads.ai
-                    </p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "admin_new_registration",
+        company_name=company_name,
+        dashboard_url=dashboard_url,
+        logo_html=logo_html,
+        registration_date=registration_date,
+        role=role,
+        user_email=user_email,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(admin_email, subject, html_content)
+        await enqueue_email_async(
+            admin_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Admin notification email sent successfully to {admin_email} for new {role} registration: {user_email}"
+            f"Admin notification email queued for {admin_email} for new {role} registration: {user_email}"
         )
         return True, None
     except Exception as e:
@@ -744,14 +382,7 @@ async def send_subscription_thank_you_email(
     subject = f"Thank You for Subscribing to {plan_name} – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -759,77 +390,24 @@ async def send_subscription_thank_you_email(
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">🎉 Thank You for Your Subscription!</h2>
-                    
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Hi <strong style="color: #f58220;">{user_name}</strong>,
-                    </p>
-
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Thank you for subscribing to the <strong>{plan_name}</strong> plan on <strong>Tiger Leads.ai</strong>! 
-                        We're thrilled to have you on board and can't wait to help you grow your business.
-                    </p>
-
-                    <div style="background-color: #fff3e0; border-left: 4px solid #f58220; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 12px 0; font-size: 15px; color: #e65100; font-weight: 600;">📦 Your Subscription Details:</p>
-                        <p style="margin: 0; font-size: 14px; color: #333; line-height: 1.8;">
-                            <strong>Plan:</strong> <span style="color: #f58220; font-weight: 600;">{plan_name}</span><br>
-                            <strong>Credits:</strong> {credits} credits per month<br>
-                            <strong>Team Seats:</strong> {max_seats} seat{"s" if max_seats != 1 else ""}
-                        </p>
-                    </div>
-
-                    <div style="background-color: #e8f5e9; border-radius: 6px; padding: 20px; margin: 25px 0;">
-                        <p style="margin: 0 0 12px 0; font-weight: 600; color: #2e7d32; font-size: 15px;">✨ What You Can Do Now:</p>
-                        <ul style="margin: 0; padding-left: 20px; line-height: 2;">
-                            <li style="margin-bottom: 8px;">Access exclusive leads tailored to your business</li>
-                            <li style="margin-bottom: 8px;">Connect with potential clients in your service area</li>
-                            <li style="margin-bottom: 8px;">Invite team members to collaborate (up to {max_seats} seat{"s" if max_seats != 1 else ""})</li>
-                            <li style="margin-bottom: 0;">Grow your business with Tiger Leads.ai</li>
-                        </ul>
-                    </div>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <p style="font-size: 16px; color: #666; margin-bottom: 15px;">
-                            Ready to get started?
-                        </p>
-                        <a href="{FRONTEND_URL}/dashboard" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 16px 40px; border-radius: 6px; font-weight: 600; display: inline-block; font-size: 16px; box-shadow: 0 2px 8px rgba(245, 130, 32, 0.3);">
-                            Go to Dashboard
-                        </a>
-                    </div>
-
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-
-                    <p style="margin-top: 30px; line-height: 1.6; color: #666;">
-                        If you have any questions or need assistance, feel free to reply to this email or contact our support team. We're here to help!
-                    </p>
-
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "subscription_thank_you",
+        credits=credits,
+        frontend_url=FRONTEND_URL,
+        logo_html=logo_html,
+        max_seats=max_seats,
+        plan_name=plan_name,
+        seats_suffix="s" if max_seats != 1 else "",
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Subscription thank you email sent successfully to {recipient_email} for {plan_name} plan via Resend"
+            f"Subscription thank you email queued for {recipient_email} for {plan_name} plan"
         )
         return True, None
     except Exception as e:
@@ -866,14 +444,7 @@ async def send_lead_unlock_email(
     subject = f"🎉 You've Unlocked a New Lead – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -881,83 +452,24 @@ async def send_lead_unlock_email(
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">🎉 Yay! You've Unlocked a New Lead!</h2>
-                    
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Hi <strong style="color: #f58220;">{user_name}</strong>,
-                    </p>
-
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Great news! You've successfully unlocked a new lead on <strong>Tiger Leads.ai</strong>. 
-                        Here are the details:
-                    </p>
-
-                    <div style="background-color: #fff3e0; border-left: 4px solid #f58220; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 12px 0; font-size: 15px; color: #e65100; font-weight: 600;">📋 Lead Details:</p>
-                        <p style="margin: 0; font-size: 14px; color: #333; line-height: 1.8;">
-                            <strong>Job:</strong> <span style="color: #f58220; font-weight: 600;">{job_title}</span><br>
-                            <strong>Location:</strong> {job_location}<br>
-                            <strong>Credits Spent:</strong> {credits_spent} credit{"s" if credits_spent != 1 else ""}
-                        </p>
-                    </div>
-
-                    <div style="background-color: #e8f5e9; border-radius: 6px; padding: 20px; margin: 25px 0;">
-                        <p style="margin: 0 0 12px 0; font-weight: 600; color: #2e7d32; font-size: 15px;">✨ What's Next?</p>
-                        <ul style="margin: 0; padding-left: 20px; line-height: 2;">
-                            <li style="margin-bottom: 8px;">Review the full lead details in your dashboard</li>
-                            <li style="margin-bottom: 8px;">Contact the client to discuss the project</li>
-                            <li style="margin-bottom: 8px;">Submit your proposal or quote</li>
-                            <li style="margin-bottom: 0;">Win the project and grow your business!</li>
-                        </ul>
-                    </div>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <p style="font-size: 16px; color: #666; margin-bottom: 15px;">
-                            Ready to view your lead?
-                        </p>
-                        <a href="{FRONTEND_URL}/dashboard/unlocked-leads" style="background-color: #f58220; color: #fff; text-decoration: none; padding: 16px 40px; border-radius: 6px; font-weight: 600; display: inline-block; font-size: 16px; box-shadow: 0 2px 8px rgba(245, 130, 32, 0.3);">
-                            View Lead Details
-                        </a>
-                    </div>
-
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-
-                    <div style="background-color: #fff3e0; border-radius: 6px; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 0; font-size: 14px; color: #e65100; line-height: 1.6;">
-                            <strong>💡 Tip:</strong> Respond quickly to increase your chances of winning the project. Early responses often make the best impression!
-                        </p>
-                    </div>
-
-                    <p style="margin-top: 30px; line-height: 1.6; color: #666;">
-                        Good luck with your proposal! If you have any questions, feel free to reply to this email or contact our support team.
-                    </p>
-
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "lead_unlock",
+        credits_spent=credits_spent,
+        credits_suffix="s" if credits_spent != 1 else "",
+        frontend_url=FRONTEND_URL,
+        job_location=job_location,
+        job_title=job_title,
+        logo_html=logo_html,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         logger.info(
-            f"Lead unlock email sent successfully to {recipient_email} for job '{job_title}'"
+            f"Lead unlock email queued for {recipient_email} for job '{job_title}'"
         )
         return True, None
     except Exception as e:
@@ -976,13 +488,7 @@ async def send_jurisdiction_rejection_email(
     subject = "Update Regarding Your Jurisdiction Request – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -1000,39 +506,20 @@ async def send_jurisdiction_rejection_email(
             </div>
         """
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">Update on Your Request</h2>
-                    <p style="line-height: 1.6; font-size: 16px;">Hi {user_name},</p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Thank you for your request to add <strong>{jurisdiction_value}</strong> ({j_type_label}) to your service area.
-                    </p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        After reviewing your request, our team is unable to approve this jurisdiction at this time.
-                    </p>
-                    {note_section}
-                    <p style="line-height: 1.6; color: #666; font-size: 14px;">
-                        If you believe this is an error or if you have updated information, please feel free to reach out to our support team.
-                    </p>
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-    """
+    rendered = email_templates.render(
+        "jurisdiction_rejection",
+        j_type_label=j_type_label,
+        jurisdiction_value=jurisdiction_value,
+        logo_html=logo_html,
+        note_section=note_section,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         return True, None
     except Exception as e:
         logger.error(f"Failed to send jurisdiction rejection email: {str(e)}")
@@ -1049,13 +536,7 @@ async def send_category_rejection_email(
     subject = "Update Regarding Your Trade Category Request – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -1072,39 +553,19 @@ async def send_category_rejection_email(
             </div>
         """
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">Update on Your Category Request</h2>
-                    <p style="line-height: 1.6; font-size: 16px;">Hi {user_name},</p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Thank you for your request to add <strong>{category_value}</strong> to your profile categories.
-                    </p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Our team has reviewed your request and is unable to approve this category at this time.
-                    </p>
-                    {note_section}
-                    <p style="line-height: 1.6; color: #666; font-size: 14px;">
-                        If you have supporting documentation or believe this to be an error, please contact our support team.
-                    </p>
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-    """
+    rendered = email_templates.render(
+        "category_rejection",
+        category_value=category_value,
+        logo_html=logo_html,
+        note_section=note_section,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         return True, None
     except Exception as e:
         logger.error(f"Failed to send category rejection email: {str(e)}")
@@ -1121,13 +582,7 @@ async def send_account_rejection_email(
     subject = "Update Regarding Your Application – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -1144,39 +599,19 @@ async def send_account_rejection_email(
             </div>
         """
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-                <div style="padding: 30px;">
-                    <h2 style="color: #222; margin-top: 0;">Tiger Leads Application Update</h2>
-                    <p style="line-height: 1.6; font-size: 16px;">Hi {user_name},</p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Thank you for your interest in joining Tiger Leads.ai as a <strong>{role}</strong>.
-                    </p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        At this time, we are unable to approve your application to the platform.
-                    </p>
-                    {note_section}
-                    <p style="line-height: 1.6; color: #666; font-size: 14px;">
-                        If you have any questions, please contact our support team.
-                    </p>
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-    """
+    rendered = email_templates.render(
+        "account_rejection",
+        logo_html=logo_html,
+        note_section=note_section,
+        role=role,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
         return True, None
     except Exception as e:
         logger.error(f"Failed to send account rejection email: {str(e)}")
@@ -1194,13 +629,7 @@ async def send_account_approval_email(
     subject = "🎉 Your Account Has Been Approved – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            pass
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -1217,62 +646,21 @@ async def send_account_approval_email(
             </div>
         """
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-                <div style="padding: 30px;">
-                    <h2 style="color: #10b981; margin-top: 0;">🎉 Congratulations! Your Account is Approved!</h2>
-                    <p style="line-height: 1.6; font-size: 16px;">Hi {user_name},</p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        Great news! Your <strong>{role}</strong> account on Tiger Leads.ai has been approved by our team.
-                    </p>
-                    <p style="line-height: 1.6; font-size: 16px;">
-                        You now have full access to the platform and can start exploring exclusive leads!
-                    </p>
-                    {note_section}
-                    <div style="background-color: #f0fdf4; border-left: 4px solid #10b981; padding: 20px; margin: 25px 0; border-radius: 6px;">
-                        <p style="margin: 0 0 12px 0; font-size: 15px; color: #065f46; font-weight: 600;">What You Can Do Now:</p>
-                        <ul style="margin: 0; padding-left: 20px; color: #374151; font-size: 14px; line-height: 1.8;">
-                            <li>Access exclusive construction leads in your area</li>
-                            <li>Connect with potential clients and projects</li>
-                            <li>Manage your profile and preferences</li>
-                            <li>Unlock leads and grow your business</li>
-                            <li>Explore all platform features</li>
-                        </ul>
-                    </div>
-                    <p style="line-height: 1.6; font-size: 16px; margin-top: 25px;">
-                        <strong>Ready to get started?</strong>
-                    </p>
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{login_url}" style="display: inline-block; background-color: #f58220; color: #ffffff; text-decoration: none; padding: 14px 32px; border-radius: 6px; font-weight: 600; font-size: 16px;">
-                            Login to Your Account →
-                        </a>
-                    </div>
-                    <p style="line-height: 1.6; color: #666; font-size: 14px;">
-                        Or copy and paste this link into your browser:<br>
-                        <a href="{login_url}" style="color: #f58220; word-break: break-all;">{login_url}</a>
-                    </p>
-                    <p style="line-height: 1.6; color: #666; font-size: 14px; margin-top: 25px;">
-                        If you have any questions or need assistance, our support team is here to help!
-                    </p>
-                    <p style="margin-top: 25px;">Best regards,<br><strong style="color: #f58220;">The Tiger Leads.ai Team</strong></p>
-                </div>
-                <div style="background-color: #fafafa; text-align: center; padding: 20px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads.ai. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-    """
+    rendered = email_templates.render(
+        "account_approval",
+        login_url=login_url,
+        logo_html=logo_html,
+        note_section=note_section,
+        role=role,
+        user_name=user_name,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
-        logger.info(f"Account approval email sent successfully to {recipient_email} for {role}")
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
+        logger.info(f"Account approval email queued for {recipient_email} for {role}")
         return True, None
     except Exception as e:
         logger.error(f"Failed to send account approval email to {recipient_email}: {str(e)}")
@@ -1351,90 +739,13 @@ async def send_job_rejection_email(
         </div>
         """
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as f:
-                logo_base64 = base64.b64encode(f.read()).decode("utf-8")
-        except Exception as e:
-            logger.warning(f"Could not load logo: {e}")
+    logo_base64 = load_logo_base64()
 
     logo_html = ""
     if logo_base64:
         logo_html = f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads.ai" style="height: 40px; margin-bottom: 20px;" />'
 
-    html_body = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #F3F4F6;">
-        <table role="presentation" style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td align="center" style="padding: 40px 20px;">
-                    <table role="presentation" style="max-width: 600px; width: 100%; background-color: #FFFFFF; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                        <!-- Header -->
-                        <tr>
-                            <td style="padding: 40px 40px 20px 40px; text-align: center;">
-                                {logo_html}
-                                <h1 style="margin: 0; font-size: 24px; font-weight: 700; color: #111827;">Job Posting Declined</h1>
-                            </td>
-                        </tr>
-                        
-                        <!-- Content -->
-                        <tr>
-                            <td style="padding: 0 40px 40px 40px;">
-                                <p style="margin: 0 0 20px 0; font-size: 16px; line-height: 24px; color: #374151;">
-                                    Hi {contractor_name},
-                                </p>
-                                
-                                <p style="margin: 0 0 20px 0; font-size: 16px; line-height: 24px; color: #374151;">
-                                    Unfortunately, your job posting has been declined by our admin team. Please review the reasons below and resubmit your job with the necessary corrections.
-                                </p>
-
-                                <!-- Rejection Reasons -->
-                                <div style="background-color: #FEE2E2; border-left: 4px solid #DC2626; padding: 16px; margin: 24px 0; border-radius: 4px;">
-                                    <p style="margin: 0 0 12px 0; font-weight: 600; color: #991B1B; font-size: 16px;">Reasons for Decline:</p>
-                                    <ul style="margin: 0; padding-left: 20px; color: #7F1D1D;">
-                                        {reasons_html}
-                                    </ul>
-                                </div>
-
-                                {admin_note_html}
-
-                                <!-- Job Details -->
-                                <div style="background-color: #F9FAFB; padding: 20px; border-radius: 6px; margin: 24px 0;">
-                                    <h2 style="margin: 0 0 16px 0; font-size: 18px; font-weight: 600; color: #111827;">Job Details</h2>
-                                    
-                                    <table style="width: 100%; border-collapse: collapse;">
-                                        <tr>
-                                            <td style="padding: 8px 0; font-weight: 600; color: #6B7280; width: 40%;">Permit Number:</td>
-                                            <td style="padding: 8px 0; color: #111827;">{job_data.get('permit_number', 'N/A')}</td>
-                                        </tr>
-                                        <tr>
-                                            <td style="padding: 8px 0; font-weight: 600; color: #6B7280;">Job Address:</td>
-                                            <td style="padding: 8px 0; color: #111827;">{job_data.get('job_address', 'N/A')}</td>
-                                        </tr>
-                                        <tr>
-                                            <td style="padding: 8px 0; font-weight: 600; color: #6B7280;">Property Type:</td>
-                                            <td style="padding: 8px 0; color: #111827;">{job_data.get('property_type', 'N/A')}</td>
-                                        </tr>
-                                        <tr>
-                                            <td style="padding: 8px 0; font-weight: 600; color: #6B7280;">Project Cost:</td>
-                                            <td style="padding: 8px 0; color: #111827;">${job_data.get('project_cost_total', 0):,.2f}</td>
-                                        </tr>
-                                        <tr>
-                                            <td style="padding: 8px 0; font-weight: 600; color: #6B7280;">Description:</td>
-                                            <td style="padding: 8px 0; color: #111827;">{job_data.get('project_description', 'N/A')[:100]}...</td>
-                                        </tr>
-                                    </table>
-                                </div>
-
-                                <!-- User Types & Offset Days -->
-                                {f'''
+    user_types_section = f'''
                                 <div style="margin: 24px 0;">
                                     <h2 style="margin: 0 0 16px 0; font-size: 18px; font-weight: 600; color: #111827;">Target User Types & Visibility Schedule</h2>
                                     <table style="width: 100%; border-collapse: collapse; border: 1px solid #E5E7EB; border-radius: 6px; overflow: hidden;">
@@ -1449,60 +760,29 @@ async def send_job_rejection_email(
                                         </tbody>
                                     </table>
                                 </div>
-                                ''' if user_types_rows else ''}
-
-                                <!-- Next Steps -->
-                                <div style="background-color: #EFF6FF; border-left: 4px solid #3B82F6; padding: 16px; margin: 24px 0; border-radius: 4px;">
-                                    <p style="margin: 0 0 12px 0; font-weight: 600; color: #1E40AF; font-size: 16px;">What to Do Next:</p>
-                                    <ol style="margin: 0; padding-left: 20px; color: #1E3A8A;">
-                                        <li style="margin-bottom: 8px;">Review the rejection reasons above</li>
-                                        <li style="margin-bottom: 8px;">Make the necessary corrections to your job posting</li>
-                                        <li style="margin-bottom: 8px;">Resubmit your job through your dashboard</li>
-                                    </ol>
-                                </div>
-
-                                <!-- CTA Button -->
-                                <div style="text-align: center; margin: 32px 0;">
-                                    <a href="{FRONTEND_URL}/contractor/my-jobs" 
-                                       style="display: inline-block; padding: 14px 32px; background-color: #F97316; color: #FFFFFF; text-decoration: none; border-radius: 6px; font-weight: 600; font-size: 16px;">
-                                        View My Jobs
-                                    </a>
-                                </div>
-
-                                <p style="margin: 24px 0 0 0; font-size: 14px; line-height: 20px; color: #6B7280;">
-                                    If you have questions about this decision, please contact our support team.
-                                </p>
-                            </td>
-                        </tr>
-                        
-                        <!-- Footer -->
-                        <tr>
-                            <td style="padding: 20px 40px; background-color: #F9FAFB; border-top: 1px solid #E5E7EB; text-align: center;">
-                                <p style="margin: 0; font-size: 12px; color: #6B7280;">
-                                    © {year} Tiger Leads.ai. All rights reserved.
-                                </p>
-                            </td>
-                        </tr>
-                    </table>
-                </td>
-            </tr>
-        </table>
-    </body>
-    </html>
-    """
+                                ''' if user_types_rows else ''
+    rendered = email_templates.render(
+        "job_rejection",
+        admin_note_html=admin_note_html,
+        contractor_name=contractor_name,
+        description_preview=job_data.get("project_description", "N/A")[:100],
+        frontend_url=FRONTEND_URL,
+        job_address=job_data.get("job_address", "N/A"),
+        logo_html=logo_html,
+        permit_number=job_data.get("permit_number", "N/A"),
+        project_cost=f"{job_data.get("project_cost_total", 0):,.2f}",
+        property_type=job_data.get("property_type", "N/A"),
+        reasons_html=reasons_html,
+        user_types_section=user_types_section,
+        year=year,
+    )
 
     try:
-        success = await send_email_resend(
-            to_email=contractor_email,
-            subject=subject,
-            html_content=html_body,
+        await enqueue_email_async(
+            contractor_email, subject, rendered.html, text_body=rendered.text
         )
-        if success:
-            logger.info(f"Job rejection email sent successfully to {contractor_email}")
-            return True, None
-        else:
-            logger.error(f"Failed to send job rejection email to {contractor_email}")
-            return False, "Failed to send email"
+        logger.info(f"Job rejection email queued for {contractor_email}")
+        return True, None
     except Exception as e:
         logger.error(f"Error sending job rejection email: {str(e)}")
         return False, str(e)
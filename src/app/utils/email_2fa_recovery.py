@@ -4,15 +4,14 @@
 This module contains the email template for 2FA recovery codes.
 """
 
-import base64
 import logging
 from datetime import datetime
-from pathlib import Path
 
-from src.app.utils.email_resend import send_email_resend
+from src.app.services.email_outbox import enqueue_email_async
+from src.app.utils.email import load_logo_base64
+from src.app.utils.email_templates import email_templates
 
 logger = logging.getLogger(__name__)
-LOGO_PATH = Path("app/static/logo.png")
 
 
 def is_valid_email(email: str) -> tuple[bool, str | None]:
@@ -43,14 +42,7 @@ async def send_2fa_recovery_email(recipient_email: str, code: str):
     subject = "2FA Recovery Code – Tiger Leads.ai"
     year = datetime.utcnow().year
 
-    # Try to load logo as base64
-    logo_base64 = None
-    if LOGO_PATH.exists():
-        try:
-            with open(LOGO_PATH, "rb") as img_file:
-                logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception:
-            logo_base64 = None
+    logo_base64 = load_logo_base64()
 
     logo_html = (
         f'<img src="data:image/png;base64,{logo_base64}" alt="Tiger Leads" style="width: 160px; height: auto;" />'
@@ -58,50 +50,18 @@ async def send_2fa_recovery_email(recipient_email: str, code: str):
         else '<h1 style="color: #f58220; margin: 0;">Tiger Leads</h1>'
     )
 
-    html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', Roboto, Arial, sans-serif; background-color: #f9f9fb; color: #333; margin: 0; padding: 0;">
-            <div style="max-width: 600px; margin: 40px auto; background: #ffffff; border-radius: 10px; box-shadow: 0 4px 10px rgba(0,0,0,0.08); overflow: hidden;">
-                <!-- Header with embedded Logo -->
-                <div style="background-color: #ffffff; text-align: center; padding: 25px 0; border-bottom: 1px solid #eee;">
-                    {logo_html}
-                </div>
-
-                <div style="padding: 30px;">
-                    <h2 style="color: #222;">🔐 2FA Recovery Request</h2>
-                    <p style="line-height: 1.6;">
-                        We received a request to recover your Two-Factor Authentication (2FA) access. 
-                        Use the code below to bypass 2FA and login to your account:
-                    </p>
-
-                    <div style="text-align: center; margin: 30px 0;">
-                        <div style="background-color: #fff3e0; border: 2px dashed #ff9800; border-radius: 8px; padding: 20px; display: inline-block;">
-                            <p style="margin: 0; font-size: 14px; color: #666; font-weight: 500;">Your Recovery Code</p>
-                            <p style="margin: 10px 0 0 0; font-size: 32px; font-weight: bold; color: #ff9800; letter-spacing: 4px; font-family: 'Courier New', monospace;">{code}</p>
-                        </div>
-                    </div>
-
-                    <p style="color: #d35400; font-weight: bold; text-align: center;">⏱️ This code will expire in 10 minutes</p>
-
-                    <p style="margin-top: 30px; line-height: 1.6;">
-                        After logging in, we recommend setting up 2FA again or ensuring you have access to your authenticator app.
-                    </p>
-
-                    <p style="margin-top: 30px;">Best regards,<br><strong>The Tiger Leads.ai Team</strong></p>
-                </div>
-
-                <div style="background-color: #fafafa; text-align: center; padding: 15px; font-size: 12px; color: #777; border-top: 1px solid #eee;">
-                    &copy; {year} Tiger Leads. All rights reserved.
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    rendered = email_templates.render(
+        "two_factor_recovery",
+        code=code,
+        logo_html=logo_html,
+        year=year,
+    )
 
     try:
-        send_email_resend(recipient_email, subject, html_content)
-        logger.info(f"2FA recovery email sent successfully to {recipient_email} via Resend")
+        await enqueue_email_async(
+            recipient_email, subject, rendered.html, text_body=rendered.text
+        )
+        logger.info(f"2FA recovery email queued for {recipient_email}")
         return True, None
     except Exception as e:
         logger.error(f"Failed to send 2FA recovery email to {recipient_email}: {str(e)}")
@@ -1,53 +1,123 @@
 import os
+import re
+import threading
+import uuid
 
-try:
-    import resend
-    HAS_RESEND = True
-except Exception:
-    resend = None
-    HAS_RESEND = False
+from src.app.utils.lazy_import import lazy_import
+
+# Loaded on the first send
+resend = lazy_import("resend")
+HAS_RESEND = resend is not None
 
 if HAS_RESEND:
     # Will raise KeyError if not configured; let caller see that explicit error
     resend.api_key = os.environ.get("RESEND_API_KEY")
 
+FROM_ADDRESS = "Accounts@tigerleads.ai"
+
+
+_SCRIPT_STYLE = re.compile(r"(?is)<(script|style).*?>.*?</\1>")
+_BR = re.compile(r"(?i)<br\s*/?>")
+_P_CLOSE = re.compile(r"(?i)</p>")
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\r]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def html_to_text(h: str) -> str:
+    """Plain-text fallback: strip basic tags and collapse whitespace.
+
+    This helps mail clients (and spam filters) and can reduce likelihood of clipping.
+    """
+    if not h:
+        return ""
+    # Remove script/style blocks first
+    h = _SCRIPT_STYLE.sub("", h)
+    # Replace <br> and <p> with newlines
+    h = _BR.sub("\n", h)
+    h = _P_CLOSE.sub("\n\n", h)
+    # Remove all remaining tags
+    h = _TAG.sub("", h)
+    # Decode common HTML entities
+    h = h.replace("&nbsp;", " ")
+    h = h.replace("&amp;", "&")
+    h = h.replace("&lt;", "<").replace("&gt;", ">")
+    # Collapse multiple whitespace/newlines
+    h = _SPACES.sub(" ", h)
+    h = _BLANK_LINES.sub("\n\n", h)
+    return h.strip()
 
-def send_email_resend(to, subject, html, reply_to=None):
-    # Build plain-text fallback by stripping basic tags and collapsing whitespace.
-    # This helps mail clients (and spam filters) and can reduce likelihood of clipping.
-    import re
-
-    def _html_to_text(h: str) -> str:
-        # Remove script/style blocks first
-        h = re.sub(r"(?is)<(script|style).*?>.*?</\1>", "", h)
-        # Replace <br> and <p> with newlines
-        h = re.sub(r"(?i)<br\s*/?>", "\n", h)
-        h = re.sub(r"(?i)</p>", "\n\n", h)
-        # Remove all remaining tags
-        h = re.sub(r"<[^>]+>", "", h)
-        # Decode common HTML entities
-        h = h.replace("&nbsp;", " ")
-        h = h.replace("&amp;", "&")
-        h = h.replace("&lt;", "<").replace("&gt;", ">")
-        # Collapse multiple whitespace/newlines
-        h = re.sub(r"[ \t\r]+", " ", h)
-        h = re.sub(r"\n{3,}", "\n\n", h)
-        return h.strip()
-
-    text = _html_to_text(html) if html else ""
 
+def build_params(to, subject, html, text=None, reply_to=None) -> dict:
     params = {
-        "from": "Accounts@tigerleads.ai",
+        "from": FROM_ADDRESS,
         "to": [to],
         "subject": subject,
         "html": html,
-        "text": text,
+        "text": text if text is not None else html_to_text(html),
     }
-    
     if reply_to:
         params["reply_to"] = reply_to
+    return params
 
+
+def send_email_resend(to, subject, html, reply_to=None, text=None):
     if not HAS_RESEND:
         raise RuntimeError("Resend SDK is not installed; cannot send email via Resend")
 
-    return resend.Emails.send(params)
+    return resend.Emails.send(build_params(to, subject, html, text, reply_to))
+
+
+class ResendTransport:
+    """Sends through the Resend API (single and batch endpoints)."""
+
+    # Resend accepts up to 100 emails per batch call
+    max_batch_size = 100
+
+    def send(self, params: dict, idempotency_key: str = None) -> str:
+        if not HAS_RESEND:
+            raise RuntimeError("Resend SDK is not installed; cannot send email via Resend")
+        options = {"idempotency_key": idempotency_key} if idempotency_key else None
+        return resend.Emails.send(params, options)["id"]
+
+    def send_batch(self, params: list, idempotency_key: str = None) -> list:
+        """Send all of ``params`` in one call; returns the email ids in order."""
+        if not HAS_RESEND:
+            raise RuntimeError("Resend SDK is not installed; cannot send email via Resend")
+        options = {"idempotency_key": idempotency_key} if idempotency_key else None
+        response = resend.Batch.send(params, options)
+        return [item["id"] for item in response["data"]]
+
+
+class StubTransport:
+    """In-memory transport for tests and local runs (``EMAIL_TRANSPORT=stub``).
+
+    Records every email in ``sent``; recipients in ``fail_addresses`` raise.
+    """
+
+    max_batch_size = 100
+
+    def __init__(self, fail_addresses=()):
+        self.sent = []
+        self.calls = 0
+        self.fail_addresses = set(fail_addresses)
+        self._lock = threading.Lock()
+
+    def send(self, params: dict, idempotency_key: str = None) -> str:
+        return self.send_batch([params], idempotency_key)[0]
+
+    def send_batch(self, params: list, idempotency_key: str = None) -> list:
+        with self._lock:
+            self.calls += 1
+            failing = [p["to"][0] for p in params if p["to"][0] in self.fail_addresses]
+            if failing:
+                raise RuntimeError(f"Stub transport rejected {', '.join(failing)}")
+            self.sent.extend(params)
+        return [f"stub-{uuid.uuid4()}" for _ in params]
+
+
+def get_transport():
+    """Transport selected by ``EMAIL_TRANSPORT`` (resend by default, or stub)."""
+    if os.getenv("EMAIL_TRANSPORT", "resend").lower() == "stub":
+        return StubTransport()
+    return ResendTransport()
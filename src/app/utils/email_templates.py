@@ -0,0 +1,147 @@
+"""
+Precompiled Email Templates
+
+Transactional email bodies are registered once (at import) from the sources
+in ``src/app/data/email_templates.py`` and compiled into:
+
+- the static HTML segments between named ``{slot}`` fields (``{{`` / ``}}``
+  are literal braces, as in ``str.format``),
+- the plain-text rendition of the same skeleton, derived once with
+  ``html_to_text``; slots that sit inside tags (e.g. ``href="{link}"``) drop
+  out of the text, and slots declared as HTML are converted per value
+  (cached, since most HTML slot values such as the logo repeat).
+
+Rendering fills the slot positions of a copy of each part list and joins it,
+so a render costs two list copies and two joins regardless of template size.
+Slot values are inserted as-is, exactly like the f-strings they replace.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+from src.app.utils.email_resend import html_to_text
+
+_SLOT_PATTERN = re.compile(r"\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Marks slot positions while the text skeleton is derived
+_MARKER = "\x02{}\x03"
+_MARKER_PATTERN = re.compile("\x02(\\d+)\x03")
+
+
+class RenderedEmail(NamedTuple):
+    html: str
+    text: str
+
+
+@lru_cache(maxsize=512)
+def _slot_text(value: str) -> str:
+    return html_to_text(value)
+
+
+def _split(source: str) -> Tuple[list, list]:
+    """Split a template into static segments and the slot names between them."""
+    segments, slots = [], []
+    current, pos = [], 0
+    for match in _SLOT_PATTERN.finditer(source):
+        current.append(source[pos : match.start()])
+        token = match.group(0)
+        if match.group(1):
+            segments.append("".join(current))
+            slots.append(match.group(1))
+            current = []
+        else:
+            current.append(token[0])  # "{{" -> "{", "}}" -> "}"
+        pos = match.end()
+    current.append(source[pos:])
+    segments.append("".join(current))
+    return segments, slots
+
+
+def _interleave(segments: list, slots: list) -> Tuple[list, tuple]:
+    """Part list with None at every slot position, and (position, slot) pairs."""
+    parts, positions = [], []
+    for index, slot in enumerate(slots):
+        parts.append(segments[index])
+        positions.append((len(parts), slot))
+        parts.append(None)
+    parts.append(segments[-1])
+    return parts, tuple(positions)
+
+
+class CompiledTemplate:
+    """One email body, split into static parts and named slots."""
+
+    def __init__(self, name: str, source: str, html_slots: Iterable[str] = ()):
+        self.name = name
+        segments, slots = _split(source)
+        self.slots = frozenset(slots)
+        self.html_slots = frozenset(html_slots)
+        unknown = self.html_slots - self.slots
+        if unknown:
+            raise ValueError(f"Template '{name}' has no slot(s) {', '.join(sorted(unknown))}")
+
+        self._html_parts, self._html_positions = _interleave(segments, slots)
+
+        # Text skeleton: convert once with numbered markers in place of the slots
+        marked = "".join(
+            segment + (_MARKER.format(i) if i < len(slots) else "")
+            for i, segment in enumerate(segments)
+        )
+        text_pieces = _MARKER_PATTERN.split(html_to_text(marked))
+        self._text_parts, self._text_positions = _interleave(
+            text_pieces[0::2], [slots[int(i)] for i in text_pieces[1::2]]
+        )
+
+    def render(self, **values) -> RenderedEmail:
+        """Fill every slot; raises KeyError naming the first missing slot."""
+        html = self._html_parts[:]
+        for position, slot in self._html_positions:
+            html[position] = str(values[slot])
+
+        text = self._text_parts[:]
+        html_slots = self.html_slots
+        for position, slot in self._text_positions:
+            value = str(values[slot])
+            text[position] = _slot_text(value) if slot in html_slots else value
+
+        return RenderedEmail("".join(html), "".join(text).strip())
+
+
+class EmailTemplateRegistry:
+    """Named, precompiled email templates."""
+
+    def __init__(self):
+        self._templates: Dict[str, CompiledTemplate] = {}
+
+    def register(
+        self, name: str, source: str, html_slots: Iterable[str] = ()
+    ) -> CompiledTemplate:
+        template = CompiledTemplate(name, source, html_slots)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> CompiledTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, **values) -> RenderedEmail:
+        return self._templates[name].render(**values)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def __iter__(self):
+        return iter(self._templates)
+
+
+def _build_registry() -> EmailTemplateRegistry:
+    from src.app.data.email_templates import TEMPLATES
+
+    registry = EmailTemplateRegistry()
+    for name, (source, html_slots) in TEMPLATES.items():
+        registry.register(name, source, html_slots)
+    return registry
+
+
+# Compiled once at import
+email_templates = _build_registry()
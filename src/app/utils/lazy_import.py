@@ -0,0 +1,38 @@
+"""
+Lazy module imports
+
+Heavy optional libraries (stripe, resend, pywebpush) are used by a handful of
+endpoints or tasks but cost up to hundreds of milliseconds to import, which
+every cold start paid. ``lazy_import`` returns the module object without
+executing it; the real import happens on first attribute access:
+
+    stripe = lazy_import("stripe")
+    stripe.api_key = ...        # kept once the module loads
+    stripe.Customer.create(...)  # loads stripe here
+
+The first attribute access is not thread-safe before Python 3.12.3; touch the
+module once before handing it to worker threads (see PushDeliveryEngine).
+
+Modules used in only a few functions are imported inside those functions
+instead (``import pandas as pd`` in the Excel endpoints).
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """Module ``name``, executed on first use; None if it is not installed."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,222 @@
+"""
+Stored files
+
+Helpers for the file entries kept in JSON columns (``TempDocument.documents``,
+``Job.job_documents``, the contractor/supplier ``license_picture``,
+``referrals`` and ``job_photos`` arrays) and for profile pictures.
+
+An entry holds metadata and a blob reference (see services/blob_store.py):
+
+    {"filename": "plan.pdf", "content_type": "application/pdf",
+     "size": 48213, "blob": "<sha256>"}
+
+Rows written before the blob store carry ``"data"`` (base64) instead, until
+``python -m src.app.services.blob_extraction`` has moved them, so readers go
+through ``file_bytes`` / ``file_response`` which accept both.
+"""
+
+import base64
+import logging
+from typing import Any, BinaryIO, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import inspect
+
+from src.app.services.blob_store import BlobNotFound, blob_store
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def store_file(
+    stream: BinaryIO,
+    filename: str,
+    content_type: str,
+    max_bytes: Optional[int] = None,
+) -> dict:
+    """Stream an upload into the blob store and return its file entry.
+
+    Raises BlobTooLarge once the upload exceeds ``max_bytes``.
+    """
+    blob = blob_store.put(stream, max_bytes=max_bytes)
+    return {
+        "filename": filename,
+        "content_type": content_type,
+        "size": blob.size,
+        "blob": blob.sha256,
+    }
+
+
+def has_file(entry: Any) -> bool:
+    return isinstance(entry, dict) and bool(entry.get("blob") or entry.get("data"))
+
+
+def file_bytes(entry: dict) -> Optional[bytes]:
+    """Contents of a file entry (blob or legacy base64); None if it has none.
+
+    Raises BlobNotFound if the referenced blob is missing from the store.
+    """
+    if entry.get("blob"):
+        return blob_store.read_bytes(entry["blob"])
+    if entry.get("data"):
+        return base64.b64decode(entry["data"])
+    return None
+
+
+def with_data(entry: dict) -> dict:
+    """Copy of ``entry`` with base64 ``data``, for responses that embed files."""
+    if not entry.get("blob"):
+        return entry
+    result = {key: value for key, value in entry.items() if key != "blob"}
+    try:
+        result["data"] = base64.b64encode(file_bytes(entry)).decode("utf-8")
+    except BlobNotFound:
+        logger.error(f"[Blob Store] Missing blob {entry['blob']}")
+        result["data"] = None
+    return result
+
+
+def files_with_data(entries: Any) -> Any:
+    """``with_data`` for each entry of a JSON file array (None passes through)."""
+    if not isinstance(entries, list):
+        return entries
+    return [with_data(entry) if isinstance(entry, dict) else entry for entry in entries]
+
+
+def _byte_range(range_header: Optional[str], size: int) -> Optional[tuple]:
+    """(start, end) of a single ``bytes=`` range, or None to send the whole file."""
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        # Multiple ranges are not supported; a full response is allowed
+        return None
+    first, _, last = spec.partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+def _apply_range(request: Request, size: int, headers: dict) -> Optional[tuple]:
+    """Set the length/range headers; returns the (start, end) to send, or None for all."""
+    headers["Accept-Ranges"] = "bytes"
+    byte_range = _byte_range(request.headers.get("range"), size)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return None
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return byte_range
+
+
+def blob_response(
+    request: Request,
+    sha256: str,
+    media_type: str,
+    filename: Optional[str] = None,
+    disposition: str = "inline",
+) -> Response:
+    """Stream a blob, honouring a single ``Range`` header (206) and ``If-None-Match``.
+
+    404 if the blob is missing from the store.
+    """
+    try:
+        size = blob_store.size(sha256)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="File data not available")
+
+    # Content-addressed, so the digest is a strong validator. URLs address
+    # files by position, not digest, so clients must still revalidate.
+    etag = f'"{sha256}"'
+    headers = {"ETag": etag}
+    if filename:
+        headers["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    byte_range = _apply_range(request, size, headers)
+    if byte_range is None:
+        return StreamingResponse(
+            blob_store.iter_range(sha256), media_type=media_type, headers=headers
+        )
+    return StreamingResponse(
+        blob_store.iter_range(sha256, *byte_range),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def file_response(
+    request: Request,
+    entry: dict,
+    filename: Optional[str] = None,
+    disposition: str = "inline",
+) -> Response:
+    """Serve a file entry (blob or legacy base64) with range support.
+
+    ``filename`` is used when the entry has none.
+    """
+    media_type = entry.get("content_type") or "application/octet-stream"
+    filename = entry.get("filename") or filename
+    if entry.get("blob"):
+        return blob_response(request, entry["blob"], media_type, filename, disposition)
+
+    content = file_bytes(entry)
+    if content is None:
+        raise HTTPException(status_code=404, detail="File data not available")
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    byte_range = _apply_range(request, len(content), headers)
+    if byte_range is None:
+        return Response(content, media_type=media_type, headers=headers)
+    start, end = byte_range
+    return Response(
+        content[start : end + 1], status_code=206, media_type=media_type, headers=headers
+    )
+
+
+def profile_picture_bytes(owner) -> Optional[bytes]:
+    """Profile picture of a User or AdminUser (blob or legacy bytea column)."""
+    if owner.profile_picture_blob:
+        try:
+            return blob_store.read_bytes(owner.profile_picture_blob)
+        except BlobNotFound:
+            logger.error(f"[Blob Store] Missing blob {owner.profile_picture_blob}")
+            return None
+    return owner.profile_picture_data
+
+
+def has_profile_picture(owner) -> bool:
+    """Whether a User or AdminUser has a profile picture.
+
+    The legacy bytea column is deferred; when it is not loaded yet, presence is
+    checked in SQL instead of loading the picture.
+    """
+    if owner.profile_picture_blob:
+        return True
+    state = inspect(owner)
+    if "profile_picture_data" not in state.unloaded or state.session is None:
+        return owner.profile_picture_data is not None
+    model = type(owner)
+    return bool(
+        state.session.query(model.profile_picture_data.isnot(None))
+        .filter(model.id == owner.id)
+        .scalar()
+    )
@@ -15,7 +15,6 @@ from typing import List, Tuple
 
 import bcrypt
 import pyotp
-import qrcode
 
 
 def generate_2fa_secret() -> str:
@@ -72,6 +71,8 @@ def generate_qr_code_image(qr_url: str) -> str:
         str: Base64-encoded PNG image that can be displayed in frontend
              Format: "data:image/png;base64,iVBORw0KGgo..."
     """
+    import qrcode
+
     # Create QR code
     qr = qrcode.QRCode(
         version=1,  # Controls size (1 is smallest)
@@ -0,0 +1,4 @@
+import os
+
+# src.app modules build their engine at import time; nothing here connects
+os.environ.setdefault("DATABASE_URL", "postgresql://test@127.0.0.1:1/test")
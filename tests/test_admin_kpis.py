@@ -0,0 +1,338 @@
+"""Admin KPI aggregates against one query per KPI, on a seeded SQLite database.
+
+contractors_kpis, suppliers_kpis and the subscriptions dashboard KPIs are
+computed with COUNT/SUM/AVG ... FILTER aggregates; the reference below runs
+each KPI as its own query, the way these endpoints used to.
+"""
+
+import inspect
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import case, create_engine, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.types import ARRAY as GenericARRAY
+
+from src.app import models
+from src.app.api.endpoints import admin_dashboard, subscriptions_dashboard
+from src.app.core.database import Base
+from src.app.core.query_fanout import query_fanout
+
+User = models.user.User
+Subscriber = models.user.Subscriber
+Subscription = models.user.Subscription
+UnlockedLead = models.user.UnlockedLead
+Job = models.user.Job
+
+TABLES = (
+    "users",
+    "subscriptions",
+    "subscribers",
+    "jobs",
+    "unlocked_leads",
+    "contractors",
+    "suppliers",
+)
+
+
+@compiles(ARRAY, "sqlite")
+@compiles(GenericARRAY, "sqlite")
+@compiles(JSONB, "sqlite")
+def _as_text(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # The fan-out runs queries on the given session when not concurrent
+    monkeypatch.setattr(query_fanout, "max_concurrency", 1)
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables[t] for t in TABLES])
+    session = sessionmaker(bind=engine)()
+    _seed(session)
+    yield session
+    session.close()
+
+
+def _seed(db):
+    rnd = random.Random(7)
+    now = datetime.utcnow()
+
+    def ago(days):
+        # 1-2 hours past a whole day, clear of the 7/14/30/60/90-day cutoffs
+        return now - timedelta(days=days, hours=1 + rnd.random())
+
+    for plan_id, name in enumerate(("Starter", "Professional", "Enterprise", "Custom"), 1):
+        db.add(Subscription(id=plan_id, name=name, price="$10", credits=10))
+    for user_id in range(1, 401):
+        db.add(
+            User(
+                id=user_id,
+                email=f"user{user_id}@example.com",
+                password_hash="x",
+                role=rnd.choice(["Contractor", "Supplier", None]),
+                approved_by_admin=rnd.choice(["approved", "approved", "pending"]),
+                created_at=ago(rnd.randint(0, 120)),
+            )
+        )
+        if rnd.random() < 0.85:
+            db.add(
+                Subscriber(
+                    user_id=user_id,
+                    subscription_id=rnd.choice([1, 2, 3, 4, None]),
+                    current_credits=rnd.choice([0, 5, 50, None]),
+                    total_spending=rnd.randint(0, 90),
+                    frozen_credits=rnd.choice([0, 3, None]),
+                    is_active=rnd.random() < 0.6,
+                    subscription_status=rnd.choice(
+                        ["active", "past_due", "canceled", "inactive"]
+                    ),
+                    subscription_start_date=rnd.choice([None, ago(rnd.randint(0, 120))]),
+                    frozen_at=rnd.choice([None, ago(rnd.randint(0, 70))]),
+                    trial_credits=rnd.randint(0, 25),
+                    trial_credits_used=rnd.random() < 0.5,
+                )
+            )
+    for job_id in range(1, 601):
+        db.add(
+            Job(
+                id=job_id,
+                created_at=ago(rnd.randint(0, 3) if rnd.random() < 0.3 else rnd.randint(0, 90)),
+                job_review_status=rnd.choice(["posted", "pending", "declined"]),
+                uploaded_by_contractor=rnd.random() < 0.3,
+                review_posted_at=rnd.choice([None, ago(rnd.randint(0, 30))]),
+            )
+        )
+    for lead_id in range(1, 1201):
+        db.add(
+            UnlockedLead(
+                user_id=rnd.randint(1, 400),
+                job_id=rnd.randint(1, 600),
+                unlocked_at=ago(rnd.randint(0, 20)),
+            )
+        )
+    db.commit()
+
+
+def _call(endpoint, db):
+    """Call an endpoint with its Query defaults."""
+    kwargs = {
+        name: db if name == "db" else getattr(param.default, "default", param.default)
+        for name, param in inspect.signature(endpoint).parameters.items()
+    }
+    return endpoint(**kwargs)
+
+
+def _change(current, previous):
+    if previous == 0:
+        return 0 if current == 0 else 100
+    return round(((current - previous) / previous) * 100, 1)
+
+
+def _rate(part, whole):
+    return round((part / whole * 100), 1) if whole > 0 else 0
+
+
+def reference_role_kpis(db, role):
+    now = datetime.utcnow()
+    seven_days_ago = now - timedelta(days=7)
+    fourteen_days_ago = now - timedelta(days=14)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday_start = today_start - timedelta(days=1)
+    of_role = (User.role == role, User.approved_by_admin == "approved")
+
+    def subscribers(column, *filters):
+        return (
+            db.query(column)
+            .join(User, Subscriber.user_id == User.id)
+            .filter(*of_role, *filters)
+            .scalar()
+            or 0
+        )
+
+    def unlocks(*filters):
+        return (
+            db.query(func.count(UnlockedLead.id))
+            .join(User, UnlockedLead.user_id == User.id)
+            .filter(*of_role, *filters)
+            .scalar()
+        )
+
+    def jobs(*filters):
+        return db.query(func.count(Job.id)).filter(*filters).scalar()
+
+    count = func.count(Subscriber.id)
+    unlocks_last_7d = unlocks(UnlockedLead.unlocked_at >= seven_days_ago)
+    unlocks_prev_7d = unlocks(
+        UnlockedLead.unlocked_at >= fourteen_days_ago,
+        UnlockedLead.unlocked_at < seven_days_ago,
+    )
+    ingested_today = jobs(Job.created_at >= today_start)
+    ingested_yesterday = jobs(
+        Job.created_at >= yesterday_start, Job.created_at < today_start
+    )
+    purchased = func.sum(
+        Subscriber.current_credits + Subscriber.total_spending + Subscriber.frozen_credits
+    )
+    return {
+        "activeSubscriptions": {
+            "value": subscribers(count, Subscriber.is_active == True),
+            "change": 0,
+        },
+        "pastDue": {
+            "value": subscribers(count, Subscriber.subscription_status == "past_due"),
+            "change": 0,
+        },
+        "creditsOutstanding": {
+            "value": subscribers(func.sum(Subscriber.current_credits)),
+            "change": 0,
+        },
+        "unlocksLast7d": {
+            "value": unlocks_last_7d,
+            "change": _change(unlocks_last_7d, unlocks_prev_7d),
+        },
+        "creditsPurchased": {"value": int(subscribers(purchased)), "change": 0},
+        "creditsSpent": {
+            "value": subscribers(func.sum(Subscriber.total_spending)),
+            "change": 0,
+        },
+        "trialCreditsUsed": {
+            "value": int(
+                subscribers(
+                    func.sum(25 - Subscriber.trial_credits),
+                    Subscriber.trial_credits_used == True,
+                )
+            ),
+            "change": 0,
+        },
+        "leadsIngestedToday": {
+            "value": ingested_today,
+            "change": _change(ingested_today, ingested_yesterday),
+        },
+        "leadsDelivered": {"value": jobs(Job.job_review_status == "posted"), "change": 0},
+        "leadsUnlocked": {"value": unlocks(), "change": 0},
+    }
+
+
+def reference_subscription_kpis(db):
+    now = datetime.utcnow()
+    thirty_days_ago = now - timedelta(days=30)
+    sixty_days_ago = now - timedelta(days=60)
+    ninety_days_ago = now - timedelta(days=90)
+
+    def approved(column, *filters):
+        return (
+            db.query(column)
+            .select_from(Subscriber)
+            .join(User, Subscriber.user_id == User.id)
+            .outerjoin(Subscription, Subscriber.subscription_id == Subscription.id)
+            .filter(User.approved_by_admin == "approved", *filters)
+            .scalar()
+        )
+
+    def count(*filters):
+        return approved(func.count(Subscriber.id), *filters)
+
+    def average(column, places, *filters):
+        value = approved(func.avg(column), *filters)
+        return round(float(value), places) if value else 0
+
+    is_active = Subscriber.is_active == True
+    started_30d_ago = Subscriber.subscription_start_date <= thirty_days_ago
+    started_60d_ago = Subscriber.subscription_start_date <= sixty_days_ago
+    canceled = Subscriber.subscription_status == "canceled"
+    trial_used = Subscriber.trial_credits_used == True
+    past_due_status = Subscriber.subscription_status == "past_due"
+    joined_30d_ago = User.created_at <= thirty_days_ago
+    plan_price = func.sum(
+        case(
+            (Subscription.name == "Starter", 49.99),
+            (Subscription.name == "Professional", 99.99),
+            (Subscription.name == "Enterprise", 199.99),
+            else_=0,
+        )
+    )
+
+    active = count(is_active)
+    active_30d_ago = count(is_active, started_30d_ago)
+    mrr = round(float(approved(plan_price, is_active) or 0), 2)
+    mrr_30d_ago = round(float(approved(plan_price, is_active, started_30d_ago) or 0), 2)
+    churned = count(
+        canceled, Subscriber.frozen_at >= thirty_days_ago, Subscriber.frozen_at <= now
+    )
+    churned_prev = count(
+        canceled,
+        Subscriber.frozen_at >= sixty_days_ago,
+        Subscriber.frozen_at < thirty_days_ago,
+    )
+    churn_rate = _rate(churned, active_30d_ago)
+    churn_rate_prev = _rate(churned_prev, count(is_active, started_60d_ago))
+    conversion = _rate(count(trial_used, is_active), count(trial_used))
+    conversion_prev = _rate(
+        count(
+            trial_used,
+            is_active,
+            started_60d_ago,
+            Subscriber.subscription_start_date > ninety_days_ago,
+        ),
+        count(trial_used, started_60d_ago),
+    )
+    avg_credits = average(Subscriber.current_credits, 1)
+    avg_credits_prev = average(Subscriber.current_credits, 1, joined_30d_ago)
+    past_due = count(past_due_status)
+    past_due_prev = count(past_due_status, joined_30d_ago)
+    avg_ltv = average(Subscriber.total_spending, 2)
+    avg_ltv_prev = average(Subscriber.total_spending, 2, joined_30d_ago)
+
+    return {
+        "active_subscriptions": {
+            "value": active,
+            "change": _change(active, active_30d_ago),
+        },
+        "mrr": {"value": mrr, "change": _change(mrr, mrr_30d_ago)},
+        "churn_rate": {"value": churn_rate, "change": _change(churn_rate, churn_rate_prev)},
+        "trial_conversion": {
+            "value": conversion,
+            "change": _change(conversion, conversion_prev),
+        },
+        "avg_credits": {
+            "value": avg_credits,
+            "change": _change(avg_credits, avg_credits_prev),
+        },
+        "past_due": {"value": past_due, "change": _change(past_due, past_due_prev)},
+        "cancellation_monthly": {
+            "value": churned,
+            "change": _change(churned, churned_prev),
+        },
+        "avg_lifetime_value": {
+            "value": avg_ltv,
+            "change": _change(avg_ltv, avg_ltv_prev),
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "endpoint, role",
+    [
+        (admin_dashboard.contractors_kpis, "Contractor"),
+        (admin_dashboard.suppliers_kpis, "Supplier"),
+    ],
+)
+def test_role_kpis_match_one_query_per_kpi(db, endpoint, role):
+    assert _call(endpoint, db) == reference_role_kpis(db, role)
+
+
+def test_subscription_dashboard_kpis_match_one_query_per_kpi(db):
+    params = inspect.signature(subscriptions_dashboard._subscriptions_dashboard).parameters
+    filters = {name: None for name in params if name != "db"}
+    filters.update(page=1, per_page=10)
+
+    response = subscriptions_dashboard._subscriptions_dashboard(db, **filters)
+
+    assert response["kpis"] == reference_subscription_kpis(db)
@@ -0,0 +1,61 @@
+"""BatchMatchingService scheduling (the matching itself is stubbed out)."""
+
+import asyncio
+
+from src.app.services.ai_batch_matching import BatchMatchingService
+
+
+class RecordingService(BatchMatchingService):
+    def __init__(self, run_seconds=0.0):
+        super().__init__()
+        self.run_seconds = run_seconds
+        self.runs = []
+        self.queued = []
+
+    async def _run(self, job_ids, limit):
+        self.runs.append(job_ids)
+        await asyncio.sleep(self.run_seconds)
+
+    def _queue_posted(self, job_ids):
+        self.queued.append(job_ids)
+
+
+def test_ingest_ids_queued_during_a_sweep_are_matched_after_it():
+    async def scenario():
+        service = RecordingService(run_seconds=0.05)
+        service.start(job_ids=None)
+        await asyncio.sleep(0)
+        assert service.is_running
+
+        service.schedule([3, 1])
+        service.schedule([2])
+        await service._sweep_task
+        await service._task
+        return service.runs
+
+    assert asyncio.run(scenario()) == [None, [1, 2, 3]]
+
+
+def test_ids_arriving_during_a_drain_get_a_follow_up_run():
+    async def scenario():
+        service = RecordingService(run_seconds=0.05)
+        service.schedule([1])
+        await asyncio.sleep(0.01)
+        service.schedule([2])
+        await service._task
+        return service.runs, service.queued
+
+    # Ingested ids are queued for push fan-out only after their run
+    assert asyncio.run(scenario()) == ([[1], [2]], [[1], [2]])
+
+
+def test_admin_run_is_refused_while_another_is_in_progress():
+    async def scenario():
+        service = RecordingService(run_seconds=0.05)
+        service.schedule([1])
+        await asyncio.sleep(0)
+        await service.run(job_ids=[9])
+        await service._task
+        return service.runs
+
+    assert asyncio.run(scenario()) == [[1]]
@@ -0,0 +1,208 @@
+"""Blob store, ranged/conditional blob responses and blob extraction."""
+
+import asyncio
+import base64
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.types import ARRAY as GenericARRAY
+
+from src.app import models
+from src.app.core.database import Base
+from src.app.services import blob_extraction
+from src.app.services.blob_store import BlobTooLarge, LocalBlobStore
+from src.app.utils import stored_files
+
+CONTENT = bytes(range(100))
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(stored_files, "blob_store", store)
+    monkeypatch.setattr(blob_extraction, "blob_store", store)
+    return store
+
+
+def _blobs(store):
+    blobs = [p for p in store.root.rglob("*") if p.is_file()]
+    return [p for p in blobs if p.relative_to(store.root).parts[0] != "tmp"]
+
+
+def _request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def _body(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_put_is_addressed_and_deduplicated_by_sha256(store):
+    first = store.put(io.BytesIO(CONTENT))
+    second = store.put_bytes(CONTENT)
+
+    assert first == second == (DIGEST, len(CONTENT))
+    assert store.read_bytes(DIGEST) == CONTENT
+    assert [p.name for p in _blobs(store)] == [DIGEST]
+    assert list((store.root / "tmp").iterdir()) == []
+
+
+def test_put_over_the_limit_stores_nothing(store):
+    with pytest.raises(BlobTooLarge):
+        store.put(io.BytesIO(CONTENT), max_bytes=10)
+
+    assert _blobs(store) == []
+    assert list((store.root / "tmp").iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "range_header, content_range, expected",
+    [
+        ("bytes=0-9", "bytes 0-9/100", CONTENT[:10]),
+        ("bytes=-5", "bytes 95-99/100", CONTENT[-5:]),
+        ("bytes=90-", "bytes 90-99/100", CONTENT[90:]),
+        ("bytes=95-500", "bytes 95-99/100", CONTENT[95:]),
+    ],
+)
+def test_range_is_served_partially(store, range_header, content_range, expected):
+    store.put_bytes(CONTENT)
+
+    response = stored_files.blob_response(
+        _request(range=range_header), DIGEST, "application/pdf"
+    )
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == content_range
+    assert response.headers["content-length"] == str(len(expected))
+    assert _body(response) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=100-", "bytes=150-200", "bytes=9-5"])
+def test_unsatisfiable_range_is_416(store, range_header):
+    store.put_bytes(CONTENT)
+
+    with pytest.raises(HTTPException) as error:
+        stored_files.blob_response(_request(range=range_header), DIGEST, "text/plain")
+
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == "bytes */100"
+
+
+def test_whole_blob_without_range(store):
+    store.put_bytes(CONTENT)
+
+    response = stored_files.blob_response(_request(), DIGEST, "text/plain")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{DIGEST}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert _body(response) == CONTENT
+
+
+def test_matching_etag_is_304(store):
+    store.put_bytes(CONTENT)
+
+    response = stored_files.blob_response(
+        _request(**{"if-none-match": f'"{DIGEST}"'}), DIGEST, "text/plain"
+    )
+
+    assert response.status_code == 304
+    assert response.body == b""
+
+
+def test_missing_blob_is_404(store):
+    with pytest.raises(HTTPException) as error:
+        stored_files.blob_response(_request(), "0" * 64, "text/plain")
+
+    assert error.value.status_code == 404
+
+
+def test_legacy_base64_entry_honours_range(store):
+    entry = {"filename": "a.bin", "data": base64.b64encode(CONTENT).decode()}
+
+    response = stored_files.file_response(_request(range="bytes=-5"), entry)
+
+    assert response.status_code == 206
+    assert response.body == CONTENT[-5:]
+
+
+def test_extract_entry_moves_base64_data(store):
+    entry = {"filename": "a.bin", "data": base64.b64encode(CONTENT).decode()}
+
+    extracted = blob_extraction.extract_entry(entry)
+
+    assert extracted == {"filename": "a.bin", "size": 100, "blob": DIGEST}
+    assert store.read_bytes(DIGEST) == CONTENT
+
+
+def test_extract_entry_is_idempotent(store, monkeypatch):
+    def put_bytes(data):
+        raise AssertionError("already extracted entries must not be stored again")
+
+    monkeypatch.setattr(store, "put_bytes", put_bytes)
+    extracted = {"filename": "a.bin", "size": 100, "blob": DIGEST}
+    # A run interrupted between writing the blob and dropping the data
+    half_extracted = {**extracted, "data": base64.b64encode(b"stale").decode()}
+
+    assert blob_extraction.extract_entry(extracted) == extracted
+    assert blob_extraction.extract_entry(half_extracted) == extracted
+    assert blob_extraction.extract_entry(extracted) is extracted
+
+
+@compiles(ARRAY, "sqlite")
+@compiles(GenericARRAY, "sqlite")
+@compiles(JSONB, "sqlite")
+def _as_text(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables["users"]])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_has_profile_picture_does_not_load_the_picture(db):
+    User = models.user.User
+    for user_id, data, blob in ((1, CONTENT, None), (2, None, None), (3, None, DIGEST)):
+        db.add(
+            User(
+                id=user_id,
+                email=f"user{user_id}@example.com",
+                password_hash="x",
+                profile_picture_data=data,
+                profile_picture_blob=blob,
+            )
+        )
+    db.commit()
+    db.expunge_all()
+
+    users = db.query(User).order_by(User.id).all()
+
+    assert [stored_files.has_profile_picture(user) for user in users] == [
+        True,
+        False,
+        True,
+    ]
+    assert all("profile_picture_data" in inspect(user).unloaded for user in users)
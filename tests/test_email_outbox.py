@@ -0,0 +1,109 @@
+"""Email outbox queueing and sending through StubTransport (no database)."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from src.app.services import email_outbox
+from src.app.services.email_outbox import (
+    DEDUP_WINDOW_SECONDS,
+    EmailOutboxSender,
+    default_dedup_key,
+    enqueue_email_async,
+)
+from src.app.utils.email_resend import StubTransport
+
+
+class FakeSession:
+    """Enough of a Session for ENQUEUE_SQL: dedup keys live in ``keys``."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.threads = []
+
+    def execute(self, statement, params):
+        self.threads.append(threading.get_ident())
+        if params["dedup_key"] in self.keys:
+            return SimpleNamespace(first=lambda: None)
+        self.keys.add(params["dedup_key"])
+        return SimpleNamespace(first=lambda: (len(self.keys),))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _row(row_id, to_email):
+    return SimpleNamespace(
+        id=row_id,
+        dedup_key=f"key-{row_id}",
+        to_email=to_email,
+        subject="Subject",
+        html="<p>Body</p>",
+        text_body="Body",
+        reply_to=None,
+    )
+
+
+def test_dedup_key_is_stable_within_a_window_and_changes_after_it():
+    start = 1_000 * DEDUP_WINDOW_SECONDS
+    key = default_dedup_key("a@example.com", "Hi", "<p>x</p>", now=start)
+
+    assert key == default_dedup_key("a@example.com", "Hi", "<p>x</p>", now=start + 1)
+    assert key != default_dedup_key(
+        "a@example.com", "Hi", "<p>x</p>", now=start + DEDUP_WINDOW_SECONDS
+    )
+    assert key != default_dedup_key("b@example.com", "Hi", "<p>x</p>", now=start)
+
+
+def test_async_enqueue_runs_off_the_loop_and_reports_duplicates(monkeypatch):
+    sessions = []
+    keys = set()
+
+    def session_factory():
+        sessions.append(FakeSession(keys))
+        return sessions[-1]
+
+    monkeypatch.setattr(email_outbox, "SessionLocal", session_factory)
+
+    async def scenario():
+        first = await enqueue_email_async("a@example.com", "Hi", "<p>x</p>")
+        again = await enqueue_email_async("a@example.com", "Hi", "<p>x</p>")
+        other = await enqueue_email_async("a@example.com", "Hi", "<p>x</p>", dedup_key="k")
+        return first, again, other, threading.get_ident()
+
+    first, again, other, loop_thread = asyncio.run(scenario())
+
+    assert (first, again, other) == (True, False, True)
+    assert all(loop_thread not in session.threads for session in sessions)
+
+
+def test_chunk_goes_out_in_one_batch_call():
+    transport = StubTransport()
+    sender = EmailOutboxSender(transport=transport)
+
+    outcomes = sender._send_chunk([_row(1, "a@example.com"), _row(2, "b@example.com")])
+
+    assert transport.calls == 1
+    assert [p["to"] for p in transport.sent] == [["a@example.com"], ["b@example.com"]]
+    assert [(row_id, error) for row_id, _, error in outcomes] == [(1, None), (2, None)]
+    assert all(pid.startswith("stub-") for _, pid, _ in outcomes)
+
+
+def test_failed_batch_is_retried_per_email():
+    transport = StubTransport(fail_addresses={"bad@example.com"})
+    sender = EmailOutboxSender(transport=transport)
+    rows = [_row(1, "a@example.com"), _row(2, "bad@example.com"), _row(3, "c@example.com")]
+
+    outcomes = sender._send_chunk(rows)
+
+    # One failed batch call, then one call per email
+    assert transport.calls == 4
+    assert [p["to"][0] for p in transport.sent] == ["a@example.com", "c@example.com"]
+    assert [row_id for row_id, _, error in outcomes if error is None] == [1, 3]
+    assert [row_id for row_id, _, error in outcomes if error is not None] == [2]
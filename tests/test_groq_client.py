@@ -0,0 +1,144 @@
+"""GroqClient against a local fake Groq server (no network)."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import HTTPException
+
+from src.app.services.groq_client import GroqClient
+
+COMPLETION = {"choices": [{"message": {"role": "assistant", "content": '{"ok": true}'}}]}
+
+
+class FakeGroq:
+    """Serves the queued (status, delay seconds) replies, then 200s."""
+
+    def __init__(self):
+        self.replies = []
+        self.requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                fake.requests += 1
+                status, delay = fake.replies.pop(0) if fake.replies else (200, 0)
+                time.sleep(delay)
+                payload = json.dumps(COMPLETION if status == 200 else {}).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}/chat/completions"
+
+
+@pytest.fixture
+def fake_groq():
+    fake = FakeGroq()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+def make_client(fake, **options):
+    options.setdefault("backoff_base", 0.01)
+    options.setdefault("backoff_max", 0.02)
+    return GroqClient(endpoint=fake.endpoint, **options)
+
+
+def call(client, deadline=None):
+    async def run():
+        try:
+            return await client.chat_json("test-key", {"messages": []}, deadline)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_transient_errors_are_retried(fake_groq):
+    fake_groq.replies = [(503, 0), (429, 0)]
+    client = make_client(fake_groq, max_retries=2)
+
+    assert call(client) == {"ok": True}
+    assert fake_groq.requests == 3
+    assert client.breaker.state == "closed"
+
+
+def test_client_errors_are_not_retried(fake_groq):
+    fake_groq.replies = [(400, 0)]
+    client = make_client(fake_groq, max_retries=2)
+
+    with pytest.raises(HTTPException) as error:
+        call(client)
+    assert error.value.status_code == 502
+    assert fake_groq.requests == 1
+    assert client.breaker.failures == 0
+
+
+def test_retries_exhausted_is_502(fake_groq):
+    fake_groq.replies = [(500, 0)] * 3
+    client = make_client(fake_groq, max_retries=2)
+
+    with pytest.raises(HTTPException) as error:
+        call(client)
+    assert error.value.status_code == 502
+    assert fake_groq.requests == 3
+
+
+def test_deadline_covers_slow_responses(fake_groq):
+    fake_groq.replies = [(200, 1.0)]
+    client = make_client(fake_groq, max_retries=2)
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as error:
+        call(client, deadline=0.3)
+    assert error.value.status_code == 504
+    assert time.monotonic() - started < 0.9
+
+
+def test_open_breaker_fails_fast_with_503(fake_groq):
+    fake_groq.replies = [(500, 0)] * 2
+    client = make_client(fake_groq, max_retries=0)
+    client.breaker.failure_threshold = 2
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            call(client)
+    assert client.breaker.state == "open"
+
+    with pytest.raises(HTTPException) as error:
+        call(client)
+    assert error.value.status_code == 503
+    assert "Retry-After" in error.value.headers
+    assert fake_groq.requests == 2
+
+
+def test_breaker_closes_after_successful_trial(fake_groq):
+    fake_groq.replies = [(500, 0)]
+    client = make_client(fake_groq, max_retries=0)
+    client.breaker.failure_threshold = 1
+    client.breaker.reset_timeout = 0.05
+
+    with pytest.raises(HTTPException):
+        call(client)
+    assert client.breaker.state == "open"
+
+    time.sleep(0.1)
+    assert call(client) == {"ok": True}
+    assert client.breaker.state == "closed"
@@ -0,0 +1,11 @@
+"""Cold-start import of src.app.main stays within budget (check_import_time.py)."""
+
+import check_import_time
+
+
+def test_app_import_is_fast_lazy_and_offline():
+    samples, failures = check_import_time.check(
+        runs=2, budget_ms=check_import_time.DEFAULT_BUDGET_MS
+    )
+
+    assert not failures, f"{failures} (samples: {[round(s) for s in samples]} ms)"
@@ -0,0 +1,116 @@
+"""Job-posted push consumer against a fake session (no database)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.services import job_posted_push
+from src.app.services.job_posted_push import (
+    CLAIM_EVENTS_SQL,
+    DELETE_PENDING_SQL,
+    DUE_PENDING_SQL,
+    POSTED_JOBS_SQL,
+    SUBSCRIPTIONS_FOR_USERS_SQL,
+    JobPostedPushService,
+)
+from src.app.services.push_service import SENT
+
+
+class FakeResult:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def fetchall(self):
+        return self.rows
+
+    all = fetchall
+
+    def scalars(self):
+        return self
+
+
+class FakeSession:
+    """Answers the consumer's queries from fixed rows; records deletions."""
+
+    def __init__(self, due, jobs, subscriptions):
+        self.answers = {
+            CLAIM_EVENTS_SQL: FakeResult(),
+            DUE_PENDING_SQL: FakeResult(due),
+            POSTED_JOBS_SQL: FakeResult(jobs),
+            SUBSCRIPTIONS_FOR_USERS_SQL: FakeResult(subscriptions),
+        }
+        self.deleted = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if sql == DELETE_PENDING_SQL:
+            self.deleted.extend(zip(params["user_ids"], params["job_ids"]))
+        return self.answers.get(sql, FakeResult())
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.deleted.clear()
+
+    def close(self):
+        pass
+
+
+def _job(job_id):
+    return SimpleNamespace(
+        id=job_id,
+        permit_type_norm="roofing",
+        project_description=f"job {job_id}",
+        contractor_name="",
+        contractor_email="",
+    )
+
+
+def _subscription(sub_id, user_id):
+    return SimpleNamespace(
+        id=sub_id,
+        user_id=user_id,
+        endpoint="https://push.example/x",
+        p256dh_key="k",
+        auth_key="a",
+        effective_user_id=user_id,
+    )
+
+
+@pytest.fixture
+def session(monkeypatch):
+    due = [
+        SimpleNamespace(user_id=1, job_id=10),
+        SimpleNamespace(user_id=2, job_id=10),
+        SimpleNamespace(user_id=3, job_id=10),  # no subscription left
+        SimpleNamespace(user_id=1, job_id=11),  # no longer posted
+    ]
+    session = FakeSession(
+        due, jobs=[_job(10)], subscriptions=[_subscription(100, 1), _subscription(200, 2)]
+    )
+    monkeypatch.setattr(job_posted_push, "SessionLocal", lambda: session)
+    return session
+
+
+def test_only_pushed_users_leave_the_pending_set(monkeypatch, session):
+    def deliver(db, subscriptions, payload_for, **kwargs):
+        # User 2's push fails
+        return {SENT: 1, "sent_ids": [100]}
+
+    monkeypatch.setattr(job_posted_push.push_engine, "deliver", deliver)
+
+    assert JobPostedPushService()._process_outbox_sync() == 1
+    assert sorted(session.deleted) == [(1, 10), (1, 11), (3, 10)]
+
+
+def test_pending_rows_survive_a_failed_delivery(monkeypatch, session):
+    def deliver(db, subscriptions, payload_for, **kwargs):
+        raise RuntimeError("push service down")
+
+    monkeypatch.setattr(job_posted_push.push_engine, "deliver", deliver)
+
+    with pytest.raises(RuntimeError):
+        JobPostedPushService()._process_outbox_sync()
+    assert session.deleted == []
@@ -0,0 +1,48 @@
+"""Non-transactional migration steps against a recording connection."""
+
+from types import SimpleNamespace
+
+from src.app.core.migrations import Migration, _apply
+
+STEP = Migration(
+    99,
+    "test index",
+    ("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_test ON jobs (created_at)",),
+    transactional=False,
+)
+
+
+class RecordingConnection:
+    def __init__(self, invalid_indexes=()):
+        self.invalid_indexes = set(invalid_indexes)
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        invalid = "indisvalid" in sql and params["name"] in self.invalid_indexes
+        return SimpleNamespace(first=lambda: (1,) if invalid else None)
+
+
+def _executed(conn):
+    return [s for s in conn.statements if "indisvalid" not in s]
+
+
+def test_invalid_index_is_dropped_before_it_is_rebuilt():
+    conn = RecordingConnection(invalid_indexes={"ix_test"})
+
+    _apply(None, conn, STEP)
+
+    assert _executed(conn)[:2] == [
+        "DROP INDEX CONCURRENTLY IF EXISTS ix_test",
+        STEP.statements[0],
+    ]
+
+
+def test_missing_or_valid_index_is_left_to_if_not_exists():
+    conn = RecordingConnection()
+
+    _apply(None, conn, STEP)
+
+    assert _executed(conn)[0] == STEP.statements[0]
+    assert not any(s.startswith("DROP") for s in conn.statements)
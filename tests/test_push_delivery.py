@@ -0,0 +1,179 @@
+"""PushDeliveryEngine against a local fake push service (no network)."""
+
+import base64
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from py_vapid import Vapid
+
+from src.app.services import push_service
+from src.app.services.push_service import FAILED, GONE, SENT, PushDeliveryEngine
+
+
+class FakePushService:
+    """Replies by endpoint name: gone-* 410, missing-* 404, fail-* 500, else 201."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake._lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                time.sleep(fake.delay)
+                with fake._lock:
+                    fake.in_flight -= 1
+                name = self.path.rsplit("/", 1)[-1]
+                status = 201
+                for prefix, code in (("gone", 410), ("missing", 404), ("fail", 500)):
+                    if name.startswith(prefix):
+                        status = code
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/push"
+
+
+class RecordingSession:
+    """Records the statements the engine would send to Postgres."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.statements.append((" ".join(str(statement).split()), params))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def ids_of(self, prefix):
+        return [params["ids"] for sql, params in self.statements if sql.startswith(prefix)]
+
+
+@pytest.fixture
+def fake_push():
+    fake = FakePushService()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def vapid_keys(tmp_path, monkeypatch):
+    key_file = tmp_path / "vapid_private_key.pem"
+    vapid = Vapid()
+    vapid.generate_keys()
+    vapid.save_key(str(key_file))
+    monkeypatch.setattr(push_service, "VAPID_PRIVATE_KEY", str(key_file))
+    monkeypatch.setattr(push_service, "VAPID_PUBLIC_KEY", "test-public-key")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_subscriptions(fake, names):
+    subscriptions = []
+    for sub_id, name in enumerate(names, 1):
+        public_key = ec.generate_private_key(ec.SECP256R1()).public_key()
+        p256dh = public_key.public_bytes(
+            serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+        )
+        subscriptions.append(
+            SimpleNamespace(
+                id=sub_id,
+                user_id=sub_id,
+                endpoint=f"{fake.base_url}/{name}",
+                p256dh_key=_b64(p256dh),
+                auth_key=_b64(os.urandom(16)),
+            )
+        )
+    return subscriptions
+
+
+def deliver(engine, subscriptions, **options):
+    db = RecordingSession()
+    stats = engine.deliver(db, subscriptions, lambda sub: {"title": "t"}, **options)
+    return db, stats
+
+
+def test_outcomes_are_counted_and_applied_in_one_batch(fake_push):
+    names = ["sub-1", "gone-2", "sub-3", "missing-4", "fail-5", "sub-6"]
+    subscriptions = make_subscriptions(fake_push, names)
+
+    engine = PushDeliveryEngine(max_concurrency=4)
+
+    db, stats = deliver(engine, subscriptions, mark_notified=True)
+
+    assert (stats["total"], stats[SENT], stats[GONE], stats[FAILED]) == (6, 3, 2, 1)
+    assert sorted(stats["sent_ids"]) == [1, 3, 6]
+    assert fake_push.requests == 6
+    # One DELETE for the 404/410 endpoints, one UPDATE for the sent ones
+    assert [sorted(ids) for ids in db.ids_of("DELETE FROM push_subscriptions")] == [
+        [2, 4]
+    ]
+    assert [
+        sorted(ids) for ids in db.ids_of("UPDATE push_subscriptions SET last_notified_at")
+    ] == [[1, 3, 6]]
+    assert db.commits == 1
+
+
+def test_state_updates_are_batched_per_chunk(fake_push):
+    names = [f"sub-{i}" for i in range(1, 11)]
+    subscriptions = make_subscriptions(fake_push, names)
+    engine = PushDeliveryEngine(max_concurrency=4, chunk_size=4)
+
+    db, stats = deliver(
+        engine, subscriptions, mark_notified=True, notified_column="last_job_push_at"
+    )
+
+    assert stats[SENT] == 10
+    assert [
+        sorted(ids) for ids in db.ids_of("UPDATE push_subscriptions SET last_job_push_at")
+    ] == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+    assert db.ids_of("DELETE") == []
+    assert db.commits == 3
+
+
+def test_unmarked_delivery_writes_no_timestamp(fake_push):
+    db, stats = deliver(PushDeliveryEngine(), make_subscriptions(fake_push, ["sub-1"]))
+
+    assert stats[SENT] == 1
+    assert db.ids_of("UPDATE") == []
+
+
+def test_concurrency_is_bounded(fake_push):
+    fake_push.delay = 0.05
+    subscriptions = make_subscriptions(fake_push, [f"sub-{i}" for i in range(12)])
+
+    _, stats = deliver(PushDeliveryEngine(max_concurrency=3), subscriptions)
+
+    assert stats[SENT] == 12
+    assert 1 < fake_push.max_in_flight <= 3
@@ -0,0 +1,80 @@
+"""Scheduler task execution (leader election and run history are stubbed out)."""
+
+import asyncio
+import threading
+import time
+
+from src.app.services.scheduler import Scheduler, run_blocking
+
+
+class LocalScheduler(Scheduler):
+    """Always wins the claim; records when each run released its lock."""
+
+    def __init__(self):
+        super().__init__()
+        self.finished = []
+
+    def _claim(self, task):
+        return None, 0
+
+    def _finish(self, conn, task, run_id, status, duration_ms, rows_affected, error):
+        self.finished.append((task.name, status, time.monotonic()))
+
+
+def blocking_task(seconds, done=None):
+    async def body():
+        await run_blocking(time.sleep, seconds)
+        if done is not None:
+            done.set()
+        return 1
+
+    return body
+
+
+def test_long_tasks_do_not_starve_a_short_one():
+    scheduler = LocalScheduler()
+    slow = [
+        scheduler.register(f"slow.{i}", blocking_task(0.5), interval_seconds=3600)
+        for i in range(3)
+    ]
+    fast = scheduler.register(
+        "fast", blocking_task(0.01), interval_seconds=60, timeout_seconds=0.2
+    )
+
+    async def scenario():
+        runs = [asyncio.create_task(scheduler.run_task(t)) for t in slow]
+        await asyncio.sleep(0.01)
+        status = await scheduler.run_task(fast)
+        await asyncio.gather(*runs)
+        return status
+
+    assert asyncio.run(scenario()) == "success"
+
+
+def test_timed_out_task_keeps_its_lock_until_the_thread_returns():
+    scheduler = LocalScheduler()
+    thread_done = threading.Event()
+
+    def work():
+        time.sleep(0.3)
+        thread_done.set()
+
+    async def body():
+        await run_blocking(work)
+
+    task = scheduler.register("slow", body, interval_seconds=60, timeout_seconds=0.05)
+
+    started = time.monotonic()
+    assert asyncio.run(scheduler.run_task(task)) == "timeout"
+    assert thread_done.is_set()
+    name, status, released_at = scheduler.finished[0]
+    assert status == "timeout"
+    assert released_at - started >= 0.3
+    assert not task.in_flight
+
+
+def test_run_blocking_outside_a_task_uses_the_shared_pool():
+    async def scenario():
+        return await run_blocking(threading.current_thread)
+
+    assert asyncio.run(scenario()).name.startswith("scheduler_")
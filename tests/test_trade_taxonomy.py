@@ -0,0 +1,20 @@
+from src.app.api.endpoints import ai_job_matching
+from src.app.data import trade_taxonomy
+
+
+def test_prompt_catalogs_cover_every_trade_of_the_role():
+    for role, catalog in (
+        (trade_taxonomy.CONTRACTOR, ai_job_matching.CONTRACTOR_PROMPT_TYPES),
+        (trade_taxonomy.SUPPLIER, ai_job_matching.SUPPLIER_PROMPT_TYPES),
+    ):
+        names = [t.display_name for t in trade_taxonomy.trades_for_role(role)]
+        assert list(catalog) == names
+    assert "Irrigation Contractors" in ai_job_matching.CONTRACTOR_PROMPT_TYPES
+
+
+def test_catalog_ids_decode_to_display_names():
+    catalog = ai_job_matching.SUPPLIER_PROMPT_TYPES
+    matches = ai_job_matching.decode_catalog_matches(
+        [[1, 0], [len(catalog), 30], [len(catalog) + 1, 5]], catalog
+    )
+    assert [m["user_type"] for m in matches] == [catalog[0], catalog[-1]]